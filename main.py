@@ -6,6 +6,13 @@ Usage:
   python main.py --ui
   python main.py --headless [--runs 50] [--days 365]
   python main.py --headless --runs 2 --days 3   # tests rapides
+  python main.py --headless --runs 50 --workers 8   # runs répartis sur 8 processus
+  python main.py --headless --runs 50 --resume   # reprend une campagne interrompue
+  python main.py --headless --stream --no-pickles   # résultats journaliers par blocs, mémoire bornée
+  python main.py --headless --runs 50 --ensemble   # statistiques d'ensemble agrégées pendant les runs
+  python main.py --headless --runs 500 --queue /partage/file.db   # dépose les runs dans la file partagée
+  python main.py --worker --queue /partage/file.db   # worker : exécute les travaux de la file (une machine, un processus)
+  python main.py --headless --cible morts_base_evenements_mensuelles_arrondissement:0.1:0.05 --runs 500   # runs jusqu'à convergence
 """
 
 from __future__ import annotations
@@ -15,6 +22,7 @@ import logging
 import subprocess
 import sys
 from pathlib import Path
+from typing import List
 
 from src.core.config.config_validator import Config, load_and_validate_config
 from src.core.utils.path_resolver import PathResolver
@@ -33,6 +41,7 @@ def _parse_args() -> argparse.Namespace:
     g = p.add_mutually_exclusive_group()
     g.add_argument("--ui", action="store_true", help="Lancer l'interface Streamlit")
     g.add_argument("--headless", action="store_true", help="Simulation sans UI (N runs × M jours)")
+    g.add_argument("--worker", action="store_true", help="Worker de la file de travaux --queue")
     p.add_argument("--runs", type=int, default=50, help="Nombre de runs (headless). Défaut: 50")
     p.add_argument("--days", type=int, default=365, help="Nombre de jours par run. Défaut: 365")
     p.add_argument(
@@ -41,8 +50,24 @@ def _parse_args() -> argparse.Namespace:
         default=None,
         help="Chemin config YAML (défaut: config/config.yaml)",
     )
+    p.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="Dossier de sortie headless (défaut: data/intermediate, data/intermediate/adaptatif en adaptatif)",
+    )
     p.add_argument("--no-pickles", action="store_true", help="Ne pas sauvegarder les pickles (headless)")
     p.add_argument("--no-trace", action="store_true", help="Ne pas sauvegarder les trace JSON (headless)")
+    p.add_argument(
+        "--stream",
+        action="store_true",
+        help="Écrire les résultats journaliers par blocs pendant les runs (headless, run_XXX/stream)",
+    )
+    p.add_argument(
+        "--ensemble",
+        action="store_true",
+        help="Agréger les statistiques d'ensemble pendant les runs (headless, ensemble.npz)",
+    )
     p.add_argument(
         "--scenario",
         type=str,
@@ -57,6 +82,47 @@ def _parse_args() -> argparse.Namespace:
         default="Moyenne",
         help="Variabilité locale (headless). Défaut: Moyenne",
     )
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Nombre de processus pour les runs (headless). Défaut: 1 (séquentiel)",
+    )
+    p.add_argument(
+        "--resume",
+        action="store_true",
+        help="Reprendre la campagne (headless) : runs vérifiés par le manifeste non relancés",
+    )
+    p.add_argument(
+        "--cible",
+        action="append",
+        default=None,
+        metavar="METRIQUE[:PRECISION[:TOLERANCE]]",
+        help="Campagne adaptative (headless) : runs par lots jusqu'à ce que la demi-largeur relative de l'IC "
+        "de chaque cible passe sous PRECISION (défaut 0.05) ou sa demi-largeur sous TOLERANCE (défaut 0, "
+        "requise pour qu'une composante toujours nulle converge) ; --runs devient le budget. Répétable",
+    )
+    p.add_argument("--lot", type=int, default=10, help="Runs par lot (campagne adaptative). Défaut: 10")
+    p.add_argument(
+        "--confiance", type=float, default=0.95, help="Niveau de confiance de l'IC (campagne adaptative). Défaut: 0.95"
+    )
+    p.add_argument(
+        "--queue",
+        type=str,
+        default=None,
+        help="File de travaux SQLite partagée : --headless y dépose les runs, --worker les exécute",
+    )
+    p.add_argument(
+        "--exit-when-empty",
+        action="store_true",
+        help="Worker : s'arrêter quand plus aucun travail n'est en attente",
+    )
+    p.add_argument(
+        "--queue-journal",
+        choices=["WAL", "DELETE"],
+        default="WAL",
+        help="Mode de journal de la file (DELETE pour un montage réseau entre machines). Défaut: WAL",
+    )
     p.add_argument(
         "--debug-prints",
         action="store_true",
@@ -65,6 +131,21 @@ def _parse_args() -> argparse.Namespace:
     return p.parse_args()
 
 
+def _options_sans_effet(args: argparse.Namespace) -> List[str]:
+    """Options headless ignorées par la file (--queue) ou la campagne adaptative (--cible)."""
+    options = {
+        "--resume": args.resume,
+        "--stream": args.stream,
+        "--ensemble": args.ensemble,
+        "--debug-prints": args.debug_prints,
+    }
+    if args.queue:
+        # Parallélisme donné par le nombre de workers lancés ; --queue prime sur --cible
+        options["--workers"] = args.workers != 1
+        options["--cible"] = bool(args.cible)
+    return [nom for nom, active in options.items() if active]
+
+
 def _run_ui(config_path: str) -> None:
     root = PathResolver.get_project_root()
     app = root / "src" / "adapters" / "ui" / "streamlit_app.py"
@@ -77,25 +158,94 @@ def _run_ui(config_path: str) -> None:
 
 def _run_headless(args: argparse.Namespace, config: Config) -> None:
     svc = SimulationService(config=config)
-    svc.run_headless(
+    echecs = svc.run_headless(
         days=args.days,
         runs=args.runs,
+        output_dir=Path(args.output) if args.output else None,
         save_pickles=not args.no_pickles,
         save_trace=not args.no_trace,
         verbose=True,
         scenario_ui=args.scenario,
         variabilite_ui=args.variabilite,
         debug_prints=args.debug_prints,
+        workers=args.workers,
+        resume=args.resume,
+        save_stream=args.stream,
+        save_ensemble=args.ensemble,
     )
     logger.info(
         "Headless terminé: %s runs × %s jours (scénario=%s, variabilité=%s).",
         args.runs, args.days, args.scenario, args.variabilite,
     )
+    if echecs:
+        logger.error("Runs en échec: %s", ", ".join(f"run_{i:03d}" for i in echecs))
+        sys.exit(1)
+
+
+def _run_adaptatif(args: argparse.Namespace, config: Config) -> None:
+    from src.services.adaptive_campaign import CibleConvergence, executer_campagne_adaptative
+    from src.services.simulation_service import SCENARIO_UI_TO_CONFIG
+
+    cibles = [CibleConvergence.depuis_texte(spec) for spec in args.cible]
+    output_dir = (
+        Path(args.output) if args.output else PathResolver.get_project_root() / "data" / "intermediate" / "adaptatif"
+    )
+    bilan = executer_campagne_adaptative(
+        config,
+        cibles,
+        output_dir,
+        scenario=SCENARIO_UI_TO_CONFIG[args.scenario],
+        variabilite=args.variabilite,
+        jours=args.days,
+        taille_lot=args.lot,
+        runs_max=args.runs,
+        confiance=args.confiance,
+        workers=args.workers,
+        save_pickles=not args.no_pickles,
+        save_trace=not args.no_trace,
+    )
+    logger.info(
+        "Campagne adaptative terminée: %s runs en %s lots, convergence=%s (%s).",
+        bilan["runs"], bilan["lots"], bilan["converge"], output_dir,
+    )
+
+
+def _soumettre_file(args: argparse.Namespace, config: Config) -> None:
+    from src.services.job_queue import FileTravaux, soumettre_runs
+
+    file = FileTravaux(Path(args.queue), mode_journal=args.queue_journal)
+    campagne = soumettre_runs(
+        file,
+        config,
+        Path(args.output) if args.output else PathResolver.get_project_root() / "data" / "intermediate",
+        runs=args.runs,
+        days=args.days,
+        scenario_ui=args.scenario,
+        variabilite_ui=args.variabilite,
+        save_pickles=not args.no_pickles,
+        save_trace=not args.no_trace,
+    )
+    logger.info("%s runs déposés dans %s (campagne %s).", args.runs, args.queue, campagne)
+
+
+def _run_worker(args: argparse.Namespace) -> None:
+    from src.services.job_queue import executer_worker
+
+    executes = executer_worker(Path(args.queue), arret_si_vide=args.exit_when_empty, mode_journal=args.queue_journal)
+    logger.info("Worker arrêté après %s travaux.", executes)
 
 
 def main() -> None:
     args = _parse_args()
 
+    if args.worker:
+        if not args.queue:
+            logger.error("--worker demande --queue")
+            sys.exit(1)
+        # Config lue dans la file (celle de chaque campagne déposée)
+        _run_worker(args)
+        return
+
     config_path = args.config
     if config_path is None:
         config_path = str(PathResolver.config_file("config.yaml"))
@@ -115,7 +265,21 @@ def main() -> None:
         return
 
     if args.headless:
-        _run_headless(args, config)
+        if args.queue or args.cible:
+            ignorees = _options_sans_effet(args)
+            if ignorees:
+                logger.error("%s sans effet avec %s", ", ".join(ignorees), "--queue" if args.queue else "--cible")
+                sys.exit(1)
+        if args.queue:
+            _soumettre_file(args, config)
+        elif args.cible:
+            try:
+                _run_adaptatif(args, config)
+            except ValueError as e:
+                logger.error("Campagne adaptative invalide: %s", e)
+                sys.exit(1)
+        else:
+            _run_headless(args, config)
         return
 
     # Défaut: mode UI
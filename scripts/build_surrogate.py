@@ -0,0 +1,89 @@
+"""
+Émulateur des statistiques de run : plan en hypercube latin simulé, ajustement, rapport de validation.
+
+Usage:
+  python scripts/build_surrogate.py --points 40 --validation 10 --seeds 42 43 --days 90 --workers 4
+  python scripts/build_surrogate.py --methode gradient_boosting --parametre matrices_base.reduction_effet -1 0.8 \\
+      --parametre scenarios.moyen.proba_crise 0 0.3
+  python scripts/build_surrogate.py --cribler 5000 --emulateur data/intermediate/emulateur/emulateur.joblib
+
+Écrit <output>/emulateur.joblib et <output>/validation_emulateur.csv ; --cribler prédit N
+configurations tirées dans l'espace et écrit les plus fortes (--tri) dans <output>/criblage.csv.
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Ajouter la racine au path
+root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(root))
+
+from src.core.config.config_validator import load_and_validate_config
+from src.core.utils.path_resolver import PathResolver
+from src.services.surrogate import Emulateur, EspaceParametres, construire_emulateur
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument(
+        "--parametre", nargs=3, action="append", metavar=("CHEMIN", "BAS", "HAUT"), default=None,
+        help="Paramètre émulé (répétable) ; défaut : EspaceParametres.defaut(scenario)",
+    )
+    p.add_argument("--points", type=int, default=40, help="Points du plan d'apprentissage")
+    p.add_argument("--validation", type=int, default=10, help="Points du plan de validation")
+    p.add_argument("--seeds", nargs="+", type=int, default=[42, 43], help="Seeds par point")
+    p.add_argument("--days", type=int, default=90)
+    p.add_argument("--scenario", type=str, default="moyen", help="pessimiste, moyen, optimiste")
+    p.add_argument("--variabilite", type=str, default="Moyenne", help="Faible, Moyenne, Forte")
+    p.add_argument("--methode", choices=["gp", "gradient_boosting"], default="gp")
+    p.add_argument("--seed", type=int, default=0, help="Graine des plans et des ajustements")
+    p.add_argument("--workers", type=int, default=1)
+    p.add_argument("--output", type=str, default=None, help="Défaut: data/intermediate/emulateur")
+    p.add_argument("--emulateur", type=str, default=None, help="Émulateur existant (pas de simulation)")
+    p.add_argument("--cribler", type=int, default=0, help="Nombre de configurations à cribler")
+    p.add_argument("--tri", type=str, default="morts_base_evenements", help="Statistique de tri du criblage")
+    args = p.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    output_dir = (
+        Path(args.output) if args.output else PathResolver.get_project_root() / "data" / "intermediate" / "emulateur"
+    )
+
+    if args.emulateur:
+        emulateur = Emulateur.charger(Path(args.emulateur))
+    else:
+        espace = None
+        if args.parametre:
+            espace = EspaceParametres({chemin: (float(bas), float(haut)) for chemin, bas, haut in args.parametre})
+        config = load_and_validate_config(str(PathResolver.config_file("config.yaml")))
+        emulateur, df_validation = construire_emulateur(
+            config,
+            output_dir,
+            espace=espace,
+            points=args.points,
+            points_validation=args.validation,
+            seeds=args.seeds,
+            jours=args.days,
+            scenario=args.scenario,
+            variabilite=args.variabilite,
+            methode=args.methode,
+            seed=args.seed,
+            workers=args.workers,
+        )
+        if not df_validation.empty:
+            print(df_validation.to_string(index=False))
+
+    if args.cribler > 0:
+        df = emulateur.predire(emulateur.espace.plan_hypercube(args.cribler, args.seed + 2))
+        df = df.sort_values(args.tri, ascending=False)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        df.to_csv(output_dir / "criblage.csv", index=False)
+        colonnes = emulateur.espace.parametres + [args.tri, f"{args.tri}_std"]
+        print(df[colonnes].head(20).to_string(index=False))
+    print(f"\nÉmulateur : {output_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
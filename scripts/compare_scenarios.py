@@ -0,0 +1,70 @@
+"""
+Comparaison de deux scénarios par différences appariées (mêmes runs, nombres aléatoires communs).
+
+Usage:
+  python scripts/compare_scenarios.py --a moyen --b pessimiste --runs 20 --days 90 --workers 4
+  python scripts/compare_scenarios.py --a moyen --b optimiste --reduction antithetique --runs 20
+
+Écrit <output>/comparaison.csv (différence B − A, IC apparié et IC indépendant par statistique).
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Ajouter la racine au path
+root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(root))
+
+from src.core.config.config_validator import load_and_validate_config
+from src.core.utils.path_resolver import PathResolver
+from src.services.scenario_comparison import comparer_scenarios
+from src.services.sweep_service import appliquer_surcharges
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--a", type=str, default="moyen", help="Scénario de référence (pessimiste, moyen, optimiste)")
+    p.add_argument("--b", type=str, default="pessimiste", help="Scénario comparé")
+    p.add_argument("--variabilite", type=str, default="Moyenne", help="Faible, Moyenne, Forte")
+    p.add_argument("--days", type=int, default=365)
+    p.add_argument("--runs", type=int, default=20, help="Runs par scénario")
+    p.add_argument("--seed", type=int, default=None)
+    p.add_argument("--workers", type=int, default=1)
+    p.add_argument("--confiance", type=float, default=0.95)
+    p.add_argument(
+        "--reduction",
+        choices=["aucune", "crn", "antithetique"],
+        default="crn",
+        help="Réduction de variance (remplace simulation.reduction_variance)",
+    )
+    p.add_argument("--output", type=str, default=None, help="Défaut: data/intermediate/comparaison")
+    p.add_argument("--pickles", action="store_true", help="Sauvegarder les pickles des runs")
+    args = p.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    output_dir = (
+        Path(args.output) if args.output else PathResolver.get_project_root() / "data" / "intermediate" / "comparaison"
+    )
+
+    config = load_and_validate_config(str(PathResolver.config_file("config.yaml")))
+    config = appliquer_surcharges(config, {"simulation.reduction_variance": args.reduction})
+    df = comparer_scenarios(
+        config,
+        output_dir,
+        scenario_a=args.a,
+        scenario_b=args.b,
+        variabilite=args.variabilite,
+        jours=args.days,
+        runs=args.runs,
+        seed=args.seed,
+        workers=args.workers,
+        confiance=args.confiance,
+        save_pickles=args.pickles,
+    )
+    print(df.to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
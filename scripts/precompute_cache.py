@@ -0,0 +1,175 @@
+"""
+Cache adressé par contenu des artefacts de pré-calcul (data/source_data).
+
+Organisation du cache (par défaut data/cache/precompute) :
+- objects/<sha256[:2]>/<sha256> : contenu des fichiers produits (un blob par contenu distinct) ;
+- manifests/<etape>/<empreinte>.json : pour une empreinte d'étape (entrées + code + config,
+  calculée par PrecomputePipeline.fingerprint), la liste des sorties et le sha256 de leur contenu.
+
+Chaque fichier de data/source_data produit par une étape est référencé dans
+data/source_data/.precompute_manifest.json (étape, empreinte, sha256 du blob).
+
+Revenir à une configuration déjà calculée (ex: k voisins différent) restaure les
+sorties depuis les blobs sans relancer l'étape. La restauration copie les blobs
+(pas de lien dur) : les scripts de mise à jour réécrivent les pickles en place et
+corrompraient sinon le cache.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = "data/cache/precompute"
+SOURCE_MANIFEST_FILENAME = ".precompute_manifest.json"
+
+
+def sha256_file(path: Path) -> str:
+    """sha256 du contenu d'un fichier."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _copy_atomic(source: Path, destination: Path) -> None:
+    """Copie via un fichier temporaire voisin puis os.replace (pas de fichier tronqué)."""
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    tmp = destination.with_name(f".{destination.name}.{os.getpid()}.tmp")
+    shutil.copyfile(source, tmp)
+    os.replace(tmp, destination)
+
+
+def _write_json_atomic(path: Path, data: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+class ArtifactCache:
+    """Magasin d'artefacts de pré-calcul adressé par contenu."""
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+        self.objects_dir = self.cache_dir / "objects"
+        self.manifests_dir = self.cache_dir / "manifests"
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], root_dir: Path) -> Optional["ArtifactCache"]:
+        """
+        Crée le cache depuis precompute.cache ({enabled, dir}).
+
+        Returns:
+            ArtifactCache, ou None si le cache est désactivé
+        """
+        cache_config = (config.get('precompute') or {}).get('cache') or {}
+        if not cache_config.get('enabled', True):
+            return None
+        cache_dir = Path(cache_config.get('dir') or DEFAULT_CACHE_DIR)
+        if not cache_dir.is_absolute():
+            cache_dir = Path(root_dir) / cache_dir
+        return cls(cache_dir)
+
+    def object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def manifest_path(self, step_name: str, key: str) -> Path:
+        return self.manifests_dir / step_name / f"{key}.json"
+
+    def load_manifest(self, step_name: str, key: str) -> Optional[Dict[str, Any]]:
+        path = self.manifest_path(step_name, key)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            logger.warning(f"⚠️  Manifeste de cache illisible, ignoré: {path}")
+            return None
+
+    def store(self, step_name: str, key: str, output_dir: Path, outputs: Sequence[str]) -> Optional[Dict[str, Any]]:
+        """
+        Enregistre les sorties d'une étape réussie sous l'empreinte key.
+
+        Returns:
+            Manifeste écrit, ou None si une sortie est absente (rien n'est enregistré)
+        """
+        output_dir = Path(output_dir)
+        chemins = {name: output_dir / name for name in outputs}
+        manquants = [name for name, p in chemins.items() if not p.is_file()]
+        if manquants:
+            logger.warning(f"⚠️  {step_name}: sorties absentes, non mises en cache: {manquants}")
+            return None
+
+        entrees = {}
+        for name, chemin in chemins.items():
+            digest = sha256_file(chemin)
+            blob = self.object_path(digest)
+            if not blob.exists():
+                _copy_atomic(chemin, blob)
+            entrees[name] = {'sha256': digest, 'size': chemin.stat().st_size}
+
+        manifest = {'step': step_name, 'key': key, 'outputs': entrees, 'created': time.time()}
+        _write_json_atomic(self.manifest_path(step_name, key), manifest)
+        self.record_source_manifest(output_dir, step_name, key, entrees)
+        return manifest
+
+    def restore(self, step_name: str, key: str, output_dir: Path, outputs: Sequence[str]) -> bool:
+        """
+        Restaure les sorties d'une étape depuis le cache si l'empreinte y est connue.
+
+        Returns:
+            True si toutes les sorties ont été restaurées, False sinon (rien n'est modifié)
+        """
+        manifest = self.load_manifest(step_name, key)
+        if manifest is None:
+            return False
+        entrees = manifest.get('outputs', {})
+        if set(entrees) != set(outputs):
+            return False
+        if not all(self.object_path(e['sha256']).is_file() for e in entrees.values()):
+            logger.warning(f"⚠️  {step_name}: blobs manquants dans le cache, restauration impossible")
+            return False
+
+        output_dir = Path(output_dir)
+        for name, entree in entrees.items():
+            destination = output_dir / name
+            if destination.is_file() and sha256_file(destination) == entree['sha256']:
+                continue
+            _copy_atomic(self.object_path(entree['sha256']), destination)
+        self.record_source_manifest(output_dir, step_name, key, entrees)
+        return True
+
+    def record_source_manifest(
+        self,
+        output_dir: Path,
+        step_name: str,
+        key: str,
+        entrees: Dict[str, Dict[str, Any]],
+    ) -> None:
+        """Met à jour data/source_data/.precompute_manifest.json (fichier → blob du cache)."""
+        path = Path(output_dir) / SOURCE_MANIFEST_FILENAME
+        manifest: Dict[str, Any] = {}
+        if path.exists():
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                manifest = {}
+        for name, entree in entrees.items():
+            manifest[name] = {
+                'step': step_name,
+                'key': key,
+                'sha256': entree['sha256'],
+                'object': str(self.object_path(entree['sha256'])),
+            }
+        _write_json_atomic(path, manifest)
@@ -10,6 +10,7 @@ Ce module calcule :
 
 import logging
 import pickle
+import sys
 from pathlib import Path
 from typing import Dict, Tuple, List
 import geopandas as gpd
@@ -21,6 +22,13 @@ import requests
 import zipfile
 import io
 
+# Racine du projet (accès à src/ quand le script est lancé depuis scripts/)
+ROOT_DIR = Path(__file__).resolve().parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src.core.utils.spatial_index import MicrozoneSpatialIndex
+
 logger = logging.getLogger(__name__)
 
 
@@ -295,6 +303,15 @@ class DistanceCalculator:
     
     def __init__(self, config: Dict):
         self.config = config
+        self._index_source = None
+        self._index = None
+    
+    def get_spatial_index(self, microzones: gpd.GeoDataFrame) -> MicrozoneSpatialIndex:
+        """Index STRtree des microzones, construit une fois par GeoDataFrame."""
+        if self._index is None or self._index_source is not microzones:
+            self._index = MicrozoneSpatialIndex(microzones)
+            self._index_source = microzones
+        return self._index
     
     def load_casernes(self) -> gpd.GeoDataFrame:
         """Charge les positions des casernes BSPP."""
@@ -370,11 +387,8 @@ class DistanceCalculator:
         return gdf
     
     def find_microzone_for_point(self, point: Point, microzones: gpd.GeoDataFrame) -> str:
-        """Trouve dans quelle microzone se trouve un point."""
-        for idx, mz in microzones.iterrows():
-            if mz.geometry.contains(point) or mz.geometry.intersects(point):
-                return mz['microzone_id']
-        return None
+        """Trouve dans quelle microzone se trouve un point (index STRtree)."""
+        return self.get_spatial_index(microzones).find(point)
     
     def find_microzones_traversed(self, 
                                   point1: Point, 
@@ -392,31 +406,23 @@ class DistanceCalculator:
         import random
         
         line = LineString([point1, point2])
-        traversed = []
-        
-        # Trouver les microzones qui contiennent les points source et destination
-        mz_source = None
-        mz_dest = None
+        index = self.get_spatial_index(microzones)
         
-        for idx, mz in microzones.iterrows():
-            if mz.geometry.contains(point1) or mz.geometry.intersects(point1):
-                mz_source = mz['microzone_id']
-            if mz.geometry.contains(point2) or mz.geometry.intersects(point2):
-                mz_dest = mz['microzone_id']
-            # Microzones traversées par la ligne
-            if mz.geometry.intersects(line):
-                traversed.append(mz['microzone_id'])
+        # Microzones contenant les points source et destination : sur une frontière, la
+        # dernière dans l'ordre du GeoDataFrame, comme l'ancienne boucle iterrows de ce calcul
+        # (query_points garde la première)
+        sources, destinations = index.intersecting(point1), index.intersecting(point2)
+        mz_source = sources[-1] if sources else None
+        mz_dest = destinations[-1] if destinations else None
+        # Microzones traversées par la ligne
+        traversed = index.intersecting(line)
         
         # Si on n'a pas trouvé de microzones, utiliser les plus proches
         if mz_source is None:
-            distances = microzones.geometry.centroid.distance(point1)
-            closest_idx = distances.idxmin()
-            mz_source = microzones.iloc[closest_idx]['microzone_id']
+            mz_source = index.nearest_centroid(point1)
         
         if mz_dest is None:
-            distances = microzones.geometry.centroid.distance(point2)
-            closest_idx = distances.idxmin()
-            mz_dest = microzones.iloc[closest_idx]['microzone_id']
+            mz_dest = index.nearest_centroid(point2)
         
         # S'assurer que source et destination sont dans la liste
         if mz_source not in traversed:
@@ -524,10 +530,15 @@ class DistanceCalculator:
         import random
         random.seed(42)  # Pour reproductibilité
         
+        # Assignation groupée point → microzone (une requête STRtree par ensemble)
+        index = self.get_spatial_index(microzones_utm)
+        casernes_mz = index.query_points(casernes_utm.geometry.values)
+        hopitaux_mz = index.query_points(hopitaux_utm.geometry.values)
+        
         # Casernes
         casernes_sans_microzone = []
-        for idx_cas, caserne in casernes_utm.iterrows():
-            mz_id = self.find_microzone_for_point(caserne.geometry, microzones_utm)
+        for pos_cas, (idx_cas, caserne) in enumerate(casernes_utm.iterrows()):
+            mz_id = casernes_mz[pos_cas]
             if mz_id is None:
                 casernes_sans_microzone.append((idx_cas, caserne['nom']))
                 # Assigner une microzone aléatoire
@@ -541,8 +552,8 @@ class DistanceCalculator:
         
         # Hôpitaux (y compris les 3 supplémentaires ajoutés précédemment)
         hopitaux_sans_microzone = []
-        for idx_hop, hopital in hopitaux_utm.iterrows():
-            mz_id = self.find_microzone_for_point(hopital.geometry, microzones_utm)
+        for pos_hop, (idx_hop, hopital) in enumerate(hopitaux_utm.iterrows()):
+            mz_id = hopitaux_mz[pos_hop]
             if mz_id is None:
                 hopitaux_sans_microzone.append((idx_hop, hopital['nom']))
                 # Assigner une microzone aléatoire
@@ -554,13 +565,10 @@ class DistanceCalculator:
             if hopital['nom'] in ['Hôpital Saint-Vincent', 'Hôpital Laennec', 'Hôpital Tenon']:
                 # Ces hôpitaux ont été créés avec leur position = centroïde de leur microzone
                 # On trouve quelle microzone contient leur position
-                mz_id = self.find_microzone_for_point(hopital.geometry, microzones_utm)
+                mz_id = hopitaux_mz[pos_hop]
                 if mz_id is None:
                     # Si pas trouvé (ne devrait pas arriver), utiliser la microzone la plus proche
-                    from shapely.geometry import Point as ShapelyPoint
-                    distances = microzones_utm.geometry.centroid.distance(hopital.geometry)
-                    closest_idx = distances.idxmin()
-                    mz_id = microzones_utm.iloc[closest_idx]['microzone_id']
+                    mz_id = index.nearest_centroid(hopital.geometry)
                     logger.info(f"   ⚠️  Hôpital {hopital['nom']} → microzone {mz_id} (plus proche)")
                 else:
                     logger.info(f"   ✅ Hôpital {hopital['nom']} → microzone {mz_id} (confirmée)")
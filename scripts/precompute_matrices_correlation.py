@@ -16,7 +16,8 @@ Matrices calculées :
    - Basée sur les processus de Hawkes
 
 3. Matrices voisin (8 microzones)
-   - Identification des 8 microzones les plus proches
+   - Identification des 8 microzones les plus proches (cKDTree ; modes rayon/adjacence configurables)
+   - Export CSR (matrices_voisin_csr.pkl) pour les calculs vectorisés
    - Calcul des poids d'influence (inverse de la distance)
    - Utilisé pour l'effet d'augmentation (+0.1 si >5 incidents dans voisins)
 
@@ -36,6 +37,11 @@ Matrices calculées :
    - Incendies : +30% hiver, -10% été
    - Accidents : +10% hiver, -5% été
 
+Les matrices 1, 2, 4, 5 et 6 sont calculées en une passe sous forme de tenseurs
+(microzone × type × gravité/saison) à partir des arrondissements, puis converties en
+dictionnaires historiques. La forme dense est aussi exportée
+(matrices_correlation_arrays.pkl, voir calculate_tenseurs).
+
 7. Règles effet d'augmentation (fixes)
    - +0.1 si délinquance voisin > microzone ou si >5 incidents dans 8 voisins, max +0.2
 
@@ -59,14 +65,37 @@ Date: 28 Janvier 2026
 
 import logging
 import pickle
+import sys
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 import numpy as np
-import pandas as pd
 import geopandas as gpd
 
+# Racine du projet (accès à src/ quand le script est lancé depuis scripts/)
+ROOT_DIR = Path(__file__).resolve().parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src.core.utils.voisinage import VoisinageCSR, construire_voisinage
+
 logger = logging.getLogger(__name__)
 
+# Groupes d'arrondissements utilisés par les règles d'ajustement
+ARR_NORD_EST = [18, 19, 20]               # Zones à risque
+ARR_CENTRE = [1, 2, 3, 4, 5, 6, 7, 8]     # Zones calmes
+
+# Heures considérées comme "nuit" (22h-5h)
+HEURES_NUIT = [22, 23, 0, 1, 2, 3, 4, 5]
+
+# Colonnes du tenseur trafic (ordre des clés de matrices_trafic)
+CHAMPS_TRAFIC = (
+    'prob_engorgement',
+    'prob_desengorgement',
+    'facteur_memoire',
+    'amplitude_engorgement',
+    'amplitude_desengorgement',
+)
+
 
 class MatricesCorrelationCalculator:
     """
@@ -91,6 +120,57 @@ class MatricesCorrelationCalculator:
         # Saisons
         self.saisons = ['hiver', 'intersaison', 'ete']
     
+    # ============================================================================
+    # 0. TENSEURS (microzone × type × gravité × période)
+    # ============================================================================
+    
+    @staticmethod
+    def _arrondissements(microzones: gpd.GeoDataFrame) -> np.ndarray:
+        """Numéros d'arrondissement (int64) dans l'ordre des microzones."""
+        return microzones['arrondissement'].to_numpy().astype(np.int64)
+    
+    @staticmethod
+    def _facteur_par_groupe(
+        arrondissements: np.ndarray,
+        regles: List[Tuple[np.ndarray, float]],
+    ) -> np.ndarray:
+        """
+        Facteur multiplicatif par microzone : première règle (masque, facteur) vérifiée,
+        1.0 sinon (équivalent vectorisé d'une chaîne if/elif sur l'arrondissement).
+        """
+        return np.select([m for m, _ in regles], [f for _, f in regles], default=1.0)
+    
+    def calculate_tenseurs(self, microzones: gpd.GeoDataFrame) -> Dict:
+        """
+        Forme dense (tableaux numpy) de toutes les matrices par microzone.
+        
+        Axes : microzone (ordre de `microzones`), type (self.types_incidents),
+        gravité (self.gravites), saison (self.saisons).
+        
+        Returns:
+            Dict avec les étiquettes d'axes et :
+            - 'intra_type' : (N, T, 3, 3), lignes normalisées
+            - 'inter_type' : (N, T_cible, T_source, 3), 0 sur la diagonale (pas d'auto-influence)
+            - 'saisonnalite' : (N, T, S)
+            - 'alcool_nuit' : Dict['prob_alcool'|'prob_nuit'|'facteur_ete_alcool'] = (N, T)
+            - 'trafic' : (N, len(CHAMPS_TRAFIC))
+        """
+        arr = self._arrondissements(microzones)
+        alcool_nuit = self._tenseurs_alcool_nuit(arr)
+        return {
+            'microzone_ids': microzones['microzone_id'].tolist(),
+            'types_incidents': list(self.types_incidents),
+            'gravites': list(self.gravites),
+            'saisons': list(self.saisons),
+            'champs_trafic': list(CHAMPS_TRAFIC),
+            'heures_nuit': list(HEURES_NUIT),
+            'intra_type': self._tenseur_intra_type(arr),
+            'inter_type': self._tenseur_inter_type(arr),
+            'saisonnalite': self._tenseur_saisonnalite(arr),
+            'alcool_nuit': alcool_nuit,
+            'trafic': self._tenseur_trafic(arr),
+        }
+    
     # ============================================================================
     # 1. MATRICES DE CORRÉLATION INTRA-TYPE
     # ============================================================================
@@ -107,104 +187,68 @@ class MatricesCorrelationCalculator:
         """
         logger.info("🔄 Calcul des matrices de corrélation intra-type...")
         
-        matrices = {}
-        
-        for idx, mz in microzones.iterrows():
-            microzone_id = mz['microzone_id']
-            arrondissement = int(mz['arrondissement'])
-            
-            matrices[microzone_id] = {}
-            
-            for type_incident in self.types_incidents:
-                # Matrice de transition 3×3 (bénin, moyen, grave)
-                matrice = self._calculate_matrice_intra_type_base(
-                    type_incident, arrondissement
-                )
-                
-                matrices[microzone_id][type_incident] = matrice
+        tenseur = self._tenseur_intra_type(self._arrondissements(microzones))
+        matrices = {
+            microzone_id: {
+                type_incident: tenseur[i, t].copy()
+                for t, type_incident in enumerate(self.types_incidents)
+            }
+            for i, microzone_id in enumerate(microzones['microzone_id'])
+        }
         
         logger.info(f"✅ Matrices intra-type calculées pour {len(matrices)} microzones")
         return matrices
     
-    def _calculate_matrice_intra_type_base(
-        self, 
-        type_incident: str, 
-        arrondissement: int
-    ) -> np.ndarray:
+    def _tenseur_intra_type(self, arrondissements: np.ndarray) -> np.ndarray:
         """
-        Calcule une matrice de transition intra-type de base (3×3).
+        Matrices de transition intra-type (N, T, 3, 3).
         
         Basé sur le modèle Zero-Inflated Poisson du PDF avec probabilités de transition réalistes.
         La matrice modélise les transitions entre gravités J→J+1 pour un type d'incident donné.
         
-        Structure :
+        Structure (deux derniers axes) :
         - Ligne i : état à J (bénin=0, moyen=1, grave=2)
         - Colonne j : état à J+1 (bénin=0, moyen=1, grave=2)
         - Valeur [i,j] : probabilité de transition de i vers j
         
-        Args:
-            type_incident: Type d'incident ('agressions', 'incendies', 'accidents')
-            arrondissement: Numéro d'arrondissement (1-20)
-        
         Returns:
-            Matrice numpy 3×3 normalisée (somme de chaque ligne = 1)
+            Tenseur numpy normalisé (somme de chaque ligne = 1)
         """
         # Matrice de base : tendance à rester dans la même gravité
         # mais possibilité de dégradation ou amélioration
-        
-        matrice = np.zeros((3, 3))  # [bénin, moyen, grave] × [bénin, moyen, grave]
-        
-        # Probabilités de transition (basées sur le modèle PDF)
-        # Ligne 0 : bénin → [bénin, moyen, grave]
-        matrice[0, 0] = 0.85  # Reste bénin (stabilité)
-        matrice[0, 1] = 0.12  # Dégradation vers moyen
-        matrice[0, 2] = 0.03  # Dégradation vers grave (rare)
-        
-        # Ligne 1 : moyen → [bénin, moyen, grave]
-        matrice[1, 0] = 0.10  # Amélioration vers bénin
-        matrice[1, 1] = 0.75  # Reste moyen (stabilité)
-        matrice[1, 2] = 0.15  # Dégradation vers grave
-        
-        # Ligne 2 : grave → [bénin, moyen, grave]
-        matrice[2, 0] = 0.05  # Amélioration vers bénin (rare)
-        matrice[2, 1] = 0.20  # Amélioration vers moyen
-        matrice[2, 2] = 0.75  # Reste grave (persistance)
-        
-        # Ajustements selon le type d'incident (logique métier)
-        if type_incident == 'agressions':
-            # Agressions : plus de dégradation possible (escalade de violence)
-            matrice[0, 1] *= 1.2
-            matrice[0, 2] *= 1.3
-            matrice[1, 2] *= 1.1
-        elif type_incident == 'incendies':
-            # Incendies : moins de dégradation, plus de stabilité (souvent isolés)
-            matrice[0, 1] *= 0.8
-            matrice[0, 2] *= 0.7
-            matrice[1, 2] *= 0.9
-        elif type_incident == 'accidents':
-            # Accidents : valeurs par défaut (déjà réalistes)
-            pass
-        
-        # Ajustements légers selon l'arrondissement
-        if arrondissement in [18, 19, 20]:  # Nord-est (zones à risque)
-            # Plus de dégradation possible
-            matrice[0, 1] *= 1.1
-            matrice[0, 2] *= 1.15
-        elif arrondissement in [1, 2, 3, 4, 5, 6, 7, 8]:  # Centre (zones calmes)
-            # Moins de dégradation
-            matrice[0, 1] *= 0.9
-            matrice[0, 2] *= 0.85
-        
-        # Normaliser chaque ligne pour que la somme = 1
-        for i in range(3):
-            somme = matrice[i, :].sum()
-            if somme > 0:
-                matrice[i, :] /= somme
-            else:
-                # Fallback si somme = 0 (ne devrait pas arriver)
-                matrice[i, :] = np.array([0.33, 0.33, 0.34])
-        
-        return matrice
+        base = np.array([
+            [0.85, 0.12, 0.03],  # bénin → [bénin (stabilité), moyen, grave (rare)]
+            [0.10, 0.75, 0.15],  # moyen → [amélioration, stabilité, dégradation]
+            [0.05, 0.20, 0.75],  # grave → [amélioration rare, amélioration, persistance]
+        ])
+        
+        # Ajustements selon le type d'incident (logique métier) : facteurs sur [0,1], [0,2], [1,2]
+        facteurs_type = {
+            'agressions': (1.2, 1.3, 1.1),  # Escalade de violence
+            'incendies': (0.8, 0.7, 0.9),   # Souvent isolés, plus de stabilité
+            'accidents': (1.0, 1.0, 1.0),   # Valeurs par défaut (déjà réalistes)
+        }
+        par_type = np.repeat(base[None], len(self.types_incidents), axis=0)
+        for t, type_incident in enumerate(self.types_incidents):
+            f01, f02, f12 = facteurs_type[type_incident]
+            if type_incident != 'accidents':
+                par_type[t, 0, 1] *= f01
+                par_type[t, 0, 2] *= f02
+                par_type[t, 1, 2] *= f12
+        
+        # Ajustements légers selon l'arrondissement (dégradation depuis bénin)
+        regles_01 = [(np.isin(arrondissements, ARR_NORD_EST), 1.1), (np.isin(arrondissements, ARR_CENTRE), 0.9)]
+        regles_02 = [(np.isin(arrondissements, ARR_NORD_EST), 1.15), (np.isin(arrondissements, ARR_CENTRE), 0.85)]
+        tenseur = np.repeat(par_type[None], arrondissements.shape[0], axis=0)
+        tenseur[:, :, 0, 1] *= self._facteur_par_groupe(arrondissements, regles_01)[:, None]
+        tenseur[:, :, 0, 2] *= self._facteur_par_groupe(arrondissements, regles_02)[:, None]
+        
+        # Normaliser chaque ligne pour que la somme = 1 (fallback uniforme si somme nulle)
+        sommes = tenseur.sum(axis=-1, keepdims=True)
+        nulles = np.broadcast_to(sommes <= 0, tenseur.shape)
+        tenseur = np.divide(tenseur, sommes, out=np.zeros_like(tenseur), where=sommes > 0)
+        tenseur[nulles] = np.broadcast_to(np.array([0.33, 0.33, 0.34]), tenseur.shape)[nulles]
+        return tenseur
     
     # ============================================================================
     # 2. MATRICES DE CORRÉLATION INTER-TYPE
@@ -225,39 +269,24 @@ class MatricesCorrelationCalculator:
         """
         logger.info("🔄 Calcul des matrices de corrélation inter-type...")
         
+        tenseur = self._tenseur_inter_type(self._arrondissements(microzones))
         matrices = {}
-        
-        for idx, mz in microzones.iterrows():
-            microzone_id = mz['microzone_id']
-            arrondissement = int(mz['arrondissement'])
-            
-            matrices[microzone_id] = {}
-            
-            for type_cible in self.types_incidents:
-                matrices[microzone_id][type_cible] = {}
-                
-                for type_source in self.types_incidents:
-                    if type_source == type_cible:
-                        continue  # Pas d'auto-influence
-                    
-                    # Calculer l'influence du type_source sur le type_cible
-                    influence = self._calculate_influence_inter_type(
-                        type_source, type_cible, arrondissement
-                    )
-                    
-                    matrices[microzone_id][type_cible][type_source] = influence
+        for i, microzone_id in enumerate(microzones['microzone_id']):
+            matrices[microzone_id] = {
+                type_cible: {
+                    type_source: tenseur[i, c, s].tolist()
+                    for s, type_source in enumerate(self.types_incidents)
+                    if type_source != type_cible  # Pas d'auto-influence
+                }
+                for c, type_cible in enumerate(self.types_incidents)
+            }
         
         logger.info(f"✅ Matrices inter-type calculées pour {len(matrices)} microzones")
         return matrices
     
-    def _calculate_influence_inter_type(
-        self,
-        type_source: str,
-        type_cible: str,
-        arrondissement: int
-    ) -> List[float]:
+    def _tenseur_inter_type(self, arrondissements: np.ndarray) -> np.ndarray:
         """
-        Calcule l'influence d'un type d'incident sur un autre.
+        Influence d'un type d'incident sur un autre (N, T_cible, T_source, 3).
         
         Basé sur les processus de Hawkes et les corrélations observées dans la littérature :
         - Incendie → Accidents : fumée réduisant visibilité, routes bloquées
@@ -267,69 +296,77 @@ class MatricesCorrelationCalculator:
         - Incendie → Agressions : stress, évacuation, tensions
         - Agressions → Incendies : actes volontaires (incendies criminels)
         
-        Args:
-            type_source: Type d'incident source (qui influence)
-            type_cible: Type d'incident cible (qui est influencé)
-            arrondissement: Numéro d'arrondissement (1-20)
-        
         Returns:
-            [influence_bénin, influence_moyen, influence_grave]
-            Valeurs entre 0 et 1, représentant l'augmentation de probabilité
+            [..., bénin/moyen/grave] : valeurs entre 0 et 1 (augmentation de probabilité),
+            0 sur la diagonale cible == source
         """
+        # (source, cible) → [bénin, moyen, grave]
+        influences = {
+            ('incendies', 'accidents'): [0.12, 0.08, 0.05],   # Surtout incidents graves (route)
+            ('agressions', 'accidents'): [0.10, 0.06, 0.03],  # Surtout moyens/graves
+            ('accidents', 'incendies'): [0.08, 0.05, 0.02],   # Surtout graves
+            ('accidents', 'agressions'): [0.06, 0.04, 0.02],  # Faible à modéré
+            ('incendies', 'agressions'): [0.05, 0.03, 0.01],  # Faible
+            ('agressions', 'incendies'): [0.04, 0.02, 0.01],  # Faible mais réel
+        }
         # Valeurs de base (faible influence croisée par défaut)
-        influence_base = [0.05, 0.03, 0.01]  # [bénin, moyen, grave]
-        
-        # Corrélations spécifiques basées sur la logique métier et la littérature
-        if type_source == 'incendies' and type_cible == 'accidents':
-            # Incendie → Accidents : fumée réduisant visibilité, routes bloquées
-            # Impact plus fort sur incidents graves (accidents de la route)
-            influence_base = [0.12, 0.08, 0.05]
-        
-        elif type_source == 'agressions' and type_cible == 'accidents':
-            # Agressions → Accidents : panique, fuite, conduite dangereuse
-            # Impact modéré, surtout sur incidents moyens/graves
-            influence_base = [0.10, 0.06, 0.03]
-        
-        elif type_source == 'accidents' and type_cible == 'incendies':
-            # Accidents → Incendies : explosions, court-circuits, fuites de carburant
-            # Impact modéré, surtout sur incidents graves
-            influence_base = [0.08, 0.05, 0.02]
-        
-        elif type_source == 'accidents' and type_cible == 'agressions':
-            # Accidents → Agressions : tensions post-accident, disputes
-            # Impact faible à modéré
-            influence_base = [0.06, 0.04, 0.02]
-        
-        elif type_source == 'incendies' and type_cible == 'agressions':
-            # Incendie → Agressions : stress, évacuation, tensions
-            # Impact faible
-            influence_base = [0.05, 0.03, 0.01]
-        
-        elif type_source == 'agressions' and type_cible == 'incendies':
-            # Agressions → Incendies : actes volontaires (incendies criminels)
-            # Impact faible mais réel
-            influence_base = [0.04, 0.02, 0.01]
-        
-        # Ajustements selon l'arrondissement
-        if arrondissement in [18, 19, 20]:  # Nord-est (zones à risque)
-            # Corrélations plus fortes dans les zones à risque
-            influence_base = [x * 1.2 for x in influence_base]
-        elif arrondissement in [1, 2, 3, 4, 5, 6, 7, 8]:  # Centre (zones calmes)
-            # Corrélations plus faibles dans les zones calmes
-            influence_base = [x * 0.8 for x in influence_base]
+        influence_defaut = [0.05, 0.03, 0.01]
+        
+        n_types = len(self.types_incidents)
+        base = np.zeros((n_types, n_types, 3))
+        for c, type_cible in enumerate(self.types_incidents):
+            for s, type_source in enumerate(self.types_incidents):
+                if s != c:
+                    base[c, s] = influences.get((type_source, type_cible), influence_defaut)
+        
+        # Corrélations plus fortes dans les zones à risque, plus faibles au centre
+        facteurs = self._facteur_par_groupe(
+            arrondissements,
+            [(np.isin(arrondissements, ARR_NORD_EST), 1.2), (np.isin(arrondissements, ARR_CENTRE), 0.8)],
+        )
+        tenseur = base[None] * facteurs[:, None, None, None]
         
         # S'assurer que les valeurs restent dans [0, 1]
-        influence_base = [min(max(x, 0.0), 1.0) for x in influence_base]
-        
-        return influence_base
+        return np.clip(tenseur, 0.0, 1.0)
     
     # ============================================================================
     # 3. MATRICES VOISIN (8 microzones)
     # ============================================================================
     
-    def calculate_matrices_voisin(self, microzones: gpd.GeoDataFrame) -> Dict:
+    def _parametres_voisinage(self) -> Dict:
+        """Paramètres du voisinage (config precompute.matrices_correlation.voisinage)."""
+        params = (
+            (self.config.get('precompute') or {})
+            .get('matrices_correlation', {})
+            .get('voisinage', {})
+        ) or {}
+        return {
+            'mode': params.get('mode', 'knn'),
+            'k': int(params.get('k', 8)),
+            'rayon': params.get('rayon'),
+        }
+    
+    def calculate_voisinage_csr(self, microzones: gpd.GeoDataFrame) -> VoisinageCSR:
+        """
+        Construit le graphe de voisinage (CSR) selon le mode configuré.
+        
+        Modes : knn (k plus proches centroïdes, cKDTree), rayon (centroïdes à moins
+        de `rayon`), adjacence (polygones qui se touchent, STRtree).
+        """
+        params = self._parametres_voisinage()
+        return construire_voisinage(microzones, mode=params['mode'], k=params['k'], rayon=params['rayon'])
+    
+    def calculate_matrices_voisin(
+        self,
+        microzones: gpd.GeoDataFrame,
+        voisinage: Optional[VoisinageCSR] = None,
+    ) -> Dict:
         """
-        Identifie les 8 microzones voisines pour chaque microzone et calcule leur influence.
+        Identifie les microzones voisines (8 par défaut) pour chaque microzone et calcule leur influence.
+        
+        Args:
+            microzones: GeoDataFrame des microzones
+            voisinage: Graphe CSR déjà construit (sinon construit via calculate_voisinage_csr)
         
         Returns:
             Dict[microzone_id] = {
@@ -338,49 +375,14 @@ class MatricesCorrelationCalculator:
                 'seuil_activation': 5  # Seuil pour effet d'augmentation
             }
         """
-        logger.info("🔄 Calcul des matrices voisin (8 microzones)...")
-        
-        matrices = {}
+        if voisinage is None:
+            voisinage = self.calculate_voisinage_csr(microzones)
+        logger.info(f"🔄 Calcul des matrices voisin (mode {voisinage.mode})...")
         
-        # Calculer les centroïdes de toutes les microzones
-        centroids = {}
-        for idx, mz in microzones.iterrows():
-            centroids[mz['microzone_id']] = (
-                mz.geometry.centroid.x,
-                mz.geometry.centroid.y
-            )
-        
-        # Pour chaque microzone, trouver les 8 plus proches
-        for idx, mz in microzones.iterrows():
-            microzone_id = mz['microzone_id']
-            center_x, center_y = centroids[microzone_id]
-            
-            # Calculer distances à toutes les autres microzones
-            distances = []
-            for other_id, (other_x, other_y) in centroids.items():
-                if other_id == microzone_id:
-                    continue
-                dist = np.sqrt((center_x - other_x)**2 + (center_y - other_y)**2)
-                distances.append((other_id, dist))
-            
-            # Trier par distance et prendre les 8 plus proches
-            distances.sort(key=lambda x: x[1])
-            voisins = [d[0] for d in distances[:8]]
-            distances_voisins = [d[1] for d in distances[:8]]
-            
-            # Calculer poids d'influence (inverse de la distance, normalisé)
-            poids = [1.0 / (d + 0.001) for d in distances_voisins]  # +0.001 pour éviter division par 0
-            poids = np.array(poids)
-            poids = poids / poids.sum()  # Normaliser
-            
-            matrices[microzone_id] = {
-                'voisins': voisins,
-                'poids_influence': poids.tolist(),
-                'distances': distances_voisins,
-                'seuil_activation': 5  # Seuil pour effet d'augmentation
-            }
+        # Poids d'influence = inverse de la distance (+0.001), normalisés par microzone
+        matrices = voisinage.to_matrices_voisin(seuil_activation=5)
         
-        logger.info(f"✅ Matrices voisin calculées pour {len(matrices)} microzones")
+        logger.info(f"✅ Matrices voisin calculées pour {len(matrices)} microzones ({voisinage.nnz} liens)")
         return matrices
     
     # ============================================================================
@@ -410,51 +412,43 @@ class MatricesCorrelationCalculator:
         """
         logger.info("🔄 Calcul des matrices trafic...")
         
-        matrices = {}
-        
-        for idx, mz in microzones.iterrows():
-            microzone_id = mz['microzone_id']
-            arrondissement = int(mz['arrondissement'])
-            
-            # Probabilités de base
-            prob_engorgement = 0.35  # 35% chance d'engorgement si trafic élevé J
-            prob_desengorgement = 0.40  # 40% chance de désengorgement si trafic faible J
-            facteur_memoire = 0.60  # 60% de persistance du trafic (décroissance)
-            amplitude_engorgement = 0.15  # +15% de trafic si engorgement
-            amplitude_desengorgement = -0.12  # -12% de trafic si désengorgement
-            
-            # Ajustements selon l'arrondissement
-            if arrondissement <= 4:  # Centre (1er-4e) : beaucoup de trafic
-                prob_engorgement *= 1.3
-                facteur_memoire *= 1.2  # Plus de persistance
-                amplitude_engorgement *= 1.2
-            elif arrondissement in [5, 6, 7, 8]:  # Centre-ouest : trafic modéré
-                prob_engorgement *= 1.1
-                facteur_memoire *= 1.05
-            elif arrondissement >= 16:  # Ouest (16e-20e) : moins de trafic
-                prob_engorgement *= 0.8
-                prob_desengorgement *= 1.1
-                facteur_memoire *= 0.9
-            elif arrondissement in [18, 19, 20]:  # Nord-est : trafic variable
-                prob_engorgement *= 1.1
-                amplitude_engorgement *= 1.1
-            
-            # S'assurer que les probabilités restent dans [0, 1]
-            prob_engorgement = min(max(prob_engorgement, 0.0), 1.0)
-            prob_desengorgement = min(max(prob_desengorgement, 0.0), 1.0)
-            facteur_memoire = min(max(facteur_memoire, 0.0), 1.0)
-            
-            matrices[microzone_id] = {
-                'prob_engorgement': prob_engorgement,
-                'prob_desengorgement': prob_desengorgement,
-                'facteur_memoire': facteur_memoire,
-                'amplitude_engorgement': amplitude_engorgement,
-                'amplitude_desengorgement': amplitude_desengorgement
-            }
+        tenseur = self._tenseur_trafic(self._arrondissements(microzones))
+        matrices = {
+            microzone_id: dict(zip(CHAMPS_TRAFIC, tenseur[i].tolist()))
+            for i, microzone_id in enumerate(microzones['microzone_id'])
+        }
         
         logger.info(f"✅ Matrices trafic calculées pour {len(matrices)} microzones")
         return matrices
     
+    def _tenseur_trafic(self, arrondissements: np.ndarray) -> np.ndarray:
+        """Paramètres de trafic (N, len(CHAMPS_TRAFIC)), colonnes dans l'ordre de CHAMPS_TRAFIC."""
+        n = arrondissements.shape[0]
+        centre = arrondissements <= 4                   # Centre (1er-4e) : beaucoup de trafic
+        centre_ouest = np.isin(arrondissements, [5, 6, 7, 8])  # Centre-ouest : trafic modéré
+        ouest = arrondissements >= 16                   # Ouest (16e-20e) : moins de trafic
+        # Nord-est (18-20) déjà couvert par la règle ouest (>= 16), qui prime
+        
+        # Probabilités de base, ajustées selon l'arrondissement
+        prob_engorgement = 0.35 * self._facteur_par_groupe(
+            arrondissements, [(centre, 1.3), (centre_ouest, 1.1), (ouest, 0.8)]
+        )
+        prob_desengorgement = 0.40 * self._facteur_par_groupe(arrondissements, [(ouest, 1.1)])
+        facteur_memoire = 0.60 * self._facteur_par_groupe(  # Plus de persistance au centre
+            arrondissements, [(centre, 1.2), (centre_ouest, 1.05), (ouest, 0.9)]
+        )
+        amplitude_engorgement = 0.15 * self._facteur_par_groupe(arrondissements, [(centre, 1.2)])
+        amplitude_desengorgement = np.full(n, -0.12)
+        
+        # S'assurer que les probabilités restent dans [0, 1]
+        return np.column_stack([
+            np.clip(prob_engorgement, 0.0, 1.0),
+            np.clip(prob_desengorgement, 0.0, 1.0),
+            np.clip(facteur_memoire, 0.0, 1.0),
+            amplitude_engorgement,
+            amplitude_desengorgement,
+        ])
+    
     # ============================================================================
     # 5. MATRICES ALCOOL/NUIT
     # ============================================================================
@@ -487,66 +481,57 @@ class MatricesCorrelationCalculator:
         """
         logger.info("🔄 Calcul des matrices alcool/nuit...")
         
-        matrices = {}
+        tenseurs = self._tenseurs_alcool_nuit(self._arrondissements(microzones))
+        prob_alcool = tenseurs['prob_alcool'].tolist()
+        prob_nuit = tenseurs['prob_nuit'].tolist()
+        facteur_ete_alcool = tenseurs['facteur_ete_alcool'].tolist()
         
-        # Heures considérées comme "nuit" (22h-5h)
-        heures_nuit = [22, 23, 0, 1, 2, 3, 4, 5]
-        
-        for idx, mz in microzones.iterrows():
-            microzone_id = mz['microzone_id']
-            arrondissement = int(mz['arrondissement'])
-            
-            matrices[microzone_id] = {}
-            
-            for type_incident in self.types_incidents:
-                if type_incident == 'accidents':
-                    # Accidents : 20% avec alcool (base), 30% l'été
-                    # Source : statistiques sécurité routière
-                    prob_alcool = 0.20
-                    facteur_ete_alcool = 1.5  # 20% * 1.5 = 30% l'été
-                    prob_nuit = 0.35  # Plus d'accidents la nuit (visibilité réduite)
-                
-                elif type_incident == 'agressions':
-                    # Agressions : moins d'alcool directement, mais contexte alcoolisé
-                    # Beaucoup plus fréquentes la nuit
-                    prob_alcool = 0.15  # Contexte alcoolisé (bars, sorties)
-                    facteur_ete_alcool = 1.2  # Légère augmentation l'été
-                    prob_nuit = 0.45  # Beaucoup d'agressions la nuit (sorties, bars)
-                
-                elif type_incident == 'incendies':
-                    # Incendies : peu d'alcool directement, répartition jour/nuit équilibrée
-                    prob_alcool = 0.05  # Très faible (erreurs, négligence)
-                    facteur_ete_alcool = 1.0  # Pas d'augmentation été
-                    prob_nuit = 0.40  # Légèrement plus la nuit (chauffage, cuisson)
-                
-                # Ajustements selon l'arrondissement
-                if arrondissement in [18, 19, 20]:  # Nord-est (zones à risque)
-                    prob_alcool *= 1.2
-                    prob_nuit *= 1.1
-                elif arrondissement in [9, 10, 11, 12]:  # Est (zones animées)
-                    prob_alcool *= 1.1
-                    prob_nuit *= 1.05
-                elif arrondissement in [1, 2, 3, 4, 5, 6, 7, 8]:  # Centre (zones calmes)
-                    prob_alcool *= 0.9
-                    prob_nuit *= 0.95
-                elif arrondissement >= 16:  # Ouest (zones résidentielles)
-                    prob_alcool *= 0.85
-                    prob_nuit *= 0.9
-                
-                # S'assurer que les probabilités restent dans [0, 1]
-                prob_alcool = min(max(prob_alcool, 0.0), 0.5)  # Max 50%
-                prob_nuit = min(max(prob_nuit, 0.0), 0.6)  # Max 60%
-                
-                matrices[microzone_id][type_incident] = {
-                    'prob_alcool': prob_alcool,
-                    'prob_nuit': prob_nuit,
-                    'facteur_ete_alcool': facteur_ete_alcool,
-                    'heures_nuit': heures_nuit
+        matrices = {}
+        for i, microzone_id in enumerate(microzones['microzone_id']):
+            matrices[microzone_id] = {
+                type_incident: {
+                    'prob_alcool': prob_alcool[i][t],
+                    'prob_nuit': prob_nuit[i][t],
+                    'facteur_ete_alcool': facteur_ete_alcool[i][t],
+                    'heures_nuit': HEURES_NUIT,
                 }
+                for t, type_incident in enumerate(self.types_incidents)
+            }
         
         logger.info(f"✅ Matrices alcool/nuit calculées pour {len(matrices)} microzones")
         return matrices
     
+    def _tenseurs_alcool_nuit(self, arrondissements: np.ndarray) -> Dict[str, np.ndarray]:
+        """Probabilités alcool/nuit (N, T) par microzone et type d'incident."""
+        # Par type : (prob_alcool, facteur_ete_alcool, prob_nuit)
+        parametres_type = {
+            # Accidents : 20% avec alcool (base), 30% l'été ; plus la nuit (visibilité réduite)
+            'accidents': (0.20, 1.5, 0.35),
+            # Agressions : contexte alcoolisé (bars, sorties), beaucoup plus fréquentes la nuit
+            'agressions': (0.15, 1.2, 0.45),
+            # Incendies : très peu d'alcool, répartition jour/nuit équilibrée (chauffage, cuisson)
+            'incendies': (0.05, 1.0, 0.40),
+        }
+        base = np.array([parametres_type[t] for t in self.types_incidents])
+        
+        # Ajustements selon l'arrondissement : nord-est (risque), est (animé), centre (calme),
+        # ouest (résidentiel)
+        groupes = [
+            np.isin(arrondissements, ARR_NORD_EST),
+            np.isin(arrondissements, [9, 10, 11, 12]),
+            np.isin(arrondissements, ARR_CENTRE),
+            arrondissements >= 16,
+        ]
+        facteurs_alcool = self._facteur_par_groupe(arrondissements, list(zip(groupes, [1.2, 1.1, 0.9, 0.85])))
+        facteurs_nuit = self._facteur_par_groupe(arrondissements, list(zip(groupes, [1.1, 1.05, 0.95, 0.9])))
+        
+        n = arrondissements.shape[0]
+        return {
+            'prob_alcool': np.clip(base[None, :, 0] * facteurs_alcool[:, None], 0.0, 0.5),  # Max 50%
+            'prob_nuit': np.clip(base[None, :, 2] * facteurs_nuit[:, None], 0.0, 0.6),      # Max 60%
+            'facteur_ete_alcool': np.broadcast_to(base[:, 1], (n, base.shape[0])).copy(),
+        }
+    
     # ============================================================================
     # 6. SAISONNALITÉ
     # ============================================================================
@@ -571,8 +556,20 @@ class MatricesCorrelationCalculator:
         """
         logger.info("🔄 Calcul des matrices saisonnalité...")
         
-        matrices = {}
+        tenseur = self._tenseur_saisonnalite(self._arrondissements(microzones)).tolist()
+        matrices = {
+            microzone_id: {
+                type_incident: dict(zip(self.saisons, tenseur[i][t]))
+                for t, type_incident in enumerate(self.types_incidents)
+            }
+            for i, microzone_id in enumerate(microzones['microzone_id'])
+        }
         
+        logger.info(f"✅ Matrices saisonnalité calculées pour {len(matrices)} microzones")
+        return matrices
+    
+    def _tenseur_saisonnalite(self, arrondissements: np.ndarray) -> np.ndarray:
+        """Facteurs de saisonnalité (N, T, S)."""
         # Facteurs de base par type et saison (basés sur statistiques réelles Paris)
         facteurs_base = {
             'agressions': {
@@ -591,35 +588,19 @@ class MatricesCorrelationCalculator:
                 'ete': 0.95         # -5% en été (meilleures conditions)
             }
         }
-        
-        for idx, mz in microzones.iterrows():
-            microzone_id = mz['microzone_id']
-            arrondissement = int(mz['arrondissement'])
-            
-            matrices[microzone_id] = {}
-            
-            for type_incident in self.types_incidents:
-                matrices[microzone_id][type_incident] = {}
-                
-                for saison in self.saisons:
-                    facteur = facteurs_base[type_incident][saison]
-                    
-                    # Ajustements selon l'arrondissement
-                    if arrondissement in [1, 2, 3, 4, 5, 6, 7, 8]:  # Centre
-                        # Moins de variation saisonnière en centre (activité constante)
-                        facteur = 1.0 + (facteur - 1.0) * 0.7
-                    elif arrondissement in [18, 19, 20]:  # Nord-est
-                        # Plus de variation saisonnière dans les zones à risque
-                        facteur = 1.0 + (facteur - 1.0) * 1.1
-                    
-                    # S'assurer que le facteur reste dans une plage raisonnable [0.5, 2.0]
-                    facteur = min(max(facteur, 0.5), 2.0)
-                    
-                    matrices[microzone_id][type_incident][saison] = facteur
-        
-        logger.info(f"✅ Matrices saisonnalité calculées pour {len(matrices)} microzones")
-        return matrices
-
+        base = np.array([[facteurs_base[t][s] for s in self.saisons] for t in self.types_incidents])
+        
+        # Centre : moins de variation saisonnière (activité constante) ;
+        # nord-est : plus de variation dans les zones à risque
+        centre = np.isin(arrondissements, ARR_CENTRE)
+        nord_est = np.isin(arrondissements, ARR_NORD_EST)
+        amplitude = self._facteur_par_groupe(arrondissements, [(centre, 0.7), (nord_est, 1.1)])
+        ajuste = 1.0 + (base[None] - 1.0) * amplitude[:, None, None]
+        tenseur = np.where((centre | nord_est)[:, None, None], ajuste, base[None])
+        
+        # S'assurer que le facteur reste dans une plage raisonnable [0.5, 2.0]
+        return np.clip(tenseur, 0.5, 2.0)
+    
     # ============================================================================
     # 7. EFFET D'AUGMENTATION (règles fixes – Story 1.4.4 AC4, Epic 4.4)
     # ============================================================================
@@ -870,12 +851,15 @@ def precompute_matrices_correlation(config: Dict, output_dir: Path) -> bool:
         
         matrices_intra_type = calculator.calculate_matrices_intra_type(microzones)
         matrices_inter_type = calculator.calculate_matrices_inter_type(microzones)
-        matrices_voisin = calculator.calculate_matrices_voisin(microzones)
+        voisinage = calculator.calculate_voisinage_csr(microzones)
+        matrices_voisin = calculator.calculate_matrices_voisin(microzones, voisinage)
         matrices_trafic = calculator.calculate_matrice_trafic(microzones)
         matrices_alcool_nuit = calculator.calculate_matrices_alcool_nuit(microzones)
         matrices_saisonnalite = calculator.calculate_matrices_saisonnalite(microzones)
         regles_effet_augmentation = calculator.calculate_regles_effet_augmentation()
         regles_patterns = calculator.calculate_regles_patterns()
+        # Forme dense (tableaux numpy) pour les moteurs vectorisés
+        tenseurs = calculator.calculate_tenseurs(microzones)
         
         # 4. Sauvegarder toutes les matrices et structures fixes
         logger.info("💾 Sauvegarde des matrices...")
@@ -884,9 +868,11 @@ def precompute_matrices_correlation(config: Dict, output_dir: Path) -> bool:
             'matrices_correlation_intra_type.pkl': matrices_intra_type,
             'matrices_correlation_inter_type.pkl': matrices_inter_type,
             'matrices_voisin.pkl': matrices_voisin,
+            'matrices_voisin_csr.pkl': voisinage.to_dict(),
             'matrices_trafic.pkl': matrices_trafic,
             'matrices_alcool_nuit.pkl': matrices_alcool_nuit,
             'matrices_saisonnalite.pkl': matrices_saisonnalite,
+            'matrices_correlation_arrays.pkl': tenseurs,
             'regles_effet_augmentation.pkl': regles_effet_augmentation,
             'pattern_7j_transition.pkl': pattern_7j_transition,
             'pattern_60j_transition.pkl': pattern_60j_transition,
@@ -918,14 +904,17 @@ def precompute_matrices_correlation(config: Dict, output_dir: Path) -> bool:
                     assert abs(matrice[i, :].sum() - 1.0) < 0.01, \
                         f"Ligne {i} de {mz_id}/{type_incident} doit sommer à 1"
         
-        # Vérifier matrices voisin (8 voisins)
+        # Vérifier matrices voisin (k voisins en mode knn, 8 par défaut)
+        k_attendu = min(calculator._parametres_voisinage()['k'], len(microzones) - 1)
         for mz_id, data in matrices_voisin.items():
-            assert len(data['voisins']) == 8, \
-                f"Microzone {mz_id} doit avoir 8 voisins"
-            assert len(data['poids_influence']) == 8, \
-                f"Microzone {mz_id} doit avoir 8 poids"
-            assert abs(sum(data['poids_influence']) - 1.0) < 0.01, \
-                f"Poids voisins {mz_id} doivent sommer à 1"
+            if voisinage.mode == 'knn':
+                assert len(data['voisins']) == k_attendu, \
+                    f"Microzone {mz_id} doit avoir {k_attendu} voisins"
+            assert len(data['poids_influence']) == len(data['voisins']), \
+                f"Microzone {mz_id} doit avoir un poids par voisin"
+            if data['voisins']:
+                assert abs(sum(data['poids_influence']) - 1.0) < 0.01, \
+                    f"Poids voisins {mz_id} doivent sommer à 1"
         
         # Vérifier structures fixes (effet augmentation, patterns, regles)
         assert regles_effet_augmentation['seuil_voisins_incidents'] == 5
@@ -0,0 +1,338 @@
+"""
+Exécuteur DAG des pré-calculs (orchestration parallèle de run_precompute.py).
+
+Chaque étape déclare ses entrées (fichiers/dossiers lus, code source, clés de
+config) et ses sorties (fichiers écrits dans data/source_data). L'exécuteur :
+- déduit les dépendances (une étape dépend de celles qui produisent ses entrées) ;
+- ordonnance les étapes prêtes sur un ProcessPoolExecutor (tri topologique) ;
+- saute une étape dont l'empreinte des entrées est inchangée depuis la dernière
+  exécution réussie et dont toutes les sorties existent ;
+- restaure depuis le cache d'artefacts (precompute_cache.py) les sorties d'une
+  étape dont l'empreinte a déjà été calculée (ex: retour à une config antérieure) ;
+- mesure la durée de chaque étape et affiche le chemin critique.
+
+L'état (empreinte par étape) est conservé dans <output_dir>/.precompute_state.json.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from precompute_cache import ArtifactCache
+
+logger = logging.getLogger(__name__)
+
+STATE_FILENAME = ".precompute_state.json"
+
+# Statuts d'étape
+STATUT_SUCCES = "succes"
+STATUT_A_JOUR = "a_jour"
+STATUT_CACHE = "cache"
+STATUT_ECHEC = "echec"
+STATUT_DEPENDANCE_ECHOUEE = "dependance_echouee"
+
+
+@dataclass
+class PrecomputeStep:
+    """
+    Étape du pipeline de pré-calcul.
+
+    func doit être une fonction de module (picklable) : func(config, output_dir) -> bool.
+    inputs/outputs : chemins relatifs à output_dir ou absolus.
+    code : fichiers source dont le contenu entre dans l'empreinte.
+    config_keys : clés pointées de la config (ex: "precompute.distances") entrant dans l'empreinte.
+    """
+
+    name: str
+    func: Callable[[Dict[str, Any], Path], bool]
+    inputs: Sequence[str] = ()
+    outputs: Sequence[str] = ()
+    code: Sequence[str] = ()
+    config_keys: Sequence[str] = ()
+
+
+@dataclass
+class StepResult:
+    """Résultat d'exécution d'une étape."""
+
+    name: str
+    statut: str
+    duree: float = 0.0
+    empreinte: Optional[str] = None
+    erreur: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.statut in (STATUT_SUCCES, STATUT_A_JOUR, STATUT_CACHE)
+
+
+def _hash_file(path: Path, h) -> None:
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+
+
+def hash_path(path: Path) -> str:
+    """Empreinte sha256 d'un fichier ou d'un dossier (récursif, ordre stable)."""
+    h = hashlib.sha256()
+    if path.is_file():
+        _hash_file(path, h)
+    elif path.is_dir():
+        for p in sorted(q for q in path.rglob('*') if q.is_file()):
+            h.update(str(p.relative_to(path)).encode('utf-8'))
+            _hash_file(p, h)
+    else:
+        h.update(b'<absent>')
+    return h.hexdigest()
+
+
+def _config_value(config: Dict[str, Any], dotted_key: str) -> Any:
+    value: Any = config
+    for part in dotted_key.split('.'):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+
+def _run_step(func: Callable[[Dict[str, Any], Path], bool], config: Dict[str, Any], output_dir: Path) -> Tuple[bool, float]:
+    """Exécute une étape (dans un processus worker) et mesure sa durée."""
+    debut = time.perf_counter()
+    ok = bool(func(config, output_dir))
+    return ok, time.perf_counter() - debut
+
+
+class PrecomputePipeline:
+    """Ordonnanceur DAG des étapes de pré-calcul."""
+
+    def __init__(
+        self,
+        steps: Sequence[PrecomputeStep],
+        config: Dict[str, Any],
+        output_dir: Path,
+        max_workers: Optional[int] = None,
+        force: bool = False,
+        cache: Optional[ArtifactCache] = None,
+    ):
+        """
+        Args:
+            steps: Étapes à exécuter (noms uniques)
+            config: Configuration passée à chaque étape
+            output_dir: Dossier des sorties (data/source_data)
+            max_workers: Nombre de processus (1 = exécution dans le processus courant)
+            force: Ignorer l'état et le cache, tout ré-exécuter
+            cache: Cache d'artefacts adressé par contenu (None = pas de cache)
+        """
+        noms = [s.name for s in steps]
+        if len(set(noms)) != len(noms):
+            raise ValueError(f"Noms d'étapes dupliqués: {noms}")
+        self.steps = {s.name: s for s in steps}
+        self.config = config
+        self.output_dir = Path(output_dir)
+        self.max_workers = max_workers or min(len(steps), os.cpu_count() or 1) or 1
+        self.force = force
+        self.cache = cache
+        self.state_file = self.output_dir / STATE_FILENAME
+        self.dependencies = self._build_dependencies()
+        self.order = self.topological_order()
+
+    def _resolve(self, path: str) -> Path:
+        p = Path(path)
+        return p if p.is_absolute() else self.output_dir / p
+
+    def _build_dependencies(self) -> Dict[str, List[str]]:
+        """Une étape dépend des étapes qui produisent l'une de ses entrées."""
+        producteurs: Dict[Path, str] = {}
+        for step in self.steps.values():
+            for out in step.outputs:
+                chemin = self._resolve(out)
+                if chemin in producteurs:
+                    raise ValueError(
+                        f"Sortie {out} produite par {producteurs[chemin]} et {step.name}"
+                    )
+                producteurs[chemin] = step.name
+        deps = {}
+        for step in self.steps.values():
+            deps[step.name] = sorted({
+                producteurs[self._resolve(inp)]
+                for inp in step.inputs
+                if self._resolve(inp) in producteurs and producteurs[self._resolve(inp)] != step.name
+            })
+        return deps
+
+    def topological_order(self) -> List[str]:
+        """Ordre topologique (Kahn, stable selon l'ordre de déclaration)."""
+        restants = {name: set(d) for name, d in self.dependencies.items()}
+        ordre: List[str] = []
+        while restants:
+            prets = [n for n in self.steps if n in restants and not restants[n]]
+            if not prets:
+                raise ValueError(f"Cycle de dépendances entre étapes: {sorted(restants)}")
+            for n in prets:
+                ordre.append(n)
+                del restants[n]
+            for d in restants.values():
+                d.difference_update(prets)
+        return ordre
+
+    def fingerprint(self, step: PrecomputeStep) -> str:
+        """Empreinte des entrées, du code et des paramètres d'une étape."""
+        h = hashlib.sha256()
+        for label, chemins in (('input', step.inputs), ('code', step.code)):
+            for chemin in chemins:
+                h.update(f"{label}:{chemin}:{hash_path(self._resolve(chemin))}".encode('utf-8'))
+        params = {k: _config_value(self.config, k) for k in step.config_keys}
+        h.update(json.dumps(params, sort_keys=True, default=str).encode('utf-8'))
+        return h.hexdigest()
+
+    def load_state(self) -> Dict[str, Any]:
+        if not self.state_file.exists():
+            return {}
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            logger.warning(f"⚠️  État pré-calcul illisible, ignoré: {self.state_file}")
+            return {}
+
+    def save_state(self, state: Dict[str, Any]) -> None:
+        tmp = self.state_file.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.state_file)
+
+    def is_up_to_date(self, step: PrecomputeStep, empreinte: str, state: Dict[str, Any]) -> bool:
+        if self.force:
+            return False
+        if state.get(step.name, {}).get('empreinte') != empreinte:
+            return False
+        return all(self._resolve(out).exists() for out in step.outputs)
+
+    def run(self) -> Dict[str, StepResult]:
+        """
+        Exécute le DAG : les étapes prêtes tournent en parallèle.
+
+        Returns:
+            Dict[nom_etape, StepResult] dans l'ordre topologique
+        """
+        state = self.load_state()
+        resultats: Dict[str, StepResult] = {}
+        en_cours: Dict[Any, Tuple[str, str]] = {}
+        debut_total = time.perf_counter()
+
+        def prets() -> List[str]:
+            lances = {n for n, _ in en_cours.values()}
+            return [
+                n for n in self.order
+                if n not in resultats and n not in lances
+                and all(d in resultats for d in self.dependencies[n])
+            ]
+
+        executor = ProcessPoolExecutor(max_workers=self.max_workers) if self.max_workers > 1 else None
+        try:
+            while len(resultats) < len(self.steps):
+                for name in prets():
+                    step = self.steps[name]
+                    if any(not resultats[d].ok for d in self.dependencies[name]):
+                        resultats[name] = StepResult(name, STATUT_DEPENDANCE_ECHOUEE)
+                        logger.error(f"❌ {name}: dépendance échouée, étape non lancée")
+                        continue
+                    empreinte = self.fingerprint(step)
+                    if self.is_up_to_date(step, empreinte, state):
+                        resultats[name] = StepResult(name, STATUT_A_JOUR, empreinte=empreinte)
+                        logger.info(f"⏭️  {name}: à jour (entrées inchangées)")
+                        continue
+                    if self._restore_from_cache(step, empreinte, state):
+                        resultats[name] = StepResult(name, STATUT_CACHE, empreinte=empreinte)
+                        logger.info(f"📦 {name}: sorties restaurées depuis le cache")
+                        continue
+                    logger.info(f"🔄 {name}: lancement")
+                    if executor is None:
+                        resultats[name] = self._finish(name, empreinte, self._call(step), state)
+                    else:
+                        future = executor.submit(_run_step, step.func, self.config, self.output_dir)
+                        en_cours[future] = (name, empreinte)
+                if not en_cours:
+                    continue
+                termines, _ = wait(list(en_cours), return_when=FIRST_COMPLETED)
+                for future in termines:
+                    name, empreinte = en_cours.pop(future)
+                    try:
+                        issue = future.result()
+                    except Exception as e:
+                        issue = e
+                    resultats[name] = self._finish(name, empreinte, issue, state)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+        self._log_timings(resultats, time.perf_counter() - debut_total)
+        return {n: resultats[n] for n in self.order}
+
+    def _call(self, step: PrecomputeStep):
+        try:
+            return _run_step(step.func, self.config, self.output_dir)
+        except Exception as e:
+            return e
+
+    def _finish(self, name: str, empreinte: str, issue, state: Dict[str, Any]) -> StepResult:
+        if isinstance(issue, Exception):
+            logger.error(f"❌ {name}: exception {issue}")
+            return StepResult(name, STATUT_ECHEC, erreur=str(issue))
+        ok, duree = issue
+        if not ok:
+            logger.error(f"❌ {name}: échec ({duree:.2f}s)")
+            return StepResult(name, STATUT_ECHEC, duree=duree)
+        logger.info(f"✅ {name}: terminé en {duree:.2f}s")
+        step = self.steps[name]
+        if self.cache is not None and step.outputs:
+            self.cache.store(name, empreinte, self.output_dir, step.outputs)
+        state[name] = {'empreinte': empreinte, 'duree': duree, 'termine_le': time.time()}
+        self.save_state(state)
+        return StepResult(name, STATUT_SUCCES, duree=duree, empreinte=empreinte)
+
+    def _restore_from_cache(self, step: PrecomputeStep, empreinte: str, state: Dict[str, Any]) -> bool:
+        if self.cache is None or self.force or not step.outputs:
+            return False
+        if any(Path(out).is_absolute() for out in step.outputs):
+            return False
+        if not self.cache.restore(step.name, empreinte, self.output_dir, step.outputs):
+            return False
+        state[step.name] = {'empreinte': empreinte, 'duree': 0.0, 'termine_le': time.time()}
+        self.save_state(state)
+        return True
+
+    def critical_path(self, resultats: Dict[str, StepResult]) -> Tuple[List[str], float]:
+        """Plus long chemin (somme des durées) à travers le DAG exécuté."""
+        meilleur: Dict[str, Tuple[float, List[str]]] = {}
+        for name in self.order:
+            duree = resultats[name].duree if name in resultats else 0.0
+            amont = max(
+                (meilleur[d] for d in self.dependencies[name]),
+                key=lambda x: x[0],
+                default=(0.0, []),
+            )
+            meilleur[name] = (amont[0] + duree, amont[1] + [name])
+        if not meilleur:
+            return [], 0.0
+        total, chemin = max(meilleur.values(), key=lambda x: x[0])
+        return chemin, total
+
+    def _log_timings(self, resultats: Dict[str, StepResult], duree_totale: float) -> None:
+        logger.info("⏱️  Durées par étape :")
+        for name in self.order:
+            r = resultats.get(name)
+            if r is not None:
+                logger.info(f"   {name:<22} {r.statut:<20} {r.duree:8.2f}s")
+        chemin, duree_critique = self.critical_path(resultats)
+        somme = sum(r.duree for r in resultats.values())
+        logger.info(
+            f"⏱️  Total {duree_totale:.2f}s (somme étapes {somme:.2f}s, "
+            f"chemin critique {duree_critique:.2f}s : {' → '.join(chemin) or '-'})"
+        )
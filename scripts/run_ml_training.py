@@ -3,7 +3,7 @@ Script pour lancer l'entraînement ML complet : 50 runs headless, extraction, en
 Story 2.4.4 - Interface ML modèles
 
 Usage:
-  python scripts/run_ml_training.py [--runs 50] [--days 365] [--regression|--classification]
+  python scripts/run_ml_training.py [--runs 50] [--days 365] [--regression|--classification] [--resume]
 """
 
 import argparse
@@ -26,6 +26,7 @@ def main():
     p.add_argument("--days", type=int, default=365)
     p.add_argument("--regression", action="store_true", help="Entraîner régression (défaut)")
     p.add_argument("--classification", action="store_true", help="Entraîner classification")
+    p.add_argument("--resume", action="store_true", help="Reprendre la simulation (runs vérifiés non relancés)")
     args = p.parse_args()
 
     mode = "classification" if args.classification else "regression"
@@ -42,6 +43,7 @@ def main():
         save_pickles=True,
         save_trace=True,
         verbose=True,
+        resume=args.resume,
     )
 
     print("\n2. Extraction features/labels + préparation ML...")
@@ -8,11 +8,20 @@ Ce script lance tous les pré-calculs nécessaires pour la simulation :
 - Vecteurs statiques, prix m², congestion statique (Story 1.3)
 - Matrices de corrélation (intra-type, inter-type, voisin, trafic, alcool/nuit, saisonnalité) (Story 1.4.4)
 
+Les blocs sont exécutés comme un DAG (precompute_pipeline.py) : distances d'abord,
+puis vecteurs statiques et matrices de corrélation en parallèle. Un bloc dont les
+entrées, le code et la config n'ont pas changé depuis sa dernière réussite est sauté ;
+si cette combinaison a déjà été calculée, ses sorties sont restaurées depuis le cache
+d'artefacts (precompute_cache.py, data/cache/precompute).
+
 Usage:
     python scripts/run_precompute.py                    # Lance tous les pré-calculs
     python scripts/run_precompute.py --skip-distances   # Saute le calcul des distances
     python scripts/run_precompute.py --skip-vectors     # Saute les vecteurs statiques
     python scripts/run_precompute.py --only-distances  # Lance uniquement les distances
+    python scripts/run_precompute.py --workers 1        # Exécution séquentielle
+    python scripts/run_precompute.py --force            # Ré-exécute même les blocs à jour
+    python scripts/run_precompute.py --no-cache         # N'utilise pas le cache d'artefacts
 """
 
 import argparse
@@ -20,7 +29,14 @@ import sys
 import yaml
 from pathlib import Path
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from precompute_cache import ArtifactCache
+from precompute_pipeline import PrecomputePipeline, PrecomputeStep
 
 # Configuration du logging
 logging.basicConfig(
@@ -244,6 +260,114 @@ def run_validate_patterns(config: Dict[str, Any]) -> bool:
         return False
 
 
+def build_precompute_steps(config: Dict[str, Any], args: argparse.Namespace) -> List[PrecomputeStep]:
+    """
+    Construit les étapes du DAG de pré-calcul (blocs retenus par should_run_block).
+
+    Les dépendances sont déduites des fichiers : une étape dont une entrée est
+    produite par une autre étape retenue attend celle-ci. Les sorties d'un bloc
+    exclu sont lues telles quelles sur disque.
+    """
+    root_dir = SCRIPTS_DIR.parent
+    patterns_dir = Path(config.get('paths', {}).get('data_patterns', 'data/patterns'))
+    if not patterns_dir.is_absolute():
+        patterns_dir = root_dir / patterns_dir
+    utils_dir = root_dir / 'src' / 'core' / 'utils'
+
+    steps = [
+        PrecomputeStep(
+            name='distances',
+            func=run_distances,
+            outputs=(
+                'microzones.pkl',
+                'distances_caserne_microzone.pkl',
+                'distances_microzone_hopital.pkl',
+                'locations_casernes_hopitaux.pkl',
+                'limites_microzone_arrondissement.pkl',
+            ),
+            code=(str(SCRIPTS_DIR / 'precompute_distances.py'), str(utils_dir / 'spatial_index.py')),
+            config_keys=('precompute.distances', 'precompute.microzones'),
+        ),
+        PrecomputeStep(
+            name='vectors_static',
+            func=run_vectors_static,
+            inputs=('microzones.pkl', str(patterns_dir)),
+            outputs=(
+                'prix_m2.pkl',
+                'chomage.pkl',
+                'delinquance.pkl',
+                'vecteurs_statiques.pkl',
+                'congestion_statique.pkl',
+            ),
+            code=(str(SCRIPTS_DIR / 'precompute_vectors_static.py'),),
+            config_keys=('precompute.vectors_static',),
+        ),
+        # prix m² et congestion sont produits par vectors_static : ces blocs ne font
+        # que constater leur présence, ils dépendent donc de ses sorties
+        PrecomputeStep(name='prix_m2', func=run_prix_m2, inputs=('prix_m2.pkl',)),
+        PrecomputeStep(name='congestion_static', func=run_congestion_static, inputs=('congestion_statique.pkl',)),
+        PrecomputeStep(
+            name='matrices_correlation',
+            func=run_matrices_correlation,
+            inputs=('microzones.pkl',),
+            outputs=(
+                'matrices_correlation_intra_type.pkl',
+                'matrices_correlation_inter_type.pkl',
+                'matrices_voisin.pkl',
+                'matrices_voisin_csr.pkl',
+                'matrices_trafic.pkl',
+                'matrices_alcool_nuit.pkl',
+                'matrices_saisonnalite.pkl',
+                'matrices_correlation_arrays.pkl',
+                'regles_effet_augmentation.pkl',
+                'pattern_7j_transition.pkl',
+                'pattern_60j_transition.pkl',
+                'regles_patterns.pkl',
+            ),
+            code=(str(SCRIPTS_DIR / 'precompute_matrices_correlation.py'), str(utils_dir / 'voisinage.py')),
+            config_keys=('precompute.matrices_correlation',),
+        ),
+    ]
+
+    retenues = []
+    for step in steps:
+        if should_run_block(step.name, config, args):
+            retenues.append(step)
+        else:
+            logger.info(f"⏭️  Pré-calcul {step.name} ignoré (--skip-*/--only-* ou config)")
+    return retenues
+
+
+def run_pipeline(
+    config: Dict[str, Any],
+    output_dir: Path,
+    args: argparse.Namespace,
+) -> Dict[str, Optional[bool]]:
+    """
+    Exécute les blocs retenus via le DAG et retourne le dict de résultats
+    (True = succès ou à jour, False = échec, None = ignoré).
+    """
+    steps = build_precompute_steps(config, args)
+    cache = None if getattr(args, 'no_cache', False) else ArtifactCache.from_config(config, SCRIPTS_DIR.parent)
+    pipeline = PrecomputePipeline(
+        steps,
+        config,
+        output_dir,
+        max_workers=getattr(args, 'workers', None),
+        force=getattr(args, 'force', False),
+        cache=cache,
+    )
+    step_results = pipeline.run() if steps else {}
+
+    results: Dict[str, Optional[bool]] = {}
+    for name in ('distances', 'microzones', 'vectors_static', 'prix_m2', 'congestion_static', 'matrices_correlation'):
+        # Les microzones sont créées dans run_distances
+        source = 'distances' if name == 'microzones' else name
+        r = step_results.get(source)
+        results[name] = None if r is None else r.ok
+    return results
+
+
 def main():
     """Point d'entrée principal."""
     parser = argparse.ArgumentParser(
@@ -289,6 +413,14 @@ Exemples:
     parser.add_argument('--only-validate-patterns', action='store_true',
                        help='Uniquement valider les patterns puis quitter')
     
+    # Exécution du DAG
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Nombre de processus pour les blocs indépendants (défaut: nb CPU, 1 = séquentiel)')
+    parser.add_argument('--force', action='store_true',
+                       help='Ré-exécuter les blocs même si leurs entrées n\'ont pas changé')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Ne pas restaurer ni alimenter le cache d\'artefacts (precompute.cache)')
+    
     # Option pour spécifier le fichier config
     parser.add_argument('--config', type=str, default='config/config.yaml',
                        help='Chemin vers le fichier de configuration (défaut: config/config.yaml)')
@@ -328,51 +460,8 @@ Exemples:
     output_dir.mkdir(parents=True, exist_ok=True)
     logger.info(f"📁 Dossier de sortie: {output_dir}")
     
-    # Lancer les pré-calculs
-    results = {}
-    
-    # Distances (Story 1.2) - Les microzones sont créées automatiquement dans run_distances
-    if should_run_block('distances', config, args):
-        results['distances'] = run_distances(config, output_dir)
-        # Les microzones sont créées dans run_distances, donc on marque aussi microzones comme fait
-        results['microzones'] = results['distances']
-    else:
-        logger.info("⏭️  Pré-calcul distances ignoré (--skip-distances ou config)")
-        results['distances'] = None
-        results['microzones'] = None
-    
-    # Note: run_microzones n'est plus appelé car les microzones sont créées dans run_distances
-    # On garde la vérification pour compatibilité avec la config
-    if should_run_block('microzones', config, args) and results.get('microzones') is None:
-        logger.info("⚠️  Pré-calcul microzones demandé mais distances non exécutées")
-        logger.info("   Les microzones sont créées automatiquement avec --only-distances")
-        results['microzones'] = None
-    
-    # Vecteurs statiques, prix m², congestion (Story 1.3)
-    if should_run_block('vectors_static', config, args):
-        results['vectors_static'] = run_vectors_static(config, output_dir)
-    else:
-        logger.info("⏭️  Pré-calcul vecteurs statiques ignoré (--skip-vectors ou config)")
-        results['vectors_static'] = None
-    
-    if should_run_block('prix_m2', config, args):
-        results['prix_m2'] = run_prix_m2(config, output_dir)
-    else:
-        logger.info("⏭️  Pré-calcul prix m² ignoré (--skip-prix-m2 ou config)")
-        results['prix_m2'] = None
-    
-    if should_run_block('congestion_static', config, args):
-        results['congestion_static'] = run_congestion_static(config, output_dir)
-    else:
-        logger.info("⏭️  Pré-calcul congestion statique ignoré (--skip-congestion ou config)")
-        results['congestion_static'] = None
-    
-    # Matrices de corrélation (Story 1.4.4)
-    if should_run_block('matrices_correlation', config, args):
-        results['matrices_correlation'] = run_matrices_correlation(config, output_dir)
-    else:
-        logger.info("⏭️  Pré-calcul matrices de corrélation ignoré (--skip-matrices ou config)")
-        results['matrices_correlation'] = None
+    # Lancer les pré-calculs (DAG : distances → vecteurs statiques ∥ matrices de corrélation)
+    results = run_pipeline(config, output_dir, args)
     
     # Résumé
     logger.info("\n" + "="*60)
@@ -0,0 +1,91 @@
+"""
+Balayage scénario × variabilité × seeds × horizon (× surcharges de config) en un seul lancement.
+
+Usage:
+  python scripts/run_sweep.py --scenarios pessimiste moyen optimiste --variabilites Faible Forte \\
+      --seeds 42 43 44 --days 90 --workers 4 --output data/intermediate/sweep
+  python scripts/run_sweep.py --grille grille.yaml --workers 8
+  python scripts/run_sweep.py --grille grille.yaml --queue /partage/file.db --output /partage/sweep   # dépôt dans la file
+  python scripts/run_sweep.py --queue /partage/file.db --output /partage/sweep --collecter   # résumés depuis la file
+
+Fichier de grille (YAML) : clés scenarios, variabilites, seeds, jours, surcharges
+(liste de {"section.champ": valeur}) ; les options de ligne de commande le complètent.
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+import yaml
+
+# Ajouter la racine au path
+root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(root))
+
+from src.core.config.config_validator import load_and_validate_config
+from src.core.utils.path_resolver import PathResolver
+from src.services.sweep_service import GrilleBalayage, executer_balayage
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--grille", type=str, default=None, help="Fichier YAML de grille")
+    p.add_argument("--scenarios", nargs="+", default=None, help="pessimiste, moyen, optimiste")
+    p.add_argument("--variabilites", nargs="+", default=None, help="Faible, Moyenne, Forte")
+    p.add_argument("--seeds", nargs="+", type=int, default=None)
+    p.add_argument("--days", nargs="+", type=int, default=None, help="Horizon(s) en jours")
+    p.add_argument("--workers", type=int, default=1)
+    p.add_argument("--output", type=str, default=None, help="Défaut: data/intermediate/sweep")
+    p.add_argument("--no-pickles", action="store_true", help="Ne pas sauvegarder les pickles")
+    p.add_argument("--queue", type=str, default=None, help="Déposer les runs dans cette file de travaux partagée")
+    p.add_argument("--collecter", action="store_true", help="Écrire les résumés du balayage déposé dans --queue")
+    args = p.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    output_dir = Path(args.output) if args.output else PathResolver.get_project_root() / "data" / "intermediate" / "sweep"
+
+    if args.queue:
+        from src.services.job_queue import FileTravaux, collecter_balayage, soumettre_balayage
+
+        file = FileTravaux(Path(args.queue))
+        if args.collecter:
+            campagne = str(output_dir.resolve())
+            df = collecter_balayage(file, campagne)
+            print(file.compter(campagne))
+            print(df.to_string(index=False))
+            return 0
+
+    grille_dict = {}
+    if args.grille:
+        with open(args.grille, "r", encoding="utf-8") as f:
+            grille_dict = yaml.safe_load(f) or {}
+    for cle, valeur in (
+        ("scenarios", args.scenarios),
+        ("variabilites", args.variabilites),
+        ("seeds", args.seeds),
+        ("jours", args.days),
+    ):
+        if valeur is not None:
+            grille_dict[cle] = valeur
+    grille = GrilleBalayage.depuis_dict(grille_dict)
+
+    config = load_and_validate_config(str(PathResolver.config_file("config.yaml")))
+    if args.queue:
+        campagne = soumettre_balayage(file, config, grille, output_dir, save_pickles=not args.no_pickles)
+        print(f"Balayage déposé dans {args.queue} (campagne {campagne}) : {file.compter(campagne)}")
+        return 0
+    df = executer_balayage(
+        config,
+        grille,
+        output_dir,
+        workers=args.workers,
+        save_pickles=not args.no_pickles,
+    )
+    colonnes = ["scenario", "variabilite", "jours", "n_runs", "incidents_par_jour_moy", "morts_base_evenements_moy"]
+    print(df[[c for c in colonnes if c in df.columns]].to_string(index=False))
+    print(f"\nRésumé : {output_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -42,6 +42,15 @@ class SimulationConfig(BaseModel):
     default_runs: int = Field(ge=1, le=1000, description="Nombre de runs par défaut")
     speed_per_day_seconds: float = Field(gt=0.0, le=3600.0, description="Vitesse simulation (secondes/jour)")
     seed_default: int = Field(ge=0, description="Seed par défaut pour reproductibilité")
+    mode_creux: bool = Field(
+        default=False,
+        description="Calcul détaillé réservé aux cellules actives, cellules calmes tirées en bloc (même loi, autre suite aléatoire)",
+    )
+    reduction_variance: str = Field(
+        default="aucune",
+        pattern="^(aucune|crn|antithetique)$",
+        description="Nombres aléatoires communs entre scénarios (crn), paires de runs antithétiques (antithetique)",
+    )
 
 
 class ScenarioConfig(BaseModel):
@@ -159,6 +168,27 @@ class PrecomputeCongestionStaticConfig(BaseModel):
     base_factors: bool = Field(default=True, description="Facteurs de base")
 
 
+class PrecomputeVoisinageConfig(BaseModel):
+    """Configuration du voisinage des microzones (matrices_voisin)."""
+    
+    mode: str = Field(default="knn", pattern="^(knn|rayon|adjacence)$", description="Mode de voisinage")
+    k: int = Field(default=8, ge=1, description="Nombre de voisins (mode knn)")
+    rayon: Optional[float] = Field(default=None, gt=0, description="Distance max entre centroïdes (mode rayon, unités du CRS)")
+    
+    @model_validator(mode='after')
+    def validate_rayon_required(self):
+        """Le mode rayon exige un rayon."""
+        if self.mode == "rayon" and self.rayon is None:
+            raise ValueError("precompute.matrices_correlation.voisinage.rayon requis en mode 'rayon'")
+        return self
+
+
+class PrecomputeMatricesCorrelationConfig(BaseModel):
+    """Configuration pré-calcul matrices de corrélation."""
+    
+    voisinage: PrecomputeVoisinageConfig = Field(default_factory=PrecomputeVoisinageConfig)
+
+
 class VecteursStatiquesConfig(BaseModel):
     """Configuration du lissage des vecteurs statiques (Story 2.4.3.1)."""
     lissage_alpha: float = Field(
@@ -189,6 +219,24 @@ class EffetsPatternsConfig(BaseModel):
         le=1.0,
         description="0.8 = 80 % réduction (20 % conservé) ; 0 = effet plein ; négatif = amplification (ex. -0.5 = 50 % en plus)",
     )
+    detection_active: bool = Field(
+        default=False,
+        description="Détection incrémentale des patterns 4j/7j/60j pendant la génération (alimente patterns_actifs)",
+    )
+
+
+class EchantillonnagePreferentielConfig(BaseModel):
+    """Échantillonnage préférentiel des mois catastrophiques (facteurs 1.0 = loi nominale)."""
+
+    facteur_deterioration: float = Field(
+        default=1.0, gt=0.0, le=20.0, description="Multiplie la probabilité de transition vers Détérioration"
+    )
+    facteur_crise: float = Field(
+        default=1.0, gt=0.0, le=20.0, description="Multiplie la probabilité de transition vers Crise"
+    )
+    facteur_grave: float = Field(
+        default=1.0, gt=0.0, le=20.0, description="Multiplie la probabilité qu'un incident soit grave (événements graves)"
+    )
 
 
 class RealaléatoirisationConfig(BaseModel):
@@ -233,6 +281,13 @@ class RealaléatoirisationConfig(BaseModel):
     )
 
 
+class PrecomputeCacheConfig(BaseModel):
+    """Configuration du cache d'artefacts de pré-calcul (adressé par contenu)."""
+    
+    enabled: bool = Field(default=True, description="Restaurer/alimenter le cache")
+    dir: str = Field(default="data/cache/precompute", description="Dossier du cache")
+
+
 class PrecomputeConfig(BaseModel):
     """Configuration pré-calculs."""
     
@@ -242,6 +297,8 @@ class PrecomputeConfig(BaseModel):
     vectors_static: Optional[PrecomputeVectorsStaticConfig] = None
     prix_m2: Optional[PrecomputePrixM2Config] = None
     congestion_static: Optional[PrecomputeCongestionStaticConfig] = None
+    matrices_correlation: Optional[PrecomputeMatricesCorrelationConfig] = None
+    cache: Optional[PrecomputeCacheConfig] = None
     
     @field_validator('enabled')
     @classmethod
@@ -270,6 +327,7 @@ class Config(BaseModel):
     matrices_base: Optional[MatricesBaseConfig] = None
     effets_patterns: Optional[EffetsPatternsConfig] = None
     realaléatoirisation: Optional[RealaléatoirisationConfig] = None
+    echantillonnage_preferentiel: Optional[EchantillonnagePreferentielConfig] = None
     microzones: MicrozonesConfig
     golden_hour: GoldenHourConfig
     ml: MLConfig
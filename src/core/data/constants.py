@@ -12,3 +12,6 @@ VECTOR_INDEX_BENIN = 2
 INCIDENT_TYPE_INCENDIE = "incendie"
 INCIDENT_TYPE_ACCIDENT = "accident"
 INCIDENT_TYPE_AGRESSION = "agression"
+
+# Mois des lignes ML et des agrégats mensuels : 4 semaines
+JOURS_PAR_MOIS = 28
@@ -41,6 +41,43 @@ RADIUS_INCREASE_BAD_VECTORS = 3  # microzones
 DUREE_MIN_EVENT = 3
 DUREE_MAX_EVENT = 10
 
+# Tirage par lots : ordre des caractéristiques (colonnes du tirage uniforme)
+CARACTERISTIQUES = ("traffic_slowdown", "cancel_sports", "increase_bad_vectors", "kill_pompier")
+PROBS_CARACTERISTIQUES = np.array(
+    [PROB_TRAFFIC_SLOWDOWN, PROB_CANCEL_SPORTS, PROB_INCREASE_BAD_VECTORS, PROB_KILL_POMPIER]
+)
+
+TYPES_INCIDENT = [INCIDENT_TYPE_AGRESSION, INCIDENT_TYPE_INCENDIE, INCIDENT_TYPE_ACCIDENT]
+CLASSES_EVENEMENT = {
+    INCIDENT_TYPE_AGRESSION: AgressionGrave,
+    INCIDENT_TYPE_INCENDIE: IncendieGrave,
+    INCIDENT_TYPE_ACCIDENT: AccidentGrave,
+}
+
+
+def _caracteristiques_depuis_flags(
+    traffic_slowdown: bool,
+    cancel_sports: bool,
+    increase_bad_vectors: bool,
+    kill_pompier: bool,
+) -> Dict[str, float]:
+    """Dictionnaire de caractéristiques (même contenu que _generer_caracteristiques)."""
+    characteristics = {}
+    if traffic_slowdown:
+        characteristics['traffic_slowdown'] = EFFET_TRAFFIC_SLOWDOWN
+        characteristics['traffic_slowdown_duration'] = DUREE_TRAFFIC_SLOWDOWN
+        characteristics['traffic_slowdown_radius'] = RADIUS_TRAFFIC_SLOWDOWN
+    if cancel_sports:
+        characteristics['cancel_sports'] = 1.0
+        characteristics['cancel_sports_duration'] = DUREE_CANCEL_SPORTS
+    if increase_bad_vectors:
+        characteristics['increase_bad_vectors'] = EFFET_INCREASE_BAD_VECTORS
+        characteristics['increase_bad_vectors_duration'] = DUREE_INCREASE_BAD_VECTORS
+        characteristics['increase_bad_vectors_radius'] = RADIUS_INCREASE_BAD_VECTORS
+    if kill_pompier:
+        characteristics['kill_pompier'] = 1.0
+    return characteristics
+
 
 class EventGenerator:
     """
@@ -72,6 +109,9 @@ class EventGenerator:
         
         # Compteur d'événements pour génération d'IDs uniques
         self.event_counter = 0
+
+        # Arrondissements par ordre de microzones (tirage par lots), 0 = inconnu
+        self._arrondissements_ordre: Optional[Tuple[Tuple[str, ...], np.ndarray]] = None
     
     def _generer_caracteristiques(self) -> Dict[str, float]:
         """
@@ -244,6 +284,110 @@ class EventGenerator:
         
         return evenements_generes
     
+    def _arrondissements_array(self, microzone_ids: List[str]) -> np.ndarray:
+        """Arrondissement (N,) dans l'ordre de microzone_ids (0 si absent des limites)."""
+        cle = tuple(microzone_ids)
+        if self._arrondissements_ordre is None or self._arrondissements_ordre[0] != cle:
+            arrs = np.array(
+                [self.limites_microzone_arrondissement.get(mz) or 0 for mz in microzone_ids],
+                dtype=np.int64,
+            )
+            self._arrondissements_ordre = (cle, arrs)
+        return self._arrondissements_ordre[1]
+
+    def tirer_evenements_graves(
+        self,
+        jour: int,
+        microzone_ids: List[str],
+        graves: np.ndarray,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Tire en quelques appels vectorisés les événements graves du jour.
+
+        Un événement par incident grave (microzones avec arrondissement connu) : un
+        tirage uniforme (K, 4) pour les caractéristiques, un tirage entier (K,) pour les durées.
+
+        Args:
+            jour: Numéro du jour (0-indexé)
+            microzone_ids: Ordre des lignes de graves
+            graves: Nombre d'incidents graves (N, 3), colonnes dans l'ordre de TYPES_INCIDENT
+
+        Returns:
+            Colonnes du journal (voir state.event_log.COLONNES), une ligne par événement
+        """
+        graves = np.asarray(graves, dtype=np.int64)
+        arrondissements = self._arrondissements_array(microzone_ids)
+        graves = np.where((arrondissements > 0)[:, None], graves, 0)
+        cellules = np.repeat(np.arange(graves.size), graves.ravel())
+        mz_idx, type_idx = np.divmod(cellules, graves.shape[1])
+        k = len(cellules)
+
+        flags = self.rng.random((k, len(CARACTERISTIQUES))) < PROBS_CARACTERISTIQUES
+        durees = self.rng.integers(DUREE_MIN_EVENT, DUREE_MAX_EVENT + 1, size=k)
+
+        colonnes = {
+            "jour": np.full(k, jour, dtype=np.int64),
+            "microzone": mz_idx,
+            "arrondissement": arrondissements[mz_idx],
+            "type": type_idx,
+            "duration": durees,
+            "casualties_base": graves[mz_idx, type_idx],
+        }
+        for c, nom in enumerate(CARACTERISTIQUES):
+            colonnes[nom] = flags[:, c]
+        return colonnes
+
+    def generer_evenements_graves_batch(
+        self,
+        jour: int,
+        microzone_ids: List[str],
+        graves: np.ndarray,
+        events_state: EventsState,
+    ) -> List:
+        """
+        Version par lots de generer_evenements_graves (mêmes règles, mêmes caractéristiques).
+
+        Les tirages sont faits par tirer_evenements_graves ; les lignes sont ajoutées au
+        journal colonnaire events_state.journal_graves, puis les objets Event sont créés
+        pour EventsState.
+
+        Args:
+            jour: Numéro du jour (0-indexé)
+            microzone_ids: Ordre des lignes de graves
+            graves: Nombre d'incidents graves (N, 3), colonnes dans l'ordre de TYPES_INCIDENT
+            events_state: État des événements (sera mis à jour)
+
+        Returns:
+            Liste des événements graves générés
+        """
+        colonnes = self.tirer_evenements_graves(jour, microzone_ids, graves)
+        k = len(colonnes["jour"])
+        if k == 0:
+            return []
+        events_state.journal_graves.ajouter(colonnes)
+
+        evenements_generes = []
+        lignes = zip(
+            colonnes["arrondissement"].tolist(),
+            colonnes["type"].tolist(),
+            colonnes["duration"].tolist(),
+            colonnes["casualties_base"].tolist(),
+            *(colonnes[nom].tolist() for nom in CARACTERISTIQUES),
+        )
+        for arrondissement, t, duration, casualties_base, *flags in lignes:
+            self.event_counter += 1
+            event = CLASSES_EVENEMENT[TYPES_INCIDENT[t]](
+                event_id=f"EVT_{self.event_counter:06d}",
+                jour=jour,
+                arrondissement=arrondissement,
+                duration=duration,
+                casualties_base=casualties_base,
+                characteristics=_caracteristiques_depuis_flags(*flags),
+            )
+            events_state.add_event(event)
+            evenements_generes.append(event)
+        return evenements_generes
+    
     def appliquer_effets_congestion_temps_reel(
         self,
         jour: int,
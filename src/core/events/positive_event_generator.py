@@ -81,14 +81,11 @@ class PositiveEventGenerator:
         if nb_events == 0:
             return evenements_generes
         
-        # Générer nb_events événements
-        for _ in range(nb_events):
-            # Choisir arrondissement aléatoirement
-            arrondissement = self.rng.choice(self.arrondissements)
-            
-            # Choisir type d'événement selon probabilités
-            type_event = self._choisir_type_event()
-            
+        # Tirages par lots : arrondissements puis types (un appel chacun)
+        arrondissements = self.rng.choice(self.arrondissements, size=nb_events)
+        types_events = self._choisir_types_events(nb_events)
+
+        for arrondissement, type_event in zip(arrondissements, types_events):
             # Générer ID unique
             self.event_counter += 1
             event_id = f"POS_{self.event_counter:06d}"
@@ -124,6 +121,20 @@ class PositiveEventGenerator:
         
         return evenements_generes
     
+    def _choisir_types_events(self, n: int) -> List[str]:
+        """Choisit n types d'événements positifs en un tirage (mêmes seuils que _choisir_type_event)."""
+        rand = self.rng.uniform(0.0, 1.0, size=n)
+        types = np.where(
+            rand < PROB_FIN_TRAVAUX,
+            "fin_travaux",
+            np.where(
+                rand < PROB_FIN_TRAVAUX + PROB_NOUVELLE_CASERNE,
+                "nouvelle_caserne",
+                "amelioration_materiel",
+            ),
+        )
+        return types.tolist()
+
     def _choisir_type_event(self) -> str:
         """
         Choisit un type d'événement positif selon les probabilités.
@@ -12,6 +12,11 @@ import pandas as pd
 from ..data.constants import INCIDENT_TYPE_AGRESSION
 from ..utils.path_resolver import PathResolver
 
+# Quartier riche (facteur prix m² > seuil) : probabilités Détérioration / Crise atténuées
+SEUIL_QUARTIER_RICHE = 1.2
+FACTEUR_DETERIORATION_RICHE = 0.8
+FACTEUR_CRISE_RICHE = 0.7
+
 
 def _normalize_prix_m2_data(data: object) -> Dict[str, float]:
     """
@@ -161,9 +166,9 @@ class PrixM2Modulator:
         """
         facteur = self.get_facteur_prix_m2(microzone_id)
         
-        if facteur > 1.2:  # Quartier riche
-            prob_deterioration_mod = prob_deterioration * 0.8
-            prob_crise_mod = prob_crise * 0.7
+        if facteur > SEUIL_QUARTIER_RICHE:  # Quartier riche
+            prob_deterioration_mod = prob_deterioration * FACTEUR_DETERIORATION_RICHE
+            prob_crise_mod = prob_crise * FACTEUR_CRISE_RICHE
         else:
             prob_deterioration_mod = prob_deterioration
             prob_crise_mod = prob_crise
@@ -4,14 +4,17 @@ from typing import Any, Dict, List, Optional
 
 import numpy as np
 
-from .alcool_evolution import evoluer_incidents_alcool_J1
-from .nuit_evolution import evoluer_incidents_nuit_J1
+from .alcool_evolution import evoluer_incidents_alcool_J1, evoluer_incidents_alcool_J1_array
+from .nuit_evolution import evoluer_incidents_nuit_J1, evoluer_incidents_nuit_J1_array, matrice_poids_inter
 from .trafic_evolution import evoluer_trafic_J1
 
 __all__ = [
     "evoluer_trafic_J1",
     "evoluer_incidents_nuit_J1",
     "evoluer_incidents_alcool_J1",
+    "evoluer_incidents_nuit_J1_array",
+    "evoluer_incidents_alcool_J1_array",
+    "matrice_poids_inter",
     "evoluer_dynamic_state",
 ]
 
@@ -15,6 +15,7 @@ from .nuit_evolution import (
     TYPES,
     _calibrer_vers_proportion,
     _count_by_type,
+    _evoluer_array,
     _inter_influence,
 )
 
@@ -70,3 +71,27 @@ def evoluer_incidents_alcool_J1(
             val = _calibrer_vers_proportion(raw, total, p_base, rng)
             out[mz][t] = min(val, total)
     return out
+
+
+def evoluer_incidents_alcool_J1_array(
+    incidents_alcool_J: np.ndarray,
+    counts_J: np.ndarray,
+    poids_inter: np.ndarray,
+    saison: str,
+    *,
+    memoire: float = MEMOIRE_DEFAULT,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """
+    Version tableau de evoluer_incidents_alcool_J1 (entrées/sortie (N, T), T dans l'ordre de TYPES).
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    facteurs_mu = np.array([
+        SAISON_ETE_FACTEUR_ALCOOL_ACCIDENTS if (t == "accidents" and saison == "ete") else 1.0
+        for t in TYPES
+    ])
+    proportions = np.array([PROPORTIONS_ALCOOL.get(t, 0.6) for t in TYPES])
+    return _evoluer_array(
+        incidents_alcool_J, counts_J, poids_inter, facteurs_mu, proportions, memoire, rng
+    )
@@ -115,3 +115,104 @@ def evoluer_incidents_nuit_J1(
             val = _calibrer_vers_proportion(raw, total, p_base, rng)
             out[mz][t] = min(val, total)
     return out
+
+
+# ---- Implémentation tableaux (microzones × types) ----
+
+
+def matrice_poids_inter(
+    matrices_inter_type: Dict[str, Dict[str, Dict[str, List[float]]]],
+    microzone_ids: List[str],
+) -> np.ndarray:
+    """
+    Poids inter-type (N, T_cible, T_source) : moyenne des coefficients bénin/moyen/grave
+    de matrices_inter_type, 0 sur la diagonale et pour les couples absents.
+
+    corr[mz, cible] = poids[mz, cible] @ counts[mz] reproduit _inter_influence.
+    """
+    poids = np.zeros((len(microzone_ids), len(TYPES), len(TYPES)))
+    for i, mz in enumerate(microzone_ids):
+        inter = matrices_inter_type.get(mz, {})
+        for c, type_cible in enumerate(TYPES):
+            by_cible = inter.get(type_cible, {})
+            for s, type_source in enumerate(TYPES):
+                coefs = by_cible.get(type_source)
+                if s != c and coefs:
+                    poids[i, c, s] = sum(coefs) / 3.0
+    return poids
+
+
+def _calibrer_vers_proportion_array(
+    raw: np.ndarray,
+    totals: np.ndarray,
+    p_base: np.ndarray,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """Version tableau de _calibrer_vers_proportion (un seul tirage binomial)."""
+    ref = totals * p_base + 0.5
+    factor = np.clip((raw + 1) / (ref + 1), 0.5, 1.2)
+    p_eff = np.clip(p_base * factor, 0.02, 0.98)
+    return rng.binomial(totals, p_eff)
+
+
+def _evoluer_array(
+    prev: np.ndarray,
+    counts: np.ndarray,
+    poids_inter: np.ndarray,
+    facteurs_mu: np.ndarray,
+    proportions: np.ndarray,
+    memoire: float,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """
+    Évolution mémoire + corrélations + saisonnalité + calibration sur (N, T).
+
+    Seules les cellules avec incidents tirent du bruit et un binomial (comme la
+    version dict) ; les autres valent 0.
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    out = np.zeros(counts.shape, dtype=np.int64)
+    actives = counts > 0
+    if not actives.any():
+        return out
+    mem = max(0.0, min(1.0, memoire))
+    corr = np.einsum("nct,nt->nc", poids_inter, counts)
+    corr_scaled = np.clip(corr, 0.0, 10.0) * 0.3
+    mu = (mem * np.asarray(prev, dtype=np.float64) + (1.0 - mem) * corr_scaled) * facteurs_mu
+    totals = counts[actives]
+    noise = rng.normal(0, 0.5, size=totals.shape[0])
+    raw = np.maximum(0.0, mu[actives] + noise)
+    p_base = np.broadcast_to(proportions, counts.shape)[actives]
+    vals = _calibrer_vers_proportion_array(raw, totals, p_base, rng)
+    out[actives] = np.minimum(vals, totals)
+    return out
+
+
+def evoluer_incidents_nuit_J1_array(
+    incidents_nuit_J: np.ndarray,
+    counts_J: np.ndarray,
+    poids_inter: np.ndarray,
+    saison: str,
+    *,
+    memoire: float = MEMOIRE_DEFAULT,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """
+    Version tableau de evoluer_incidents_nuit_J1.
+
+    Args:
+        incidents_nuit_J: Incidents nuit J (N, T), T dans l'ordre de TYPES
+        counts_J: Incidents du jour par microzone et type (N, T)
+        poids_inter: Poids inter-type (N, T, T), voir matrice_poids_inter
+        saison: hiver, intersaison ou ete
+
+    Returns:
+        Incidents nuit J+1 (N, T) int64, ≤ counts_J
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    facteur_saison = SAISON_ETE_FACTEUR_NUIT if saison == "ete" else 1.0
+    proportions = np.array([PROPORTIONS_NUIT.get(t, 0.6) for t in TYPES])
+    return _evoluer_array(
+        incidents_nuit_J, counts_J, poids_inter, facteur_saison, proportions, memoire, rng
+    )
@@ -584,7 +584,17 @@ class CongestionCalculator:
             self.congestion_table[microzone_id] = {}
         
         self.congestion_table[microzone_id][day] = max(0.1, min(5.0, new_congestion))
-    
+
+    def clear_day(self, day: int) -> None:
+        """
+        Supprime la congestion d'un jour (toutes microzones).
+
+        Args:
+            day: Numéro du jour à supprimer (0-indexé)
+        """
+        for jours in self.congestion_table.values():
+            jours.pop(day, None)
+
     def to_dict(self) -> Dict:
         """
         Convertit la table de congestion en dictionnaire (pour sérialisation).
@@ -0,0 +1,153 @@
+"""
+Contexte de génération partagé entre runs (Story 2.2.1, 2.4.2).
+
+GenerationContext regroupe tout ce qui ne dépend ni du seed ni de l'état d'un run :
+matrices, intensités de base (vecteurs statiques lissés), probabilités initiales des
+régimes, limites microzone → arrondissement, congestion statique, modulateur prix m²,
+poids inter-type et facteurs statiques compilés. Il est construit une fois par campagne
+(ou par worker) et lu sans modification par chaque GenerationService (partie par run :
+générateurs aléatoires, régimes, historiques, événements).
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from ._loader import load_base_intensities, load_matrices_for_generation
+from .congestion_calculator import CongestionCalculator
+from .shared_static_data import DonneesStatiques
+from .static_factors import FacteursStatiques
+from .static_vector_loader import StaticVectorLoader
+from .vector_generator import _parse_arrondissement_from_microzone_id
+from ..events.prix_m2_modulator import PrixM2Modulator
+from ..evolution import matrice_poids_inter
+
+
+def _microzone_to_arrondissement_fallback(microzone_ids: List[str]) -> Dict[str, int]:
+    """Mapping microzone_id → arrondissement (1..20) quand limites.pkl est absent.
+    Formats : MZ_11_01 → 11 ; MZ031 (MZ + 3 chiffres, 5 microzones/arr) → 7."""
+    out: Dict[str, int] = {}
+    for mz_id in microzone_ids:
+        try:
+            parts = mz_id.split("_")
+            if len(parts) >= 2:
+                out[mz_id] = max(1, min(20, int(parts[1])))
+            elif (
+                len(mz_id) == 5
+                and mz_id.startswith("MZ")
+                and mz_id[2:].isdigit()
+            ):
+                idx = int(mz_id[2:])
+                out[mz_id] = max(1, min(20, (idx - 1) // 5 + 1))
+            else:
+                out[mz_id] = 1
+        except (ValueError, TypeError):
+            out[mz_id] = 1
+    return out
+
+
+class GenerationContext:
+    """
+    Données statiques d'une campagne, en lecture seule pour les runs qui les partagent.
+    """
+
+    def __init__(
+        self,
+        microzone_ids: List[str],
+        base_intensities: Optional[Dict[str, Dict[str, float]]] = None,
+        matrices: Optional[Dict[str, Any]] = None,
+        lissage_alpha: float = 0.7,
+        donnees_statiques: Optional[DonneesStatiques] = None,
+    ):
+        """
+        Charge et compile les entrées statiques.
+
+        Args:
+            microzone_ids: Liste des identifiants de microzones
+            base_intensities: Intensités de base (si None, vecteurs statiques lissés)
+            matrices: Matrices (si None, chargées depuis fichiers)
+            lissage_alpha: Alpha de lissage vecteurs statiques (1=aucun, 0.7≈−30% disparité)
+            donnees_statiques: Tables statiques déjà chargées (ex. segment partagé entre workers) ;
+                les entrées absentes sont chargées depuis les fichiers
+        """
+        self.microzone_ids = microzone_ids
+        self.lissage_alpha = lissage_alpha
+
+        # Charger les données si non fournies
+        if matrices is None:
+            matrices = donnees_statiques.matrices() if donnees_statiques is not None else load_matrices_for_generation()
+        self.matrices = matrices
+        vecteurs_statiques = donnees_statiques.vecteurs_statiques() if donnees_statiques is not None else None
+
+        self.matrices_inter_type = matrices.get("matrices_inter_type", {})
+        # Poids inter-type (N, T, T) pour l'évolution nuit/alcool vectorisée
+        self.poids_inter = matrice_poids_inter(self.matrices_inter_type, microzone_ids)
+
+        # Intensités de base : si non fournies, charger avec recalibration pour éviter trop d'incidents
+        # Priorité : StaticVectorLoader.get_base_intensities_dict() (recalibration en moyenne par type)
+        if base_intensities is None:
+            try:
+                self.static_vector_loader = StaticVectorLoader(vecteurs_statiques, lissage_alpha=lissage_alpha)
+                base_intensities = self.static_vector_loader.get_base_intensities_dict(microzone_ids)
+            except (FileNotFoundError, IOError):
+                self.static_vector_loader = None
+                base_intensities = load_base_intensities()
+        else:
+            # base_intensities fourni (ex. tests) : ne pas écraser
+            try:
+                self.static_vector_loader = StaticVectorLoader(vecteurs_statiques, lissage_alpha=lissage_alpha)
+            except (FileNotFoundError, IOError):
+                self.static_vector_loader = None
+        self.base_intensities = base_intensities
+
+        # Probabilités initiales des régimes selon vecteurs statiques (Story 2.2.10)
+        self.probas_regimes: Optional[Dict[str, np.ndarray]] = None
+        if self.static_vector_loader is not None:
+            self.probas_regimes = {
+                mz_id: self.static_vector_loader.calculer_probabilites_regimes(mz_id) for mz_id in microzone_ids
+            }
+
+        # Limites microzone → arrondissement
+        limites = donnees_statiques.limites_microzone_arrondissement() if donnees_statiques is not None else None
+        if limites is None:
+            try:
+                from ...services.casualty_calculator import CasualtyCalculator
+                limites = CasualtyCalculator.load_limites_microzone_arrondissement()
+            except FileNotFoundError:
+                limites = _microzone_to_arrondissement_fallback(microzone_ids)
+        self.limites_microzone_arrondissement = limites
+        # Arrondissements uniques (événements positifs)
+        self.arrondissements = sorted(set(limites.values()))
+
+        # Congestion statique
+        congestion_statique = donnees_statiques.congestion_statique() if donnees_statiques is not None else None
+        if congestion_statique is None:
+            try:
+                congestion_statique = CongestionCalculator.load_static_congestion()
+            except FileNotFoundError:
+                # Si pas disponible, utiliser valeurs par défaut
+                congestion_statique = {mz_id: 0.5 for mz_id in microzone_ids}
+        self.congestion_statique = congestion_statique
+
+        # Modulateur prix m²
+        try:
+            self.prix_m2_modulator = PrixM2Modulator(
+                donnees_statiques.prix_m2() if donnees_statiques is not None else None
+            )
+        except (FileNotFoundError, IOError):
+            # Si pas disponible, créer avec données vides
+            self.prix_m2_modulator = PrixM2Modulator(prix_m2_data={})
+
+        # Facteurs indépendants de l'état simulé (λ_base, saison, prix m², arrondissements)
+        self.facteurs_statiques = FacteursStatiques(
+            microzone_ids,
+            base_intensities,
+            {
+                mz_id: limites.get(mz_id, _parse_arrondissement_from_microzone_id(mz_id))
+                for mz_id in microzone_ids
+            },
+            self.prix_m2_modulator,
+        )
+
+    def __repr__(self) -> str:
+        return f"GenerationContext(microzones={len(self.microzone_ids)}, lissage_alpha={self.lissage_alpha})"
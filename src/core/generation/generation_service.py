@@ -15,16 +15,21 @@ from ..state.simulation_state import SimulationState
 from ..state.vectors_state import VectorsState
 from ..utils.path_resolver import PathResolver
 from ..utils.pickle_utils import save_pickle
-from ._loader import load_base_intensities, load_matrices_for_generation
 from .congestion_calculator import CongestionCalculator
+from .generation_context import GenerationContext, _microzone_to_arrondissement_fallback  # noqa: F401
+from .importance_sampling import Inclinaison
 from .intensity_calculator import IntensityCalculator
 from .regime_manager import RegimeManager
-from .static_vector_loader import StaticVectorLoader
+from .shared_static_data import DonneesStatiques
+from .variance_reduction import FluxCommuns
 from .vector_generator import VectorGenerator
 from ..events.event_generator import EventGenerator
 from ..events.positive_event_generator import PositiveEventGenerator
-from ..events.prix_m2_modulator import PrixM2Modulator
-from ..evolution import evoluer_incidents_alcool_J1, evoluer_incidents_nuit_J1
+from ..patterns import StreamingPatternDetector
+from ..evolution import (
+    evoluer_incidents_alcool_J1_array,
+    evoluer_incidents_nuit_J1_array,
+)
 
 _DEFAULT_SCENARIO_CONFIG = {"facteur_intensite": 1.0, "proba_crise": 0.1}
 
@@ -39,34 +44,13 @@ TYPE_MAPPING = {
 }
 
 
-def _microzone_to_arrondissement_fallback(microzone_ids: List[str]) -> Dict[str, int]:
-    """Mapping microzone_id → arrondissement (1..20) quand limites.pkl est absent.
-    Formats : MZ_11_01 → 11 ; MZ031 (MZ + 3 chiffres, 5 microzones/arr) → 7."""
-    out: Dict[str, int] = {}
-    for mz_id in microzone_ids:
-        try:
-            parts = mz_id.split("_")
-            if len(parts) >= 2:
-                out[mz_id] = max(1, min(20, int(parts[1])))
-            elif (
-                len(mz_id) == 5
-                and mz_id.startswith("MZ")
-                and mz_id[2:].isdigit()
-            ):
-                idx = int(mz_id[2:])
-                out[mz_id] = max(1, min(20, (idx - 1) // 5 + 1))
-            else:
-                out[mz_id] = 1
-        except (ValueError, TypeError):
-            out[mz_id] = 1
-    return out
-
-
 class GenerationService:
     """
     Service orchestrant la génération de vecteurs journaliers.
     
     Utilise le modèle Zero-Inflated Poisson avec régimes cachés et triple pattern matricielle.
+    Les données statiques viennent d'un GenerationContext (partageable entre runs) ; le
+    service ne porte que l'état d'un run (générateurs aléatoires, régimes, historiques).
     """
     
     def __init__(
@@ -81,6 +65,12 @@ class GenerationService:
         lissage_alpha: float = 0.7,
         reduction_base_matrices: float = 0.80,
         reduction_effet_patterns: float = 0.8,
+        detection_patterns: bool = False,
+        mode_creux: bool = False,
+        flux_communs: Optional[FluxCommuns] = None,
+        inclinaison: Optional[Inclinaison] = None,
+        donnees_statiques: Optional[DonneesStatiques] = None,
+        contexte: Optional[GenerationContext] = None,
     ):
         """
         Initialise le service de génération.
@@ -96,33 +86,47 @@ class GenerationService:
             lissage_alpha: Alpha de lissage vecteurs statiques (1=aucun, 0.7≈−30% disparité)
             reduction_base_matrices: Décorélation de base (0.8 = 80 % réduction de l'effet des matrices)
             reduction_effet_patterns: Réduction des effets patterns 4j/7j/60j (0.8 = 80 % de réduction, 20 % conservé)
+            detection_patterns: Si True, détecte les patterns 4j/7j/60j chaque jour et alimente patterns_actifs
+            mode_creux: Si True, seules les cellules actives passent par le calcul détaillé (même loi, autre suite aléatoire)
+            flux_communs: Nombres aléatoires communs des tirages de vecteurs (variance_reduction) ; désactive le mode creux
+            inclinaison: Échantillonnage préférentiel (importance_sampling) ; log-rapports par jour dans
+                generator.log_rapport_jours ; désactive le mode creux
+            donnees_statiques: Tables statiques déjà chargées (ex. segment partagé entre workers) ; les entrées
+                absentes sont chargées depuis les fichiers
+            contexte: Contexte statique partagé ; si fourni, base_intensities, matrices, lissage_alpha et
+                donnees_statiques sont ignorés
+
+        Raises:
+            ValueError: Si le contexte a été construit pour d'autres microzones
         """
         self.microzone_ids = microzone_ids
         self.scenario_config = scenario_config or _DEFAULT_SCENARIO_CONFIG
         self.variabilite_locale = variabilite_locale
         self.debug_prints = debug_prints
 
-        # Charger les données si non fournies
-        if matrices is None:
-            matrices = load_matrices_for_generation()
-
-        self.matrices_inter_type = matrices.get("matrices_inter_type", {})
+        if contexte is None:
+            contexte = GenerationContext(
+                microzone_ids,
+                base_intensities=base_intensities,
+                matrices=matrices,
+                lissage_alpha=lissage_alpha,
+                donnees_statiques=donnees_statiques,
+            )
+        elif list(contexte.microzone_ids) != list(microzone_ids):
+            raise ValueError("Le contexte de génération ne correspond pas aux microzones demandées")
+        self.contexte = contexte
+        matrices = contexte.matrices
+        base_intensities = contexte.base_intensities
+        limites_microzone_arrondissement = contexte.limites_microzone_arrondissement
 
-        # Intensités de base : si non fournies, charger avec recalibration pour éviter trop d'incidents
-        # Priorité : StaticVectorLoader.get_base_intensities_dict() (recalibration en moyenne par type)
-        if base_intensities is None:
-            try:
-                self.static_vector_loader = StaticVectorLoader(lissage_alpha=lissage_alpha)
-                base_intensities = self.static_vector_loader.get_base_intensities_dict(microzone_ids)
-            except (FileNotFoundError, IOError):
-                self.static_vector_loader = None
-                base_intensities = load_base_intensities()
-        else:
-            # base_intensities fourni (ex. tests) : ne pas écraser
-            try:
-                self.static_vector_loader = StaticVectorLoader(lissage_alpha=lissage_alpha)
-            except (FileNotFoundError, IOError):
-                self.static_vector_loader = None
+        self.matrices_inter_type = contexte.matrices_inter_type
+        # Poids inter-type (N, T, T) et générateur propre pour l'évolution nuit/alcool vectorisée :
+        # flux enfant de la seed, indépendant de celui de VectorGenerator.rng (PCG64(seed))
+        self._poids_inter = contexte.poids_inter
+        self.evolution_rng = np.random.Generator(np.random.PCG64(np.random.SeedSequence(seed).spawn(2)[1]))
+        # Détection incrémentale des patterns (séries par microzone × type)
+        self.pattern_detector = StreamingPatternDetector(microzone_ids) if detection_patterns else None
+        self.static_vector_loader = contexte.static_vector_loader
 
         # Initialiser les composants
         self.regime_manager = RegimeManager()
@@ -145,13 +149,6 @@ class GenerationService:
         )
         self._matrix_modulator = matrix_modulator
         
-        # Charger limites microzone → arrondissement (avant VectorGenerator et EventGenerator)
-        try:
-            from ...services.casualty_calculator import CasualtyCalculator
-            limites_microzone_arrondissement = CasualtyCalculator.load_limites_microzone_arrondissement()
-        except FileNotFoundError:
-            limites_microzone_arrondissement = _microzone_to_arrondissement_fallback(microzone_ids)
-        
         # Créer le générateur (avec limites pour effets_reduction par arrondissement)
         self.generator = VectorGenerator(
             regime_manager=self.regime_manager,
@@ -165,25 +162,23 @@ class GenerationService:
             seed=seed,
             limites_microzone_arrondissement=limites_microzone_arrondissement,
             reduction_effet_patterns=reduction_effet_patterns,
+            mode_creux=mode_creux,
         )
+        self.generator.flux_communs = flux_communs
+        self.generator.inclinaison = inclinaison
         
         # Réinitialiser les régimes avec probabilités modifiées selon vecteurs statiques (Story 2.2.10)
         # Cela remplace l'initialisation par défaut faite dans VectorGenerator.__init__
-        if self.static_vector_loader is not None:
+        if contexte.probas_regimes is not None:
             for mz_id in microzone_ids:
-                probas_regimes = self.static_vector_loader.calculer_probabilites_regimes(mz_id)
-                regime = self.regime_manager.initialize_regime(mz_id, self.generator.rng, probas_regimes)
+                regime = self.regime_manager.initialize_regime(
+                    mz_id, self.generator.rng, contexte.probas_regimes[mz_id]
+                )
                 self.generator.regime_state.set_regime(mz_id, regime)
         
-        # Charger congestion statique et créer calculateur de congestion
-        try:
-            congestion_statique = CongestionCalculator.load_static_congestion()
-        except FileNotFoundError:
-            # Si pas disponible, utiliser valeurs par défaut
-            congestion_statique = {mz_id: 0.5 for mz_id in microzone_ids}
-        
+        # Créer calculateur de congestion
         self.congestion_calculator = CongestionCalculator(
-            congestion_statique=congestion_statique,
+            congestion_statique=contexte.congestion_statique,
             microzone_ids=microzone_ids,
             matrices_voisin=matrices.get("matrices_voisin", {}),
             seed=seed
@@ -197,46 +192,49 @@ class GenerationService:
         )
         
         # Créer générateur d'événements positifs
-        # Extraire arrondissements uniques depuis limites_microzone_arrondissement
-        arrondissements = sorted(set(limites_microzone_arrondissement.values()))
         self.positive_event_generator = PositiveEventGenerator(
             limites_microzone_arrondissement=limites_microzone_arrondissement,
-            arrondissements=arrondissements,
+            arrondissements=contexte.arrondissements,
             seed=seed
         )
         
-        # Créer modulateur prix m²
-        try:
-            self.prix_m2_modulator = PrixM2Modulator()
-        except (FileNotFoundError, IOError):
-            # Si pas disponible, créer avec données vides
-            self.prix_m2_modulator = PrixM2Modulator(prix_m2_data={})
+        # Modulateur prix m² et facteurs statiques compilés : partagés via le contexte
+        self.prix_m2_modulator = contexte.prix_m2_modulator
+        self.facteurs_statiques = contexte.facteurs_statiques
+        self.generator.facteurs_statiques = contexte.facteurs_statiques
 
     def set_realaléatoirisation_state(self, state):  # Story 2.4.3.4
         """Injecte l'état des patterns de réaléatoirisation pour le run en cours."""
         self._matrix_modulator.realaléatoirisation_state = state
     
-    def _vectors_to_incidents_j(
-        self, vectors_j: Dict[str, Dict[str, Vector]]
-    ) -> Dict[str, Dict[str, Dict[str, int]]]:
+    def _vectors_to_counts_array(self, vectors_j: Dict[str, Dict[str, Vector]]) -> np.ndarray:
         """
-        Convertit les vecteurs du jour au format incidents_J attendu par l'évolution.
-        incidents_J[mz][type_plural][gravity] = count avec type in (agressions, incendies, accidents).
+        Totaux du jour (N, T) par microzone (ordre self.microzone_ids) et type
+        (agressions, incendies, accidents), pour l'évolution vectorisée.
         """
-        incidents_J: Dict[str, Dict[str, Dict[str, int]]] = {}
-        for mz_id in self.microzone_ids:
-            vecs = vectors_j.get(mz_id, {})
-            incidents_J[mz_id] = {}
-            for inc_singular, inc_plural in _TYPE_TO_EVOLUTION.items():
+        counts = np.zeros((len(self.microzone_ids), len(_TYPE_TO_EVOLUTION)), dtype=np.int64)
+        for i, mz_id in enumerate(self.microzone_ids):
+            vecs = vectors_j.get(mz_id)
+            if not vecs:
+                continue
+            for t, inc_singular in enumerate(_TYPE_TO_EVOLUTION):
                 vec = vecs.get(inc_singular)
-                if vec is None:
-                    vec = Vector(0, 0, 0)
-                incidents_J[mz_id][inc_plural] = {
-                    "benin": vec.benin,
-                    "moyen": vec.moyen,
-                    "grave": vec.grave,
-                }
-        return incidents_J
+                if vec is not None:
+                    counts[i, t] = vec.total()
+        return counts
+
+    def _vectors_to_graves_array(self, vectors_j: Dict[str, Dict[str, Vector]]) -> np.ndarray:
+        """Incidents graves du jour (N, T) par microzone (ordre self.microzone_ids) et type."""
+        graves = np.zeros((len(self.microzone_ids), len(_TYPE_TO_EVOLUTION)), dtype=np.int64)
+        for i, mz_id in enumerate(self.microzone_ids):
+            vecs = vectors_j.get(mz_id)
+            if not vecs:
+                continue
+            for t, inc_singular in enumerate(_TYPE_TO_EVOLUTION):
+                vec = vecs.get(inc_singular)
+                if vec is not None:
+                    graves[i, t] = vec.grave
+        return graves
 
     def _get_season(self, day: int) -> str:
         """Retourne la saison (hiver, intersaison, ete) pour un jour 1-indexé."""
@@ -350,8 +348,9 @@ class GenerationService:
             simulation_state.dynamic_state.trafic[mz_id] = min(1.0, congestion / 5.0)
         
         # Générer événements graves juste après les vecteurs
-        evenements_graves = self.event_generator.generer_evenements_graves(
-            day, vectors_j, simulation_state.events_state
+        # Tirage par lots depuis les incidents graves (N, 3)
+        evenements_graves = self.event_generator.generer_evenements_graves_batch(
+            day, self.microzone_ids, self._vectors_to_graves_array(vectors_j), simulation_state.events_state
         )
         if self.debug_prints and evenements_graves:
             print(f"  [J{day}] Événements graves: {len(evenements_graves)} — {evenements_graves}")
@@ -382,31 +381,35 @@ class GenerationService:
                     print(f"  [J{day}] Microzone {mz_id} total incidents = {total} (agr+inc+acc)")
 
         # Évolution incidents_nuit et incidents_alcool J→J+1 (Story 1.4.4.2)
-        # Convertisse les vecteurs du jour en format incidents_J pour l'évolution
-        incidents_J = self._vectors_to_incidents_j(vectors_j)
+        # Totaux du jour (microzones × types) : une passe binomiale vectorisée par étape
+        counts_J = self._vectors_to_counts_array(vectors_j)
         saison = self._get_season(day_1_indexed)
         dynamic_state = simulation_state.dynamic_state
         dynamic_state.ensure_microzones(self.microzone_ids)
 
-        new_nuit = evoluer_incidents_nuit_J1(
-            dynamic_state.incidents_nuit,
-            incidents_J,
-            self.matrices_inter_type,
-            self.microzone_ids,
+        new_nuit = evoluer_incidents_nuit_J1_array(
+            dynamic_state.incidents_to_array("incidents_nuit", self.microzone_ids),
+            counts_J,
+            self._poids_inter,
             saison,
-            rng=self.generator.rng,
+            rng=self.evolution_rng,
         )
-        dynamic_state.incidents_nuit.update(new_nuit)
+        dynamic_state.update_incidents_from_array("incidents_nuit", self.microzone_ids, new_nuit)
 
-        new_alcool = evoluer_incidents_alcool_J1(
-            dynamic_state.incidents_alcool,
-            incidents_J,
-            self.matrices_inter_type,
-            self.microzone_ids,
+        new_alcool = evoluer_incidents_alcool_J1_array(
+            dynamic_state.incidents_to_array("incidents_alcool", self.microzone_ids),
+            counts_J,
+            self._poids_inter,
             saison,
-            rng=self.generator.rng,
+            rng=self.evolution_rng,
         )
-        dynamic_state.incidents_alcool.update(new_alcool)
+        dynamic_state.update_incidents_from_array("incidents_alcool", self.microzone_ids, new_alcool)
+
+        # Patterns 4j→7j / 60j : mise à jour des séries, utilisés par la génération de J+1
+        if self.pattern_detector is not None:
+            evenements_patterns = self.pattern_detector.update(day_1_indexed, counts_J, patterns_actifs)
+            if self.debug_prints and evenements_patterns:
+                print(f"  [J{day}] Patterns: {len(evenements_patterns)} — {evenements_patterns}")
 
         # Les effets des événements positifs seront appliqués lors de la génération J+1
         # via get_effets_reduction_actifs() qui sera appelé dans generate_day pour day+1
@@ -489,3 +492,7 @@ class GenerationService:
             run_id=run_id,
             schema_version="1.0"
         )
+
+
+# Partie par run de la génération (le contexte statique étant GenerationContext)
+GenerationRun = GenerationService
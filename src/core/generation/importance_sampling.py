@@ -0,0 +1,78 @@
+"""
+Échantillonnage préférentiel des mois catastrophiques (régimes de crise, incidents graves).
+
+La loi de simulation est inclinée : probabilités de transition vers Détérioration et Crise, et
+probabilité qu'un incident soit grave (chaque incident grave donne un événement grave),
+multipliées par des facteurs puis renormalisées. Chaque tirage incliné ajoute au journal du jour
+log(p / q) de l'issue tirée (p : loi nominale, q : loi inclinée) ; les autres tirages suivent la
+loi nominale conditionnellement à l'état et ne modifient pas le rapport.
+
+Une grandeur qui ne dépend que des jours 0..t a pour poids exp(somme des log-rapports des jours
+0..t) ; la moyenne pondérée des runs inclinés estime sans biais son espérance sous la loi nominale.
+"""
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+
+class Inclinaison:
+    """Facteurs d'inclinaison de la loi de simulation (1.0 = loi nominale)."""
+
+    def __init__(
+        self,
+        facteur_deterioration: float = 1.0,
+        facteur_crise: float = 1.0,
+        facteur_grave: float = 1.0,
+    ):
+        """
+        Args:
+            facteur_deterioration: Multiplie la probabilité de transition vers Détérioration
+            facteur_crise: Multiplie la probabilité de transition vers Crise
+            facteur_grave: Multiplie la probabilité qu'un incident soit grave
+        """
+        if min(facteur_deterioration, facteur_crise, facteur_grave) <= 0:
+            raise ValueError("Les facteurs d'inclinaison doivent être > 0")
+        self.facteur_deterioration = float(facteur_deterioration)
+        self.facteur_crise = float(facteur_crise)
+        self.facteur_grave = float(facteur_grave)
+
+    @classmethod
+    def depuis_config(cls, config: Any) -> Optional["Inclinaison"]:
+        """Inclinaison de la section echantillonnage_preferentiel ; None si absente ou neutre."""
+        section = getattr(config, "echantillonnage_preferentiel", None)
+        if section is None:
+            return None
+        inclinaison = cls(section.facteur_deterioration, section.facteur_crise, section.facteur_grave)
+        return inclinaison if inclinaison.active else None
+
+    @property
+    def active(self) -> bool:
+        return (self.facteur_deterioration, self.facteur_crise, self.facteur_grave) != (1.0, 1.0, 1.0)
+
+    def facteurs(self) -> Dict[str, float]:
+        return {
+            "facteur_deterioration": self.facteur_deterioration,
+            "facteur_crise": self.facteur_crise,
+            "facteur_grave": self.facteur_grave,
+        }
+
+    def incliner_transition(self, probas: np.ndarray) -> np.ndarray:
+        """Probabilités (Stable, Détérioration, Crise) inclinées puis renormalisées."""
+        q = np.asarray(probas, dtype=float) * (1.0, self.facteur_deterioration, self.facteur_crise)
+        return q / q.sum()
+
+    def incliner_gravite(self, probas: np.ndarray) -> np.ndarray:
+        """Probabilités (bénin, moyen, grave) inclinées puis renormalisées."""
+        p = np.asarray(probas, dtype=float)
+        q = p / p.sum() * (1.0, 1.0, self.facteur_grave)
+        return q / q.sum()
+
+
+def log_rapport_multinomial(counts, p: np.ndarray, q: np.ndarray) -> float:
+    """log P(counts | p) − log P(counts | q) d'un tirage multinomial (coefficient commun simplifié)."""
+    total = 0.0
+    for n, pk, qk in zip(counts, p, q):
+        if n:
+            total += n * (np.log(pk) - np.log(qk))
+    return float(total)
@@ -0,0 +1,329 @@
+"""
+Données statiques partagées entre processus de simulation (Story 2.4.2).
+
+Chaque GenerationService recharge et normalise les pickles sources (matrices, vecteurs
+statiques, limites, prix m², congestion statique). En mode multi-processus, les entrées
+en lecture seule sont chargées une fois par le processus principal et normalisées en
+tableaux numpy indexés par microzone, publiés dans un segment
+multiprocessing.shared_memory ; les workers s'y attachent par nom, sans copie ni
+relecture des pickles.
+
+Tables (N = microzones du vocabulaire, T = types, S = saisons ; masque *_present
+pour les entrées absentes des fichiers) :
+- microzone_ids (N,) : vocabulaire, ordre des fichiers ;
+- vecteurs_statiques (N, T, 3) : (bénin, moyen, grave) ;
+- intra_type (N, T, 3, 3), inter_type (N, T, T, 3), saisonnalite (N, T, S) ;
+- voisins_indptr / voisins_indices / voisins_poids / voisins_distances (CSR), voisins_seuil (N,) ;
+- limites (N,), prix_m2 (N,), congestion (N,).
+
+Les consommateurs existants lisent des dictionnaires : matrices(), vecteurs_statiques()
+etc. les reconstruisent depuis les tableaux (les matrices intra-type sont des vues en
+lecture seule du segment).
+"""
+
+import logging
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Alignement des tableaux dans le segment (octets)
+ALIGNEMENT = 64
+
+# Clés de types des fichiers : vecteurs statiques au singulier, matrices au pluriel
+TYPES_VECTEURS = ("agression", "incendie", "accident")
+TYPES_MATRICES = ("agressions", "incendies", "accidents")
+SAISONS = ("hiver", "intersaison", "ete")
+
+
+def _charger_sources() -> Dict[str, Optional[Dict[str, Any]]]:
+    """Charge les entrées statiques avec les chargeurs de GenerationService (None si absentes)."""
+    from ...services.casualty_calculator import CasualtyCalculator
+    from ..events.prix_m2_modulator import PrixM2Modulator
+    from ._loader import load_matrices_for_generation
+    from .congestion_calculator import CongestionCalculator
+    from .static_vector_loader import StaticVectorLoader
+
+    sources: Dict[str, Optional[Dict[str, Any]]] = {"matrices": load_matrices_for_generation()}
+    for cle, chargeur in (
+        ("vecteurs_statiques", StaticVectorLoader.load_static_vectors),
+        ("limites", CasualtyCalculator.load_limites_microzone_arrondissement),
+        ("prix_m2", PrixM2Modulator.load_prix_m2),
+        ("congestion", CongestionCalculator.load_static_congestion),
+    ):
+        try:
+            sources[cle] = chargeur()
+        except (FileNotFoundError, IOError):
+            sources[cle] = None
+    return sources
+
+
+class DonneesStatiques:
+    """
+    Tables statiques normalisées, en mémoire locale (normaliser) ou dans un segment
+    partagé (publier_donnees_statiques / attacher).
+    """
+
+    def __init__(self, tables: Dict[str, np.ndarray], segment: Optional[shared_memory.SharedMemory] = None):
+        """
+        Args:
+            tables: Tableaux nommés (voir docstring du module)
+            segment: Segment partagé portant les tableaux (gardé ouvert tant que l'objet vit)
+        """
+        self.tables = tables
+        self._segment = segment
+        self.microzone_ids: List[str] = [str(mz) for mz in tables["microzone_ids"]]
+        self.index = {mz: i for i, mz in enumerate(self.microzone_ids)}
+
+    # --- Construction ---------------------------------------------------------------
+
+    @classmethod
+    def normaliser(cls, sources: Optional[Dict[str, Optional[Dict[str, Any]]]] = None) -> "DonneesStatiques":
+        """
+        Normalise les entrées (par défaut chargées depuis data/source_data) en tableaux.
+
+        Args:
+            sources: {"matrices", "vecteurs_statiques", "limites", "prix_m2", "congestion"}
+        """
+        if sources is None:
+            sources = _charger_sources()
+        matrices = sources.get("matrices") or {}
+        intra = matrices.get("matrices_intra_type", {})
+        inter = matrices.get("matrices_inter_type", {})
+        voisin = matrices.get("matrices_voisin", {})
+        saison = matrices.get("matrices_saisonnalite", {})
+        vecteurs = sources.get("vecteurs_statiques") or {}
+        limites = sources.get("limites") or {}
+        prix = sources.get("prix_m2") or {}
+        congestion = sources.get("congestion") or {}
+
+        # Vocabulaire : ordre de première apparition (vecteurs statiques d'abord)
+        index: Dict[str, int] = {}
+        for table in (vecteurs, intra, inter, voisin, saison, limites, prix, congestion):
+            for mz in table:
+                index.setdefault(mz, len(index))
+        for entree in voisin.values():
+            for v in entree.get("voisins", []):
+                index.setdefault(v, len(index))
+        n, nt, ns = len(index), len(TYPES_MATRICES), len(SAISONS)
+
+        t = {
+            "microzone_ids": np.array(list(index), dtype=str) if index else np.zeros(0, dtype="<U1"),
+            "vecteurs_statiques": np.zeros((n, nt, 3)),
+            "vecteurs_present": np.zeros((n, nt), dtype=bool),
+            "intra_type": np.zeros((n, nt, 3, 3)),
+            "intra_present": np.zeros((n, nt), dtype=bool),
+            "inter_type": np.zeros((n, nt, nt, 3)),
+            "inter_present": np.zeros((n, nt, nt), dtype=bool),
+            "saisonnalite": np.zeros((n, nt, ns)),
+            "saisonnalite_present": np.zeros((n, nt), dtype=bool),
+            "voisins_seuil": np.zeros(n, dtype=np.int64),
+            "voisins_present": np.zeros(n, dtype=bool),
+            "limites": np.zeros(n, dtype=np.int64),
+            "limites_present": np.zeros(n, dtype=bool),
+            "prix_m2": np.full(n, np.nan),
+            "prix_m2_present": np.zeros(n, dtype=bool),
+            "congestion": np.zeros(n, dtype=np.float64),
+            "congestion_present": np.zeros(n, dtype=bool),
+        }
+        for mz, par_type in vecteurs.items():
+            for k, cle in enumerate(TYPES_VECTEURS):
+                if cle in par_type:
+                    t["vecteurs_statiques"][index[mz], k] = par_type[cle]
+                    t["vecteurs_present"][index[mz], k] = True
+        for mz, par_type in intra.items():
+            for k, cle in enumerate(TYPES_MATRICES):
+                if cle in par_type:
+                    t["intra_type"][index[mz], k] = par_type[cle]
+                    t["intra_present"][index[mz], k] = True
+        for mz, par_cible in inter.items():
+            for k, cible in enumerate(TYPES_MATRICES):
+                for m, source in enumerate(TYPES_MATRICES):
+                    coefs = par_cible.get(cible, {}).get(source)
+                    if coefs is not None:
+                        t["inter_type"][index[mz], k, m] = coefs
+                        t["inter_present"][index[mz], k, m] = True
+        for mz, par_type in saison.items():
+            for k, cle in enumerate(TYPES_MATRICES):
+                if cle in par_type:
+                    t["saisonnalite"][index[mz], k] = [par_type[cle][s] for s in SAISONS]
+                    t["saisonnalite_present"][index[mz], k] = True
+
+        indptr, indices, poids, distances = [0], [], [], []
+        for mz in index:
+            entree = voisin.get(mz)
+            if entree is not None:
+                t["voisins_present"][index[mz]] = True
+                t["voisins_seuil"][index[mz]] = entree.get("seuil_activation", 5)
+                ids = entree.get("voisins", [])
+                indices.extend(index[v] for v in ids)
+                poids.extend(entree.get("poids_influence", [np.nan] * len(ids)))
+                distances.extend(entree.get("distances", [np.nan] * len(ids)))
+            indptr.append(len(indices))
+        t["voisins_indptr"] = np.array(indptr, dtype=np.int64)
+        t["voisins_indices"] = np.array(indices, dtype=np.int64)
+        t["voisins_poids"] = np.array(poids, dtype=np.float64)
+        t["voisins_distances"] = np.array(distances, dtype=np.float64)
+
+        for cle, table in (("limites", limites), ("prix_m2", prix), ("congestion", congestion)):
+            for mz, valeur in table.items():
+                t[f"{cle}_present"][index[mz]] = True
+                if valeur is not None:
+                    t[cle][index[mz]] = valeur
+        return cls(t)
+
+    @classmethod
+    def attacher(cls, descripteur: Dict[str, Any]) -> "DonneesStatiques":
+        """
+        S'attache à un segment publié, sans copie : les tableaux sont des vues en lecture seule.
+
+        Args:
+            descripteur: Retour de publier_donnees_statiques (nom du segment, dtype/forme/offset par table)
+        """
+        try:
+            segment = shared_memory.SharedMemory(name=descripteur["nom"], track=False)
+        except TypeError:  # Python < 3.13
+            segment = shared_memory.SharedMemory(name=descripteur["nom"])
+        tables = {}
+        for nom, (dtype, forme, offset) in descripteur["tables"].items():
+            if 0 in forme:
+                arr = np.zeros(tuple(forme), dtype=np.dtype(dtype))
+            else:
+                arr = np.ndarray(tuple(forme), dtype=np.dtype(dtype), buffer=segment.buf, offset=offset)
+            arr.flags.writeable = False
+            tables[nom] = arr
+        return cls(tables, segment)
+
+    def fermer(self) -> None:
+        """
+        Libère les tables et ferme le segment attaché (sans le détruire). Les vues encore
+        référencées ailleurs (matrices intra-type) maintiennent le segment ouvert.
+        """
+        if self._segment is not None:
+            self.tables = {}
+            try:
+                self._segment.close()
+            except BufferError:
+                logger.debug("Segment %s encore référencé, fermeture différée", self._segment.name)
+                return
+            self._segment = None
+
+    # --- Vues dictionnaires pour les consommateurs existants -------------------------
+
+    def _valeurs(self, cle: str) -> Optional[Dict[str, Any]]:
+        present = self.tables[f"{cle}_present"]
+        if not present.any():
+            return None
+        valeurs = self.tables[cle]
+        return {self.microzone_ids[i]: valeurs[i].item() for i in np.flatnonzero(present)}
+
+    def matrices(self) -> Dict[str, Any]:
+        """Matrices au format de load_matrices_for_generation (intra-type : vues du segment)."""
+        t = self.tables
+        intra, inter, saison, voisin = {}, {}, {}, {}
+        for i, mz in enumerate(self.microzone_ids):
+            if t["intra_present"][i].any():
+                intra[mz] = {
+                    cle: t["intra_type"][i, k] for k, cle in enumerate(TYPES_MATRICES) if t["intra_present"][i, k]
+                }
+            if t["inter_present"][i].any():
+                inter[mz] = {
+                    cible: {
+                        source: t["inter_type"][i, k, m].tolist()
+                        for m, source in enumerate(TYPES_MATRICES) if t["inter_present"][i, k, m]
+                    }
+                    for k, cible in enumerate(TYPES_MATRICES) if t["inter_present"][i, k].any()
+                }
+            if t["saisonnalite_present"][i].any():
+                saison[mz] = {
+                    cle: dict(zip(SAISONS, t["saisonnalite"][i, k].tolist()))
+                    for k, cle in enumerate(TYPES_MATRICES) if t["saisonnalite_present"][i, k]
+                }
+            if t["voisins_present"][i]:
+                debut, fin = t["voisins_indptr"][i], t["voisins_indptr"][i + 1]
+                voisin[mz] = {
+                    "voisins": [self.microzone_ids[j] for j in t["voisins_indices"][debut:fin]],
+                    "poids_influence": t["voisins_poids"][debut:fin].tolist(),
+                    "distances": t["voisins_distances"][debut:fin].tolist(),
+                    "seuil_activation": int(t["voisins_seuil"][i]),
+                }
+        tables = {
+            "matrices_intra_type": intra,
+            "matrices_inter_type": inter,
+            "matrices_voisin": voisin,
+            "matrices_saisonnalite": saison,
+        }
+        return {cle: valeur for cle, valeur in tables.items() if valeur}
+
+    def vecteurs_statiques(self) -> Optional[Dict[str, Dict[str, Tuple[float, float, float]]]]:
+        """Vecteurs statiques au format de StaticVectorLoader.load_static_vectors (None si absents)."""
+        present = self.tables["vecteurs_present"]
+        if not present.any():
+            return None
+        v = self.tables["vecteurs_statiques"]
+        return {
+            self.microzone_ids[i]: {
+                cle: tuple(v[i, k].tolist()) for k, cle in enumerate(TYPES_VECTEURS) if present[i, k]
+            }
+            for i in np.flatnonzero(present.any(axis=1))
+        }
+
+    def limites_microzone_arrondissement(self) -> Optional[Dict[str, int]]:
+        """Mapping microzone → arrondissement (None si absent)."""
+        return self._valeurs("limites")
+
+    def prix_m2(self) -> Optional[Dict[str, Optional[float]]]:
+        """Prix m² par microzone (None si absent ; valeurs manquantes → None)."""
+        valeurs = self._valeurs("prix_m2")
+        if valeurs is None:
+            return None
+        return {mz: (None if np.isnan(p) else p) for mz, p in valeurs.items()}
+
+    def congestion_statique(self) -> Optional[Dict[str, float]]:
+        """Congestion statique par microzone (None si absente)."""
+        return self._valeurs("congestion")
+
+    def nbytes(self) -> int:
+        """Taille totale des tableaux (octets)."""
+        return int(sum(arr.nbytes for arr in self.tables.values()))
+
+
+@contextmanager
+def publier_donnees_statiques(
+    donnees: Optional[DonneesStatiques] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Publie les tables dans un segment partagé pour la durée du bloc.
+
+    Usage :
+        with publier_donnees_statiques() as descripteur:
+            ...  # workers : DonneesStatiques.attacher(descripteur)
+
+    Args:
+        donnees: Tables à publier (défaut : DonneesStatiques.normaliser())
+
+    Yields:
+        Descripteur picklable {"nom", "tables": {nom: (dtype, forme, offset)}}
+    """
+    if donnees is None:
+        donnees = DonneesStatiques.normaliser()
+    specs, offset = {}, 0
+    for nom, arr in donnees.tables.items():
+        offset = -(-offset // ALIGNEMENT) * ALIGNEMENT
+        specs[nom] = (arr.dtype.str, list(arr.shape), offset)
+        offset += arr.nbytes
+    segment = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    try:
+        for nom, arr in donnees.tables.items():
+            if arr.size == 0:
+                continue
+            debut = specs[nom][2]
+            np.ndarray(arr.shape, dtype=arr.dtype, buffer=segment.buf, offset=debut)[...] = arr
+        logger.info("Données statiques publiées: %s (%.1f Mo)", segment.name, offset / 1e6)
+        yield {"nom": segment.name, "tables": specs}
+    finally:
+        segment.close()
+        segment.unlink()
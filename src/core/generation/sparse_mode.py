@@ -0,0 +1,239 @@
+"""
+Mode creux : calcul détaillé réservé aux cellules actives (Story 2.2.1, 2.2.9).
+
+Avec la formule calibrée (MatrixModulator), une cellule (microzone, type) est « calme »
+le jour J si :
+- aucun incident du même type dans la microzone sur J-7..J-1 (facteur gravité = ligne
+  bénin de la matrice intra-type) ;
+- aucun incident, tous types confondus, dans la microzone à J-1 (facteur croisé = 1) ;
+- aucun incident du même type chez les voisins à J-1 (facteur voisins = 1).
+
+Son intensité ne dépend alors que de facteurs tabulés (λ_base, saison, régime,
+événements, patterns, atténuation réaléatoirisation) et se calcule en bloc. Les
+cellules calmes sont tirées en une passe vectorisée : nulles avec
+P(0) = π + (1 − π)·e^{−λ}, sinon Poisson tronquée en zéro puis multinomiale des
+gravités. La loi de chaque vecteur est celle du mode dense ; seul l'ordre des tirages
+(donc la suite aléatoire pour un seed donné) diffère.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+from scipy.stats import poisson
+
+from ..data.constants import (
+    INCIDENT_TYPE_ACCIDENT,
+    INCIDENT_TYPE_AGRESSION,
+    INCIDENT_TYPE_INCENDIE,
+)
+from ..data.vector import Vector
+from ..state.regime_state import REGIME_STABLE
+from .calibration import ZERO_INFLATION_ALPHA
+from .matrix_modulator import MAX_FACTOR, MIN_FACTOR, MatrixModulator
+
+TYPES_INCIDENT = [INCIDENT_TYPE_AGRESSION, INCIDENT_TYPE_INCENDIE, INCIDENT_TYPE_ACCIDENT]
+
+# Historique lu par le facteur gravité (J-7 à J-1)
+FENETRE_HISTORIQUE = 7
+
+# Poids de la ligne de matrice intra-type (bénin, moyen, grave), cf. calculer_facteur_gravite
+POIDS_GRAVITE = np.array([0.5, 1.0, 1.5])
+
+
+class MoteurCreux:
+    """
+    Sélection des cellules actives et tirage en bloc des cellules calmes.
+
+    Tient un historique circulaire des totaux (jour, microzone, type) sur
+    FENETRE_HISTORIQUE jours, alimenté par enregistrer() et reconstruit depuis
+    vectors_state en cas de discontinuité.
+    """
+
+    def __init__(
+        self,
+        microzone_ids: List[str],
+        base_intensities: Dict[str, Dict[str, float]],
+        matrix_modulator: MatrixModulator,
+    ):
+        """
+        Args:
+            microzone_ids: Ordre des lignes
+            base_intensities: Intensités de base par microzone et type (celles de l'IntensityCalculator)
+            matrix_modulator: Modulateur dont les matrices et réglages définissent les facteurs
+        """
+        self.microzone_ids = list(microzone_ids)
+        self.index = {mz: i for i, mz in enumerate(self.microzone_ids)}
+        self.matrix_modulator = matrix_modulator
+        n, nt = len(self.microzone_ids), len(TYPES_INCIDENT)
+
+        self.lambda_base = np.array(
+            [[base_intensities.get(mz, {}).get(t, 0.0) for t in TYPES_INCIDENT] for mz in self.microzone_ids],
+            dtype=np.float64,
+        ).reshape(n, nt)
+
+        # Facteur gravité sans historique : ligne bénin de la matrice intra-type (1.0 si absente)
+        self.facteur_gravite_calme = np.ones((n, nt), dtype=np.float64)
+        for i, mz in enumerate(self.microzone_ids):
+            matrices_mz = matrix_modulator.matrices_intra_type.get(mz, {})
+            for t, incident_type in enumerate(TYPES_INCIDENT):
+                matrice = matrices_mz.get(incident_type)
+                if matrice is not None:
+                    self.facteur_gravite_calme[i, t] = float(np.sum(matrice[0, :] * POIDS_GRAVITE))
+
+        # Adjacence voisins (N, N), restreinte aux microzones générées
+        lignes, colonnes = [], []
+        for i, mz in enumerate(self.microzone_ids):
+            for voisin_id in matrix_modulator.matrices_voisin.get(mz, {}).get("voisins", []):
+                j = self.index.get(voisin_id)
+                if j is not None:
+                    lignes.append(i)
+                    colonnes.append(j)
+        self.adjacence = sparse.csr_matrix(
+            (np.ones(len(lignes), dtype=np.int64), (lignes, colonnes)), shape=(n, n)
+        )
+
+        self._historique = np.zeros((FENETRE_HISTORIQUE, n, nt), dtype=np.int64)
+        self._dernier_jour: Optional[int] = None
+        self._etat_source = None
+
+    def totaux(self, vectors: Dict[str, Dict[str, Vector]]) -> np.ndarray:
+        """Totaux (N, T) d'un dictionnaire {microzone_id: {type: Vector}}."""
+        counts = np.zeros((len(self.microzone_ids), len(TYPES_INCIDENT)), dtype=np.int64)
+        for i, mz in enumerate(self.microzone_ids):
+            vecteurs_mz = vectors.get(mz)
+            if not vecteurs_mz:
+                continue
+            for t, incident_type in enumerate(TYPES_INCIDENT):
+                v = vecteurs_mz.get(incident_type)
+                if v is not None:
+                    counts[i, t] = v.grave + v.moyen + v.benin
+        return counts
+
+    def synchroniser(self, jour: int, vectors_state) -> None:
+        """
+        Prépare l'historique J-7..J-1 du jour `jour` (0-indexé).
+
+        Reconstruit depuis vectors_state si le jour précédent n'a pas été enregistré
+        pour ce même état.
+        """
+        if self._dernier_jour == jour - 1 and self._etat_source is vectors_state:
+            return
+        self._historique[:] = 0
+        for d in range(max(0, jour - FENETRE_HISTORIQUE), jour):
+            slot = self._historique[d % FENETRE_HISTORIQUE]
+            for i, mz in enumerate(self.microzone_ids):
+                for t, incident_type in enumerate(TYPES_INCIDENT):
+                    v = vectors_state.get_vector(mz, d, incident_type)
+                    if v is not None:
+                        slot[i, t] = v.grave + v.moyen + v.benin
+        self._dernier_jour = jour - 1
+        self._etat_source = vectors_state
+
+    def enregistrer(self, jour: int, counts: np.ndarray) -> None:
+        """Ajoute les totaux (N, T) du jour `jour` (0-indexé) à l'historique."""
+        self._historique[jour % FENETRE_HISTORIQUE] = counts
+        self._dernier_jour = jour
+
+    def cellules_actives(self, counts_j_minus_1: np.ndarray) -> np.ndarray:
+        """
+        Masque (N, T) des cellules dont un facteur gravité / croisé / voisins peut s'écarter
+        de sa valeur calme (historique synchronisé au jour courant).
+        """
+        historique = self._historique.sum(axis=0) > 0
+        microzone_j1 = counts_j_minus_1.sum(axis=1, keepdims=True) > 0
+        voisins_j1 = self.adjacence @ (counts_j_minus_1 > 0).astype(np.int64) > 0
+        return historique | microzone_j1 | voisins_j1
+
+    def intensites_calmes(
+        self,
+        jour: int,
+        facteurs_saison: np.ndarray,
+        regimes: Sequence[str],
+        events_grave: List,
+        events_positifs: List,
+        patterns_actifs: Optional[Dict[str, List[dict]]] = None,
+    ) -> np.ndarray:
+        """
+        Intensités calibrées (N, T) des cellules calmes, dans l'ordre des opérations de
+        MatrixModulator.calculer_intensite_calibree.
+
+        Args:
+            jour: Jour courant (0-indexé)
+            facteurs_saison: Facteur saisonnier par type (T,)
+            regimes: Régime de chaque microzone (N,)
+            events_grave: Événements graves actifs
+            events_positifs: Événements positifs actifs
+            patterns_actifs: Patterns actifs par microzone
+        """
+        mod = self.matrix_modulator
+        keep_base = 1.0 - mod.reduction_base_matrices
+        facteur_gravite = 1.0 + (self.facteur_gravite_calme - 1.0) * keep_base
+        if mod.realaléatoirisation_state is not None:
+            dampening = mod.realaléatoirisation_state.dampening_jour(jour, self.microzone_ids)
+            facteur_gravite = 1.0 + (facteur_gravite - 1.0) * dampening[:, None]
+
+        # Facteur long = événements × régime × patterns (événements communs à toutes les cellules)
+        ref = self.microzone_ids[0] if self.microzone_ids else ""
+        facteur_events = mod.calculer_modulations_dynamiques(
+            ref, TYPES_INCIDENT[0], REGIME_STABLE, events_grave, events_positifs, None
+        )["facteur_events"]
+        par_regime = {
+            r: mod.calculer_modulations_dynamiques(ref, TYPES_INCIDENT[0], r, [], [], None)["facteur_regime"]
+            for r in set(regimes)
+        }
+        facteur_regime = np.array([par_regime[r] for r in regimes], dtype=np.float64)
+        facteur_patterns = np.ones(len(self.microzone_ids), dtype=np.float64)
+        for mz in patterns_actifs or {}:
+            i = self.index.get(mz)
+            if i is not None:
+                facteur_patterns[i] = mod.calculer_modulations_dynamiques(
+                    mz, TYPES_INCIDENT[0], REGIME_STABLE, [], [], patterns_actifs
+                )["facteur_patterns"]
+        facteur_long = facteur_events * facteur_regime * facteur_patterns
+
+        lam = self.lambda_base * facteurs_saison[None, :] * facteur_gravite * facteur_long[:, None]
+        lam = np.maximum(MIN_FACTOR * self.lambda_base, np.minimum(MAX_FACTOR * self.lambda_base, lam))
+        return np.where(self.lambda_base > 0, lam, 0.0)
+
+    def tirer_calmes(
+        self,
+        intensites: np.ndarray,
+        facteurs_regime: np.ndarray,
+        calmes: np.ndarray,
+        probas_gravite: np.ndarray,
+        rng: np.random.Generator,
+    ) -> Dict[Tuple[int, int], Vector]:
+        """
+        Tire les cellules calmes en bloc (zero-inflated Poisson puis multinomiale).
+
+        Args:
+            intensites: Intensités finales (N, T)
+            facteurs_regime: Facteur d'intensité du régime par microzone (N,)
+            calmes: Masque (N, T) des cellules à tirer
+            probas_gravite: Probabilités (bénin, moyen, grave) par type pour une gravité J-1 bénigne (T, 3)
+            rng: Générateur aléatoire
+
+        Returns:
+            {(i, t): Vector} pour les seules cellules non nulles
+        """
+        i_c, t_c = np.nonzero(calmes)
+        lam = intensites[i_c, t_c]
+        exp_term = np.exp(-ZERO_INFLATION_ALPHA * (lam * facteurs_regime[i_c]))
+        p_zero_inflation = np.clip(exp_term / (1.0 + exp_term), 0.0, 1.0)
+        e0 = np.exp(-lam)
+        p_nul = p_zero_inflation + (1.0 - p_zero_inflation) * e0
+        non_nuls = np.flatnonzero(rng.random(len(lam)) >= p_nul)
+        if len(non_nuls) == 0:
+            return {}
+
+        # Poisson tronquée en zéro par inversion de la fonction de répartition
+        lam_nn, e0_nn = lam[non_nuls], e0[non_nuls]
+        q = e0_nn + rng.random(len(non_nuls)) * (1.0 - e0_nn)
+        totaux = np.maximum(1, poisson.ppf(q, lam_nn)).astype(np.int64)
+        counts = rng.multinomial(totaux, probas_gravite[t_c[non_nuls]])
+
+        return {
+            (int(i_c[k]), int(t_c[k])): Vector(grave=int(c[2]), moyen=int(c[1]), benin=int(c[0]))
+            for k, c in zip(non_nuls, counts)
+        }
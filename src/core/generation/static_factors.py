@@ -0,0 +1,94 @@
+"""
+Facteurs statiques compilés pour la génération journalière (Story 2.2.1, 2.2.8, 2.2.9).
+
+Tout ce qui ne dépend pas de l'état simulé est matérialisé une fois, à la création du
+GenerationService, en tableaux indexés par (microzone, type[, saison]) :
+- intensités de base λ_base (issues des vecteurs statiques) ;
+- facteurs saisonniers (type × saison) ;
+- règle prix m² : diviseur d'intensité (agressions) et quartier riche (régimes) ;
+- arrondissement de chaque microzone (effets de réduction).
+
+Le calcul du jour lit ces tableaux au lieu de réinterroger les dictionnaires et le
+modulateur prix m² pour chaque cellule.
+"""
+
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+import numpy as np
+
+from ..data.constants import (
+    INCIDENT_TYPE_ACCIDENT,
+    INCIDENT_TYPE_AGRESSION,
+    INCIDENT_TYPE_INCENDIE,
+)
+from ..events.prix_m2_modulator import SEUIL_QUARTIER_RICHE
+
+if TYPE_CHECKING:
+    from ..events.prix_m2_modulator import PrixM2Modulator
+
+TYPES_INCIDENT = [INCIDENT_TYPE_AGRESSION, INCIDENT_TYPE_INCENDIE, INCIDENT_TYPE_ACCIDENT]
+SAISONS = ("hiver", "intersaison", "ete")
+
+# Facteurs saisonniers par type d'incident (hiver, intersaison, été)
+FACTEURS_SAISON = {
+    INCIDENT_TYPE_INCENDIE: {"hiver": 1.3, "intersaison": 1.0, "ete": 0.9},  # +30 % hiver, -10 % été
+    INCIDENT_TYPE_AGRESSION: {"hiver": 0.8, "intersaison": 1.0, "ete": 1.2},  # -20 % hiver, +20 % été
+    INCIDENT_TYPE_ACCIDENT: {"hiver": 1.0, "intersaison": 1.075, "ete": 1.0},  # +7.5 % intersaison
+}
+
+
+def saison_du_jour(day: int) -> str:
+    """Saison pour un jour 1-indexé : 1-80 hiver, 81-260 intersaison, 261+ été."""
+    if day <= 80:
+        return "hiver"
+    elif day <= 260:
+        return "intersaison"
+    return "ete"
+
+
+class FacteursStatiques:
+    """
+    Tableaux des facteurs indépendants de l'état simulé, dans l'ordre de microzone_ids
+    et de TYPES_INCIDENT.
+    """
+
+    def __init__(
+        self,
+        microzone_ids: List[str],
+        base_intensities: Dict[str, Dict[str, float]],
+        arrondissements: Dict[str, int],
+        prix_m2_modulator: Optional["PrixM2Modulator"] = None,
+    ):
+        """
+        Args:
+            microzone_ids: Ordre des lignes
+            base_intensities: Intensités de base par microzone et type
+            arrondissements: Mapping microzone_id → arrondissement (1..20)
+            prix_m2_modulator: Modulateur prix m² dont la règle est compilée (optionnel)
+        """
+        self.microzone_ids = list(microzone_ids)
+        self.index = {mz: i for i, mz in enumerate(self.microzone_ids)}
+        n, nt = len(self.microzone_ids), len(TYPES_INCIDENT)
+
+        self.lambda_base = np.array(
+            [[base_intensities.get(mz, {}).get(t, 0.0) for t in TYPES_INCIDENT] for mz in self.microzone_ids],
+            dtype=np.float64,
+        ).reshape(n, nt)
+        self.facteur_saison = np.array(
+            [[FACTEURS_SAISON[t][s] for s in SAISONS] for t in TYPES_INCIDENT], dtype=np.float64
+        )
+        self.arrondissement = np.array(
+            [arrondissements[mz] for mz in self.microzone_ids], dtype=np.int64
+        )
+
+        # Règle prix m² : intensité agressions / facteur (si facteur > 0), régimes atténués en quartier riche
+        self.prix_m2_modulator = prix_m2_modulator
+        self.diviseur_prix = np.ones((n, nt), dtype=np.float64)
+        self.quartier_riche = np.zeros(n, dtype=bool)
+        if prix_m2_modulator is not None:
+            a = TYPES_INCIDENT.index(INCIDENT_TYPE_AGRESSION)
+            for i, mz in enumerate(self.microzone_ids):
+                facteur = prix_m2_modulator.get_facteur_prix_m2(mz)
+                if facteur > 0:
+                    self.diviseur_prix[i, a] = facteur
+                self.quartier_riche[i] = facteur > SEUIL_QUARTIER_RICHE
@@ -0,0 +1,134 @@
+"""
+Réduction de variance : nombres aléatoires communs (CRN) et variables antithétiques.
+
+En mode CRN, les tirages de la génération des vecteurs (transition de régime, zero-inflation,
+Poisson, répartition par gravité) ne consomment plus le générateur séquentiel du run : chaque
+jour dispose d'un sous-flux dérivé de (seed, étape, jour), dont chaque microzone lit une ligne
+d'uniformes de taille fixe. Deux scénarios simulés avec la même seed utilisent donc les mêmes
+uniformes pour la même microzone le même jour, quel que soit le nombre de tirages consommés
+ailleurs. Les tirages se font par inversion de la fonction de répartition (monotone en u) : le
+run antithétique d'une paire utilise 1 − u et reste distribué selon la même loi.
+"""
+
+import math
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import stats
+
+# Étapes (clés de sous-flux)
+ETAPE_VECTEURS = 1
+
+# Uniformes par microzone et par jour : transition de régime, puis pour chaque type
+# (zero-inflation, Poisson, bénin, moyen)
+UNIFORMES_PAR_TYPE = 4
+UNIFORMES_PAR_MICROZONE = 1 + 3 * UNIFORMES_PAR_TYPE
+
+# Au-delà, les inversions passent par scipy (boucles de sommation trop longues)
+_LAMBDA_MAX_BOUCLE = 30.0
+_N_MAX_BOUCLE = 100
+
+MODES_REDUCTION_VARIANCE = ("aucune", "crn", "antithetique")
+
+
+class FluxCommuns:
+    """Sous-flux d'uniformes par (étape, jour), identiques pour toute simulation de même seed."""
+
+    def __init__(self, seed: int, antithetique: bool = False):
+        """
+        Args:
+            seed: Seed du run (partagée par les scénarios comparés et par les deux runs d'une paire)
+            antithetique: Utiliser 1 − u (second run d'une paire antithétique)
+        """
+        self.seed = seed
+        self.antithetique = antithetique
+
+    def uniformes(self, etape: int, jour: int, lignes: int, colonnes: int) -> np.ndarray:
+        """Uniformes (lignes, colonnes) du sous-flux (étape, jour) ; dans ]0, 1] si antithétique."""
+        sequence = np.random.SeedSequence(self.seed, spawn_key=(etape, jour))
+        u = np.random.Generator(np.random.PCG64(sequence)).random((lignes, colonnes))
+        return 1.0 - u if self.antithetique else u
+
+
+def choix_inverse(u: float, probas: Sequence[float]) -> int:
+    """Indice tiré par inversion : premier i tel que u < somme(probas[:i+1])."""
+    cumul = np.cumsum(probas)
+    return int(min(np.searchsorted(cumul, u * cumul[-1], side="right"), len(cumul) - 1))
+
+
+def poisson_inverse(u: float, lam: float) -> int:
+    """Quantile u de la loi de Poisson(lam)."""
+    if lam <= 0.0:
+        return 0
+    if lam > _LAMBDA_MAX_BOUCLE:
+        return int(stats.poisson.ppf(min(u, 1.0 - 1e-16), lam))
+    k, p = 0, math.exp(-lam)
+    cumul = p
+    k_max = int(lam + 20.0 * math.sqrt(lam) + 20)
+    while u > cumul and k < k_max:
+        k += 1
+        p *= lam / k
+        cumul += p
+    return k
+
+
+def binomiale_inverse(u: float, n: int, p: float) -> int:
+    """Quantile u de la loi binomiale(n, p)."""
+    if n <= 0 or p <= 0.0:
+        return 0
+    if p >= 1.0:
+        return n
+    if n > _N_MAX_BOUCLE:
+        return int(stats.binom.ppf(min(u, 1.0 - 1e-16), n, p))
+    k, q = 0, (1.0 - p) ** n
+    cumul = q
+    rapport = p / (1.0 - p)
+    while u > cumul and k < n:
+        q *= (n - k) / (k + 1) * rapport
+        k += 1
+        cumul += q
+    return k
+
+
+def zip_inverse(u_zero: float, u_poisson: float, intensite: float, proba_zero: float) -> int:
+    """Zero-Inflated Poisson par inversion (même loi que sample_zero_inflated_poisson)."""
+    if u_zero < proba_zero:
+        return 0
+    return poisson_inverse(u_poisson, intensite)
+
+
+def multinomiale_inverse(
+    u_benin: float, u_moyen: float, total: int, probas: Tuple[float, float, float]
+) -> Tuple[int, int, int]:
+    """
+    Répartition (bénin, moyen, grave) par binomiales conditionnelles inversées
+    (même loi que sample_multinomial_counts).
+    """
+    p = np.asarray(probas, dtype=float)
+    p = p / p.sum()
+    benin = binomiale_inverse(u_benin, total, float(p[0]))
+    reste_p = 1.0 - float(p[0])
+    moyen = binomiale_inverse(u_moyen, total - benin, float(p[1]) / reste_p) if reste_p > 0 else 0
+    return benin, moyen, total - benin - moyen
+
+
+def valider_mode(mode: str) -> str:
+    """Mode de réduction de variance validé (aucune, crn, antithetique)."""
+    if mode not in MODES_REDUCTION_VARIANCE:
+        raise ValueError(f"Mode de réduction de variance inconnu : {mode} (disponibles : {MODES_REDUCTION_VARIANCE})")
+    return mode
+
+
+def seed_du_run(seed: int, run_idx: int, mode: str = "aucune") -> int:
+    """Seed du run run_idx d'une campagne : seed + run_idx, ou seed de la paire en mode antithétique."""
+    return seed + (run_idx // 2 if valider_mode(mode) == "antithetique" else run_idx)
+
+
+def flux_du_run(seed_run: int, run_idx: int, mode: str = "aucune") -> Optional[FluxCommuns]:
+    """
+    Sous-flux communs d'un run (None en mode aucune) ; en mode antithétique, le run impair
+    d'une paire (2k, 2k+1) utilise les uniformes miroirs.
+    """
+    if valider_mode(mode) == "aucune":
+        return None
+    return FluxCommuns(seed_run, antithetique=mode == "antithetique" and run_idx % 2 == 1)
@@ -3,7 +3,7 @@ Générateur de vecteurs journaliers avec modèle Zero-Inflated Poisson.
 Story 2.2.1 - Génération vecteurs journaliers
 """
 
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 
@@ -13,10 +13,23 @@ from ..data.constants import (
     INCIDENT_TYPE_INCENDIE,
 )
 from ..data.vector import Vector
+from ..events.prix_m2_modulator import FACTEUR_CRISE_RICHE, FACTEUR_DETERIORATION_RICHE
 from ..probability.matrix_applicator import apply_voisin
 from ..state.regime_state import RegimeState
+from .importance_sampling import Inclinaison, log_rapport_multinomial
 from .intensity_calculator import IntensityCalculator
 from .regime_manager import RegimeManager
+from .sparse_mode import MoteurCreux
+from .static_factors import FACTEURS_SAISON, SAISONS, FacteursStatiques, saison_du_jour
+from .variance_reduction import (
+    ETAPE_VECTEURS,
+    UNIFORMES_PAR_MICROZONE,
+    UNIFORMES_PAR_TYPE,
+    FluxCommuns,
+    choix_inverse,
+    multinomiale_inverse,
+    zip_inverse,
+)
 from .zero_inflated_poisson import (
     calculate_zero_inflation_probability,
     sample_multinomial_counts,
@@ -74,6 +87,7 @@ class VectorGenerator:
         seed: Optional[int] = None,
         limites_microzone_arrondissement: Optional[Dict[str, int]] = None,
         reduction_effet_patterns: float = 0.8,
+        mode_creux: bool = False,
     ):
         """
         Initialise le générateur de vecteurs.
@@ -90,6 +104,8 @@ class VectorGenerator:
             seed: Seed pour reproductibilité
             limites_microzone_arrondissement: Mapping microzone_id → arrondissement (1..20) pour effets_reduction
             reduction_effet_patterns: Réduction des effets patterns 4j/7j/60j (0.8 = 80 % réduction, 20 % conservé)
+            mode_creux: Si True, calcul détaillé réservé aux cellules actives, cellules calmes tirées en bloc
+                (formule calibrée et facteurs statiques compilés requis, sinon mode dense)
         """
         self.regime_manager = regime_manager
         self.intensity_calculator = intensity_calculator
@@ -101,6 +117,18 @@ class VectorGenerator:
         self.microzone_ids = microzone_ids
         self.limites_microzone_arrondissement = limites_microzone_arrondissement or {}
         self.reduction_effet_patterns = reduction_effet_patterns
+        # Facteurs indépendants de l'état simulé (compiler_facteurs_statiques)
+        self.facteurs_statiques: Optional[FacteursStatiques] = None
+        # Mode creux (sparse_mode), moteur créé au premier jour éligible
+        self.mode_creux = mode_creux
+        self.moteur_creux: Optional[MoteurCreux] = None
+        # Nombres aléatoires communs (variance_reduction) : tirages par inversion sur des
+        # sous-flux par jour au lieu de self.rng ; désactive le mode creux
+        self.flux_communs: Optional[FluxCommuns] = None
+        # Échantillonnage préférentiel (importance_sampling) : transitions et gravité inclinées,
+        # log-rapport de vraisemblance nominale / inclinée par jour (0-indexé) ; désactive le mode creux
+        self.inclinaison: Optional[Inclinaison] = None
+        self.log_rapport_jours: Dict[int, float] = {}
         
         # Générateur aléatoire
         self.rng = np.random.Generator(np.random.PCG64(seed))
@@ -129,12 +157,7 @@ class VectorGenerator:
         Returns:
             Saison ("hiver", "intersaison", "ete")
         """
-        if day <= 80:
-            return "hiver"
-        elif day <= 260:
-            return "intersaison"
-        else:
-            return "ete"
+        return saison_du_jour(day)
     
     def _get_season_factor(
         self,
@@ -151,25 +174,30 @@ class VectorGenerator:
         Returns:
             Facteur multiplicatif
         """
-        factors = {
-            INCIDENT_TYPE_INCENDIE: {
-                "hiver": 1.3,  # +30% hiver
-                "intersaison": 1.0,
-                "ete": 0.9  # -10% été
-            },
-            INCIDENT_TYPE_AGRESSION: {
-                "hiver": 0.8,  # -20% hiver
-                "intersaison": 1.0,
-                "ete": 1.2  # +20% été
-            },
-            INCIDENT_TYPE_ACCIDENT: {
-                "hiver": 1.0,
-                "intersaison": 1.075,  # +7.5% intersaison
-                "ete": 1.0
-            }
+        return FACTEURS_SAISON.get(incident_type, {}).get(season, 1.0)
+
+    def compiler_facteurs_statiques(self, prix_m2_modulator: Optional[Any] = None) -> FacteursStatiques:
+        """
+        Compile les facteurs indépendants de l'état simulé (λ_base, saison, prix m²,
+        arrondissements) ; utilisés par generate_vectors_for_day à la place des
+        recalculs par cellule.
+
+        Args:
+            prix_m2_modulator: Modulateur prix m² passé ensuite à generate_vectors_for_day
+
+        Returns:
+            FacteursStatiques compilés (aussi stockés dans self.facteurs_statiques)
+        """
+        arrondissements = {
+            mz_id: self.limites_microzone_arrondissement.get(
+                mz_id, _parse_arrondissement_from_microzone_id(mz_id)
+            )
+            for mz_id in self.microzone_ids
         }
-        
-        return factors.get(incident_type, {}).get(season, 1.0)
+        self.facteurs_statiques = FacteursStatiques(
+            self.microzone_ids, self.base_intensities, arrondissements, prix_m2_modulator
+        )
+        return self.facteurs_statiques
     
     def _calculate_neighbor_effect(
         self,
@@ -242,10 +270,10 @@ class VectorGenerator:
         day: int,
         vectors_j_minus_1: Dict[str, Dict[str, Vector]],
         patterns_actifs: Optional[Dict[str, List[dict]]] = None,
-        dynamic_state: Optional[any] = None,
+        dynamic_state: Optional[Any] = None,
         effets_reduction: Optional[Dict[int, float]] = None,
-        prix_m2_modulator: Optional[any] = None,
-        vectors_state: Optional[any] = None,
+        prix_m2_modulator: Optional[Any] = None,
+        vectors_state: Optional[Any] = None,
         events_grave: Optional[List] = None,
         events_positifs: Optional[List] = None,
         variabilite_locale: float = 0.5,
@@ -279,9 +307,24 @@ class VectorGenerator:
         self.events_grave = events_grave or []
         self.events_positifs = events_positifs or []
         self.variabilite_locale = variabilite_locale
+
+        # Facteurs statiques compilés (règle prix m² seulement s'ils portent ce modulateur)
+        fs = self.facteurs_statiques
+        prix_compile = fs is not None and prix_m2_modulator is not None and fs.prix_m2_modulator is prix_m2_modulator
+        saison_idx = SAISONS.index(season)
+        inclinaison = self.inclinaison
+        log_rapport = 0.0
+
+        # Nombres aléatoires communs : une ligne d'uniformes par microzone (même position quel
+        # que soit le scénario)
+        u_jour = None
+        if self.flux_communs is not None:
+            u_jour = self.flux_communs.uniformes(
+                ETAPE_VECTEURS, day, len(self.microzone_ids), UNIFORMES_PAR_MICROZONE
+            )
         
         # Transition des régimes (modulation prix m² + scénario proba_crise)
-        for mz_id in self.microzone_ids:
+        for i, mz_id in enumerate(self.microzone_ids):
             current_regime = self.regime_state.get_regime_or_default(mz_id)
             regime_idx = self.regime_manager.regime_to_idx[current_regime]
             transition_probas = self.regime_manager.transition_matrix[regime_idx, :].copy()
@@ -290,9 +333,16 @@ class VectorGenerator:
             if prix_m2_modulator is not None:
                 prob_deterioration = transition_probas[1]
                 prob_crise_mat = transition_probas[2]
-                prob_deterioration_mod, prob_crise_mod = prix_m2_modulator.moduler_probabilites_regimes(
-                    mz_id, prob_deterioration, prob_crise_mat
-                )
+                if prix_compile:
+                    if fs.quartier_riche[i]:
+                        prob_deterioration_mod = prob_deterioration * FACTEUR_DETERIORATION_RICHE
+                        prob_crise_mod = prob_crise_mat * FACTEUR_CRISE_RICHE
+                    else:
+                        prob_deterioration_mod, prob_crise_mod = prob_deterioration, prob_crise_mat
+                else:
+                    prob_deterioration_mod, prob_crise_mod = prix_m2_modulator.moduler_probabilites_regimes(
+                        mz_id, prob_deterioration, prob_crise_mat
+                    )
                 transition_probas[1] = prob_deterioration_mod
                 transition_probas[2] = prob_crise_mod
                 transition_probas[0] = 1.0 - prob_deterioration_mod - prob_crise_mod
@@ -300,35 +350,69 @@ class VectorGenerator:
             # Scénario : modulation proba régime Crise (Story 2.4.2.1)
             transition_probas[2] = transition_probas[2] * (proba_crise / PROBA_CRISE_REF)
             transition_probas = transition_probas / np.sum(transition_probas)
+            probas_tirage = transition_probas
+            if inclinaison is not None:
+                probas_tirage = inclinaison.incliner_transition(transition_probas)
 
-            new_idx = self.rng.choice(len(self.regime_manager.regimes), p=transition_probas)
+            if u_jour is not None:
+                new_idx = choix_inverse(u_jour[i, 0], probas_tirage)
+            else:
+                new_idx = self.rng.choice(len(self.regime_manager.regimes), p=probas_tirage)
+            if inclinaison is not None:
+                log_rapport += float(np.log(transition_probas[new_idx]) - np.log(probas_tirage[new_idx]))
             new_regime = self.regime_manager.regimes[new_idx]
             self.regime_state.set_regime(mz_id, new_regime)
         
+        # Convertir les vecteurs en format attendu par apply_voisin (avec strings), une fois par jour
+        incidents_j_for_voisin = {}
+        for mz, vectors in vectors_j_minus_1.items():
+            incidents_j_for_voisin[mz] = {}
+            for inc_type, vector in vectors.items():
+                # Convertir type en string pour apply_voisin
+                type_str = TYPE_TO_STRING.get(inc_type, inc_type)
+                incidents_j_for_voisin[mz][type_str] = (vector.grave, vector.moyen, vector.benin)
+
+        # Mode creux : cellules calmes tirées en bloc, calcul détaillé pour les seules cellules actives
+        moteur = None
+        if (
+            self.mode_creux
+            and u_jour is None
+            and inclinaison is None
+            and self.intensity_calculator.matrix_modulator is not None
+            and vectors_state is not None
+            and fs is not None
+            and (prix_m2_modulator is None or prix_compile)
+        ):
+            moteur = self._get_moteur_creux()
+            actives, vecteurs_calmes = self._tirer_cellules_calmes(
+                moteur, day, vectors_j_minus_1, patterns_actifs, effets_reduction,
+                facteur_intensite, prix_compile, saison_idx,
+            )
+
         # Génération des vecteurs par microzone
-        for mz_id in self.microzone_ids:
+        for i, mz_id in enumerate(self.microzone_ids):
             vectors_j[mz_id] = {}
             regime = self.regime_state.get_regime_or_default(mz_id)
             regime_factor = self.regime_manager.get_regime_intensity_factor(regime)
-            
-            # Convertir les vecteurs en format attendu par apply_voisin (avec strings)
-            incidents_j_for_voisin = {}
-            for mz, vectors in vectors_j_minus_1.items():
-                incidents_j_for_voisin[mz] = {}
-                for inc_type, vector in vectors.items():
-                    # Convertir type en string pour apply_voisin
-                    type_str = TYPE_TO_STRING.get(inc_type, inc_type)
-                    incidents_j_for_voisin[mz][type_str] = (vector.grave, vector.moyen, vector.benin)
-            
-            # Effet voisins
-            neighbor_effect = self._calculate_neighbor_effect(mz_id, incidents_j_for_voisin)
-            
-            # Effet patterns
-            pattern_effect = self._calculate_pattern_effect(mz_id, patterns_actifs)
+
+            if moteur is None or actives[i].any():
+                # Effet voisins
+                neighbor_effect = self._calculate_neighbor_effect(mz_id, incidents_j_for_voisin)
+
+                # Effet patterns
+                pattern_effect = self._calculate_pattern_effect(mz_id, patterns_actifs)
             
             # Génération pour chaque type d'incident
-            for incident_type in TYPES_INCIDENT:
-                season_factor = self._get_season_factor(incident_type, season)
+            for t, incident_type in enumerate(TYPES_INCIDENT):
+                if moteur is not None and not actives[i, t]:
+                    vecteur = vecteurs_calmes.get((i, t))
+                    vectors_j[mz_id][incident_type] = vecteur if vecteur is not None else Vector(0, 0, 0)
+                    continue
+
+                if fs is not None:
+                    season_factor = float(fs.facteur_saison[t, saison_idx])
+                else:
+                    season_factor = self._get_season_factor(incident_type, season)
                 
                 # Calcul de l'intensité λ
                 # Utiliser formule calibrée complète si matrix_modulator disponible (Story 2.2.9)
@@ -354,16 +438,21 @@ class VectorGenerator:
                 intensity = intensity * facteur_intensite
 
                 # Modulation prix m² (pour agressions principalement)
-                if prix_m2_modulator is not None:
+                if prix_compile:
+                    intensity = intensity / float(fs.diviseur_prix[i, t])
+                elif prix_m2_modulator is not None:
                     intensity = prix_m2_modulator.moduler_intensite(
                         mz_id, incident_type, intensity
                     )
                 
                 # Application effets réduction événements positifs
                 if effets_reduction is not None:
-                    arr = self.limites_microzone_arrondissement.get(
-                        mz_id, _parse_arrondissement_from_microzone_id(mz_id)
-                    )
+                    if fs is not None:
+                        arr = int(fs.arrondissement[i])
+                    else:
+                        arr = self.limites_microzone_arrondissement.get(
+                            mz_id, _parse_arrondissement_from_microzone_id(mz_id)
+                        )
                     reduction = effets_reduction.get(arr, 0.0)
                     if reduction > 0:
                         intensity = intensity * (1.0 - reduction)  # Réduction
@@ -375,11 +464,15 @@ class VectorGenerator:
                 )
                 
                 # Échantillonnage Zero-Inflated Poisson
-                total_count = sample_zero_inflated_poisson(
-                    intensity,
-                    zero_inflation_prob,
-                    self.rng
-                )
+                if u_jour is not None:
+                    u_type = u_jour[i, 1 + t * UNIFORMES_PAR_TYPE:1 + (t + 1) * UNIFORMES_PAR_TYPE]
+                    total_count = zip_inverse(u_type[0], u_type[1], intensity, zero_inflation_prob)
+                else:
+                    total_count = sample_zero_inflated_poisson(
+                        intensity,
+                        zero_inflation_prob,
+                        self.rng
+                    )
                 
                 # Si total_count = 0, vecteur nul
                 if total_count == 0:
@@ -402,11 +495,20 @@ class VectorGenerator:
                 )
                 
                 # Échantillonnage multinomial
-                counts = sample_multinomial_counts(
-                    total_count,
-                    cross_probs,
-                    self.rng
-                )
+                probas_gravite = cross_probs
+                if inclinaison is not None:
+                    probas_gravite = inclinaison.incliner_gravite(cross_probs)
+                if u_jour is not None:
+                    counts = multinomiale_inverse(u_type[2], u_type[3], total_count, probas_gravite)
+                else:
+                    counts = sample_multinomial_counts(
+                        total_count,
+                        probas_gravite,
+                        self.rng
+                    )
+                if inclinaison is not None:
+                    p_nominal = np.asarray(cross_probs, dtype=float)
+                    log_rapport += log_rapport_multinomial(counts, p_nominal / p_nominal.sum(), probas_gravite)
                 
                 # Créer le vecteur (grave, moyen, bénin)
                 vectors_j[mz_id][incident_type] = Vector(
@@ -414,5 +516,68 @@ class VectorGenerator:
                     moyen=counts[1],  # moyen = index 1
                     benin=counts[0]   # bénin = index 0
                 )
+
+        if moteur is not None:
+            moteur.enregistrer(day - 1, moteur.totaux(vectors_j))
+        if inclinaison is not None:
+            self.log_rapport_jours[day - 1] = log_rapport
         
         return vectors_j
+
+    def _get_moteur_creux(self) -> MoteurCreux:
+        """Moteur du mode creux, créé à la première utilisation (matrices du MatrixModulator)."""
+        if self.moteur_creux is None:
+            self.moteur_creux = MoteurCreux(
+                self.microzone_ids,
+                self.intensity_calculator.base_intensities,
+                self.intensity_calculator.matrix_modulator,
+            )
+        return self.moteur_creux
+
+    def _tirer_cellules_calmes(
+        self,
+        moteur: MoteurCreux,
+        day: int,
+        vectors_j_minus_1: Dict[str, Dict[str, Vector]],
+        patterns_actifs: Optional[Dict[str, List[dict]]],
+        effets_reduction: Optional[Dict[int, float]],
+        facteur_intensite: float,
+        prix_compile: bool,
+        saison_idx: int,
+    ) -> Tuple[np.ndarray, Dict[Tuple[int, int], Vector]]:
+        """
+        Sélectionne les cellules actives du jour et tire les cellules calmes en bloc.
+
+        Les intensités calmes suivent la même chaîne que le calcul détaillé (formule
+        calibrée, scénario, prix m², effets de réduction) ; les régimes sont ceux issus
+        de la transition du jour.
+
+        Returns:
+            (masque (N, T) des cellules actives, {(i, t): Vector} des cellules calmes non nulles)
+        """
+        fs = self.facteurs_statiques
+        jour = day - 1
+        moteur.synchroniser(jour, self.vectors_state)
+        actives = moteur.cellules_actives(moteur.totaux(vectors_j_minus_1))
+
+        regimes = [self.regime_state.get_regime_or_default(mz_id) for mz_id in self.microzone_ids]
+        facteurs_regime = np.array(
+            [self.regime_manager.get_regime_intensity_factor(r) for r in regimes], dtype=np.float64
+        )
+        intensites = moteur.intensites_calmes(
+            jour, fs.facteur_saison[:, saison_idx], regimes,
+            self.events_grave, self.events_positifs, patterns_actifs,
+        )
+        intensites = intensites * facteur_intensite
+        if prix_compile:
+            intensites = intensites / fs.diviseur_prix
+        if effets_reduction is not None:
+            reduction = np.array([effets_reduction.get(int(a), 0.0) for a in fs.arrondissement])
+            intensites = np.where((reduction > 0)[:, None], intensites * (1.0 - reduction)[:, None], intensites)
+
+        probas_gravite = np.array(
+            [self.intensity_calculator.get_cross_probabilities(t, 0) for t in TYPES_INCIDENT], dtype=np.float64
+        )
+        probas_gravite = probas_gravite / probas_gravite.sum(axis=1, keepdims=True)
+        vecteurs_calmes = moteur.tirer_calmes(intensites, facteurs_regime, ~actives, probas_gravite, self.rng)
+        return actives, vecteurs_calmes
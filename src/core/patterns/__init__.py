@@ -11,6 +11,7 @@ from .pattern_manager import (
     update_patterns,
     remove_expired_patterns,
 )
+from .pattern_stream import StreamingPatternDetector
 
 __all__ = [
     "detect_pattern_4j",
@@ -20,4 +21,5 @@ __all__ = [
     "add_pattern",
     "update_patterns",
     "remove_expired_patterns",
+    "StreamingPatternDetector",
 ]
@@ -0,0 +1,172 @@
+"""
+Détection incrémentale des patterns 4j→7j et 60j (Story 1.4.4.5).
+
+detect_pattern_4j / detect_pattern_60j réexaminent la fenêtre d'historique à chaque
+appel. StreamingPatternDetector tient à la place, par (microzone, type), la longueur
+de la série en cours de jours avec incident(s) et de jours sans incident : une mise
+à jour par jour en O(microzones × types), sans historique.
+
+Règles (identiques aux détecteurs fenêtrés) :
+- 4j→7j : série de FENETRE_4J jours consécutifs avec ≥ 1 incident → pattern 7j ;
+- 60j : série de FENETRE_60J jours consécutifs sans incident → pattern 60j.
+Un pattern est déclenché le jour où la série atteint la fenêtre (une fois par série).
+
+Les patterns actifs sont écrits dans patterns_actifs (Dict[microzone_id, List[dict]],
+format lu par VectorGenerator et MatrixModulator) via add_pattern ; seules les
+microzones ayant un pattern actif y figurent.
+"""
+
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from .pattern_detector import FENETRE_4J, FENETRE_60J, create_pattern_60j, create_pattern_7j
+from .pattern_manager import MAX_PATTERNS, _avance_jour_actuel, add_pattern
+
+TYPES = ("agressions", "incendies", "accidents")
+
+# Types d'incident déclenchant des patterns (les patterns 7j/60j portent sur les agressions)
+TYPES_DECLENCHEURS = ("agressions",)
+
+EVENEMENT_DEBUT = "debut"
+EVENEMENT_FIN = "fin"
+
+
+def _evenement(evenement: str, mz: str, pattern: dict, jour: int) -> dict:
+    return {
+        "evenement": evenement,
+        "microzone_id": mz,
+        "type": pattern.get("type"),
+        "type_incident": pattern.get("type_incident"),
+        "jour": jour,
+    }
+
+
+class StreamingPatternDetector:
+    """
+    Compteurs de séries par (microzone, type) mis à jour une fois par jour.
+
+    Usage :
+        detector = StreamingPatternDetector(microzone_ids)
+        evenements = detector.update(jour, counts_J, simulation_state.patterns_actifs)
+    """
+
+    def __init__(
+        self,
+        microzone_ids: List[str],
+        types_declencheurs: Sequence[str] = TYPES_DECLENCHEURS,
+        fenetre_4j: int = FENETRE_4J,
+        fenetre_60j: int = FENETRE_60J,
+        max_par_mz: int = MAX_PATTERNS,
+    ):
+        """
+        Args:
+            microzone_ids: Ordre des lignes des tableaux de comptage
+            types_declencheurs: Types (parmi TYPES) pour lesquels des patterns sont créés
+            fenetre_4j: Jours consécutifs avec incident déclenchant un pattern 7j
+            fenetre_60j: Jours consécutifs sans incident déclenchant un pattern 60j
+            max_par_mz: Nombre maximal de patterns actifs par microzone
+        """
+        inconnus = set(types_declencheurs) - set(TYPES)
+        if inconnus:
+            raise ValueError(f"Types déclencheurs inconnus: {sorted(inconnus)}")
+        self.microzone_ids = list(microzone_ids)
+        self.fenetre_4j = fenetre_4j
+        self.fenetre_60j = fenetre_60j
+        self.max_par_mz = max_par_mz
+        self._colonnes = [TYPES.index(t) for t in types_declencheurs]
+        shape = (len(self.microzone_ids), len(TYPES))
+        # Longueur de la série en cours : jours consécutifs avec incident / sans incident
+        self.serie_active = np.zeros(shape, dtype=np.int64)
+        self.serie_calme = np.zeros(shape, dtype=np.int64)
+
+    def observer(self, counts_J: np.ndarray) -> None:
+        """Met à jour les compteurs de séries avec les totaux du jour (N, T)."""
+        counts_J = np.asarray(counts_J)
+        if counts_J.shape != self.serie_active.shape:
+            raise ValueError(f"counts_J de forme {counts_J.shape}, attendu {self.serie_active.shape}")
+        actif = counts_J > 0
+        self.serie_active = np.where(actif, self.serie_active + 1, 0)
+        self.serie_calme = np.where(actif, 0, self.serie_calme + 1)
+
+    def declenchements(self) -> Dict[str, np.ndarray]:
+        """
+        Masques (N, T) des patterns déclenchés par le dernier jour observé.
+
+        Returns:
+            {"7j": série active atteignant fenetre_4j, "60j": série calme atteignant fenetre_60j},
+            limités aux types déclencheurs
+        """
+        masque_types = np.zeros(self.serie_active.shape[1], dtype=bool)
+        masque_types[self._colonnes] = True
+        return {
+            "7j": (self.serie_active == self.fenetre_4j) & masque_types,
+            "60j": (self.serie_calme == self.fenetre_60j) & masque_types,
+        }
+
+    def update(
+        self,
+        jour: int,
+        counts_J: np.ndarray,
+        patterns_actifs: Dict[str, List[dict]],
+    ) -> List[dict]:
+        """
+        Avance les patterns actifs d'un jour, retire les expirés, observe counts_J et
+        ajoute les patterns déclenchés.
+
+        Args:
+            jour: Jour de simulation (stocké dans jour_debut des nouveaux patterns)
+            counts_J: Totaux du jour (N, T), lignes dans l'ordre de microzone_ids
+            patterns_actifs: Table des patterns actifs, modifiée en place
+
+        Returns:
+            Événements {"evenement": "debut"|"fin", "microzone_id", "type", "type_incident", "jour"}
+        """
+        evenements = self._avancer(jour, patterns_actifs)
+        self.observer(counts_J)
+        for type_pattern, masque in self.declenchements().items():
+            creer = create_pattern_7j if type_pattern == "7j" else create_pattern_60j
+            for i in np.flatnonzero(masque.any(axis=1)):
+                mz = self.microzone_ids[i]
+                evenements.extend(self._ajouter(mz, creer(jour), jour, patterns_actifs))
+        return evenements
+
+    def _avancer(self, jour: int, patterns_actifs: Dict[str, List[dict]]) -> List[dict]:
+        """update_patterns + remove_expired_patterns, en émettant les expirations."""
+        evenements = []
+        for mz in list(patterns_actifs.keys()):
+            restants = []
+            for p in patterns_actifs[mz]:
+                _avance_jour_actuel(p)
+                if p.get("jour_actuel", 0) < p.get("duree", 7):
+                    restants.append(p)
+                else:
+                    evenements.append(_evenement(EVENEMENT_FIN, mz, p, jour))
+            if restants:
+                patterns_actifs[mz] = restants
+            else:
+                del patterns_actifs[mz]
+        return evenements
+
+    def _ajouter(
+        self,
+        mz: str,
+        pattern: dict,
+        jour: int,
+        patterns_actifs: Dict[str, List[dict]],
+    ) -> List[dict]:
+        """add_pattern avec émission du début et des patterns évincés (limite par microzone)."""
+        avant = list(patterns_actifs.get(mz, []))
+        add_pattern(patterns_actifs, mz, pattern, self.max_par_mz)
+        apres = {id(p) for p in patterns_actifs[mz]}
+        evenements = []
+        if id(pattern) in apres:
+            evenements.append(_evenement(EVENEMENT_DEBUT, mz, pattern, jour))
+        evenements.extend(
+            _evenement(EVENEMENT_FIN, mz, p, jour) for p in avant if id(p) not in apres
+        )
+        return evenements
+
+    def nombre_actifs(self, patterns_actifs: Dict[str, List[dict]]) -> np.ndarray:
+        """Nombre de patterns actifs par microzone (N,), dans l'ordre de microzone_ids."""
+        return np.array([len(patterns_actifs.get(mz, ())) for mz in self.microzone_ids], dtype=np.int64)
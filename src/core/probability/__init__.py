@@ -17,6 +17,12 @@ from .variables_etat_applicator import (
     EFFET_ALCOOL,
 )
 from .pattern_applicator import apply_patterns
+from .probability_tensor import (
+    MatricesProbabilite,
+    compiler_matrices_probabilite,
+    calculer_probabilite_tenseur,
+    calculer_probabilite_incidents_J1_array,
+)
 from ._loader import load_matrices_for_probability
 
 __all__ = [
@@ -27,6 +33,10 @@ __all__ = [
     "apply_saisonnalite",
     "apply_variables_etat",
     "apply_patterns",
+    "MatricesProbabilite",
+    "compiler_matrices_probabilite",
+    "calculer_probabilite_tenseur",
+    "calculer_probabilite_incidents_J1_array",
     "SEUIL_TRAFIC_HAUT",
     "SEUIL_INCIDENTS_NUIT",
     "SEUIL_INCIDENTS_ALCOOL",
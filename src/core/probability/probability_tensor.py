@@ -0,0 +1,266 @@
+"""
+Calcul tensoriel des probabilités d'incidents J+1 (Story 1.4.4.3, 1.4.4.4, 1.4.4.6).
+
+Même chaîne que calculer_probabilite_incidents_J1 (intra-type → inter-type → voisin →
+saisonnalité → variables d'état → patterns), appliquée à toutes les microzones à la fois
+sur un tableau (N microzones × 3 types × 3 gravités) :
+- intra-type : sélection de la ligne dominante par microzone × type ;
+- inter-type : einsum sur les coefficients (N × cible × source × gravité) ;
+- voisin : produit creux (matrice d'adjacence N × N) ;
+- saisonnalité : diffusion d'un facteur (N × T).
+
+Les matrices sont compilées une fois par compiler_matrices_probabilite ; les voisins hors
+de microzone_ids sont ignorés (leurs incidents ne figurent pas dans le tableau).
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from .matrix_applicator import POIDS_VOISIN, SEUIL_VOISINS, EFFET_VOISIN
+from .pattern_applicator import TYPE_PATTERN, _amplitude_pattern
+from .variables_etat_applicator import (
+    SEUIL_TRAFIC_HAUT,
+    SEUIL_INCIDENTS_NUIT,
+    SEUIL_INCIDENTS_ALCOOL,
+    EFFET_TRAFIC,
+    EFFET_NUIT,
+    EFFET_ALCOOL,
+)
+
+TYPES = ("agressions", "incendies", "accidents")
+SAISONS = ("hiver", "intersaison", "ete")
+
+# Poids voisins ×10 (entiers) : somme pondérée exacte, sans erreur d'arrondi avant le seuil
+_POIDS_VOISIN_X10 = np.array([round(p * 10) for p in POIDS_VOISIN], dtype=np.int64)
+
+
+@dataclass
+class MatricesProbabilite:
+    """Matrices fixes compilées en tableaux pour une liste ordonnée de microzones."""
+
+    microzone_ids: List[str]
+    intra: np.ndarray  # (N, T, 3, 3)
+    intra_present: np.ndarray  # (N, T) bool
+    inter: np.ndarray  # (N, T cible, T source, 3), diagonale nulle
+    voisins: sparse.csr_matrix  # (N, N), A[i, j] = multiplicité de j parmi les voisins de i
+    seuil_voisins: np.ndarray  # (N,)
+    saisonnalite: np.ndarray  # (N, T, len(SAISONS))
+
+
+def compiler_matrices_probabilite(
+    microzone_ids: List[str],
+    matrices_intra_type: Dict[str, Dict[str, Any]],
+    matrices_inter_type: Dict[str, Dict[str, Dict[str, List[float]]]],
+    matrices_voisin: Dict[str, Any],
+    matrices_saisonnalite: Dict[str, Dict[str, Dict[str, float]]],
+) -> MatricesProbabilite:
+    """Convertit les matrices (dicts par microzone) en tableaux ordonnés selon microzone_ids."""
+    n, nt = len(microzone_ids), len(TYPES)
+    index = {mz: i for i, mz in enumerate(microzone_ids)}
+    intra = np.zeros((n, nt, 3, 3), dtype=np.float64)
+    intra_present = np.zeros((n, nt), dtype=bool)
+    inter = np.zeros((n, nt, nt, 3), dtype=np.float64)
+    seuil = np.full(n, float(SEUIL_VOISINS), dtype=np.float64)
+    saisonnalite = np.ones((n, nt, len(SAISONS)), dtype=np.float64)
+    lignes, colonnes = [], []
+
+    for i, mz in enumerate(microzone_ids):
+        intra_mz = matrices_intra_type.get(mz, {})
+        inter_mz = matrices_inter_type.get(mz, {})
+        saison_mz = matrices_saisonnalite.get(mz, {})
+        for c, t in enumerate(TYPES):
+            mat = intra_mz.get(t)
+            if mat is not None:
+                intra[i, c] = np.asarray(mat, dtype=np.float64)[:3, :3]
+                intra_present[i, c] = True
+            by_cible = inter_mz.get(t, {})
+            for s, ts in enumerate(TYPES):
+                coefs = by_cible.get(ts)
+                if ts == t or not coefs:
+                    continue
+                inter[i, c, s, :len(coefs[:3])] = coefs[:3]
+            for k, saison in enumerate(SAISONS):
+                saisonnalite[i, c, k] = saison_mz.get(t, {}).get(saison, 1.0)
+        voisin_data = matrices_voisin.get(mz, {})
+        seuil[i] = voisin_data.get("seuil_activation", SEUIL_VOISINS)
+        for v in voisin_data.get("voisins", []):
+            j = index.get(v)
+            if j is not None:
+                lignes.append(i)
+                colonnes.append(j)
+
+    voisins = sparse.csr_matrix(
+        (np.ones(len(lignes), dtype=np.int64), (lignes, colonnes)), shape=(n, n)
+    )
+    return MatricesProbabilite(
+        microzone_ids=list(microzone_ids),
+        intra=intra,
+        intra_present=intra_present,
+        inter=inter,
+        voisins=voisins,
+        seuil_voisins=seuil,
+        saisonnalite=saisonnalite,
+    )
+
+
+def prob_base_to_array(prob_base: Dict[str, Dict[str, float]], microzone_ids: List[str]) -> np.ndarray:
+    """prob_base[mz][type] → tableau (N, T) (0.0 si absent)."""
+    return np.array(
+        [[prob_base.get(mz, {}).get(t, 0.0) for t in TYPES] for mz in microzone_ids],
+        dtype=np.float64,
+    )
+
+
+def incidents_to_array(
+    incidents_J: Dict[str, Dict[str, Tuple[int, int, int]]],
+    microzone_ids: List[str],
+) -> np.ndarray:
+    """incidents_J[mz][type] = (b, m, g) → tableau (N, T, 3) d'entiers."""
+    out = np.zeros((len(microzone_ids), len(TYPES), 3), dtype=np.int64)
+    for i, mz in enumerate(microzone_ids):
+        inc_mz = incidents_J.get(mz, {})
+        for c, t in enumerate(TYPES):
+            n = inc_mz.get(t)
+            if n:
+                out[i, c, :len(n[:3])] = n[:3]
+    return out
+
+
+def _totaux_dynamiques(valeurs: Dict[str, Dict[str, int]], microzone_ids: List[str]) -> np.ndarray:
+    return np.array(
+        [sum(valeurs.get(mz, {}).get(t, 0) for t in TYPES) for mz in microzone_ids],
+        dtype=np.int64,
+    )
+
+
+def _facteurs_variables_etat(dynamic_state: Any, microzone_ids: List[str]) -> np.ndarray:
+    """Facteurs multiplicatifs (N, T) trafic / nuit / alcool, dans l'ordre de apply_variables_etat."""
+    n = len(microzone_ids)
+    trafic = np.array([dynamic_state.trafic.get(mz, 0.0) for mz in microzone_ids], dtype=np.float64)
+    nuit = _totaux_dynamiques(dynamic_state.incidents_nuit, microzone_ids)
+    alcool = _totaux_dynamiques(dynamic_state.incidents_alcool, microzone_ids)
+    types_trafic = np.array([t in ("agressions", "accidents") for t in TYPES])
+    f = np.ones((n, len(TYPES)), dtype=np.float64)
+    f = np.where((trafic > SEUIL_TRAFIC_HAUT)[:, None] & types_trafic, f * (1.0 + EFFET_TRAFIC), f)
+    f = np.where((nuit > SEUIL_INCIDENTS_NUIT)[:, None], f * (1.0 + EFFET_NUIT), f)
+    f = np.where((alcool > SEUIL_INCIDENTS_ALCOOL)[:, None], f * (1.0 + EFFET_ALCOOL), f)
+    return f
+
+
+def _delta_patterns(patterns_actifs: Dict[str, List[dict]], microzone_ids: List[str]) -> np.ndarray:
+    """Somme des amplitudes 7j/60j (agressions) par microzone (N,)."""
+    delta = np.zeros(len(microzone_ids), dtype=np.float64)
+    for i, mz in enumerate(microzone_ids):
+        lst = patterns_actifs.get(mz)
+        if not lst:
+            continue
+        d = 0.0
+        for p in lst:
+            if p.get("type_incident") == TYPE_PATTERN:
+                d += _amplitude_pattern(p)
+        delta[i] = d
+    return delta
+
+
+def calculer_probabilite_tenseur(
+    prob_base: np.ndarray,
+    incidents: np.ndarray,
+    matrices: MatricesProbabilite,
+    saison: str,
+    *,
+    dynamic_state: Optional[Any] = None,
+    patterns_actifs: Optional[Dict[str, List[dict]]] = None,
+) -> np.ndarray:
+    """
+    Probabilités J→J+1 pour toutes les microzones.
+
+    Args:
+        prob_base: Probabilités de base (N, T)
+        incidents: Incidents du jour J (N, T, 3)
+        matrices: Matrices compilées (compiler_matrices_probabilite)
+        saison: "hiver" | "intersaison" | "ete" (autre → facteur 1)
+        dynamic_state: Optionnel. Trafic, incidents nuit, alcool
+        patterns_actifs: Optionnel. Patterns 7j/60j (agressions)
+
+    Returns:
+        Tableau (N, T, 3) de probabilités (bénin, moyen, grave) dans [0, 1]
+    """
+    n = len(matrices.microzone_ids)
+    prob_base = np.asarray(prob_base, dtype=np.float64)
+    incidents = np.asarray(incidents)
+
+    # Intra-type : prob_base × ligne de la gravité dominante (argmax, 0 si aucun incident)
+    ligne = np.argmax(incidents, axis=2)
+    lignes = np.take_along_axis(matrices.intra, ligne[:, :, None, None], axis=2)[:, :, 0, :]
+    p = np.where(
+        matrices.intra_present[:, :, None],
+        prob_base[:, :, None] * lignes,
+        np.concatenate([prob_base[:, :, None], np.zeros((n, len(TYPES), 2))], axis=2),
+    )
+    p = np.clip(p, 0.0, 1.0)
+
+    # Inter-type : Σ_source coefs[cible, source, g] × min(total source, 3)
+    cap = np.minimum(incidents.sum(axis=2), 3).astype(np.float64)
+    p = np.clip(p + np.einsum("ncsg,ns->ncg", matrices.inter, cap), 0.0, 1.0)
+
+    # Voisin : somme pondérée des incidents des voisins (poids ×10 exacts) > seuil → ×(1 + effet)
+    pondere_mz = (incidents @ _POIDS_VOISIN_X10).sum(axis=1)
+    pondere_voisins = matrices.voisins @ pondere_mz
+    actif = pondere_voisins > matrices.seuil_voisins * 10
+    p = np.clip(p * np.where(actif, 1.0 + EFFET_VOISIN, 1.0)[:, None, None], 0.0, 1.0)
+
+    # Saisonnalité : diffusion du facteur (N, T)
+    if saison in SAISONS:
+        p = np.clip(p * matrices.saisonnalite[:, :, SAISONS.index(saison), None], 0.0, 1.0)
+
+    if dynamic_state is not None:
+        f = _facteurs_variables_etat(dynamic_state, matrices.microzone_ids)
+        p = np.clip(p * f[:, :, None], 0.0, 1.0)
+
+    if patterns_actifs:
+        c = TYPES.index(TYPE_PATTERN)
+        p[:, c, :] = np.clip(p[:, c, :] + _delta_patterns(patterns_actifs, matrices.microzone_ids)[:, None], 0.0, 1.0)
+    return p
+
+
+def calculer_probabilite_incidents_J1_array(
+    prob_base: Dict[str, Dict[str, float]],
+    incidents_J: Dict[str, Dict[str, Tuple[int, int, int]]],
+    matrices_intra_type: Dict[str, Dict[str, Any]],
+    matrices_inter_type: Dict[str, Dict[str, Dict[str, List[float]]]],
+    matrices_voisin: Dict[str, Any],
+    matrices_saisonnalite: Dict[str, Dict[str, Dict[str, float]]],
+    microzone_ids: List[str],
+    saison: str,
+    *,
+    dynamic_state: Optional[Any] = None,
+    patterns_actifs: Optional[Dict[str, List[dict]]] = None,
+    matrices: Optional[MatricesProbabilite] = None,
+) -> Tuple[Dict[str, Dict[str, Tuple[float, float, float]]], np.ndarray]:
+    """
+    Même signature que calculer_probabilite_incidents_J1, calcul tensoriel.
+
+    - matrices : optionnel. Matrices déjà compilées pour microzone_ids (évite la
+      recompilation à chaque jour).
+    - Retour : (prob_finales[mz][type] = (p_benin, p_moyen, p_grave), tableau (N, T, 3)).
+    """
+    if matrices is None:
+        matrices = compiler_matrices_probabilite(
+            microzone_ids, matrices_intra_type, matrices_inter_type, matrices_voisin, matrices_saisonnalite
+        )
+    p = calculer_probabilite_tenseur(
+        prob_base_to_array(prob_base, microzone_ids),
+        incidents_to_array(incidents_J, microzone_ids),
+        matrices,
+        saison,
+        dynamic_state=dynamic_state,
+        patterns_actifs=patterns_actifs,
+    )
+    out = {
+        mz: {t: tuple(float(x) for x in p[i, c]) for c, t in enumerate(TYPES)}
+        for i, mz in enumerate(microzone_ids)
+    }
+    return out, p
@@ -9,6 +9,8 @@ Stockées dans SimulationState.dynamic_state. Structure :
 
 from typing import Dict, List
 
+import numpy as np
+
 
 TYPES_INCIDENT = ("agressions", "incendies", "accidents")
 
@@ -48,6 +50,26 @@ class DynamicState:
             if mz not in self.incidents_alcool:
                 self.incidents_alcool[mz] = _default_incidents_par_type().copy()
 
+    def incidents_to_array(self, attribut: str, microzone_ids: List[str]) -> np.ndarray:
+        """
+        Vue tableau (N, T) int64 de incidents_nuit ou incidents_alcool.
+
+        Args:
+            attribut: "incidents_nuit" ou "incidents_alcool"
+            microzone_ids: Ordre des lignes ; colonnes dans l'ordre de TYPES_INCIDENT
+        """
+        par_mz = getattr(self, attribut)
+        return np.array(
+            [[(par_mz.get(mz) or {}).get(t, 0) for t in TYPES_INCIDENT] for mz in microzone_ids],
+            dtype=np.int64,
+        ).reshape(len(microzone_ids), len(TYPES_INCIDENT))
+
+    def update_incidents_from_array(self, attribut: str, microzone_ids: List[str], valeurs: np.ndarray) -> None:
+        """Écrit un tableau (N, T) dans incidents_nuit ou incidents_alcool (entiers Python)."""
+        par_mz = getattr(self, attribut)
+        for mz, ligne in zip(microzone_ids, np.asarray(valeurs).tolist()):
+            par_mz[mz] = dict(zip(TYPES_INCIDENT, ligne))
+
     def copy(self) -> "DynamicState":
         """Copie shallow des dicts (les sous-dicts sont partagés)."""
         return DynamicState(
@@ -0,0 +1,69 @@
+"""
+JournalEvenements : journal colonnaire des événements graves (Story 2.2.7).
+
+Chaque appel à la génération par lots ajoute un bloc de colonnes numpy (une ligne par
+événement) ; les colonnes ne sont concaténées qu'à la lecture. Complète EventsState
+(objets Event par jour) pour les analyses sur l'ensemble d'un run.
+"""
+
+from typing import Dict, List
+
+import numpy as np
+
+# Colonnes du journal et leur dtype
+COLONNES = {
+    "jour": np.int64,
+    "microzone": np.int64,  # indice dans la liste de microzones du GenerationService
+    "arrondissement": np.int64,
+    "type": np.int64,  # indice dans TYPES_INCIDENT (agression, incendie, accident)
+    "duration": np.int64,
+    "casualties_base": np.int64,
+    "traffic_slowdown": bool,
+    "cancel_sports": bool,
+    "increase_bad_vectors": bool,
+    "kill_pompier": bool,
+}
+
+
+class JournalEvenements:
+    """Journal append-only d'événements en colonnes."""
+
+    def __init__(self):
+        self._blocs: List[Dict[str, np.ndarray]] = []
+        self._n = 0
+
+    def ajouter(self, colonnes: Dict[str, np.ndarray]) -> None:
+        """
+        Ajoute un bloc de lignes.
+
+        Args:
+            colonnes: Tableaux 1D de même longueur, une entrée par colonne de COLONNES
+
+        Raises:
+            ValueError: Si une colonne manque ou si les longueurs diffèrent
+        """
+        manquantes = set(COLONNES) - set(colonnes)
+        if manquantes:
+            raise ValueError(f"Colonnes manquantes: {sorted(manquantes)}")
+        longueurs = {len(colonnes[c]) for c in COLONNES}
+        if len(longueurs) != 1:
+            raise ValueError(f"Longueurs de colonnes différentes: {sorted(longueurs)}")
+        n = longueurs.pop()
+        if n == 0:
+            return
+        self._blocs.append({c: np.asarray(colonnes[c], dtype=dt) for c, dt in COLONNES.items()})
+        self._n += n
+
+    def colonnes(self) -> Dict[str, np.ndarray]:
+        """Colonnes concaténées de tous les blocs."""
+        if not self._blocs:
+            return {c: np.zeros(0, dtype=dt) for c, dt in COLONNES.items()}
+        if len(self._blocs) > 1:
+            self._blocs = [{c: np.concatenate([b[c] for b in self._blocs]) for c in COLONNES}]
+        return dict(self._blocs[0])
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __repr__(self) -> str:
+        return f"JournalEvenements(lignes={self._n})"
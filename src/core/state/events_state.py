@@ -8,6 +8,7 @@ from typing import Dict, List, Optional
 from ..events.event import Event
 from ..events.event_grave import EventGrave
 from ..events.positive_event import PositiveEvent
+from .event_log import JournalEvenements
 
 
 class EventsState:
@@ -22,6 +23,14 @@ class EventsState:
         """Initialise un état vide d'événements."""
         # Structure : Dict[jour, List[Event]]
         self._events: Dict[int, List[Event]] = {}
+        # Journal colonnaire des événements graves générés par lots
+        self.journal_graves = JournalEvenements()
+
+    def __setstate__(self, state: Dict) -> None:
+        """Restaure un état picklé ; journal vide pour les états antérieurs au journal colonnaire."""
+        self.__dict__.update(state)
+        if "journal_graves" not in state:
+            self.journal_graves = JournalEvenements()
     
     def add_event(self, event: Event) -> None:
         """
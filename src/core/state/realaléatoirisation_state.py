@@ -121,13 +121,45 @@ class RealaléatoirisationState:
             self._by_arr.setdefault(p.arrondissement, []).append(p)
         for arr in self._by_arr:
             self._by_arr[arr].sort(key=lambda x: x.jour_debut)
+        self._arr_cache: Dict[str, int] = {}
+        self._compiler_tables()
+
+    def _compiler_tables(self) -> None:
+        """
+        Compile les patterns en tables denses jours × arrondissements (α_eff, r_eff, atténuation).
+
+        Couvre les jours 0..max(jour_fin) ; au-delà aucun pattern n'est actif.
+        Accumulation dans l'ordre des patterns (tri par jour_debut), comme le parcours
+        de get_alpha_and_r : les valeurs sont identiques à un calcul pattern par pattern.
+        """
+        nb_jours = max((p.jour_fin() + 1 for p in self.patterns), default=0)
+        nb_arr = max([20, *self._by_arr.keys(), *self.microzone_to_arrondissement.values()]) + 1
+        somme_alpha = np.zeros((nb_jours, nb_arr), dtype=np.float64)
+        somme_r_alpha = np.zeros((nb_jours, nb_arr), dtype=np.float64)
+        for arr, patterns_arr in self._by_arr.items():
+            for p in patterns_arr:
+                jours = range(max(0, p.jour_debut), p.jour_fin() + 1)
+                alphas = np.array([p.alpha_at_day(j) for j in jours], dtype=np.float64)
+                somme_alpha[jours.start:jours.stop, arr] += alphas
+                somme_r_alpha[jours.start:jours.stop, arr] += p.taux_reduction_r * alphas
+        actif = somme_alpha > 0
+        self.table_alpha = np.where(actif, np.minimum(1.0, somme_alpha), 0.0)
+        self.table_r = np.divide(somme_r_alpha, somme_alpha, out=np.zeros_like(somme_r_alpha), where=actif)
+        self.table_dampening = 1.0 - self.table_r * self.table_alpha
 
     def get_arrondissement(self, microzone_id: str) -> int:
         """Retourne l'arrondissement (1..20) pour une microzone."""
-        return self.microzone_to_arrondissement.get(
-            microzone_id,
-            _parse_arrondissement_from_microzone_id(microzone_id),
-        )
+        arr = self._arr_cache.get(microzone_id)
+        if arr is None:
+            arr = self.microzone_to_arrondissement.get(
+                microzone_id,
+                _parse_arrondissement_from_microzone_id(microzone_id),
+            )
+            self._arr_cache[microzone_id] = arr
+        return arr
+
+    def _dans_table(self, jour: int, arr: int) -> bool:
+        return 0 <= jour < self.table_alpha.shape[0] and 0 <= arr < self.table_alpha.shape[1]
 
     def get_alpha_and_r(
         self,
@@ -139,25 +171,26 @@ class RealaléatoirisationState:
         En cas de plusieurs patterns actifs : α_eff = min(1, Σ αᵢ), r_eff = moyenne pondérée par α.
         """
         arr = self.get_arrondissement(microzone_id)
-        patterns_arr = self._by_arr.get(arr, [])
-        active = [p for p in patterns_arr if p.jour_debut <= jour <= p.jour_fin()]
-        if not active:
-            return 0.0, 0.0
-        alphas = [p.alpha_at_day(jour) for p in active]
-        rs = [p.taux_reduction_r for p in active]
-        alpha_eff = min(1.0, sum(alphas))
-        if alpha_eff <= 0:
+        if not self._dans_table(jour, arr):
             return 0.0, 0.0
-        r_eff = sum(r * a for r, a in zip(rs, alphas)) / sum(alphas)
-        return alpha_eff, r_eff
+        return float(self.table_alpha[jour, arr]), float(self.table_r[jour, arr])
 
     def get_matrix_dampening(self, jour: int, microzone_id: str) -> float:
         """
         Facteur d'atténuation des matrices : (1 - r·α).
         Pour chaque facteur matriciel F : F' = 1 + (F - 1) * dampening.
         """
-        alpha_eff, r_eff = self.get_alpha_and_r(jour, microzone_id)
-        return 1.0 - r_eff * alpha_eff
+        arr = self.get_arrondissement(microzone_id)
+        if not self._dans_table(jour, arr):
+            return 1.0
+        return float(self.table_dampening[jour, arr])
+
+    def dampening_jour(self, jour: int, microzone_ids: List[str]) -> np.ndarray:
+        """Atténuations du jour pour une liste de microzones (N,), dans l'ordre de microzone_ids."""
+        if not 0 <= jour < self.table_dampening.shape[0]:
+            return np.ones(len(microzone_ids), dtype=np.float64)
+        arrs = np.array([self.get_arrondissement(mz) for mz in microzone_ids], dtype=np.int64)
+        return self.table_dampening[jour, arrs]
 
     def to_dict(self) -> Dict[str, Any]:
         """Sérialisation pour état de simulation."""
@@ -0,0 +1,107 @@
+"""
+Écriture asynchrone des sorties de simulation (pickles, traces).
+
+EcrivainAsynchrone exécute les tâches d'écriture sur un thread dédié, alimenté par une
+file bornée : la simulation du run suivant démarre pendant que le précédent est sérialisé
+et écrit (disque lent, système de fichiers réseau). Quand la file est pleine, soumettre()
+bloque (contre-pression : au plus taille_file états en attente en mémoire). fermer() —
+appelé en sortie de bloc `with` et, à défaut, à la sortie de l'interpréteur — attend la
+fin de toutes les écritures.
+
+La sérialisation pickle garde le GIL : le recouvrement porte surtout sur les écritures
+disque. Une tâche ne doit pas lire d'objet encore modifié par la simulation.
+"""
+
+import atexit
+import logging
+import queue
+import threading
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class EcrivainAsynchrone:
+    """
+    Thread d'écriture avec file bornée et vidage garanti à la fermeture.
+
+    Une exception levée par une tâche n'arrête pas les tâches suivantes ; la première est
+    relevée au prochain soumettre(), vider() ou fermer().
+    """
+
+    def __init__(self, taille_file: int = 2, nom: str = "ecrivain-sorties"):
+        """
+        Args:
+            taille_file: Nombre maximal de tâches en attente
+            nom: Nom du thread
+
+        Raises:
+            ValueError: Si taille_file < 1
+        """
+        if taille_file < 1:
+            raise ValueError("taille_file doit être ≥ 1")
+        self._file: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=taille_file)
+        self._erreur: Optional[BaseException] = None
+        self._ferme = False
+        self._thread = threading.Thread(target=self._boucle, name=nom, daemon=True)
+        self._thread.start()
+        atexit.register(self.fermer)
+
+    def soumettre(self, tache: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+        """
+        Ajoute une tâche d'écriture ; bloque tant que la file est pleine.
+
+        Raises:
+            RuntimeError: Si l'écrivain est fermé
+            Exception: Première erreur d'une tâche précédente
+        """
+        if self._ferme:
+            raise RuntimeError("EcrivainAsynchrone fermé")
+        self._lever_erreur()
+        self._file.put((tache, args, kwargs))
+
+    def vider(self) -> None:
+        """Attend la fin des tâches soumises ; relève la première erreur."""
+        self._file.join()
+        self._lever_erreur()
+
+    def fermer(self) -> None:
+        """Termine les tâches en attente puis arrête le thread (idempotent) ; relève la première erreur."""
+        if not self._ferme:
+            self._ferme = True
+            atexit.unregister(self.fermer)
+            self._file.put(None)
+            self._thread.join()
+        self._lever_erreur()
+
+    def __enter__(self) -> "EcrivainAsynchrone":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.fermer()
+            return
+        # Exception déjà en cours : écritures terminées, erreur d'écriture seulement journalisée
+        try:
+            self.fermer()
+        except Exception as e:
+            logger.error("Erreur d'écriture asynchrone : %s", e)
+
+    def _boucle(self) -> None:
+        while True:
+            element = self._file.get()
+            try:
+                if element is None:
+                    return
+                tache, args, kwargs = element
+                tache(*args, **kwargs)
+            except BaseException as e:
+                if self._erreur is None:
+                    self._erreur = e
+            finally:
+                self._file.task_done()
+
+    def _lever_erreur(self) -> None:
+        if self._erreur is not None:
+            erreur, self._erreur = self._erreur, None
+            raise erreur
@@ -0,0 +1,219 @@
+"""
+Statistiques en ligne, sans conserver les observations et fusionnables entre processus :
+moyenne et variance (Welford, fusion de Chan et al.), quantiles (P²).
+"""
+
+from typing import Optional, Sequence, Union
+
+import numpy as np
+from scipy import stats
+
+Valeurs = Union[float, np.ndarray]
+
+
+class AccumulateurWelford:
+    """
+    Moyenne et variance d'une grandeur scalaire ou vectorielle (toutes les observations ont la
+    même forme ; calculs composante par composante).
+    """
+
+    def __init__(self, forme: Optional[tuple] = None):
+        """
+        Args:
+            forme: Forme des observations (défaut : fixée par la première observation)
+        """
+        self.n = 0
+        self._moyenne = None if forme is None else np.zeros(forme)
+        self._m2 = None if forme is None else np.zeros(forme)
+
+    def ajouter(self, x: Valeurs) -> None:
+        """Ajoute une observation."""
+        x = np.asarray(x, dtype=float)
+        if self._moyenne is None:
+            self._moyenne = np.zeros(x.shape)
+            self._m2 = np.zeros(x.shape)
+        elif x.shape != self._moyenne.shape:
+            raise ValueError(f"Forme {x.shape} incompatible avec l'accumulateur {self._moyenne.shape}")
+        self.n += 1
+        delta = x - self._moyenne
+        self._moyenne = self._moyenne + delta / self.n
+        self._m2 = self._m2 + delta * (x - self._moyenne)
+
+    def fusionner(self, autre: "AccumulateurWelford") -> None:
+        """Ajoute les observations résumées par un autre accumulateur (ex. autre worker)."""
+        if autre.n == 0:
+            return
+        if self.n == 0:
+            self.n, self._moyenne, self._m2 = autre.n, autre._moyenne.copy(), autre._m2.copy()
+            return
+        if autre._moyenne.shape != self._moyenne.shape:
+            raise ValueError(f"Forme {autre._moyenne.shape} incompatible avec l'accumulateur {self._moyenne.shape}")
+        n = self.n + autre.n
+        delta = autre._moyenne - self._moyenne
+        self._moyenne = self._moyenne + delta * autre.n / n
+        self._m2 = self._m2 + autre._m2 + delta ** 2 * self.n * autre.n / n
+        self.n = n
+
+    @property
+    def moyenne(self) -> Valeurs:
+        if self.n == 0:
+            raise ValueError("Accumulateur vide")
+        return self._moyenne.copy()
+
+    @property
+    def variance(self) -> Valeurs:
+        """Variance sans biais (ddof=1) ; NaN avec moins de deux observations."""
+        if self.n < 2:
+            return np.full(np.shape(self._moyenne), np.nan)
+        return self._m2 / (self.n - 1)
+
+    @property
+    def ecart_type(self) -> Valeurs:
+        return np.sqrt(self.variance)
+
+    def demi_largeur_ic(self, confiance: float = 0.95) -> Valeurs:
+        """Demi-largeur de l'intervalle de confiance de la moyenne (loi de Student, n-1 ddl)."""
+        if self.n < 2:
+            return np.full(np.shape(self._moyenne), np.inf)
+        t = stats.t.ppf(0.5 + confiance / 2.0, self.n - 1)
+        return t * self.ecart_type / np.sqrt(self.n)
+
+
+class EstimateurQuantilesP2:
+    """
+    Quantiles estimés en ligne par l'algorithme P² (Jain & Chlamtac, 1985) : cinq marqueurs par
+    quantile et par composante, mémoire indépendante du nombre d'observations. Les cinq premières
+    observations sont conservées telles quelles (quantiles exacts jusque-là).
+    """
+
+    def __init__(self, probabilites: Sequence[float] = (0.05, 0.5, 0.95)):
+        p = np.asarray(probabilites, dtype=float)
+        if p.ndim != 1 or p.size == 0 or np.any((p <= 0) | (p >= 1)):
+            raise ValueError("Les probabilités doivent être dans ]0, 1[")
+        self.probabilites = p
+        self.n = 0
+        # Fractions des positions désirées des marqueurs : 0, p/2, p, (1+p)/2, 1
+        self._fractions = np.stack([np.zeros_like(p), p / 2, p, (1 + p) / 2, np.ones_like(p)], axis=-1)
+        self._hauteurs: Optional[np.ndarray] = None  # (Q, *forme, 5)
+        self._positions: Optional[np.ndarray] = None  # (Q, *forme, 5), 1-indexées
+
+    def _desirees(self, n: int, ndim: int) -> np.ndarray:
+        f = self._fractions.reshape((len(self.probabilites),) + (1,) * ndim + (5,))
+        return 1.0 + (n - 1) * f
+
+    def ajouter(self, x: Valeurs) -> None:
+        """Ajoute une observation (même forme pour toutes)."""
+        x = np.asarray(x, dtype=float)
+        nq = len(self.probabilites)
+        if self._hauteurs is None:
+            self._hauteurs = np.zeros((nq,) + x.shape + (5,))
+            self._positions = np.broadcast_to(np.arange(1.0, 6.0), self._hauteurs.shape).copy()
+        elif x.shape != self._hauteurs.shape[1:-1]:
+            raise ValueError(f"Forme {x.shape} incompatible avec l'estimateur {self._hauteurs.shape[1:-1]}")
+        q, pos = self._hauteurs, self._positions
+        if self.n < 5:
+            q[..., self.n] = x
+            self.n += 1
+            if self.n == 5:
+                q.sort(axis=-1)
+            return
+
+        self.n += 1
+        x = np.broadcast_to(x, q.shape[:-1])
+        q[..., 0] = np.minimum(q[..., 0], x)
+        q[..., 4] = np.maximum(q[..., 4], x)
+        # Marqueurs au-dessus de l'observation décalés d'une position (le maximum toujours)
+        pos[..., 1:4] += x[..., None] < q[..., 1:4]
+        pos[..., 4] += 1
+        desirees = self._desirees(self.n, x.ndim - 1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for i in (1, 2, 3):
+                d = desirees[..., i] - pos[..., i]
+                ecart_haut = pos[..., i + 1] - pos[..., i]
+                ecart_bas = pos[..., i - 1] - pos[..., i]
+                ajuster = ((d >= 1) & (ecart_haut > 1)) | ((d <= -1) & (ecart_bas < -1))
+                if not ajuster.any():
+                    continue
+                s = np.sign(d)
+                qi, qh, qb = q[..., i], q[..., i + 1], q[..., i - 1]
+                parabolique = qi + s / (pos[..., i + 1] - pos[..., i - 1]) * (
+                    (pos[..., i] - pos[..., i - 1] + s) * (qh - qi) / ecart_haut
+                    + (ecart_haut - s) * (qi - qb) / -ecart_bas
+                )
+                voisin = np.where(s > 0, qh, qb)
+                ecart_voisin = np.where(s > 0, ecart_haut, ecart_bas)
+                lineaire = qi + s * (voisin - qi) / ecart_voisin
+                nouveau = np.where((qb < parabolique) & (parabolique < qh), parabolique, lineaire)
+                q[..., i] = np.where(ajuster, nouveau, qi)
+                pos[..., i] += np.where(ajuster, s, 0.0)
+
+    def _observations(self) -> np.ndarray:
+        """Observations conservées (n < 5) : (*forme, n)."""
+        return self._hauteurs[0, ..., : self.n]
+
+    def fusionner(self, autre: "EstimateurQuantilesP2") -> None:
+        """
+        Ajoute les observations résumées par un autre estimateur (ex. autre worker).
+
+        Exact si l'un des deux a moins de cinq observations (elles sont rejouées) ; sinon les
+        marqueurs sont recalculés sur le mélange des deux fonctions de répartition
+        (interpolation linéaire entre marqueurs), ce qui reste une approximation.
+        """
+        if not np.array_equal(self.probabilites, autre.probabilites):
+            raise ValueError("Probabilités différentes : estimateurs non fusionnables")
+        if autre.n == 0:
+            return
+        if autre.n < 5:
+            for k in range(autre.n):
+                self.ajouter(autre._observations()[..., k])
+            return
+        if self.n < 5:
+            observations = self._observations().copy() if self.n else None
+            n = self.n
+            self.n, self._hauteurs, self._positions = autre.n, autre._hauteurs.copy(), autre._positions.copy()
+            for k in range(n):
+                self.ajouter(observations[..., k])
+            return
+        if autre._hauteurs.shape != self._hauteurs.shape:
+            raise ValueError(f"Forme {autre._hauteurs.shape} incompatible avec l'estimateur {self._hauteurs.shape}")
+
+        forme = self._hauteurs.shape
+        qa, qb = self._hauteurs.reshape(-1, 5), autre._hauteurs.reshape(-1, 5)
+        fa = (self._positions.reshape(-1, 5) - 1) / (self.n - 1)
+        fb = (autre._positions.reshape(-1, 5) - 1) / (autre.n - 1)
+        n = self.n + autre.n
+        points = np.sort(np.concatenate([qa, qb], axis=1), axis=1)
+        repartition = (self.n * _interp_lignes(points, qa, fa) + autre.n * _interp_lignes(points, qb, fb)) / n
+        desirees = self._desirees(n, len(forme) - 2)
+        cibles = np.broadcast_to((desirees - 1) / (n - 1), forme).reshape(-1, 5)
+        hauteurs = _interp_lignes(cibles, repartition, points)
+        hauteurs[:, 0] = np.minimum(qa[:, 0], qb[:, 0])
+        hauteurs[:, 4] = np.maximum(qa[:, 4], qb[:, 4])
+        # Positions entières, strictement croissantes, de 1 à n
+        rang = np.arange(5.0)
+        positions = np.clip(np.round(np.broadcast_to(desirees, forme).reshape(-1, 5)), 1 + rang, n - 4 + rang)
+        positions = np.maximum.accumulate(positions - rang, axis=1) + rang
+        self.n = n
+        self._hauteurs = hauteurs.reshape(forme)
+        self._positions = positions.reshape(forme)
+
+    def quantiles(self) -> np.ndarray:
+        """Quantiles estimés : (Q, *forme) ; exacts (interpolation linéaire) tant que n ≤ 5."""
+        if self.n == 0:
+            raise ValueError("Estimateur vide")
+        if self.n <= 5:
+            return np.quantile(self._observations(), self.probabilites, axis=-1)
+        return self._hauteurs[..., 2].copy()
+
+
+def _interp_lignes(x: np.ndarray, xp: np.ndarray, fp: np.ndarray) -> np.ndarray:
+    """np.interp ligne par ligne : x (R, K), xp croissant (R, P), fp (R, P)."""
+    indice = (x[:, :, None] >= xp[:, None, :]).sum(axis=-1)
+    gauche = np.clip(indice - 1, 0, xp.shape[1] - 2)
+    xg, xd = np.take_along_axis(xp, gauche, 1), np.take_along_axis(xp, gauche + 1, 1)
+    fg, fd = np.take_along_axis(fp, gauche, 1), np.take_along_axis(fp, gauche + 1, 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        poids = np.clip(np.where(xd > xg, (x - xg) / (xd - xg), 1.0), 0.0, 1.0)
+    out = fg + poids * (fd - fg)
+    out = np.where(x < xp[:, :1], fp[:, :1], out)
+    return np.where(x >= xp[:, -1:], fp[:, -1:], out)
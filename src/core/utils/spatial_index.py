@@ -0,0 +1,139 @@
+"""
+Index spatial des microzones (STRtree shapely).
+
+Remplace les boucles « chaque point × chaque polygone » par un arbre R
+(STRtree) construit une seule fois sur les géométries des microzones :
+- assignation point → microzone en O(log N) par point ;
+- requêtes groupées sur des tableaux de points (un seul appel shapely) ;
+- préfiltre sur l'emprise globale (bbox) : les points hors de Paris sont
+  écartés sans interroger l'arbre.
+
+Utilisé par les pré-calculs (scripts/precompute_distances.py) et disponible
+pour toute recherche point → microzone à l'exécution (UI).
+"""
+
+from typing import List, Optional, Sequence
+
+import numpy as np
+import shapely
+from shapely.geometry.base import BaseGeometry
+
+
+class MicrozoneSpatialIndex:
+    """
+    Index STRtree sur les géométries d'un GeoDataFrame de microzones.
+
+    En cas de point situé sur une frontière (plusieurs microzones candidates),
+    query/find retiennent la microzone de plus petit rang dans le GeoDataFrame,
+    comme l'ancienne boucle iterrows de find_microzone_for_point (premier trouvé).
+    Pour la dernière correspondance, prendre le dernier élément d'intersecting().
+    """
+
+    def __init__(self, microzones, id_column: str = "microzone_id"):
+        """
+        Args:
+            microzones: GeoDataFrame des microzones (colonne geometry + id_column)
+            id_column: Nom de la colonne identifiant (défaut: microzone_id)
+        """
+        if id_column not in microzones.columns:
+            raise KeyError(f"Colonne identifiant absente des microzones: {id_column}")
+
+        self.id_column = id_column
+        self.crs = microzones.crs
+        self._geometries = np.asarray(microzones.geometry.values, dtype=object)
+        self._ids = np.asarray(microzones[id_column].values, dtype=object)
+        self._tree = shapely.STRtree(self._geometries)
+        self._bounds = tuple(float(v) for v in microzones.total_bounds)
+
+        # Arbre secondaire sur les centroïdes pour le repli « plus proche »
+        centroids = shapely.centroid(self._geometries)
+        self._centroid_tree = shapely.STRtree(centroids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def microzone_ids(self) -> List[str]:
+        """Identifiants des microzones dans l'ordre du GeoDataFrame source."""
+        return self._ids.tolist()
+
+    @property
+    def bounds(self):
+        """Emprise globale (minx, miny, maxx, maxy) des microzones."""
+        return self._bounds
+
+    def _bbox_mask(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        minx, miny, maxx, maxy = self._bounds
+        return (xs >= minx) & (xs <= maxx) & (ys >= miny) & (ys <= maxy)
+
+    def query_indices(self, xs: Sequence[float], ys: Sequence[float]) -> np.ndarray:
+        """
+        Rang (dans le GeoDataFrame) de la microzone contenant chaque point.
+
+        Args:
+            xs, ys: Coordonnées des points (même CRS que les microzones)
+
+        Returns:
+            Tableau int64 de longueur len(xs), -1 si aucun polygone ne contient le point
+        """
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float)
+        result = np.full(xs.shape[0], -1, dtype=np.int64)
+        if xs.shape[0] == 0 or len(self._ids) == 0:
+            return result
+
+        candidates = np.flatnonzero(self._bbox_mask(xs, ys))
+        if candidates.size == 0:
+            return result
+
+        points = shapely.points(xs[candidates], ys[candidates])
+        input_idx, tree_idx = self._tree.query(points, predicate="intersects")
+        if input_idx.size == 0:
+            return result
+
+        # Plusieurs candidats possibles (frontières) : garder le plus petit rang
+        order = np.lexsort((tree_idx, input_idx))
+        input_idx, tree_idx = input_idx[order], tree_idx[order]
+        _, first = np.unique(input_idx, return_index=True)
+        result[candidates[input_idx[first]]] = tree_idx[first]
+        return result
+
+    def query(self, xs: Sequence[float], ys: Sequence[float]) -> np.ndarray:
+        """
+        Identifiant de la microzone contenant chaque point (requête groupée).
+
+        Returns:
+            Tableau object de longueur len(xs), None si le point est hors microzones
+        """
+        idx = self.query_indices(xs, ys)
+        ids = np.full(idx.shape[0], None, dtype=object)
+        found = idx >= 0
+        ids[found] = self._ids[idx[found]]
+        return ids
+
+    def query_points(self, points: Sequence[BaseGeometry]) -> np.ndarray:
+        """Variante de query() prenant des géométries Point shapely."""
+        coords = shapely.get_coordinates(np.asarray(points, dtype=object))
+        if coords.shape[0] == 0:
+            return np.full(0, None, dtype=object)
+        return self.query(coords[:, 0], coords[:, 1])
+
+    def find(self, point: BaseGeometry) -> Optional[str]:
+        """Microzone contenant un point, None si hors microzones."""
+        return self.query([point.x], [point.y])[0]
+
+    def intersecting(self, geometry: BaseGeometry) -> List[str]:
+        """
+        Microzones intersectant une géométrie (ex: segment caserne → microzone).
+
+        Returns:
+            Identifiants dans l'ordre du GeoDataFrame source
+        """
+        tree_idx = np.sort(self._tree.query(geometry, predicate="intersects"))
+        return self._ids[tree_idx].tolist()
+
+    def nearest_centroid(self, point: BaseGeometry) -> Optional[str]:
+        """Microzone dont le centroïde est le plus proche du point."""
+        if len(self._ids) == 0:
+            return None
+        return self._ids[int(self._centroid_tree.nearest(point))]
@@ -0,0 +1,213 @@
+"""
+Construction du voisinage des microzones (matrices_voisin).
+
+Remplace la boucle O(N²) sur les centroïdes par des structures spatiales :
+- mode "knn"       : k plus proches centroïdes (scipy cKDTree) ;
+- mode "rayon"     : tous les centroïdes à moins d'un rayon donné (cKDTree) ;
+- mode "adjacence" : polygones qui se touchent ou se chevauchent (STRtree).
+
+Le résultat est un graphe CSR (indptr, indices, distances, poids) qui peut être
+converti dans la structure historique matrices_voisin :
+Dict[microzone_id] = {'voisins', 'poids_influence', 'distances', 'seuil_activation'}.
+
+Les distances sont exprimées dans le CRS des géométries (comme l'ancienne boucle).
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import shapely
+from scipy.spatial import cKDTree
+
+MODES_VOISINAGE = ("knn", "rayon", "adjacence")
+
+# Seuil d'activation de l'effet d'augmentation (>5 incidents dans les voisins)
+SEUIL_ACTIVATION_DEFAUT = 5
+
+# Décalage ajouté aux distances avant inversion (évite la division par 0)
+EPSILON_DISTANCE = 0.001
+
+
+@dataclass
+class VoisinageCSR:
+    """Graphe de voisinage au format CSR (ligne i = voisins de microzone_ids[i])."""
+
+    microzone_ids: List[str]
+    indptr: np.ndarray     # int64, taille N+1
+    indices: np.ndarray    # int64, rang des voisins (tri par distance croissante)
+    distances: np.ndarray  # float64, distance centroïde → centroïde
+    poids: np.ndarray      # float64, poids d'influence normalisés par ligne
+    mode: str = "knn"
+
+    def __len__(self) -> int:
+        return len(self.microzone_ids)
+
+    @property
+    def nnz(self) -> int:
+        return int(self.indices.shape[0])
+
+    def voisins(self, i: int) -> np.ndarray:
+        """Rangs des voisins de la microzone de rang i."""
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def to_matrices_voisin(self, seuil_activation: int = SEUIL_ACTIVATION_DEFAUT) -> Dict[str, Dict[str, Any]]:
+        """Structure historique matrices_voisin (Dict[microzone_id] = {...})."""
+        ids = np.asarray(self.microzone_ids, dtype=object)
+        matrices = {}
+        for i, mz_id in enumerate(self.microzone_ids):
+            debut, fin = self.indptr[i], self.indptr[i + 1]
+            matrices[mz_id] = {
+                'voisins': ids[self.indices[debut:fin]].tolist(),
+                'poids_influence': self.poids[debut:fin].tolist(),
+                'distances': self.distances[debut:fin].tolist(),
+                'seuil_activation': seuil_activation,
+            }
+        return matrices
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Forme sérialisable (pickle) des tableaux CSR."""
+        return {
+            'microzone_ids': list(self.microzone_ids),
+            'indptr': self.indptr,
+            'indices': self.indices,
+            'distances': self.distances,
+            'poids': self.poids,
+            'mode': self.mode,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "VoisinageCSR":
+        return cls(
+            microzone_ids=list(data['microzone_ids']),
+            indptr=np.asarray(data['indptr'], dtype=np.int64),
+            indices=np.asarray(data['indices'], dtype=np.int64),
+            distances=np.asarray(data['distances'], dtype=np.float64),
+            poids=np.asarray(data['poids'], dtype=np.float64),
+            mode=data.get('mode', 'knn'),
+        )
+
+
+def _poids_inverse_distance(indptr: np.ndarray, distances: np.ndarray) -> np.ndarray:
+    """Poids 1/(d+ε) normalisés par ligne (somme = 1 pour chaque microzone avec voisins)."""
+    poids = 1.0 / (distances + EPSILON_DISTANCE)
+    longueurs = np.diff(indptr)
+    lignes = np.repeat(np.arange(longueurs.shape[0]), longueurs)
+    sommes = np.bincount(lignes, weights=poids, minlength=longueurs.shape[0])
+    return poids / sommes[lignes] if poids.size else poids
+
+
+def _csr_depuis_paires(
+    n: int,
+    sources: np.ndarray,
+    cibles: np.ndarray,
+    distances: np.ndarray,
+) -> tuple:
+    """Trie les paires (source, distance, cible) et construit indptr/indices/distances."""
+    ordre = np.lexsort((cibles, distances, sources))
+    sources, cibles, distances = sources[ordre], cibles[ordre], distances[ordre]
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=n), out=indptr[1:])
+    return indptr, cibles.astype(np.int64), distances.astype(np.float64)
+
+
+def _centroides(geometries) -> np.ndarray:
+    return shapely.get_coordinates(shapely.centroid(np.asarray(geometries, dtype=object)))
+
+
+def construire_voisinage(
+    microzones,
+    mode: str = "knn",
+    k: int = 8,
+    rayon: Optional[float] = None,
+    id_column: str = "microzone_id",
+) -> VoisinageCSR:
+    """
+    Construit le graphe de voisinage des microzones.
+
+    Args:
+        microzones: GeoDataFrame (geometry + id_column)
+        mode: "knn", "rayon" ou "adjacence"
+        k: Nombre de voisins (mode knn)
+        rayon: Distance maximale entre centroïdes (mode rayon, unités du CRS)
+        id_column: Colonne identifiant des microzones
+
+    Returns:
+        VoisinageCSR, voisins triés par distance croissante (puis par rang)
+
+    Raises:
+        ValueError: Si le mode est inconnu ou si ses paramètres sont invalides
+    """
+    if mode not in MODES_VOISINAGE:
+        raise ValueError(f"Mode de voisinage inconnu: {mode} (attendu: {', '.join(MODES_VOISINAGE)})")
+
+    ids = [str(v) for v in microzones[id_column].tolist()]
+    n = len(ids)
+    geometries = microzones.geometry.values
+    coords = _centroides(geometries) if n else np.zeros((0, 2))
+
+    if mode == "knn":
+        if k < 1:
+            raise ValueError(f"k doit être >= 1 (reçu: {k})")
+        # k + 1 (la microzone elle-même) + 1 pour détecter les ex-aequo à la coupure
+        kq = min(k + 2, n)
+        if n <= 1:
+            sources = cibles = np.zeros(0, dtype=np.int64)
+            distances = np.zeros(0)
+        else:
+            arbre = cKDTree(coords)
+            dist, idx = arbre.query(coords, k=kq)
+            sources = np.repeat(np.arange(n), kq)
+            cibles, distances = idx.ravel(), dist.ravel()
+            if kq == k + 2:
+                # Ex-aequo à la coupure : la requête tranche arbitrairement ; on reprend
+                # ces lignes par rayon pour départager par rang (tri stable historique)
+                ambigus = np.flatnonzero(dist[:, -1] == dist[:, -2])
+                if ambigus.size:
+                    boules = arbre.query_ball_point(coords[ambigus], r=dist[ambigus, -1] * (1 + 1e-12))
+                    garder = ~np.isin(sources, ambigus)
+                    extra_sources = np.repeat(ambigus, [len(b) for b in boules])
+                    extra_cibles = np.concatenate([np.asarray(b, dtype=np.int64) for b in boules])
+                    sources = np.concatenate([sources[garder], extra_sources])
+                    cibles = np.concatenate([cibles[garder], extra_cibles])
+                    distances = np.concatenate([
+                        distances[garder],
+                        np.linalg.norm(coords[extra_sources] - coords[extra_cibles], axis=1),
+                    ])
+            garder = cibles != sources
+            sources, cibles, distances = sources[garder], cibles[garder], distances[garder]
+            # Tronquer chaque ligne (triée par distance puis rang) à k voisins
+            indptr, cibles, distances = _csr_depuis_paires(n, sources, cibles, distances)
+            sources = np.repeat(np.arange(n), np.diff(indptr))
+            rang = np.arange(cibles.shape[0]) - indptr[sources]
+            garder = rang < k
+            sources, cibles, distances = sources[garder], cibles[garder], distances[garder]
+
+    elif mode == "rayon":
+        if rayon is None or rayon <= 0:
+            raise ValueError(f"rayon doit être > 0 en mode rayon (reçu: {rayon})")
+        paires = cKDTree(coords).query_pairs(r=rayon, output_type="ndarray") if n else np.zeros((0, 2), dtype=np.int64)
+        sources = np.concatenate([paires[:, 0], paires[:, 1]])
+        cibles = np.concatenate([paires[:, 1], paires[:, 0]])
+        distances = np.linalg.norm(coords[sources] - coords[cibles], axis=1)
+
+    else:  # adjacence
+        if n:
+            sources, cibles = shapely.STRtree(geometries).query(geometries, predicate="intersects")
+            garder = sources != cibles
+            sources, cibles = sources[garder], cibles[garder]
+        else:
+            sources = cibles = np.zeros(0, dtype=np.int64)
+        distances = np.linalg.norm(coords[sources] - coords[cibles], axis=1)
+
+    indptr, indices, distances = _csr_depuis_paires(
+        n, np.asarray(sources, dtype=np.int64), np.asarray(cibles, dtype=np.int64), np.asarray(distances, dtype=np.float64)
+    )
+    return VoisinageCSR(
+        microzone_ids=ids,
+        indptr=indptr,
+        indices=indices,
+        distances=distances,
+        poids=_poids_inverse_distance(indptr, distances),
+        mode=mode,
+    )
@@ -0,0 +1,318 @@
+"""
+Campagne Monte-Carlo adaptative : runs lancés par lots jusqu'à convergence des métriques cibles.
+
+Chaque cible fixe une précision relative (demi-largeur de l'IC de la moyenne / |moyenne|). Après
+chaque lot, les statistiques des runs alimentent des accumulateurs de Welford (aucune relecture
+des runs) ; la campagne s'arrête quand toutes les cibles ont convergé ou quand le budget de runs
+est atteint.
+
+Sorties dans le dossier de la campagne (en plus des run_XXX) :
+  - trajectoire_convergence.csv : une ligne par (lot, cible) — runs, moyenne, précision atteinte
+  - convergence.json : paramètres, statut, estimations finales (moyenne, IC) par cible
+"""
+
+import json
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..core.config.config_validator import Config
+from ..core.data.constants import JOURS_PAR_MOIS
+from ..core.generation.shared_static_data import DonneesStatiques, publier_donnees_statiques
+from ..core.generation.variance_reduction import seed_du_run
+from ..core.utils.online_stats import AccumulateurWelford
+from .simulation_service import VARIABILITE_UI_TO_FLOAT, _get_microzone_ids
+from .sweep_service import (
+    _SCENARIO_CONFIG_TO_UI,
+    _ExecuteurBalayage,
+    _executer_tache_worker,
+    _init_worker_balayage,
+)
+
+logger = logging.getLogger(__name__)
+
+TRAJECTOIRE_FILENAME = "trajectoire_convergence.csv"
+CONVERGENCE_FILENAME = "convergence.json"
+
+
+def _par_arrondissement_mensuel(cle: str) -> Callable[[Dict[str, Any], int], np.ndarray]:
+    def metrique(resultat: Dict[str, Any], jours: int) -> np.ndarray:
+        valeurs = resultat["statistiques_arrondissement"][cle]
+        return np.array([valeurs[arr] for arr in sorted(valeurs)], dtype=float) * JOURS_PAR_MOIS / jours
+
+    return metrique
+
+
+def _scalaire(cle: str) -> Callable[[Dict[str, Any], int], np.ndarray]:
+    def metrique(resultat: Dict[str, Any], jours: int) -> np.ndarray:
+        return np.asarray(float(resultat["statistiques"][cle]))
+
+    return metrique
+
+
+# Métriques par run : (résultat du run, jours) → scalaire ou vecteur (un élément par arrondissement)
+METRIQUES: Dict[str, Callable[[Dict[str, Any], int], np.ndarray]] = {
+    "morts_base_evenements_mensuelles_arrondissement": _par_arrondissement_mensuel("morts_base_evenements"),
+    "incidents_graves_mensuels_arrondissement": _par_arrondissement_mensuel("incidents_graves"),
+    **{
+        cle: _scalaire(cle)
+        for cle in (
+            "incidents", "incidents_grave", "incidents_moyen", "incidents_benin",
+            "incidents_agression", "incidents_incendie", "incidents_accident", "incidents_par_jour",
+            "evenements_graves", "evenements_positifs", "morts_base_evenements",
+            "part_regime_stable", "part_regime_deterioration", "part_regime_crise",
+        )
+    },
+}
+
+
+@dataclass
+class CibleConvergence:
+    """
+    Métrique cible et précision voulue : convergée quand, pour chaque composante,
+    demi-largeur de l'IC ≤ precision_relative × |moyenne| ou ≤ tolerance_absolue.
+
+    Une composante de moyenne nulle (que des zéros, ex. arrondissement sans mort) n'a pas de
+    précision relative : elle ne converge que par tolerance_absolue > 0. Sans tolérance, une cible
+    d'événements rares continue donc jusqu'à observer ses premiers événements (ou le budget).
+    """
+
+    metrique: str
+    precision_relative: float = 0.05
+    tolerance_absolue: float = 0.0
+
+    def __post_init__(self):
+        if self.metrique not in METRIQUES:
+            raise ValueError(f"Métrique inconnue : {self.metrique} (disponibles : {sorted(METRIQUES)})")
+        if self.precision_relative <= 0 or self.tolerance_absolue < 0:
+            raise ValueError("precision_relative doit être > 0 et tolerance_absolue >= 0")
+
+    @classmethod
+    def depuis_texte(cls, spec: str) -> "CibleConvergence":
+        """Cible au format METRIQUE[:PRECISION[:TOLERANCE]] (option --cible)."""
+        metrique, *valeurs = spec.split(":")
+        if len(valeurs) > 2:
+            raise ValueError(f"Cible invalide : {spec} (METRIQUE[:PRECISION[:TOLERANCE]])")
+        return cls(metrique, *(float(v) for v in valeurs))
+
+
+def etat_convergence(acc: AccumulateurWelford, cible: CibleConvergence, confiance: float) -> Dict[str, Any]:
+    """
+    Précision atteinte par une cible.
+
+    Returns:
+        {"runs" (unités accumulées : runs ou paires antithétiques), "moyenne", "demi_largeur",
+        "precision_relative" (pire composante de moyenne non nulle), "composantes",
+        "composantes_convergees", "converge"}
+    """
+    moyenne = np.atleast_1d(acc.moyenne)
+    demi = np.atleast_1d(acc.demi_largeur_ic(confiance))
+    non_nulle = moyenne != 0
+    ok = (non_nulle & (demi <= cible.precision_relative * np.abs(moyenne))) | (
+        (cible.tolerance_absolue > 0) & (demi <= cible.tolerance_absolue)
+    )
+    relative = demi[non_nulle] / np.abs(moyenne[non_nulle])
+    return {
+        "runs": acc.n,
+        "moyenne": float(moyenne.mean()),
+        "demi_largeur": float(demi.max()),
+        "precision_relative": float(relative.max(initial=0.0)),
+        "composantes": int(moyenne.size),
+        "composantes_convergees": int(ok.sum()),
+        "converge": bool(ok.all()),
+    }
+
+
+def executer_campagne_adaptative(
+    config: Config,
+    cibles: List[CibleConvergence],
+    output_dir: Path,
+    scenario: str = "moyen",
+    variabilite: str = "Moyenne",
+    jours: int = 365,
+    taille_lot: int = 10,
+    runs_max: int = 200,
+    confiance: float = 0.95,
+    seed: Optional[int] = None,
+    workers: int = 1,
+    save_pickles: bool = False,
+    save_trace: bool = True,
+    verbose: bool = True,
+) -> Dict[str, Any]:
+    """
+    Lance des lots de runs jusqu'à convergence de toutes les cibles ou épuisement du budget.
+
+    Les runs d'un lot sont agrégés dans l'ordre des run_idx : le résultat ne dépend pas du nombre
+    de workers. Seed du run i : seed + i (seed par défaut de la config ; seed de la paire en mode
+    antithétique), comme en headless.
+
+    En mode antithétique (simulation.reduction_variance), les runs (2k, 2k+1) sont négativement
+    corrélés : l'unité accumulée est la moyenne de la paire (une paire incomplète est ignorée) et
+    les lots comme le budget doivent être pairs pour ne jamais séparer une paire.
+
+    Args:
+        config: Config validée
+        cibles: Métriques cibles et précisions
+        output_dir: Dossier de la campagne (run_XXX, trajectoire, convergence.json)
+        scenario: Clé de scénario (pessimiste, moyen, optimiste)
+        variabilite: Libellé de variabilité (Faible, Moyenne, Forte)
+        jours: Jours par run
+        taille_lot: Runs par lot (≥ 2 : l'IC demande au moins deux runs ; pair en mode antithétique)
+        runs_max: Budget total de runs (pair en mode antithétique)
+        confiance: Niveau de confiance de l'IC
+        seed: Seed de base
+        workers: Nombre de processus (1 = dans le processus courant)
+        save_pickles: Sauvegarder simulation_state.pkl par run
+        save_trace: Sauvegarder trace JSON par run
+        verbose: Logger la trajectoire
+
+    Returns:
+        Contenu de convergence.json : {"converge", "runs", "runs_echec", "lots", "cibles": {métrique: état}}
+    """
+    if not cibles:
+        raise ValueError("Au moins une cible de convergence est requise")
+    if scenario not in _SCENARIO_CONFIG_TO_UI or variabilite not in VARIABILITE_UI_TO_FLOAT:
+        raise ValueError(f"Scénario ou variabilité inconnu : {scenario}, {variabilite}")
+    if taille_lot < 2 or runs_max < taille_lot:
+        raise ValueError("taille_lot doit être >= 2 et runs_max >= taille_lot")
+    antithetique = config.simulation.reduction_variance == "antithetique"
+    if antithetique and (taille_lot % 2 or runs_max % 2):
+        raise ValueError("En mode antithetique, taille_lot et runs_max doivent être pairs (paires de runs)")
+    if not 0 < confiance < 1:
+        raise ValueError("confiance doit être dans ]0, 1[")
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    seed = config.simulation.seed_default if seed is None else seed
+    microzone_ids = _get_microzone_ids(config)
+    accumulateurs = {c.metrique: AccumulateurWelford() for c in cibles}
+    trajectoire: List[Dict[str, Any]] = []
+    etats: Dict[str, Dict[str, Any]] = {}
+    echecs: List[int] = []
+    lance = 0
+    lot = 0
+
+    with ExitStack() as pile:
+        if workers > 1:
+            descripteur = pile.enter_context(publier_donnees_statiques())
+            pool = pile.enter_context(ProcessPoolExecutor(
+                max_workers=min(workers, taille_lot),
+                initializer=_init_worker_balayage,
+                initargs=(config, microzone_ids, descripteur),
+            ))
+
+            def soumettre(taches: List[Dict[str, Any]]) -> list:
+                return [pool.submit(_executer_tache_worker, t) for t in taches]
+        else:
+            executeur = _ExecuteurBalayage(config, microzone_ids, DonneesStatiques.normaliser())
+
+            def soumettre(taches: List[Dict[str, Any]]) -> list:
+                return [_Immediat(executeur.executer, t) for t in taches]
+
+        converge = False
+        while not converge and lance < runs_max:
+            taches = [
+                {
+                    "surcharges": {},
+                    "scenario": scenario,
+                    "variabilite": variabilite,
+                    "jours": jours,
+                    "run_idx": i,
+                    "runs": runs_max,
+                    "seed": seed_du_run(seed, i, config.simulation.reduction_variance),
+                    "dossier": str(output_dir),
+                    "save_pickles": save_pickles,
+                    "save_trace": save_trace,
+                }
+                for i in range(lance, min(lance + taille_lot, runs_max))
+            ]
+            valeurs: Dict[int, Dict[str, np.ndarray]] = {}
+            for tache, future in zip(taches, soumettre(taches)):
+                try:
+                    resultat = future.result()
+                except Exception as e:
+                    logger.error("Run run_%03d en échec : %s", tache["run_idx"], e)
+                    echecs.append(tache["run_idx"])
+                    continue
+                valeurs[tache["run_idx"]] = {c.metrique: METRIQUES[c.metrique](resultat, jours) for c in cibles}
+            for i, observation in valeurs.items():
+                if antithetique:
+                    if i % 2 or i + 1 not in valeurs:
+                        continue
+                    observation = {m: (x + valeurs[i + 1][m]) / 2.0 for m, x in observation.items()}
+                for metrique, x in observation.items():
+                    accumulateurs[metrique].ajouter(x)
+            lance += len(taches)
+            lot += 1
+
+            if any(acc.n == 0 for acc in accumulateurs.values()):
+                continue
+            etats = {c.metrique: etat_convergence(accumulateurs[c.metrique], c, confiance) for c in cibles}
+            for cible in cibles:
+                trajectoire.append({"lot": lot, "runs_lances": lance, "metrique": cible.metrique, **etats[cible.metrique]})
+            converge = all(e["converge"] for e in etats.values())
+            if verbose:
+                logger.info(
+                    "Lot %s (%s runs) : %s",
+                    lot, lance,
+                    ", ".join(
+                        f"{m} ±{e['precision_relative']:.1%} ({e['composantes_convergees']}/{e['composantes']})"
+                        for m, e in etats.items()
+                    ),
+                )
+
+    pd.DataFrame(trajectoire).to_csv(output_dir / TRAJECTOIRE_FILENAME, index=False)
+    bilan = {
+        "converge": converge,
+        "runs": lance - len(echecs),
+        "runs_echec": echecs,
+        "lots": lot,
+        "parametres": {
+            "scenario": scenario,
+            "variabilite": variabilite,
+            "jours": jours,
+            "taille_lot": taille_lot,
+            "runs_max": runs_max,
+            "confiance": confiance,
+            "seed": seed,
+            "unite": "paire" if antithetique else "run",
+        },
+        "cibles": {
+            c.metrique: {
+                **asdict(c),
+                **etats.get(c.metrique, {}),
+                **(
+                    {
+                        "moyennes": np.atleast_1d(accumulateurs[c.metrique].moyenne).tolist(),
+                        "demi_largeurs": np.atleast_1d(accumulateurs[c.metrique].demi_largeur_ic(confiance)).tolist(),
+                    }
+                    if accumulateurs[c.metrique].n else {}
+                ),
+            }
+            for c in cibles
+        },
+    }
+    with open(output_dir / CONVERGENCE_FILENAME, "w", encoding="utf-8") as f:
+        json.dump(bilan, f, indent=2)
+    if verbose:
+        if converge:
+            logger.info("Convergence atteinte après %s runs", bilan["runs"])
+        else:
+            logger.warning("Budget de %s runs atteint sans convergence de toutes les cibles", runs_max)
+    return bilan
+
+
+class _Immediat:
+    """Exécution différée au premier .result(), pour traiter un lot séquentiel comme des futures."""
+
+    def __init__(self, fn: Callable, *args):
+        self._fn, self._args = fn, args
+
+    def result(self):
+        return self._fn(*self._args)
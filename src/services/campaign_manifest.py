@@ -0,0 +1,160 @@
+"""
+Manifeste de campagne headless : état vérifiable de chaque run (reprise après interruption).
+
+Un fichier JSON (manifest.json dans le dossier de sortie) liste, par run, le seed,
+l'empreinte de configuration, le statut, les sommes SHA-256 des fichiers produits et
+les temps d'exécution. Il est réécrit de façon atomique (fichier temporaire + os.replace)
+à chaque run terminé : une interruption laisse toujours un manifeste lisible. Les
+enregistrements sont sérialisés par un verrou (écritures depuis un thread d'écriture).
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+STATUT_TERMINE = "termine"
+STATUT_ECHEC = "echec"
+
+
+def empreinte_config(config_dict: Dict[str, Any], **parametres: Any) -> str:
+    """
+    Empreinte SHA-256 de la configuration et des paramètres d'une campagne
+    (jours, scénario, variabilité, fichiers demandés...).
+    """
+    contenu = json.dumps({"config": config_dict, "parametres": parametres}, sort_keys=True, default=str)
+    return hashlib.sha256(contenu.encode("utf-8")).hexdigest()
+
+
+def somme_fichier(path: Path) -> str:
+    """Somme SHA-256 d'un fichier (lecture par blocs de 1 Mo)."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for bloc in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloc)
+    return h.hexdigest()
+
+
+class ManifesteCampagne:
+    """
+    Manifeste JSON d'une campagne de runs headless.
+
+    Structure :
+    {
+        "version": 1,
+        "config_hash": str,
+        "runs": {
+            "run_000": {
+                "seed": int, "config_hash": str, "status": "termine" | "echec",
+                "fichiers": {"simulation_state.pkl": sha256, "trace.json": sha256},
+                "debut": iso8601, "fin": iso8601, "duree_s": float, "erreur": str (échec)
+            },
+            ...
+        }
+    }
+    """
+
+    def __init__(self, base: Path, config_hash: str, runs: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.base = Path(base)
+        self.path = self.base / MANIFEST_FILENAME
+        self.config_hash = config_hash
+        self.runs: Dict[str, Dict[str, Any]] = runs or {}
+        self._verrou = threading.Lock()
+
+    @classmethod
+    def ouvrir(cls, base: Path, config_hash: str, reprise: bool = False) -> "ManifesteCampagne":
+        """
+        Ouvre le manifeste d'une campagne.
+
+        Args:
+            base: Dossier de sortie des runs
+            config_hash: Empreinte de la campagne courante (empreinte_config)
+            reprise: Si True, relit le manifeste existant (entrées conservées, vérifiées par run_verifie) ;
+                sinon la campagne repart d'un manifeste vide
+
+        Returns:
+            ManifesteCampagne (écrit sur disque)
+        """
+        runs = None
+        path = Path(base) / MANIFEST_FILENAME
+        if reprise and path.exists():
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    runs = json.load(f).get("runs")
+            except (json.JSONDecodeError, OSError):
+                runs = None
+        manifeste = cls(base, config_hash, runs)
+        manifeste.sauvegarder()
+        return manifeste
+
+    def run_verifie(self, run_id: str, seed: int) -> bool:
+        """
+        True si le run est terminé avec la même configuration et le même seed, et que
+        tous ses fichiers existent avec la somme enregistrée.
+        """
+        entree = self.runs.get(run_id)
+        if (
+            entree is None
+            or entree.get("status") != STATUT_TERMINE
+            or entree.get("config_hash") != self.config_hash
+            or entree.get("seed") != seed
+        ):
+            return False
+        for nom, somme in entree.get("fichiers", {}).items():
+            path = self.base / run_id / nom
+            if not path.is_file() or somme_fichier(path) != somme:
+                return False
+        return True
+
+    def enregistrer_succes(self, run_id: str, resultat: Dict[str, Any]) -> None:
+        """Enregistre un run terminé (résultat de _run_one_headless_iteration) et réécrit le manifeste."""
+        with self._verrou:
+            self.runs[run_id] = {
+                "seed": resultat["seed"],
+                "config_hash": self.config_hash,
+                "status": STATUT_TERMINE,
+                "fichiers": resultat.get("fichiers", {}),
+                "debut": resultat.get("debut"),
+                "fin": resultat.get("fin"),
+                "duree_s": resultat.get("duree_s"),
+            }
+            self.sauvegarder()
+
+    def enregistrer_echec(self, run_id: str, seed: int, erreur: str) -> None:
+        """Enregistre un run en échec (relancé à la reprise) et réécrit le manifeste."""
+        with self._verrou:
+            self.runs[run_id] = {
+                "seed": seed,
+                "config_hash": self.config_hash,
+                "status": STATUT_ECHEC,
+                "fin": datetime.now().isoformat(timespec="seconds"),
+                "erreur": erreur,
+            }
+            self.sauvegarder()
+
+    def sauvegarder(self) -> None:
+        """Écriture atomique : fichier temporaire du même dossier, fsync puis os.replace."""
+        self.base.mkdir(parents=True, exist_ok=True)
+        contenu = {
+            "version": MANIFEST_VERSION,
+            "config_hash": self.config_hash,
+            "runs": dict(sorted(self.runs.items())),
+        }
+        fd, tmp = tempfile.mkstemp(prefix=".manifest_", suffix=".tmp", dir=self.base)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(contenu, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
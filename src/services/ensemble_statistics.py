@@ -0,0 +1,196 @@
+"""
+Statistiques d'ensemble d'une campagne, agrégées en ligne pendant les runs.
+
+Chaque run remplit, jour par jour, un cube d'incidents (jour × arrondissement × type × gravité,
+CubeRun). À la fin du run le cube alimente StatistiquesEnsemble : moyenne et variance (Welford),
+quantiles (P²), minimum et maximum par case, sans garder les runs. Les ensembles de plusieurs
+processus se fusionnent (fusionner) ; le résumé est sauvegardé dans un seul fichier npz
+(ensemble.npz du dossier de campagne) que les tableaux de bord relisent sans aucun pickle de run.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from ..core.data.constants import INCIDENT_TYPE_ACCIDENT, INCIDENT_TYPE_AGRESSION, INCIDENT_TYPE_INCENDIE
+from ..core.state.simulation_state import SimulationState
+from ..core.utils.online_stats import AccumulateurWelford, EstimateurQuantilesP2
+
+ENSEMBLE_FILENAME = "ensemble.npz"
+
+TYPES = (INCIDENT_TYPE_AGRESSION, INCIDENT_TYPE_INCENDIE, INCIDENT_TYPE_ACCIDENT)
+GRAVITES = ("grave", "moyen", "benin")
+
+
+class CubeRun:
+    """Incidents d'un run par (jour, arrondissement, type, gravité), remplis jour par jour."""
+
+    def __init__(self, jours: int, limites_microzone_arrondissement: Dict[str, int]):
+        self.arrondissements = sorted(set(limites_microzone_arrondissement.values()))
+        indice = {arr: i for i, arr in enumerate(self.arrondissements)}
+        self._indice_microzone = {mz: indice[arr] for mz, arr in limites_microzone_arrondissement.items()}
+        self.valeurs = np.zeros((jours, len(self.arrondissements), len(TYPES), len(GRAVITES)), dtype=np.int32)
+
+    def ajouter_jour(self, jour: int, simulation_state: SimulationState) -> None:
+        """Ajoute les vecteurs du jour (à appeler avant toute purge de l'historique)."""
+        vectors_state = simulation_state.vectors_state
+        cube_jour = self.valeurs[jour]
+        for mz_id, i_arr in self._indice_microzone.items():
+            for i_type, incident_type in enumerate(TYPES):
+                v = vectors_state.get_vector(mz_id, jour, incident_type)
+                if v is not None:
+                    cube_jour[i_arr, i_type] += (v.grave, v.moyen, v.benin)
+
+
+class StatistiquesEnsemble:
+    """
+    Statistiques par case (jour, arrondissement, type, gravité) sur les runs d'une campagne.
+
+    Chaque run n'est compté qu'une fois (run_ids) : un run relancé à la reprise n'est pas ajouté
+    deux fois.
+    """
+
+    def __init__(self, probabilites: Sequence[float] = (0.05, 0.5, 0.95), config_hash: Optional[str] = None):
+        self.config_hash = config_hash
+        self.arrondissements: Optional[List[int]] = None
+        self.run_ids: List[str] = []
+        self._welford = AccumulateurWelford()
+        self._quantiles = EstimateurQuantilesP2(probabilites)
+        self._min: Optional[np.ndarray] = None
+        self._max: Optional[np.ndarray] = None
+
+    @property
+    def n(self) -> int:
+        return len(self.run_ids)
+
+    @property
+    def probabilites(self) -> np.ndarray:
+        return self._quantiles.probabilites
+
+    def ajouter(self, run_id: str, cube: CubeRun) -> bool:
+        """
+        Ajoute le cube d'un run.
+
+        Returns:
+            False si le run est déjà compté (cube ignoré)
+        """
+        if run_id in self.run_ids:
+            return False
+        if self.arrondissements is None:
+            self.arrondissements = list(cube.arrondissements)
+        elif cube.arrondissements != self.arrondissements:
+            raise ValueError("Arrondissements du cube différents de ceux de l'ensemble")
+        valeurs = cube.valeurs
+        self._welford.ajouter(valeurs)
+        self._quantiles.ajouter(valeurs)
+        self._min = valeurs.copy() if self._min is None else np.minimum(self._min, valeurs)
+        self._max = valeurs.copy() if self._max is None else np.maximum(self._max, valeurs)
+        self.run_ids.append(run_id)
+        return True
+
+    def fusionner(self, autre: "StatistiquesEnsemble") -> None:
+        """
+        Ajoute les runs d'un autre ensemble (ex. worker, campagne complémentaire).
+
+        Raises:
+            ValueError: Runs communs, arrondissements ou empreintes de configuration différents
+        """
+        if autre.n == 0:
+            return
+        communs = set(self.run_ids) & set(autre.run_ids)
+        if communs:
+            raise ValueError(f"Runs présents dans les deux ensembles : {sorted(communs)}")
+        if self.config_hash and autre.config_hash and self.config_hash != autre.config_hash:
+            raise ValueError("Ensembles produits avec des configurations différentes")
+        if self.arrondissements is not None and autre.arrondissements != self.arrondissements:
+            raise ValueError("Arrondissements différents : ensembles non fusionnables")
+        self.arrondissements = list(autre.arrondissements)
+        self.config_hash = self.config_hash or autre.config_hash
+        self._welford.fusionner(autre._welford)
+        self._quantiles.fusionner(autre._quantiles)
+        self._min = autre._min.copy() if self._min is None else np.minimum(self._min, autre._min)
+        self._max = autre._max.copy() if self._max is None else np.maximum(self._max, autre._max)
+        self.run_ids.extend(autre.run_ids)
+
+    def tableau(self) -> pd.DataFrame:
+        """
+        Résumé en format long : une ligne par (jour, arrondissement, type, gravité) avec n,
+        moyenne, ecart_type, min, max et un quantile par probabilité (q05, q50, q95…).
+        """
+        if self.n == 0:
+            raise ValueError("Ensemble vide")
+        jours = self._min.shape[0]
+        index = pd.MultiIndex.from_product(
+            [range(jours), self.arrondissements, TYPES, GRAVITES],
+            names=["jour", "arrondissement", "type", "gravite"],
+        )
+        colonnes: Dict[str, Any] = {
+            "n": self.n,
+            "moyenne": np.ravel(self._welford.moyenne),
+            "ecart_type": np.ravel(self._welford.ecart_type),
+            "min": self._min.ravel(),
+            "max": self._max.ravel(),
+        }
+        for p, q in zip(self.probabilites, self._quantiles.quantiles()):
+            colonnes[f"q{round(p * 100):02d}"] = q.ravel()
+        return pd.DataFrame(colonnes, index=index).reset_index()
+
+    def sauvegarder(self, path: Path) -> None:
+        """
+        Écrit l'état complet (fusionnable, reprenable) dans un fichier npz compressé.
+        Écriture atomique, comme le manifeste : fichier temporaire, fsync puis remplacement.
+        """
+        if self.n == 0:
+            raise ValueError("Ensemble vide")
+        meta = {
+            "run_ids": self.run_ids,
+            "arrondissements": self.arrondissements,
+            "types": list(TYPES),
+            "gravites": list(GRAVITES),
+            "probabilites": self.probabilites.tolist(),
+            "config_hash": self.config_hash,
+        }
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp.npz")
+        with open(tmp, "wb") as f:
+            np.savez_compressed(
+                f,
+                meta=np.array(json.dumps(meta)),
+                moyenne=self._welford._moyenne,
+                m2=self._welford._m2,
+                min=self._min,
+                max=self._max,
+                p2_n=np.array(self._quantiles.n),
+                p2_hauteurs=self._quantiles._hauteurs,
+                p2_positions=self._quantiles._positions.astype(np.int32),
+            )
+            f.flush()
+            os.fsync(f.fileno())
+        tmp.replace(path)
+
+    @classmethod
+    def charger(cls, path: Path) -> "StatistiquesEnsemble":
+        """Relit un ensemble écrit par sauvegarder."""
+        with np.load(Path(path)) as d:
+            meta = json.loads(str(d["meta"]))
+            ens = cls(meta["probabilites"], config_hash=meta["config_hash"])
+            ens.arrondissements = meta["arrondissements"]
+            ens.run_ids = list(meta["run_ids"])
+            ens._welford.n = len(ens.run_ids)
+            ens._welford._moyenne = d["moyenne"]
+            ens._welford._m2 = d["m2"]
+            ens._min = d["min"]
+            ens._max = d["max"]
+            ens._quantiles.n = int(d["p2_n"])
+            ens._quantiles._hauteurs = d["p2_hauteurs"]
+            ens._quantiles._positions = d["p2_positions"].astype(float)
+        return ens
+
+
+def charger_tableau_ensemble(dossier: Path) -> pd.DataFrame:
+    """Résumé d'ensemble d'une campagne (dossier contenant ensemble.npz), en format long."""
+    return StatistiquesEnsemble.charger(Path(dossier) / ENSEMBLE_FILENAME).tableau()
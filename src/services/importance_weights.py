@@ -0,0 +1,133 @@
+"""
+Poids d'échantillonnage préférentiel des runs et estimateurs pondérés.
+
+Un run simulé sous une loi inclinée (core.generation.importance_sampling) écrit
+run_XXX/poids_importance.json : facteurs d'inclinaison et log-rapport de vraisemblance
+nominale / inclinée de chaque jour. Le poids d'un mois (4 semaines, comme les lignes ML) est
+exp(somme des log-rapports jusqu'à la fin du mois) ; les estimateurs pondérés ramènent les
+statistiques des runs inclinés à la loi nominale.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from ..core.data.constants import JOURS_PAR_MOIS
+from ..core.generation.importance_sampling import Inclinaison
+
+POIDS_FILENAME = "poids_importance.json"
+POIDS_COLUMN = "poids"
+
+
+def ecrire_poids(run_dir: Path, inclinaison: Inclinaison, log_rapport_jours: Sequence[float]) -> Path:
+    """Écrit poids_importance.json dans le dossier du run."""
+    path = Path(run_dir) / POIDS_FILENAME
+    contenu = {
+        **inclinaison.facteurs(),
+        "log_poids": float(np.sum(log_rapport_jours)),
+        "log_rapport_jours": [float(x) for x in log_rapport_jours],
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(contenu, f, indent=2)
+    return path
+
+
+def charger_log_rapport_jours(run_dir: Path) -> Optional[np.ndarray]:
+    """Log-rapports par jour d'un run ; None si le run a été simulé sous la loi nominale."""
+    path = Path(run_dir) / POIDS_FILENAME
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return np.asarray(json.load(f)["log_rapport_jours"], dtype=float)
+
+
+def log_poids_mensuels(
+    log_rapport_jours: Sequence[float], nb_mois: Optional[int] = None, jours_par_mois: int = JOURS_PAR_MOIS
+) -> np.ndarray:
+    """
+    Log-poids de chaque mois complet : somme des log-rapports des jours 0 à fin du mois.
+
+    Args:
+        log_rapport_jours: Log-rapports par jour (0-indexé)
+        nb_mois: Nombre de mois (défaut : mois complets disponibles)
+        jours_par_mois: Longueur d'un mois en jours
+    """
+    cumul = np.cumsum(np.asarray(log_rapport_jours, dtype=float))
+    disponibles = len(cumul) // jours_par_mois
+    nb_mois = disponibles if nb_mois is None else nb_mois
+    if nb_mois > disponibles:
+        raise ValueError(f"{nb_mois} mois demandés, {disponibles} mois complets simulés")
+    return cumul[np.arange(1, nb_mois + 1) * jours_par_mois - 1]
+
+
+def estimation_ponderee(
+    valeurs: Sequence[float],
+    poids: Sequence[float],
+    confiance: float = 0.95,
+    groupes: Optional[Sequence[Any]] = None,
+) -> Dict[str, float]:
+    """
+    Espérance nominale estimée depuis des observations pondérées (moyenne de poids × valeur).
+
+    Args:
+        valeurs: Observations (ex. indicatrice de mois catastrophique)
+        poids: Rapports de vraisemblance des observations (1.0 sous la loi nominale)
+        confiance: Niveau de confiance de l'IC (loi de Student)
+        groupes: Run de chaque observation : l'IC est calculé sur les moyennes par run
+            (mois d'un même run corrélés)
+
+    Returns:
+        {"n", "estimation", "demi_largeur", "autonormalisee" (Σ p·x / Σ p), "taille_effective" ((Σ p)² / Σ p²)}
+    """
+    x = np.asarray(valeurs, dtype=float)
+    w = np.asarray(poids, dtype=float)
+    if x.shape != w.shape or x.ndim != 1 or len(x) == 0:
+        raise ValueError("valeurs et poids doivent être deux vecteurs non vides de même longueur")
+    z = w * x
+    if groupes is not None:
+        z = pd.Series(z).groupby(np.asarray(groupes)).mean().to_numpy()
+    n = len(z)
+    demi = np.inf
+    if n >= 2:
+        demi = float(stats.t.ppf(0.5 + confiance / 2.0, n - 1) * z.std(ddof=1) / np.sqrt(n))
+    return {
+        "n": n,
+        "estimation": float(z.mean()),
+        "demi_largeur": demi,
+        "autonormalisee": float(np.sum(w * x) / np.sum(w)) if np.sum(w) > 0 else np.nan,
+        "taille_effective": float(np.sum(w) ** 2 / np.sum(w ** 2)) if np.sum(w ** 2) > 0 else 0.0,
+    }
+
+
+def quantile_pondere(valeurs: Sequence[float], poids: Sequence[float], probabilites: Sequence[float]) -> np.ndarray:
+    """Quantiles de la répartition pondérée autonormalisée (premier x tel que F(x) ≥ p)."""
+    x = np.asarray(valeurs, dtype=float)
+    w = np.asarray(poids, dtype=float)
+    ordre = np.argsort(x, kind="stable")
+    x, w = x[ordre], w[ordre]
+    repartition = np.cumsum(w) / np.sum(w)
+    indices = np.searchsorted(repartition, np.asarray(probabilites, dtype=float) - 1e-12, side="left")
+    return x[np.minimum(indices, len(x) - 1)]
+
+
+def frequence_classe_ponderee(
+    df_ml: pd.DataFrame,
+    classe: str,
+    colonne: str = "classe",
+    confiance: float = 0.95,
+) -> Dict[str, float]:
+    """
+    Probabilité nominale qu'un mois × arrondissement du jeu ML soit de la classe donnée
+    (ex. CLASSE_CATASTROPHE), depuis les lignes pondérées (colonne poids ; 1.0 si absente).
+    """
+    poids = df_ml[POIDS_COLUMN] if POIDS_COLUMN in df_ml.columns else np.ones(len(df_ml))
+    return estimation_ponderee(
+        (df_ml[colonne] == classe).to_numpy(dtype=float),
+        np.asarray(poids, dtype=float),
+        confiance=confiance,
+        groupes=df_ml["run_id"].to_numpy() if "run_id" in df_ml.columns else None,
+    )
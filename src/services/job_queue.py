@@ -0,0 +1,461 @@
+"""
+File de travaux partagée entre machines : une base SQLite (mode WAL) sur le disque commun.
+
+Les campagnes (runs headless, balayages) y déposent une tâche par run ; chaque worker
+(`python main.py --worker --queue chemin`) réclame une tâche sous bail, le prolonge par des
+battements de cœur pendant le run, puis enregistre le résultat. Un bail expiré (machine arrêtée,
+processus tué) remet la tâche en attente jusqu'à max_tentatives. Aucun service réseau : seul le
+système de fichiers partagé est requis.
+
+Le mode WAL (défaut) suppose que le disque partagé gère la mémoire partagée de SQLite (volume
+local, montage partagé d'un même hôte) ; sur un montage réseau entre machines (NFS), ouvrir la
+file avec mode_journal="DELETE" (journal classique, verrous de fichiers).
+
+Les tâches ont la forme des tâches de balayage (voir sweep_service) et sont exécutées par
+_ExecuteurBalayage ; les runs écrivent dans leur dossier (chemin absolu sur le disque partagé).
+"""
+
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import pandas as pd
+
+from ..core.config.config_validator import Config, validate_config_dict
+from ..core.generation.shared_static_data import DonneesStatiques
+from ..core.generation.variance_reduction import seed_du_run
+from .simulation_service import SCENARIO_UI_TO_CONFIG, _get_microzone_ids
+from .sweep_service import (
+    GrilleBalayage,
+    _ExecuteurBalayage,
+    ecrire_resumes_balayage,
+    preparer_taches_balayage,
+)
+
+logger = logging.getLogger(__name__)
+
+STATUT_ATTENTE = "en_attente"
+STATUT_EN_COURS = "en_cours"
+STATUT_TERMINE = "termine"
+STATUT_ECHEC = "echec"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS campagnes (
+    nom TEXT PRIMARY KEY,
+    config TEXT NOT NULL,
+    creee REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS travaux (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    campagne TEXT NOT NULL REFERENCES campagnes(nom),
+    type TEXT NOT NULL,
+    cle TEXT,
+    params TEXT NOT NULL,
+    statut TEXT NOT NULL,
+    tentatives INTEGER NOT NULL DEFAULT 0,
+    max_tentatives INTEGER NOT NULL,
+    worker TEXT,
+    bail_expire REAL,
+    resultat TEXT,
+    erreur TEXT,
+    cree REAL NOT NULL,
+    debut REAL,
+    fin REAL
+);
+CREATE INDEX IF NOT EXISTS idx_travaux_statut ON travaux(statut, id);
+CREATE INDEX IF NOT EXISTS idx_travaux_campagne ON travaux(campagne, id);
+"""
+
+# Un travail par run de campagne : un redépôt ne recrée pas les tâches déjà présentes
+_INDEX_CLE = "CREATE UNIQUE INDEX IF NOT EXISTS idx_travaux_cle ON travaux(campagne, cle)"
+
+
+def _cle_tache(tache: Dict[str, Any]) -> str:
+    """Identifiant d'une tâche dans sa campagne : [cellule_XXX/]run_XXX (paramètres JSON à défaut)."""
+    if "run_idx" not in tache:
+        return json.dumps(tache, sort_keys=True)
+    cle = f"run_{tache['run_idx']:03d}"
+    if "cellule" in tache:
+        cle = f"cellule_{tache['cellule']:03d}/{cle}"
+    return cle
+
+
+@dataclass
+class Travail:
+    """Tâche réclamée par un worker."""
+
+    id: int
+    campagne: str
+    type: str
+    params: Dict[str, Any]
+    tentative: int
+
+
+class FileTravaux:
+    """
+    File de travaux SQLite. Une connexion par opération : l'objet peut servir depuis plusieurs
+    threads (battement de cœur) et plusieurs processus ou machines ouvrent la même base.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        duree_bail: float = 300.0,
+        delai_verrou: float = 60.0,
+        mode_journal: str = "WAL",
+    ):
+        """
+        Args:
+            path: Fichier SQLite (créé si absent), sur le disque partagé
+            duree_bail: Durée d'un bail en secondes (prolongé par les battements de cœur)
+            delai_verrou: Attente maximale d'un verrou d'écriture (secondes)
+            mode_journal: "WAL" ou "DELETE" (montage réseau entre machines)
+        """
+        if mode_journal not in ("WAL", "DELETE"):
+            raise ValueError(f"Mode de journal non supporté : {mode_journal}")
+        self.path = Path(path)
+        self.duree_bail = duree_bail
+        self.delai_verrou = delai_verrou
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connexion() as conn:
+            conn.execute(f"PRAGMA journal_mode={mode_journal}")
+            conn.executescript(_SCHEMA)
+            colonnes = {ligne[1] for ligne in conn.execute("PRAGMA table_info(travaux)")}
+            if "cle" not in colonnes:
+                conn.execute("ALTER TABLE travaux ADD COLUMN cle TEXT")
+            conn.execute(_INDEX_CLE)
+
+    @contextmanager
+    def _connexion(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(str(self.path), timeout=self.delai_verrou, isolation_level=None)
+        try:
+            conn.execute("PRAGMA synchronous=NORMAL")
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Transaction d'écriture (BEGIN IMMEDIATE : verrou pris dès le début, pas d'interblocage)."""
+        with self._connexion() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def ajouter(
+        self,
+        campagne: str,
+        config: Config,
+        taches: List[Dict[str, Any]],
+        type_travail: str = "run",
+        max_tentatives: int = 3,
+    ) -> List[int]:
+        """
+        Dépose les tâches d'une campagne (config enregistrée avec la campagne).
+
+        Une tâche déjà présente dans la campagne (même run, voir _cle_tache) n'est pas redéposée :
+        redéposer une campagne n'ajoute que les runs manquants.
+
+        Returns:
+            Identifiants des tâches ajoutées
+
+        Raises:
+            ValueError: Campagne existante avec une autre configuration
+        """
+        if max_tentatives < 1:
+            raise ValueError("max_tentatives doit être >= 1")
+        config_json = json.dumps(config.model_dump(), sort_keys=True)
+        maintenant = time.time()
+        with self._transaction() as conn:
+            ligne = conn.execute("SELECT config FROM campagnes WHERE nom = ?", (campagne,)).fetchone()
+            if ligne is None:
+                conn.execute("INSERT INTO campagnes VALUES (?, ?, ?)", (campagne, config_json, maintenant))
+            elif ligne[0] != config_json:
+                raise ValueError(f"Campagne {campagne} déjà déposée avec une autre configuration")
+            ids = []
+            for tache in taches:
+                cur = conn.execute(
+                    "INSERT OR IGNORE INTO travaux (campagne, type, cle, params, statut, max_tentatives, cree) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        campagne, type_travail, _cle_tache(tache), json.dumps(tache, sort_keys=True),
+                        STATUT_ATTENTE, max_tentatives, maintenant,
+                    ),
+                )
+                if cur.rowcount:
+                    ids.append(cur.lastrowid)
+        if len(ids) < len(taches):
+            logger.info("Campagne %s : %s tâche(s) déjà déposée(s) ignorée(s)", campagne, len(taches) - len(ids))
+        return ids
+
+    def reclamer(self, worker: str) -> Optional[Travail]:
+        """
+        Réclame la plus ancienne tâche en attente (bail de duree_bail secondes). Les baux expirés
+        sont d'abord remis en attente, ou passés en échec après max_tentatives.
+
+        Returns:
+            Travail réclamé, ou None si aucune tâche n'est en attente
+        """
+        maintenant = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE travaux SET statut = CASE WHEN tentatives >= max_tentatives THEN ? ELSE ? END, "
+                "erreur = 'bail expiré (worker ' || worker || ')', worker = NULL, bail_expire = NULL "
+                "WHERE statut = ? AND bail_expire < ?",
+                (STATUT_ECHEC, STATUT_ATTENTE, STATUT_EN_COURS, maintenant),
+            )
+            ligne = conn.execute(
+                "SELECT id, campagne, type, params, tentatives FROM travaux WHERE statut = ? ORDER BY id LIMIT 1",
+                (STATUT_ATTENTE,),
+            ).fetchone()
+            if ligne is None:
+                return None
+            conn.execute(
+                "UPDATE travaux SET statut = ?, worker = ?, tentatives = tentatives + 1, bail_expire = ?, debut = ? "
+                "WHERE id = ?",
+                (STATUT_EN_COURS, worker, maintenant + self.duree_bail, maintenant, ligne[0]),
+            )
+        return Travail(id=ligne[0], campagne=ligne[1], type=ligne[2], params=json.loads(ligne[3]), tentative=ligne[4] + 1)
+
+    def prolonger(self, travail_id: int, worker: str) -> bool:
+        """Battement de cœur : prolonge le bail. False si la tâche n'appartient plus au worker."""
+        with self._transaction() as conn:
+            cur = conn.execute(
+                "UPDATE travaux SET bail_expire = ? WHERE id = ? AND worker = ? AND statut = ?",
+                (time.time() + self.duree_bail, travail_id, worker, STATUT_EN_COURS),
+            )
+        return cur.rowcount == 1
+
+    def terminer(self, travail_id: int, worker: str, resultat: Dict[str, Any]) -> bool:
+        """Enregistre le résultat. False (résultat ignoré) si le bail a été repris entre-temps."""
+        with self._transaction() as conn:
+            cur = conn.execute(
+                "UPDATE travaux SET statut = ?, resultat = ?, erreur = NULL, bail_expire = NULL, fin = ? "
+                "WHERE id = ? AND worker = ? AND statut = ?",
+                (STATUT_TERMINE, json.dumps(resultat, default=str), time.time(), travail_id, worker, STATUT_EN_COURS),
+            )
+        return cur.rowcount == 1
+
+    def echouer(self, travail_id: int, worker: str, erreur: str) -> bool:
+        """Enregistre un échec : tâche remise en attente, ou en échec après max_tentatives."""
+        with self._transaction() as conn:
+            cur = conn.execute(
+                "UPDATE travaux SET statut = CASE WHEN tentatives >= max_tentatives THEN ? ELSE ? END, "
+                "erreur = ?, worker = NULL, bail_expire = NULL, fin = ? WHERE id = ? AND worker = ? AND statut = ?",
+                (STATUT_ECHEC, STATUT_ATTENTE, erreur, time.time(), travail_id, worker, STATUT_EN_COURS),
+            )
+        return cur.rowcount == 1
+
+    def config_campagne(self, campagne: str) -> Config:
+        with self._connexion() as conn:
+            ligne = conn.execute("SELECT config FROM campagnes WHERE nom = ?", (campagne,)).fetchone()
+        if ligne is None:
+            raise KeyError(f"Campagne inconnue : {campagne}")
+        return validate_config_dict(json.loads(ligne[0]))
+
+    def compter(self, campagne: Optional[str] = None) -> Dict[str, int]:
+        """Nombre de tâches par statut (toutes campagnes si campagne est None)."""
+        requete = "SELECT statut, COUNT(*) FROM travaux"
+        args: tuple = ()
+        if campagne is not None:
+            requete += " WHERE campagne = ?"
+            args = (campagne,)
+        with self._connexion() as conn:
+            lignes = conn.execute(requete + " GROUP BY statut", args).fetchall()
+        compte = {s: 0 for s in (STATUT_ATTENTE, STATUT_EN_COURS, STATUT_TERMINE, STATUT_ECHEC)}
+        compte.update(dict(lignes))
+        return compte
+
+    def travaux(self, campagne: str) -> pd.DataFrame:
+        """Tâches d'une campagne dans l'ordre de dépôt (params et resultat décodés)."""
+        with self._connexion() as conn:
+            df = pd.read_sql_query(
+                "SELECT id, type, params, statut, tentatives, worker, resultat, erreur, debut, fin "
+                "FROM travaux WHERE campagne = ? ORDER BY id",
+                conn,
+                params=(campagne,),
+            )
+        df["params"] = df["params"].map(json.loads)
+        df["resultat"] = df["resultat"].map(lambda r: json.loads(r) if r else None)
+        return df
+
+
+def soumettre_runs(
+    file: FileTravaux,
+    config: Config,
+    output_dir: Path,
+    runs: int,
+    days: int,
+    scenario_ui: str = "Standard",
+    variabilite_ui: str = "Moyenne",
+    save_pickles: bool = True,
+    save_trace: bool = True,
+    max_tentatives: int = 3,
+) -> str:
+    """
+    Dépose une campagne headless (run_XXX dans output_dir, seeds comme en headless).
+
+    Returns:
+        Nom de la campagne (chemin absolu du dossier de sortie)
+    """
+    output_dir = Path(output_dir).resolve()
+    seed = config.simulation.seed_default
+    taches = [
+        {
+            "surcharges": {},
+            "scenario": SCENARIO_UI_TO_CONFIG[scenario_ui],
+            "variabilite": variabilite_ui,
+            "jours": days,
+            "run_idx": run_idx,
+            "runs": runs,
+            "seed": seed_du_run(seed, run_idx, config.simulation.reduction_variance),
+            "dossier": str(output_dir),
+            "save_pickles": save_pickles,
+            "save_trace": save_trace,
+        }
+        for run_idx in range(runs)
+    ]
+    campagne = str(output_dir)
+    file.ajouter(campagne, config, taches, type_travail="run", max_tentatives=max_tentatives)
+    return campagne
+
+
+def soumettre_balayage(
+    file: FileTravaux,
+    config: Config,
+    grille: GrilleBalayage,
+    output_dir: Path,
+    save_pickles: bool = True,
+    save_trace: bool = True,
+    max_tentatives: int = 3,
+) -> str:
+    """
+    Dépose un balayage (dossiers de cellules créés ici, un travail par (cellule, seed)).
+
+    Returns:
+        Nom de la campagne (chemin absolu du dossier du balayage)
+    """
+    output_dir = Path(output_dir).resolve()
+    taches = preparer_taches_balayage(grille, output_dir, save_pickles, save_trace)
+    campagne = str(output_dir)
+    file.ajouter(campagne, config, taches, type_travail="balayage", max_tentatives=max_tentatives)
+    return campagne
+
+
+def collecter_balayage(file: FileTravaux, campagne: str) -> pd.DataFrame:
+    """
+    Écrit resume_runs.csv et resume_cellules.csv d'un balayage déposé dans la file
+    (tâches non terminées : statut echec avec leur état dans erreur).
+
+    Returns:
+        Résumé par cellule
+    """
+    df = file.travaux(campagne)
+    taches = df["params"].tolist()
+    resultats, erreurs = [], {}
+    for i, ligne in enumerate(df.itertuples()):
+        resultats.append(ligne.resultat)
+        if ligne.statut != STATUT_TERMINE:
+            erreurs[i] = ligne.erreur if ligne.statut == STATUT_ECHEC else ligne.statut
+    return ecrire_resumes_balayage(taches, resultats, erreurs, Path(campagne))
+
+
+class _Battement:
+    """Thread de battement de cœur : prolonge le bail d'un travail jusqu'à arreter()."""
+
+    def __init__(self, file: FileTravaux, travail_id: int, worker: str, intervalle: float):
+        self._arret = threading.Event()
+        self._thread = threading.Thread(
+            target=self._boucle, args=(file, travail_id, worker, intervalle), name="battement-bail", daemon=True
+        )
+        self._thread.start()
+
+    def _boucle(self, file: FileTravaux, travail_id: int, worker: str, intervalle: float) -> None:
+        while not self._arret.wait(intervalle):
+            try:
+                if not file.prolonger(travail_id, worker):
+                    logger.warning("Travail %s : bail perdu (expiré et repris)", travail_id)
+                    return
+            except sqlite3.Error as e:
+                logger.warning("Battement de cœur du travail %s en échec : %s", travail_id, e)
+
+    def arreter(self) -> None:
+        self._arret.set()
+        self._thread.join()
+
+
+def executer_worker(
+    path: Path,
+    worker: Optional[str] = None,
+    attente: float = 5.0,
+    arret_si_vide: bool = False,
+    max_travaux: Optional[int] = None,
+    duree_bail: float = 300.0,
+    mode_journal: str = "WAL",
+) -> int:
+    """
+    Boucle d'un worker : réclame, exécute et enregistre des travaux jusqu'à interruption.
+
+    Args:
+        path: Fichier de la file
+        worker: Identifiant (défaut : machine-pid)
+        attente: Pause (secondes) quand aucune tâche n'est en attente
+        arret_si_vide: S'arrêter quand plus aucune tâche n'est en attente
+        max_travaux: S'arrêter après ce nombre de travaux
+        duree_bail: Durée du bail ; battement de cœur tous les tiers de bail
+        mode_journal: Mode de journal SQLite (voir FileTravaux)
+
+    Returns:
+        Nombre de travaux exécutés
+    """
+    file = FileTravaux(path, duree_bail=duree_bail, mode_journal=mode_journal)
+    worker = worker or f"{socket.gethostname()}-{os.getpid()}"
+    donnees_statiques = None
+    executeurs: Dict[str, _ExecuteurBalayage] = {}
+    executes = 0
+    logger.info("Worker %s sur %s", worker, file.path)
+    while max_travaux is None or executes < max_travaux:
+        travail = file.reclamer(worker)
+        if travail is None:
+            if arret_si_vide:
+                break
+            time.sleep(attente)
+            continue
+
+        executeur = executeurs.get(travail.campagne)
+        if executeur is None:
+            config = file.config_campagne(travail.campagne)
+            if donnees_statiques is None:
+                donnees_statiques = DonneesStatiques.normaliser()
+            executeur = _ExecuteurBalayage(config, _get_microzone_ids(config), donnees_statiques)
+            executeurs[travail.campagne] = executeur
+
+        logger.info(
+            "Travail %s (%s, run_%03d, tentative %s) — %s",
+            travail.id, travail.type, travail.params["run_idx"], travail.tentative, travail.campagne,
+        )
+        battement = _Battement(file, travail.id, worker, duree_bail / 3.0)
+        try:
+            resultat = executeur.executer(travail.params)
+        except Exception as e:
+            battement.arreter()
+            logger.error("Travail %s en échec : %s", travail.id, e)
+            file.echouer(travail.id, worker, str(e))
+        else:
+            battement.arreter()
+            if not file.terminer(travail.id, worker, resultat):
+                logger.warning("Travail %s : bail repris par un autre worker, résultat ignoré", travail.id)
+        executes += 1
+    return executes
@@ -33,6 +33,7 @@ from ..data.adjacents import get_voisins
 from ..core.utils.path_resolver import PathResolver
 from ..core.utils.pickle_utils import load_pickle, save_pickle
 from .feature_calculator import StateCalculator
+from .importance_weights import POIDS_COLUMN, charger_log_rapport_jours, log_poids_mensuels, quantile_pondere
 from .label_calculator import LabelCalculator
 from .ml_data_extractor import extract_and_save_ml_data, compute_nb_mois_from_days
 
@@ -192,12 +193,15 @@ class MLService:
         À J+28 pour chaque mois : concatène les 4 semaines empilées pour construire
         les 90 features et le label (construire_ligne_90_features).
 
+        Run simulé en échantillonnage préférentiel (poids_importance.json) : colonne poids ajoutée,
+        rapport de vraisemblance du run jusqu'à la fin du mois de la ligne.
+
         Args:
             run_id: Identifiant du run (ex: "001")
             label_column: Colonne label à utiliser ("score" ou "classe")
 
         Returns:
-            DataFrame avec 90 colonnes features + 1 colonne label
+            DataFrame avec 90 colonnes features + 1 colonne label (+ poids)
         """
         df_features = StateCalculator.load_features(run_id)
         df_labels = LabelCalculator.load_labels(run_id)
@@ -226,6 +230,11 @@ class MLService:
         df = df.fillna(0)
         for col in feature_cols + ["label"]:
             df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
+
+        log_rapport_jours = charger_log_rapport_jours(PathResolver.data_intermediate(f"run_{run_id}"))
+        if log_rapport_jours is not None:
+            log_poids = log_poids_mensuels(log_rapport_jours, nb_mois=int(df["mois"].max()))
+            df[POIDS_COLUMN] = np.exp(log_poids[df["mois"].astype(int).to_numpy() - 1])
         return df
 
     def _empty_dataframe(self) -> pd.DataFrame:
@@ -345,6 +354,9 @@ class MLService:
             return self._empty_dataframe()
 
         df = pd.concat(dfs, ignore_index=True)
+        if POIDS_COLUMN in df.columns:
+            # Runs simulés sous la loi nominale mélangés à des runs pondérés
+            df[POIDS_COLUMN] = df[POIDS_COLUMN].fillna(1.0)
 
         if calibrate_classification and label_column == "classe" and "score" in df.columns:
             df = calibrate_labels_classification(df, score_column="score", classe_column="classe")
@@ -418,7 +430,7 @@ class MLService:
 # ---------------------------------------------------------------------------
 
 # Colonnes non-features du DataFrame ML (label peut être "score" ou "classe")
-ML_NON_FEATURE_COLUMNS = {"run_id", "arrondissement", "mois", "label", "score", "classe"}
+ML_NON_FEATURE_COLUMNS = {"run_id", "arrondissement", "mois", "label", "score", "classe", POIDS_COLUMN}
 
 # Cibles calibration Story 2.4.4
 CALIBRATION_PCT_NORMAL = 0.85
@@ -436,7 +448,8 @@ def calibrate_labels_classification(
     """
     Recalibre la colonne classe pour viser ~85% Normal, ~10% Pre-cata, ~5% Cata.
 
-    Utilise les percentiles du score pour définir les seuils.
+    Utilise les percentiles du score pour définir les seuils (pondérés si le DataFrame a une
+    colonne poids).
 
     Args:
         df: DataFrame avec colonnes score et classe
@@ -455,8 +468,13 @@ def calibrate_labels_classification(
         return df
 
     scores = df[score_column].values
-    p85 = float(np.percentile(scores, (pct_normal) * 100))
-    p95 = float(np.percentile(scores, (pct_normal + pct_pre_cata) * 100))
+    if POIDS_COLUMN in df.columns:
+        p85, p95 = (
+            float(q) for q in quantile_pondere(scores, df[POIDS_COLUMN].values, [pct_normal, pct_normal + pct_pre_cata])
+        )
+    else:
+        p85 = float(np.percentile(scores, (pct_normal) * 100))
+        p95 = float(np.percentile(scores, (pct_normal + pct_pre_cata) * 100))
 
     def _classe(s: float) -> str:
         if s <= p85:
@@ -502,12 +520,26 @@ class MLTrainer:
         y = df[label_column]
         return X, y, feature_cols
 
-    def _metrics_regression(self, y_true: np.ndarray, y_pred: np.ndarray) -> Dict[str, float]:
-        """Calcule MAE, RMSE, R² pour la régression."""
+    def _split_poids(self, df: pd.DataFrame, X: pd.DataFrame, y, test_size: float, random_state: int) -> tuple:
+        """
+        Découpage train/test (même découpage avec ou sans poids) ; poids train/test issus de la
+        colonne poids (échantillonnage préférentiel), None si absente.
+        """
+        from sklearn.model_selection import train_test_split
+
+        if POIDS_COLUMN not in df.columns:
+            return (*train_test_split(X, y, test_size=test_size, random_state=random_state), None, None)
+        poids = df[POIDS_COLUMN].to_numpy(dtype=float)
+        return tuple(train_test_split(X, y, poids, test_size=test_size, random_state=random_state))
+
+    def _metrics_regression(
+        self, y_true: np.ndarray, y_pred: np.ndarray, sample_weight: Optional[np.ndarray] = None
+    ) -> Dict[str, float]:
+        """Calcule MAE, RMSE, R² pour la régression (pondérés si sample_weight)."""
         return {
-            "MAE": float(mean_absolute_error(y_true, y_pred)),
-            "RMSE": float(np.sqrt(mean_squared_error(y_true, y_pred))),
-            "R2": float(r2_score(y_true, y_pred)),
+            "MAE": float(mean_absolute_error(y_true, y_pred, sample_weight=sample_weight)),
+            "RMSE": float(np.sqrt(mean_squared_error(y_true, y_pred, sample_weight=sample_weight))),
+            "R2": float(r2_score(y_true, y_pred, sample_weight=sample_weight)),
         }
 
     def _metrics_classification(
@@ -515,13 +547,16 @@ class MLTrainer:
         y_true: np.ndarray,
         y_pred: np.ndarray,
         average: str = "macro",
+        sample_weight: Optional[np.ndarray] = None,
     ) -> Dict[str, float]:
-        """Calcule Accuracy, Precision, Recall, F1 pour la classification."""
+        """Calcule Accuracy, Precision, Recall, F1 pour la classification (pondérés si sample_weight)."""
         return {
-            "accuracy": float(accuracy_score(y_true, y_pred)),
-            "precision": float(precision_score(y_true, y_pred, average=average, zero_division=0)),
-            "recall": float(recall_score(y_true, y_pred, average=average, zero_division=0)),
-            "f1": float(f1_score(y_true, y_pred, average=average, zero_division=0)),
+            "accuracy": float(accuracy_score(y_true, y_pred, sample_weight=sample_weight)),
+            "precision": float(precision_score(
+                y_true, y_pred, average=average, zero_division=0, sample_weight=sample_weight
+            )),
+            "recall": float(recall_score(y_true, y_pred, average=average, zero_division=0, sample_weight=sample_weight)),
+            "f1": float(f1_score(y_true, y_pred, average=average, zero_division=0, sample_weight=sample_weight)),
         }
 
     def _path_model(self, subdir: str, algo: str, numero: str, params: str) -> Path:
@@ -558,16 +593,16 @@ class MLTrainer:
     ) -> Dict[str, Dict[str, Any]]:
         """
         Entraîne Huber Regressor et Ridge sur le label (régression).
+        Avec une colonne poids, entraînement et métriques pondérés.
 
         Returns:
             Dict algo -> { "model", "metrics", "path", "feature_columns" } (huber_regressor, ridge)
         """
-        from sklearn.model_selection import train_test_split
-
         X, y, feature_cols = self._get_X_y(df_ml, label_column)
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=test_size, random_state=random_state
+        X_train, X_test, y_train, y_test, w_train, w_test = self._split_poids(
+            df_ml, X, y, test_size, random_state
         )
+        fit_kwargs = {"sample_weight": w_train} if w_train is not None else {}
         y_train = np.asarray(y_train, dtype=float)
         y_test = np.asarray(y_test, dtype=float)
 
@@ -575,9 +610,9 @@ class MLTrainer:
 
         # Huber Regressor (pas de random_state en sklearn)
         huber = HuberRegressor(epsilon=1.35, max_iter=200)
-        huber.fit(X_train, y_train)
+        huber.fit(X_train, y_train, **fit_kwargs)
         y_pred_huber = huber.predict(X_test)
-        metrics_huber = self._metrics_regression(y_test, y_pred_huber)
+        metrics_huber = self._metrics_regression(y_test, y_pred_huber, w_test)
         meta_huber = {
             "algo": "huber_regressor",
             "numero_entrainement": numero_entrainement,
@@ -590,9 +625,9 @@ class MLTrainer:
 
         # Ridge
         ridge = Ridge(alpha=1.0, random_state=random_state)
-        ridge.fit(X_train, y_train)
+        ridge.fit(X_train, y_train, **fit_kwargs)
         y_pred_ridge = ridge.predict(X_test)
-        metrics_ridge = self._metrics_regression(y_test, y_pred_ridge)
+        metrics_ridge = self._metrics_regression(y_test, y_pred_ridge, w_test)
         meta_ridge = {
             "algo": "ridge",
             "numero_entrainement": numero_entrainement,
@@ -616,12 +651,11 @@ class MLTrainer:
     ) -> Dict[str, Dict[str, Any]]:
         """
         Entraîne Logistic Regression et XGBoost sur le label (classification).
+        Avec une colonne poids, entraînement et métriques pondérés.
 
         Returns:
             Dict algo -> { "model", "metrics", "path", "feature_columns" }
         """
-        from sklearn.model_selection import train_test_split
-
         X, y, feature_cols = self._get_X_y(df_ml, label_column)
         # Encoder les classes en entiers si besoin
         if y.dtype == object or y.dtype.name == "category" or not np.issubdtype(y.dtype, np.number):
@@ -632,17 +666,18 @@ class MLTrainer:
         else:
             y_enc = np.asarray(y, dtype=int)
             self._label_encoder = None
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y_enc, test_size=test_size, random_state=random_state
+        X_train, X_test, y_train, y_test, w_train, w_test = self._split_poids(
+            df_ml, X, y_enc, test_size, random_state
         )
+        fit_kwargs = {"sample_weight": w_train} if w_train is not None else {}
 
         results = {}
 
         # Logistic Regression
         logreg = LogisticRegression(max_iter=500, random_state=random_state)
-        logreg.fit(X_train, y_train)
+        logreg.fit(X_train, y_train, **fit_kwargs)
         y_pred_lr = logreg.predict(X_test)
-        metrics_lr = self._metrics_classification(y_test, y_pred_lr)
+        metrics_lr = self._metrics_classification(y_test, y_pred_lr, sample_weight=w_test)
         meta_lr = {
             "algo": "logistic_regression",
             "numero_entrainement": numero_entrainement,
@@ -658,9 +693,9 @@ class MLTrainer:
         # XGBoost (optionnel)
         if HAS_XGBOOST:
             xgb_clf = xgb.XGBClassifier(n_estimators=100, max_depth=6, random_state=random_state)
-            xgb_clf.fit(X_train, y_train)
+            xgb_clf.fit(X_train, y_train, **fit_kwargs)
             y_pred_xgb = xgb_clf.predict(X_test)
-            metrics_xgb = self._metrics_classification(y_test, y_pred_xgb)
+            metrics_xgb = self._metrics_classification(y_test, y_pred_xgb, sample_weight=w_test)
             meta_xgb = {
                 "algo": "xgboost",
                 "numero_entrainement": numero_entrainement,
@@ -0,0 +1,231 @@
+"""
+Flux de résultats headless : enregistrements journaliers ajoutés au fil de la simulation.
+
+Chaque jour terminé est copié dans un tampon borné (jours_par_bloc jours) ; un tampon plein
+est écrit en un bloc colonnaire numpy (stream/bloc_XXXXXX.npz, écriture atomique), jamais
+réécrit ensuite. Les blocs déjà écrits sont lisibles pendant le run (lire_flux) et restent
+valides si le run est interrompu.
+
+Colonnes d'un bloc :
+  - jour (D,), vecteurs (D, N, T, 3) [grave, moyen, bénin], congestion (D, N) (NaN si absente)
+  - evt_* : une ligne par événement grave ou positif du bloc (jour, id, type, arrondissement,
+    durée, morts de base, réduction d'impact)
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from ..core.data.constants import INCIDENT_TYPE_ACCIDENT, INCIDENT_TYPE_AGRESSION, INCIDENT_TYPE_INCENDIE
+from ..core.events.event_grave import EventGrave
+from ..core.state.simulation_state import SimulationState
+
+FLUX_DIRNAME = "stream"
+SCHEMA_FILENAME = "schema.json"
+
+# Politique fsync : "bloc" = chaque bloc est forcé sur disque avant d'être publié ; "aucun" = cache OS
+FSYNC_BLOC = "bloc"
+FSYNC_AUCUN = "aucun"
+
+_TYPES = (INCIDENT_TYPE_AGRESSION, INCIDENT_TYPE_INCENDIE, INCIDENT_TYPE_ACCIDENT)
+
+_COLONNES_EVENEMENTS = {
+    "evt_jour": np.int32,
+    "evt_id": np.str_,
+    "evt_type": np.str_,
+    "evt_arrondissement": np.int16,
+    "evt_duree": np.int32,
+    "evt_morts_base": np.int32,
+    "evt_impact_reduction": np.float64,
+}
+
+
+def _fsync_dossier(path: Path) -> None:
+    """Force l'entrée de répertoire (renommage) sur disque ; ignoré si non supporté."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class FluxResultats:
+    """
+    Puits append-only des enregistrements journaliers d'un run.
+    """
+
+    def __init__(
+        self,
+        run_dir: Path,
+        microzone_ids: List[str],
+        jours_par_bloc: int = 30,
+        fsync: str = FSYNC_BLOC,
+    ):
+        """
+        Args:
+            run_dir: Dossier du run (les blocs vont dans run_dir/stream)
+            microzone_ids: Ordre des microzones (axe N des colonnes)
+            jours_par_bloc: Taille du tampon en jours (mémoire bornée, un fichier par bloc)
+            fsync: FSYNC_BLOC ou FSYNC_AUCUN
+
+        Raises:
+            ValueError: Si jours_par_bloc < 1 ou politique fsync inconnue
+        """
+        if jours_par_bloc < 1:
+            raise ValueError("jours_par_bloc doit être ≥ 1")
+        if fsync not in (FSYNC_BLOC, FSYNC_AUCUN):
+            raise ValueError(f"Politique fsync inconnue : {fsync}")
+        self.dossier = Path(run_dir) / FLUX_DIRNAME
+        self.microzone_ids = list(microzone_ids)
+        self.jours_par_bloc = jours_par_bloc
+        self.fsync = fsync
+        self.fichiers: List[Path] = []
+
+        n = len(self.microzone_ids)
+        self._jours = np.zeros(jours_par_bloc, dtype=np.int32)
+        self._vecteurs = np.zeros((jours_par_bloc, n, len(_TYPES), 3), dtype=np.int32)
+        self._congestion = np.full((jours_par_bloc, n), np.nan, dtype=np.float32)
+        self._evenements: List[tuple] = []
+        self._remplis = 0
+
+        self.dossier.mkdir(parents=True, exist_ok=True)
+        for ancien in self.dossier.glob("bloc_*.npz"):
+            ancien.unlink()
+        self._ecrire_atomique(
+            self.dossier / SCHEMA_FILENAME,
+            lambda f: f.write(json.dumps({
+                "microzone_ids": self.microzone_ids,
+                "types": list(_TYPES),
+                "gravites": ["grave", "moyen", "benin"],
+                "jours_par_bloc": jours_par_bloc,
+            }, indent=2).encode("utf-8")),
+        )
+
+    def ajouter_jour(
+        self,
+        jour: int,
+        simulation_state: SimulationState,
+        congestion: Optional[Dict[str, Optional[float]]] = None,
+    ) -> None:
+        """
+        Copie le jour terminé dans le tampon ; écrit un bloc quand le tampon est plein.
+
+        Args:
+            jour: Jour terminé (0-indexé)
+            simulation_state: État après le jour
+            congestion: Congestion finale du jour par microzone (optionnel)
+        """
+        k = self._remplis
+        self._jours[k] = jour
+        vecteurs = self._vecteurs[k]
+        vecteurs[:] = 0
+        vectors_state = simulation_state.vectors_state
+        for i, mz_id in enumerate(self.microzone_ids):
+            for t, incident_type in enumerate(_TYPES):
+                v = vectors_state.get_vector(mz_id, jour, incident_type)
+                if v is not None:
+                    vecteurs[i, t] = (v.grave, v.moyen, v.benin)
+        self._congestion[k] = np.nan
+        if congestion:
+            for i, mz_id in enumerate(self.microzone_ids):
+                c = congestion.get(mz_id)
+                if c is not None:
+                    self._congestion[k, i] = c
+        for event in simulation_state.events_state.get_events_for_day(jour):
+            grave = isinstance(event, EventGrave)
+            self._evenements.append((
+                jour,
+                event.event_id,
+                event.get_type(),
+                event.arrondissement,
+                event.duration if grave else 1,
+                event.casualties_base if grave else 0,
+                np.nan if grave else getattr(event, "impact_reduction", np.nan),
+            ))
+        self._remplis += 1
+        if self._remplis == self.jours_par_bloc:
+            self.vider()
+
+    def vider(self) -> None:
+        """Écrit le tampon en cours (s'il n'est pas vide) dans un nouveau bloc."""
+        k = self._remplis
+        if k == 0:
+            return
+        colonnes: Dict[str, Any] = {
+            "jour": self._jours[:k],
+            "vecteurs": self._vecteurs[:k],
+            "congestion": self._congestion[:k],
+        }
+        lignes = list(zip(*self._evenements)) if self._evenements else [()] * len(_COLONNES_EVENEMENTS)
+        for (nom, dtype), valeurs in zip(_COLONNES_EVENEMENTS.items(), lignes):
+            colonnes[nom] = np.asarray(valeurs, dtype=dtype)
+        path = self.dossier / f"bloc_{int(self._jours[0]):06d}.npz"
+        self._ecrire_atomique(path, lambda f: np.savez(f, **colonnes))
+        self.fichiers.append(path)
+        self._evenements = []
+        self._remplis = 0
+
+    def fermer(self) -> None:
+        """Écrit le dernier bloc partiel."""
+        self.vider()
+
+    def __enter__(self) -> "FluxResultats":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.fermer()
+
+    def _ecrire_atomique(self, path: Path, ecrire) -> None:
+        fd, tmp = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=self.dossier)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                ecrire(f)
+                if self.fsync == FSYNC_BLOC:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        if self.fsync == FSYNC_BLOC:
+            _fsync_dossier(self.dossier)
+
+
+def lire_flux(run_dir: Path) -> Dict[str, Any]:
+    """
+    Concatène les blocs écrits d'un run (y compris pendant le run ou après interruption).
+
+    Returns:
+        {"microzone_ids", "types", "jour", "vecteurs", "congestion", "evt_*"} ; colonnes vides si aucun bloc
+
+    Raises:
+        FileNotFoundError: Si le run n'a pas de flux
+    """
+    dossier = Path(run_dir) / FLUX_DIRNAME
+    with open(dossier / SCHEMA_FILENAME, "r", encoding="utf-8") as f:
+        schema = json.load(f)
+    n = len(schema["microzone_ids"])
+    blocs = []
+    for path in sorted(dossier.glob("bloc_*.npz")):
+        with np.load(path) as npz:
+            blocs.append({nom: npz[nom] for nom in npz.files})
+    out: Dict[str, Any] = {"microzone_ids": schema["microzone_ids"], "types": schema["types"]}
+    vides = {
+        "jour": np.zeros(0, dtype=np.int32),
+        "vecteurs": np.zeros((0, n, len(schema["types"]), 3), dtype=np.int32),
+        "congestion": np.zeros((0, n), dtype=np.float32),
+        **{nom: np.zeros(0, dtype=dtype) for nom, dtype in _COLONNES_EVENEMENTS.items()},
+    }
+    for nom, vide in vides.items():
+        out[nom] = np.concatenate([b[nom] for b in blocs]) if blocs else vide
+    return out
@@ -0,0 +1,104 @@
+"""
+Statistiques agrégées d'un run, accumulées jour par jour (balayages, comparaisons de scénarios).
+
+Les totaux sont mis à jour à chaque jour terminé : ils restent exacts quand l'historique de
+l'état est purgé (flux sans pickle).
+"""
+
+from typing import Dict, List, Optional
+
+from ..core.data.constants import INCIDENT_TYPE_ACCIDENT, INCIDENT_TYPE_AGRESSION, INCIDENT_TYPE_INCENDIE
+from ..core.events.event_grave import EventGrave
+from ..core.state.regime_state import REGIME_CRISE, REGIME_DETERIORATION, REGIME_STABLE, RegimeState
+from ..core.state.simulation_state import SimulationState
+
+_TYPES = (INCIDENT_TYPE_AGRESSION, INCIDENT_TYPE_INCENDIE, INCIDENT_TYPE_ACCIDENT)
+_REGIMES = {REGIME_STABLE: "stable", REGIME_DETERIORATION: "deterioration", REGIME_CRISE: "crise"}
+
+
+class StatistiquesRun:
+    """
+    Totaux d'incidents (par gravité et par type), événements, morts de base des événements
+    graves et part des microzone-jours passés dans chaque régime ; incidents graves et morts de
+    base par arrondissement si le mapping microzone → arrondissement est fourni.
+    """
+
+    def __init__(self, microzone_ids: List[str], limites_microzone_arrondissement: Optional[Dict[str, int]] = None):
+        self.microzone_ids = list(microzone_ids)
+        self.limites_microzone_arrondissement = limites_microzone_arrondissement
+        arrondissements = sorted(set((limites_microzone_arrondissement or {}).values()))
+        self.incidents_graves_arrondissement = {arr: 0 for arr in arrondissements}
+        self.morts_base_arrondissement = {arr: 0 for arr in arrondissements}
+        self.jours = 0
+        self.gravites = {"grave": 0, "moyen": 0, "benin": 0}
+        self.types = {t: 0 for t in _TYPES}
+        self.evenements_graves = 0
+        self.evenements_positifs = 0
+        self.morts_base_evenements = 0
+        self.microzones_jours_regime = {nom: 0 for nom in _REGIMES.values()}
+
+    def ajouter_jour(self, jour: int, simulation_state: SimulationState, regime_state: RegimeState) -> None:
+        """
+        Ajoute un jour terminé.
+
+        Args:
+            jour: Jour terminé (0-indexé)
+            simulation_state: État après le jour
+            regime_state: Régimes des microzones à la fin du jour
+        """
+        self.jours += 1
+        vectors_state = simulation_state.vectors_state
+        limites = self.limites_microzone_arrondissement
+        for mz_id in self.microzone_ids:
+            arr = limites.get(mz_id) if limites is not None else None
+            for incident_type in _TYPES:
+                v = vectors_state.get_vector(mz_id, jour, incident_type)
+                if v is None:
+                    continue
+                if arr is not None:
+                    self.incidents_graves_arrondissement[arr] += v.grave
+                self.gravites["grave"] += v.grave
+                self.gravites["moyen"] += v.moyen
+                self.gravites["benin"] += v.benin
+                self.types[incident_type] += v.total()
+            regime = _REGIMES.get(regime_state.get_regime_or_default(mz_id))
+            if regime is not None:
+                self.microzones_jours_regime[regime] += 1
+        for event in simulation_state.events_state.get_events_for_day(jour):
+            if isinstance(event, EventGrave):
+                self.evenements_graves += 1
+                self.morts_base_evenements += event.casualties_base
+                if event.arrondissement in self.morts_base_arrondissement:
+                    self.morts_base_arrondissement[event.arrondissement] += event.casualties_base
+            else:
+                self.evenements_positifs += 1
+
+    def resume(self) -> Dict[str, float]:
+        """
+        Returns:
+            Colonnes plates : jours, incidents, incidents_<gravité>, incidents_<type>, incidents_par_jour,
+            evenements_graves, evenements_positifs, morts_base_evenements, part_regime_<régime>
+        """
+        incidents = sum(self.gravites.values())
+        out: Dict[str, float] = {"jours": self.jours, "incidents": incidents}
+        out.update({f"incidents_{g}": n for g, n in self.gravites.items()})
+        out.update({f"incidents_{t}": n for t, n in self.types.items()})
+        out["incidents_par_jour"] = incidents / self.jours if self.jours else 0.0
+        out["evenements_graves"] = self.evenements_graves
+        out["evenements_positifs"] = self.evenements_positifs
+        out["morts_base_evenements"] = self.morts_base_evenements
+        total_regimes = sum(self.microzones_jours_regime.values())
+        for nom, n in self.microzones_jours_regime.items():
+            out[f"part_regime_{nom}"] = n / total_regimes if total_regimes else 0.0
+        return out
+
+    def par_arrondissement(self) -> Dict[str, Dict[int, int]]:
+        """
+        Returns:
+            {"incidents_graves": {arr: n}, "morts_base_evenements": {arr: n}} (arrondissements du
+            mapping, vides sans mapping)
+        """
+        return {
+            "incidents_graves": dict(self.incidents_graves_arrondissement),
+            "morts_base_evenements": dict(self.morts_base_arrondissement),
+        }
@@ -0,0 +1,231 @@
+"""
+Comparaison de deux scénarios par différences appariées.
+
+Les deux scénarios sont simulés avec les mêmes indices et seeds de run ; avec
+simulation.reduction_variance = crn ou antithetique, les tirages des vecteurs partagent leurs
+uniformes (variance_reduction), ce qui corrèle les runs de même indice et réduit la variance de
+la différence. En mode antithétique, chaque paire de runs (2k, 2k+1) est d'abord moyennée :
+l'unité statistique est la paire.
+
+Sortie dans le dossier de la comparaison (en plus de <scenario>/run_XXX) :
+  - comparaison.csv : une ligne par statistique de run — moyennes A et B, différence B − A,
+    demi-largeurs de l'IC apparié et de l'IC d'échantillons indépendants, facteur de réduction
+    de variance
+"""
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from ..core.config.config_validator import Config
+from ..core.generation.shared_static_data import DonneesStatiques, publier_donnees_statiques
+from ..core.generation.variance_reduction import seed_du_run
+from .simulation_service import VARIABILITE_UI_TO_FLOAT, _get_microzone_ids
+from .sweep_service import (
+    _SCENARIO_CONFIG_TO_UI,
+    _ExecuteurBalayage,
+    _executer_tache_worker,
+    _init_worker_balayage,
+)
+
+logger = logging.getLogger(__name__)
+
+COMPARAISON_FILENAME = "comparaison.csv"
+
+
+def estimateur_apparie(
+    a: np.ndarray,
+    b: np.ndarray,
+    confiance: float = 0.95,
+    paires_antithetiques: bool = False,
+) -> Dict[str, float]:
+    """
+    Différence B − A estimée sur des runs appariés (a[i] et b[i] : même indice de run).
+
+    Args:
+        a: Valeurs du scénario A par run
+        b: Valeurs du scénario B par run
+        confiance: Niveau de confiance des IC (loi de Student, n-1 ddl)
+        paires_antithetiques: Moyenner d'abord les runs (2k, 2k+1) ; une paire incomplète est ignorée
+
+    Returns:
+        {"n", "moyenne_a", "moyenne_b", "difference", "ecart_type_difference", "demi_largeur_appariee",
+        "demi_largeur_independante", "facteur_reduction_variance"} ; n = nombre d'unités (runs ou paires).
+        facteur_reduction_variance = (Var A + Var B) / Var(B − A), > 1 quand l'appariement aide.
+    """
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    if a.shape != b.shape or a.ndim != 1:
+        raise ValueError("a et b doivent être deux vecteurs de même longueur")
+    if paires_antithetiques:
+        n_paires = len(a) // 2
+        a = a[: 2 * n_paires].reshape(n_paires, 2).mean(axis=1)
+        b = b[: 2 * n_paires].reshape(n_paires, 2).mean(axis=1)
+    n = len(a)
+    d = b - a
+    resultat = {
+        "n": n,
+        "moyenne_a": float(a.mean()) if n else np.nan,
+        "moyenne_b": float(b.mean()) if n else np.nan,
+        "difference": float(d.mean()) if n else np.nan,
+        "ecart_type_difference": np.nan,
+        "demi_largeur_appariee": np.inf,
+        "demi_largeur_independante": np.inf,
+        "facteur_reduction_variance": np.nan,
+    }
+    if n < 2:
+        return resultat
+    t = stats.t.ppf(0.5 + confiance / 2.0, n - 1)
+    var_d = float(d.var(ddof=1))
+    var_independante = float(a.var(ddof=1) + b.var(ddof=1))
+    resultat.update({
+        "ecart_type_difference": float(np.sqrt(var_d)),
+        "demi_largeur_appariee": float(t * np.sqrt(var_d / n)),
+        "demi_largeur_independante": float(t * np.sqrt(var_independante / n)),
+        "facteur_reduction_variance": (
+            var_independante / var_d if var_d > 0 else (np.inf if var_independante > 0 else np.nan)
+        ),
+    })
+    return resultat
+
+
+def comparer_scenarios(
+    config: Config,
+    output_dir: Path,
+    scenario_a: str = "moyen",
+    scenario_b: str = "pessimiste",
+    variabilite: str = "Moyenne",
+    jours: int = 365,
+    runs: int = 20,
+    seed: Optional[int] = None,
+    workers: int = 1,
+    confiance: float = 0.95,
+    save_pickles: bool = False,
+    save_trace: bool = False,
+    verbose: bool = True,
+) -> pd.DataFrame:
+    """
+    Simule les deux scénarios sur les mêmes runs et écrit comparaison.csv.
+
+    Un run en échec dans l'un des scénarios retire son indice des deux (appariement conservé).
+
+    Args:
+        config: Config validée (simulation.reduction_variance fixe l'appariement des tirages)
+        output_dir: Dossier de la comparaison (<scenario>/run_XXX, comparaison.csv)
+        scenario_a: Scénario de référence (pessimiste, moyen, optimiste)
+        scenario_b: Scénario comparé
+        variabilite: Libellé de variabilité (Faible, Moyenne, Forte)
+        jours: Jours par run
+        runs: Runs par scénario (pair en mode antithétique)
+        seed: Seed de base (défaut : seed de la config)
+        workers: Nombre de processus (1 = dans le processus courant)
+        save_pickles: Sauvegarder simulation_state.pkl par run
+        save_trace: Sauvegarder trace JSON par run
+        verbose: Logger la progression et le résumé
+
+    Returns:
+        Contenu de comparaison.csv (une ligne par statistique)
+    """
+    for scenario in (scenario_a, scenario_b):
+        if scenario not in _SCENARIO_CONFIG_TO_UI:
+            raise ValueError(f"Scénario inconnu : {scenario}")
+    if scenario_a == scenario_b:
+        raise ValueError("Les deux scénarios comparés doivent être différents")
+    if variabilite not in VARIABILITE_UI_TO_FLOAT:
+        raise ValueError(f"Variabilité inconnue : {variabilite}")
+    mode = config.simulation.reduction_variance
+    if runs < 2 or (mode == "antithetique" and runs % 2):
+        raise ValueError("runs doit être >= 2 (et pair en mode antithétique)")
+    if mode == "aucune":
+        logger.warning(
+            "reduction_variance = aucune : seeds partagées mais tirages non alignés, "
+            "l'appariement réduit peu la variance (utiliser crn ou antithetique)"
+        )
+
+    output_dir = Path(output_dir)
+    seed = config.simulation.seed_default if seed is None else seed
+    taches = [
+        {
+            "surcharges": {},
+            "scenario": scenario,
+            "variabilite": variabilite,
+            "jours": jours,
+            "run_idx": i,
+            "runs": runs,
+            "seed": seed_du_run(seed, i, mode),
+            "dossier": str(output_dir / scenario),
+            "save_pickles": save_pickles,
+            "save_trace": save_trace,
+        }
+        for scenario in (scenario_a, scenario_b)
+        for i in range(runs)
+    ]
+    for scenario in (scenario_a, scenario_b):
+        (output_dir / scenario).mkdir(parents=True, exist_ok=True)
+
+    microzone_ids = _get_microzone_ids(config)
+    statistiques: List[Optional[Dict[str, float]]] = [None] * len(taches)
+    if workers > 1:
+        with publier_donnees_statiques() as descripteur:
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(taches)),
+                initializer=_init_worker_balayage,
+                initargs=(config, microzone_ids, descripteur),
+            ) as pool:
+                futures = [pool.submit(_executer_tache_worker, t) for t in taches]
+                for i, future in enumerate(futures):
+                    statistiques[i] = _statistiques_ou_echec(future.result, taches[i])
+    else:
+        executeur = _ExecuteurBalayage(config, microzone_ids, DonneesStatiques.normaliser())
+        for i, tache in enumerate(taches):
+            statistiques[i] = _statistiques_ou_echec(lambda: executeur.executer(tache), tache)
+
+    stats_a, stats_b = statistiques[:runs], statistiques[runs:]
+    if mode == "antithetique":
+        # Une paire dont un run a échoué est retirée entière
+        valides = [
+            i for i in range(runs)
+            if all(s[j] is not None for s in (stats_a, stats_b) for j in (i - i % 2, i - i % 2 + 1))
+        ]
+    else:
+        valides = [i for i in range(runs) if stats_a[i] is not None and stats_b[i] is not None]
+    if len(valides) < 2:
+        raise RuntimeError("Moins de deux runs appariés terminés : comparaison impossible")
+
+    lignes = []
+    for cle in stats_a[valides[0]]:
+        estimation = estimateur_apparie(
+            np.array([stats_a[i][cle] for i in valides]),
+            np.array([stats_b[i][cle] for i in valides]),
+            confiance=confiance,
+            paires_antithetiques=mode == "antithetique",
+        )
+        lignes.append({"statistique": cle, **estimation})
+    df = pd.DataFrame(lignes)
+    df.insert(1, "scenario_a", scenario_a)
+    df.insert(2, "scenario_b", scenario_b)
+    df.insert(3, "reduction_variance", mode)
+    df.to_csv(output_dir / COMPARAISON_FILENAME, index=False)
+    if verbose:
+        ligne = df.set_index("statistique").loc["incidents"] if "incidents" in set(df["statistique"]) else None
+        if ligne is not None:
+            logger.info(
+                "%s − %s (%s, %s unités) : incidents %+.1f ± %.1f (indépendant : ± %.1f, réduction de variance ×%.1f)",
+                scenario_b, scenario_a, mode, ligne["n"], ligne["difference"], ligne["demi_largeur_appariee"],
+                ligne["demi_largeur_independante"], ligne["facteur_reduction_variance"],
+            )
+    return df
+
+
+def _statistiques_ou_echec(executer, tache: Dict[str, Any]) -> Optional[Dict[str, float]]:
+    """Statistiques du run, ou None (journalisé) s'il a échoué."""
+    try:
+        return executer()["statistiques"]
+    except Exception as e:
+        logger.error("Run run_%03d du scénario %s en échec : %s", tache["run_idx"], tache["scenario"], e)
+        return None
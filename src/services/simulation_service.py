@@ -13,17 +13,35 @@ from __future__ import annotations
 
 import json
 import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 from src.core.config.config_validator import Config
+from src.core.generation.generation_context import GenerationContext
 from src.core.generation.generation_service import GenerationService
+from src.core.generation.importance_sampling import Inclinaison
+from src.core.generation.shared_static_data import DonneesStatiques, publier_donnees_statiques
 from src.core.generation.static_vector_loader import StaticVectorLoader
+from src.core.generation.variance_reduction import flux_du_run, seed_du_run
 from src.core.state.simulation_state import SimulationState
+from src.core.utils.async_writer import EcrivainAsynchrone
 from src.core.utils.path_resolver import PathResolver
+from src.services.campaign_manifest import ManifesteCampagne, empreinte_config, somme_fichier
+from src.services.ensemble_statistics import ENSEMBLE_FILENAME, CubeRun, StatistiquesEnsemble
+from src.services.importance_weights import POIDS_FILENAME, ecrire_poids, log_poids_mensuels
+from src.services.result_stream import FluxResultats
+from src.services.run_statistics import StatistiquesRun
 
 logger = logging.getLogger(__name__)
 
+# Historique relu par la génération (matrices intra-type J-7..J-1, récurrence de congestion) :
+# au-delà, les jours déjà écrits dans le flux peuvent être purgés de l'état
+_FENETRE_HISTORIQUE = 7
+
 # Mapping UI → config (scénario) et UI → variabilité locale (float)
 SCENARIO_UI_TO_CONFIG = {
     "Pessimiste": "pessimiste",
@@ -74,11 +92,37 @@ def _resolve_run_params(
     return scenario_config, variabilite_locale, scenario_key, variabilite_label
 
 
-def _limites_microzone_arrondissement_or_parse(microzone_ids: List[str]) -> Dict[str, int]:
-    """Mapping microzone_id → arrondissement (1..20). Charge limites si dispo, sinon parse MZ_XX_YY."""
+def _parametres_generation(config: Config) -> Dict[str, Any]:
+    """
+    Paramètres de GenerationService lus dans la config (valeurs par défaut si section absente) :
+    reduction_base_matrices, reduction_effet_patterns, detection_patterns, mode_creux.
+    """
+    reduction_base = 0.80
+    if getattr(config, "matrices_base", None) is not None:
+        reduction_base = config.matrices_base.reduction_effet
+    elif getattr(config, "realaléatoirisation", None) is not None:
+        rb = getattr(config.realaléatoirisation, "reduction_base_matrices", None)
+        if rb is not None:
+            reduction_base = rb
+    effets_patterns = getattr(config, "effets_patterns", None)
+    simulation = getattr(config, "simulation", None)
+    return {
+        "reduction_base_matrices": reduction_base,
+        "reduction_effet_patterns": effets_patterns.reduction_effet if effets_patterns is not None else 0.8,
+        "detection_patterns": effets_patterns.detection_active if effets_patterns is not None else False,
+        "mode_creux": simulation.mode_creux if simulation is not None else False,
+    }
+
+
+def _limites_microzone_arrondissement_or_parse(
+    microzone_ids: List[str],
+    limites: Optional[Dict[str, int]] = None,
+) -> Dict[str, int]:
+    """Mapping microzone_id → arrondissement (1..20). Limites fournies ou chargées si dispo, sinon parse MZ_XX_YY."""
     try:
-        from src.services.casualty_calculator import CasualtyCalculator
-        limites = CasualtyCalculator.load_limites_microzone_arrondissement()
+        if limites is None:
+            from src.services.casualty_calculator import CasualtyCalculator
+            limites = CasualtyCalculator.load_limites_microzone_arrondissement()
         if limites:
             return {mz: limites.get(mz, _parse_arr(mz)) for mz in microzone_ids}
     except (FileNotFoundError, ValueError, Exception):
@@ -114,6 +158,48 @@ def _get_microzone_ids(config: Optional[Config] = None) -> List[str]:
     return list(loader.vecteurs_statiques.keys())
 
 
+class ErreurEcritureRun(Exception):
+    """
+    Erreur d'écriture asynchrone des sorties d'un run, relevée par l'écrivain pendant un run
+    suivant ; déjà enregistrée au manifeste pour le run qui l'a produite (run_id).
+    """
+
+    def __init__(self, run_id: str, erreur: Exception):
+        super().__init__(f"{run_id} : {erreur}")
+        self.run_id = run_id
+
+
+# Service du processus de travail (run_headless avec workers > 1), créé par _init_worker_headless
+_WORKER_SERVICE: Optional["SimulationService"] = None
+
+
+def _init_worker_headless(
+    config: Config,
+    seed: int,
+    microzone_ids: List[str],
+    descripteur: Optional[Dict[str, Any]] = None,
+) -> None:
+    """Initialiseur de processus : service créé et données statiques attachées une fois par worker."""
+    global _WORKER_SERVICE
+    _WORKER_SERVICE = SimulationService(config=config, seed=seed)
+    _WORKER_SERVICE._microzone_ids = list(microzone_ids)
+    _WORKER_SERVICE.precharger_donnees_statiques(descripteur)
+
+
+def _run_headless_worker(params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Exécute un run dans le processus de travail ; retourne son résultat (seed, fichiers, temps)
+    et, avec save_ensemble, l'ensemble de ce seul run (fusionné par le processus principal).
+    """
+    svc = _WORKER_SERVICE
+    params = dict(params)
+    ensemble = StatistiquesEnsemble() if params.pop("save_ensemble", False) else None
+    resultat = svc._run_one_headless_iteration(microzone_ids=svc._microzone_ids, ensemble=ensemble, **params)
+    if ensemble is not None:
+        resultat["ensemble"] = ensemble
+    return resultat
+
+
 class SimulationService:
     """
     Orchestre la simulation : chargement config, runs headless, intégration GenerationService.
@@ -126,12 +212,66 @@ class SimulationService:
         # Cache du GenerationService pour advance_one_day (évite de réinitialiser le RNG à chaque jour)
         self._cached_gen: Optional[GenerationService] = None
         self._cached_gen_run_id: Optional[str] = None
+        # Données statiques partagées entre runs (precharger_donnees_statiques), None → chargées depuis fichiers
+        self._donnees_statiques: Optional[DonneesStatiques] = None
+        # Contexte de génération partagé par tous les runs et jours (_contexte_generation)
+        self._contexte: Optional[GenerationContext] = None
 
     def _microzone_ids_or_load(self) -> List[str]:
         if self._microzone_ids is None:
             self._microzone_ids = _get_microzone_ids(self.config)
         return self._microzone_ids
 
+    def precharger_donnees_statiques(self, descripteur: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Charge une fois les données statiques, réutilisées en lecture seule par les runs suivants.
+
+        Args:
+            descripteur: Segment publié par publier_donnees_statiques (attache sans copie) ;
+                None → chargement et normalisation depuis data/source_data
+        """
+        if self._donnees_statiques is None:
+            self._donnees_statiques = (
+                DonneesStatiques.attacher(descripteur) if descripteur is not None else DonneesStatiques.normaliser()
+            )
+            self._contexte = None
+
+    def _reduction_variance(self) -> str:
+        return (
+            self.config.simulation.reduction_variance
+            if getattr(self.config, "simulation", None) is not None
+            else "aucune"
+        )
+
+    def _seed_du_run(self, run_idx: int) -> int:
+        """Seed du run run_idx (seed + indice ; seed de la paire en mode antithétique)."""
+        return seed_du_run(self._seed, run_idx, self._reduction_variance())
+
+    def _lissage_alpha(self) -> float:
+        return (
+            self.config.vecteurs_statiques.lissage_alpha
+            if self.config.vecteurs_statiques is not None
+            else 0.7
+        )
+
+    def _contexte_generation(self, microzone_ids: List[str]) -> GenerationContext:
+        """
+        Contexte statique de génération, construit au premier appel puis réutilisé par
+        tous les runs (headless, run_one) et par advance_one_day.
+        """
+        lissage_alpha = self._lissage_alpha()
+        if (
+            self._contexte is None
+            or list(self._contexte.microzone_ids) != list(microzone_ids)
+            or self._contexte.lissage_alpha != lissage_alpha
+        ):
+            self._contexte = GenerationContext(
+                microzone_ids,
+                lissage_alpha=lissage_alpha,
+                donnees_statiques=self._donnees_statiques,
+            )
+        return self._contexte
+
     def run_headless(
         self,
         days: int,
@@ -143,11 +283,42 @@ class SimulationService:
         scenario_ui: Optional[str] = None,
         variabilite_ui: Optional[str] = None,
         debug_prints: bool = False,
-    ) -> None:
+        workers: int = 1,
+        resume: bool = False,
+        save_stream: bool = False,
+        save_ensemble: bool = False,
+    ) -> List[int]:
         """
         Exécute N runs × M jours sans UI.
         Optionnellement sauvegarde état (pickle) et trace par run.
 
+        Avec workers > 1, les runs sont répartis sur un ProcessPoolExecutor : même seed par
+        run (seed + indice) et mêmes fichiers qu'en séquentiel, progression journalisée dans
+        l'ordre des runs, un run en échec n'interrompt pas les autres.
+
+        Dès que des fichiers sont sauvegardés, un manifeste (manifest.json du dossier de sortie)
+        enregistre chaque run terminé : seed, empreinte de configuration, sommes des fichiers,
+        temps. Avec resume=True, les runs déjà vérifiés sont sautés ; seuls les runs absents,
+        en échec, corrompus ou produits avec une autre configuration sont relancés.
+
+        Avec save_stream=True, chaque jour est ajouté au flux du run (run_XXX/stream, voir
+        FluxResultats) pendant la simulation ; sans pickle, l'état ne garde que la fenêtre
+        d'historique utile et la mémoire ne dépend plus de l'horizon.
+
+        En séquentiel, pickles et traces sont écrits par un thread d'écriture (EcrivainAsynchrone) :
+        la simulation du run suivant recouvre l'écriture du précédent ; toutes les écritures sont
+        terminées au retour.
+
+        Avec une section echantillonnage_preferentiel active, chaque run écrit ses poids de
+        vraisemblance (poids_importance.json) ; les statistiques d'ensemble restent non pondérées.
+
+        Avec save_ensemble=True, les incidents de chaque run par (jour, arrondissement, type,
+        gravité) alimentent des statistiques d'ensemble (StatistiquesEnsemble : moyenne,
+        écart-type, quantiles, min, max). ensemble.npz est réécrit après chaque run, avant son
+        enregistrement dans le manifeste ; à la reprise, l'ensemble existant est complété et les
+        runs vérifiés qui n'y figurent pas (fichier absent, campagne lancée sans save_ensemble)
+        sont relancés.
+
         Args:
             days: Nombre de jours par run
             runs: Nombre de runs
@@ -158,6 +329,13 @@ class SimulationService:
             scenario_ui: Scénario UI (Pessimiste, Standard, Optimiste) ou None → moyen
             variabilite_ui: Variabilité UI (Faible, Moyenne, Forte) ou None → Moyenne
             debug_prints: Si True, affiche des prints (événements graves, positifs, microzones > 6)
+            workers: Nombre de processus (1 = séquentiel)
+            resume: Reprendre la campagne du manifeste existant (runs vérifiés non relancés)
+            save_stream: Écrire le flux journalier par blocs (vecteurs, congestion, événements)
+            save_ensemble: Agréger les statistiques d'ensemble des runs (ensemble.npz)
+
+        Returns:
+            Indices des runs en échec (toujours vide en séquentiel : l'exception est propagée)
         """
         base = output_dir or PathResolver.get_project_root() / "data" / "intermediate"
         microzone_ids = self._microzone_ids_or_load()
@@ -166,23 +344,234 @@ class SimulationService:
             _resolve_run_params(self.config, scenario_ui, variabilite_ui)
         )
 
-        for run_idx in range(runs):
-            self._run_one_headless_iteration(
-                run_idx=run_idx,
-                runs=runs,
+        manifeste = None
+        a_executer = list(range(runs))
+        if save_pickles or save_trace or save_stream or save_ensemble:
+            config_hash = empreinte_config(
+                config_dict,
                 days=days,
-                base=base,
-                microzone_ids=microzone_ids,
                 scenario_config=scenario_config,
                 variabilite_locale=variabilite_locale,
-                scenario_key=scenario_key,
-                variabilite_label=variabilite_label,
                 save_pickles=save_pickles,
                 save_trace=save_trace,
-                verbose=verbose,
-                debug_prints=debug_prints,
-                on_vectors_progress=None,
+                save_stream=save_stream,
+            )
+            manifeste = ManifesteCampagne.ouvrir(base, config_hash, reprise=resume)
+
+        ensemble = None
+        if save_ensemble:
+            ensemble = self._ouvrir_ensemble(base, manifeste, resume)
+        if manifeste is not None and resume:
+            verifies = [
+                run_idx for run_idx in a_executer
+                if manifeste.run_verifie(f"run_{run_idx:03d}", self._seed_du_run(run_idx))
+            ]
+            if ensemble is not None:
+                hors_ensemble = [i for i in verifies if f"run_{i:03d}" not in ensemble.run_ids]
+                if hors_ensemble:
+                    logger.warning(
+                        "Runs vérifiés absents des statistiques d'ensemble, relancés : %s",
+                        ", ".join(f"run_{i:03d}" for i in hors_ensemble),
+                    )
+                verifies = [i for i in verifies if i not in hors_ensemble]
+            a_executer = [run_idx for run_idx in a_executer if run_idx not in verifies]
+            if verbose:
+                    logger.info(
+                    "Reprise : %s run(s) vérifié(s) sautés, %s à exécuter",
+                    runs - len(a_executer), len(a_executer),
+                )
+
+        if save_ensemble and Inclinaison.depuis_config(self.config) is not None:
+            logger.warning(
+                "Échantillonnage préférentiel actif : statistiques d'ensemble non pondérées "
+                "(utiliser les poids de %s pour revenir à la loi nominale)", POIDS_FILENAME,
+            )
+        echecs = self._executer_runs_headless(
+            a_executer, runs, days, base, microzone_ids, scenario_config, variabilite_locale,
+            scenario_key, variabilite_label, save_pickles, save_trace, save_stream, verbose,
+            debug_prints, workers, manifeste, ensemble,
+        )
+        if ensemble is not None and ensemble.n and verbose:
+            logger.info("Statistiques d'ensemble (%s runs) → %s", ensemble.n, base / ENSEMBLE_FILENAME)
+        return echecs
+
+    def _ouvrir_ensemble(self, base: Path, manifeste: ManifesteCampagne, resume: bool) -> StatistiquesEnsemble:
+        """Ensemble de la campagne : repris depuis ensemble.npz (même empreinte) ou nouveau."""
+        path = base / ENSEMBLE_FILENAME
+        if resume:
+            if not path.exists():
+                logger.warning("%s absent : statistiques d'ensemble recommencées", path)
+            else:
+                ensemble = StatistiquesEnsemble.charger(path)
+                if ensemble.config_hash == manifeste.config_hash:
+                    return ensemble
+                logger.warning("%s produit avec une autre configuration : ensemble recommencé", path)
+        return StatistiquesEnsemble(config_hash=manifeste.config_hash)
+
+    def _executer_runs_headless(
+        self,
+        a_executer: List[int],
+        runs: int,
+        days: int,
+        base: Path,
+        microzone_ids: List[str],
+        scenario_config: Dict[str, Any],
+        variabilite_locale: float,
+        scenario_key: str,
+        variabilite_label: str,
+        save_pickles: bool,
+        save_trace: bool,
+        save_stream: bool,
+        verbose: bool,
+        debug_prints: bool,
+        workers: int,
+        manifeste: Optional[ManifesteCampagne],
+        ensemble: Optional[StatistiquesEnsemble],
+    ) -> List[int]:
+        """Exécute les runs à faire (séquentiel ou pool) ; voir run_headless."""
+        if workers > 1 and len(a_executer) > 1:
+            params = [
+                {
+                    "run_idx": run_idx,
+                    "runs": runs,
+                    "days": days,
+                    "base": base,
+                    "scenario_config": scenario_config,
+                    "variabilite_locale": variabilite_locale,
+                    "scenario_key": scenario_key,
+                    "variabilite_label": variabilite_label,
+                    "save_pickles": save_pickles,
+                    "save_trace": save_trace,
+                    "save_stream": save_stream,
+                    "save_ensemble": ensemble is not None,
+                    "verbose": False,
+                    "debug_prints": debug_prints,
+                }
+                for run_idx in a_executer
+            ]
+            return self._run_headless_parallel(
+                params, min(workers, len(a_executer)), microzone_ids, verbose, manifeste, ensemble
+            )
+
+        with EcrivainAsynchrone() as ecrivain:
+            for run_idx in a_executer:
+                try:
+                    self._run_one_headless_iteration(
+                        run_idx=run_idx,
+                        runs=runs,
+                        days=days,
+                        base=base,
+                        microzone_ids=microzone_ids,
+                        scenario_config=scenario_config,
+                        variabilite_locale=variabilite_locale,
+                        scenario_key=scenario_key,
+                        variabilite_label=variabilite_label,
+                        save_pickles=save_pickles,
+                        save_trace=save_trace,
+                        save_stream=save_stream,
+                        verbose=verbose,
+                        debug_prints=debug_prints,
+                        on_vectors_progress=None,
+                        ecrivain=ecrivain,
+                        manifeste=manifeste,
+                        ensemble=ensemble,
+                        sauver_ensemble=ensemble is not None,
+                    )
+                except ErreurEcritureRun:
+                    # Échec d'écriture d'un run précédent, enregistré pour ce run-là
+                    raise
+                except Exception as e:
+                    if manifeste is not None:
+                        manifeste.enregistrer_echec(f"run_{run_idx:03d}", self._seed_du_run(run_idx), str(e))
+                    raise
+        return []
+
+    def _run_headless_parallel(
+        self,
+        params: List[Dict[str, Any]],
+        workers: int,
+        microzone_ids: List[str],
+        verbose: bool,
+        manifeste: Optional[ManifesteCampagne] = None,
+        ensemble: Optional[StatistiquesEnsemble] = None,
+    ) -> List[int]:
+        """
+        Répartit les runs sur `workers` processus.
+
+        Les runs perdus avec un processus mort (pool cassé) sont relancés chacun dans un
+        pool dédié, pour isoler le run fautif.
+
+        Returns:
+            Indices des runs en échec, triés
+        """
+        echecs: List[int] = []
+        # Données statiques chargées une fois et publiées en mémoire partagée pour tous les workers
+        with publier_donnees_statiques() as descripteur:
+            perdus = self._executer_pool(
+                params, workers, microzone_ids, descripteur, verbose, echecs, manifeste, ensemble
             )
+            for p in perdus:
+                for reste in self._executer_pool(
+                    [p], 1, microzone_ids, descripteur, verbose, echecs, manifeste, ensemble
+                ):
+                    logger.error("Run %s/%s en échec : processus interrompu", reste["run_idx"] + 1, reste["runs"])
+                    echecs.append(reste["run_idx"])
+                    if manifeste is not None:
+                        manifeste.enregistrer_echec(
+                            f"run_{reste['run_idx']:03d}", self._seed_du_run(reste["run_idx"]), "processus interrompu"
+                        )
+        if echecs:
+            logger.error("%s run(s) en échec sur %s : %s", len(echecs), len(params), sorted(echecs))
+        return sorted(echecs)
+
+    def _executer_pool(
+        self,
+        params: List[Dict[str, Any]],
+        workers: int,
+        microzone_ids: List[str],
+        descripteur: Dict[str, Any],
+        verbose: bool,
+        echecs: List[int],
+        manifeste: Optional[ManifesteCampagne] = None,
+        ensemble: Optional[StatistiquesEnsemble] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Un passage sur un pool : résultats lus dans l'ordre des runs (enregistrés dans le
+        manifeste, ensembles des runs fusionnés), exceptions ajoutées à `echecs`.
+
+        Returns:
+            Paramètres des runs perdus avec le pool (processus mort)
+        """
+        perdus = []
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker_headless,
+            initargs=(self.config, self._seed, microzone_ids, descripteur),
+        ) as pool:
+            futures = [pool.submit(_run_headless_worker, p) for p in params]
+            for p, future in zip(params, futures):
+                try:
+                    resultat = future.result()
+                except BrokenProcessPool:
+                    perdus.append(p)
+                    continue
+                except Exception as e:
+                    logger.error("Run %s/%s en échec : %s", p["run_idx"] + 1, p["runs"], e)
+                    echecs.append(p["run_idx"])
+                    if manifeste is not None:
+                        manifeste.enregistrer_echec(f"run_{p['run_idx']:03d}", self._seed_du_run(p["run_idx"]), str(e))
+                    continue
+                if ensemble is not None and resultat["run_id"] not in ensemble.run_ids:
+                    ensemble.fusionner(resultat["ensemble"])
+                    ensemble.sauvegarder(Path(p["base"]) / ENSEMBLE_FILENAME)
+                if manifeste is not None:
+                    manifeste.enregistrer_succes(resultat["run_id"], resultat)
+                if verbose:
+                    logger.info(
+                        "Run %s/%s terminé (%s jours) — scénario=%s, variabilité=%s",
+                        p["run_idx"] + 1, p["runs"], p["days"], p["scenario_key"], p["variabilite_label"],
+                    )
+        return perdus
 
     VECTORS_PRINT_INTERVAL = 10000  # Print sample every ~10000 vectors (console)
 
@@ -202,9 +591,34 @@ class SimulationService:
         verbose: bool,
         debug_prints: bool,
         on_vectors_progress: Optional[Any] = None,
-    ) -> None:
-        """Une itération headless : un run complet, sauvegarde pickle/trace, optionnel callback vecteurs."""
+        save_stream: bool = False,
+        ecrivain: Optional[EcrivainAsynchrone] = None,
+        manifeste: Optional[ManifesteCampagne] = None,
+        seed_run: Optional[int] = None,
+        statistiques: bool = False,
+        ensemble: Optional[StatistiquesEnsemble] = None,
+        sauver_ensemble: bool = False,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Une itération headless : un run complet, sauvegarde pickle/trace, optionnel callback vecteurs.
+
+        Args:
+            ecrivain: Si fourni, pickle et trace sont écrits par ce thread d'écriture (retour immédiat)
+            manifeste: Si fourni, le run y est enregistré une fois ses fichiers écrits
+            seed_run: Seed du run (défaut : seed du service + run_idx, ou seed de la paire en mode antithétique)
+            statistiques: Ajouter au résultat les statistiques agrégées du run (StatistiquesRun)
+            ensemble: Statistiques d'ensemble complétées par le cube du run une fois ses fichiers écrits
+            sauver_ensemble: Réécrire ensemble.npz après l'ajout du run, avant le manifeste (processus
+                principal ; un worker renvoie l'ensemble de son run)
+
+        Returns:
+            {"run_id", "seed", "fichiers": {nom: sha256}, "debut", "fin", "duree_s"
+            [, "statistiques", "statistiques_arrondissement"] [, "log_poids", "log_poids_mensuels"]}
+            (manifeste de campagne) ; None avec un écrivain (résultat enregistré dans le manifeste après écriture)
+        """
         run_id = f"run_{run_idx:03d}"
+        debut = datetime.now().isoformat(timespec="seconds")
+        t0 = time.perf_counter()
         if verbose:
             logger.info(
                 "Run %s/%s (%s jours) — scénario=%s, variabilité=%s",
@@ -214,8 +628,12 @@ class SimulationService:
         state = SimulationState(run_id=run_id, config=self.config.model_dump())
         state.dynamic_state.ensure_microzones(microzone_ids)
 
-        seed_run = self._seed + run_idx
-        limites_mz_arr = _limites_microzone_arrondissement_or_parse(microzone_ids)
+        if seed_run is None:
+            seed_run = self._seed_du_run(run_idx)
+        limites_mz_arr = _limites_microzone_arrondissement_or_parse(
+            microzone_ids,
+            self._donnees_statiques.limites_microzone_arrondissement() if self._donnees_statiques is not None else None,
+        )
         arrondissements = sorted(set(limites_mz_arr.values()))
         realaléatoirisation_config = {}
         if getattr(self.config, "realaléatoirisation", None) is not None:
@@ -228,39 +646,41 @@ class SimulationService:
             config=realaléatoirisation_config,
             seed=seed_run,
         )
-        lissage_alpha = (
-            self.config.vecteurs_statiques.lissage_alpha
-            if self.config.vecteurs_statiques is not None
-            else 0.7
-        )
-        reduction_base = 0.80
-        if getattr(self.config, "matrices_base", None) is not None:
-            reduction_base = self.config.matrices_base.reduction_effet
-        elif getattr(self.config, "realaléatoirisation", None) is not None:
-            rb = getattr(self.config.realaléatoirisation, "reduction_base_matrices", None)
-            if rb is not None:
-                reduction_base = rb
-        reduction_effet_patterns = (
-            self.config.effets_patterns.reduction_effet
-            if getattr(self.config, "effets_patterns", None) is not None
-            else 0.8
-        )
+        inclinaison = Inclinaison.depuis_config(self.config)
         gen = GenerationService(
             microzone_ids=microzone_ids,
             seed=seed_run,
             scenario_config=scenario_config,
             variabilite_locale=variabilite_locale,
             debug_prints=debug_prints,
-            lissage_alpha=lissage_alpha,
-            reduction_base_matrices=reduction_base,
-            reduction_effet_patterns=reduction_effet_patterns,
+            **_parametres_generation(self.config),
+            flux_communs=flux_du_run(seed_run, run_idx, self._reduction_variance()),
+            inclinaison=inclinaison,
+            contexte=self._contexte_generation(microzone_ids),
         )
         gen.set_realaléatoirisation_state(state.realaléatoirisation_state)
 
+        run_dir = base / run_id
+        flux = FluxResultats(run_dir, microzone_ids) if save_stream else None
+        # Flux sans pickle : jours hors fenêtre d'historique purgés de l'état (déjà écrits dans le flux)
+        purger = flux is not None and not save_pickles
+        stats = StatistiquesRun(microzone_ids, limites_mz_arr) if statistiques else None
+        cube = CubeRun(days, limites_mz_arr) if ensemble is not None else None
+
         # Callback : compteur de vecteurs (~1 par microzone par jour), print échantillon tous les 10000
         total_vectors = [0]  # mutable pour closure
 
         def on_day_completed(day: int, sim_state: SimulationState) -> None:
+            if stats is not None:
+                stats.ajouter_jour(day, sim_state, gen.generator.regime_state)
+            if cube is not None:
+                cube.ajouter_jour(day, sim_state)
+            if flux is not None:
+                congestion = {mz: gen.congestion_calculator.get_congestion(mz, day) for mz in microzone_ids}
+                flux.ajouter_jour(day, sim_state, congestion)
+                if purger and day >= _FENETRE_HISTORIQUE:
+                    sim_state.vectors_state.clear_day(day - _FENETRE_HISTORIQUE)
+                    gen.congestion_calculator.clear_day(day - _FENETRE_HISTORIQUE)
             total_vectors[0] += len(microzone_ids)
             if total_vectors[0] >= self.VECTORS_PRINT_INTERVAL:
                 if on_vectors_progress is not None:
@@ -285,37 +705,94 @@ class SimulationService:
                             f"microzone={mz_sample} dynamic_sample={sample}"
                         )
 
-        gen.generate_multiple_days(
-            state, start_day=0, num_days=days,
-            on_day_completed=on_day_completed,
-        )
-
-        run_dir = base / run_id
-        if save_pickles or save_trace:
-            run_dir.mkdir(parents=True, exist_ok=True)
-
-        if save_pickles:
-            pkl_path = run_dir / "simulation_state.pkl"
-            state.save(str(pkl_path))
-            if verbose:
-                logger.info("  → %s", pkl_path)
-
-        if save_trace:
-            trace = {
+        try:
+            gen.generate_multiple_days(
+                state, start_day=0, num_days=days,
+                on_day_completed=on_day_completed,
+            )
+        finally:
+            # Dernier bloc partiel écrit même si le run échoue : les jours simulés restent lisibles
+            if flux is not None:
+                flux.fermer()
+
+        # L'état n'est plus modifié après la génération : il peut être écrit depuis un autre thread
+        def ecrire_sorties() -> Dict[str, Any]:
+            try:
+                if save_pickles or save_trace or inclinaison is not None:
+                    run_dir.mkdir(parents=True, exist_ok=True)
+
+                if save_pickles:
+                    pkl_path = run_dir / "simulation_state.pkl"
+                    state.save(str(pkl_path))
+                    if verbose:
+                        logger.info("  → %s", pkl_path)
+
+                if save_trace:
+                    trace = {
+                        "run_id": run_id,
+                        "days": days,
+                        "completed": True,
+                        "final_day": state.current_day,
+                        "scenario": scenario_key,
+                        "variabilite": variabilite_label,
+                        "variabilite_locale": variabilite_locale,
+                        "seed": seed_run,
+                    }
+                    trace_path = run_dir / "trace.json"
+                    with open(trace_path, "w", encoding="utf-8") as f:
+                        json.dump(trace, f, indent=2)
+                    if verbose:
+                        logger.info("  → %s", trace_path)
+
+                log_rapport_jours = None
+                if inclinaison is not None:
+                    log_rapport_jours = [gen.generator.log_rapport_jours.get(j, 0.0) for j in range(days)]
+                    ecrire_poids(run_dir, inclinaison, log_rapport_jours)
+
+                fichiers = {}
+                if log_rapport_jours is not None:
+                    fichiers[POIDS_FILENAME] = somme_fichier(run_dir / POIDS_FILENAME)
+                if save_pickles:
+                    fichiers["simulation_state.pkl"] = somme_fichier(run_dir / "simulation_state.pkl")
+                if save_trace:
+                    fichiers["trace.json"] = somme_fichier(run_dir / "trace.json")
+                if flux is not None:
+                    for path in [flux.dossier / "schema.json"] + flux.fichiers:
+                        fichiers[path.relative_to(run_dir).as_posix()] = somme_fichier(path)
+            except Exception as e:
+                if manifeste is not None:
+                    manifeste.enregistrer_echec(run_id, seed_run, str(e))
+                raise
+            resultat = {
                 "run_id": run_id,
-                "days": days,
-                "completed": True,
-                "final_day": state.current_day,
-                "scenario": scenario_key,
-                "variabilite": variabilite_label,
-                "variabilite_locale": variabilite_locale,
                 "seed": seed_run,
+                "fichiers": fichiers,
+                "debut": debut,
+                "fin": datetime.now().isoformat(timespec="seconds"),
+                "duree_s": round(time.perf_counter() - t0, 3),
             }
-            trace_path = run_dir / "trace.json"
-            with open(trace_path, "w", encoding="utf-8") as f:
-                json.dump(trace, f, indent=2)
-            if verbose:
-                logger.info("  → %s", trace_path)
+            if log_rapport_jours is not None:
+                resultat["log_poids"] = float(sum(log_rapport_jours))
+                resultat["log_poids_mensuels"] = log_poids_mensuels(log_rapport_jours).tolist()
+            if stats is not None:
+                resultat["statistiques"] = stats.resume()
+                resultat["statistiques_arrondissement"] = stats.par_arrondissement()
+            if cube is not None and ensemble.ajouter(run_id, cube) and sauver_ensemble:
+                ensemble.sauvegarder(base / ENSEMBLE_FILENAME)
+            if manifeste is not None:
+                manifeste.enregistrer_succes(run_id, resultat)
+            return resultat
+
+        if ecrivain is not None:
+            def ecrire_sorties_async() -> None:
+                try:
+                    ecrire_sorties()
+                except Exception as e:
+                    raise ErreurEcritureRun(run_id, e) from e
+
+            ecrivain.soumettre(ecrire_sorties_async)
+            return None
+        return ecrire_sorties()
 
     def run_single_headless_run(
         self,
@@ -412,32 +889,15 @@ class SimulationService:
             seed=self._seed,
         )
 
-        lissage_alpha = (
-            self.config.vecteurs_statiques.lissage_alpha
-            if self.config.vecteurs_statiques is not None
-            else 0.7
-        )
-        reduction_base = 0.80
-        if getattr(self.config, "matrices_base", None) is not None:
-            reduction_base = self.config.matrices_base.reduction_effet
-        elif getattr(self.config, "realaléatoirisation", None) is not None:
-            rb = getattr(self.config.realaléatoirisation, "reduction_base_matrices", None)
-            if rb is not None:
-                reduction_base = rb
-        reduction_effet_patterns = (
-            self.config.effets_patterns.reduction_effet
-            if getattr(self.config, "effets_patterns", None) is not None
-            else 0.8
-        )
         gen = GenerationService(
             microzone_ids=microzone_ids,
             seed=self._seed,
             scenario_config=scenario_config,
             variabilite_locale=variabilite_locale,
             debug_prints=debug_prints,
-            lissage_alpha=lissage_alpha,
-            reduction_base_matrices=reduction_base,
-            reduction_effet_patterns=reduction_effet_patterns,
+            **_parametres_generation(self.config),
+            flux_communs=flux_du_run(self._seed, 0, self._reduction_variance()),
+            contexte=self._contexte_generation(microzone_ids),
         )
         gen.set_realaléatoirisation_state(state.realaléatoirisation_state)
         gen.generate_multiple_days(state, start_day=0, num_days=days)
@@ -490,23 +950,6 @@ class SimulationService:
             self.config, scenario_ui, variabilite_ui
         )
         from src.core.generation.generation_service import GenerationService
-        lissage_alpha = (
-            self.config.vecteurs_statiques.lissage_alpha
-            if self.config.vecteurs_statiques is not None
-            else 0.7
-        )
-        reduction_base = 0.80
-        if getattr(self.config, "matrices_base", None) is not None:
-            reduction_base = self.config.matrices_base.reduction_effet
-        elif getattr(self.config, "realaléatoirisation", None) is not None:
-            rb = getattr(self.config.realaléatoirisation, "reduction_base_matrices", None)
-            if rb is not None:
-                reduction_base = rb
-        reduction_effet_patterns = (
-            self.config.effets_patterns.reduction_effet
-            if getattr(self.config, "effets_patterns", None) is not None
-            else 0.8
-        )
         # Réutiliser le GenerationService entre les jours pour préserver l'état du RNG
         if (
             self._cached_gen is not None
@@ -523,9 +966,9 @@ class SimulationService:
                 scenario_config=scenario_config,
                 variabilite_locale=variabilite_locale,
                 debug_prints=debug_prints,
-                lissage_alpha=lissage_alpha,
-                reduction_base_matrices=reduction_base,
-                reduction_effet_patterns=reduction_effet_patterns,
+                **_parametres_generation(self.config),
+                flux_communs=flux_du_run(self._seed, 0, self._reduction_variance()),
+                contexte=self._contexte_generation(microzone_ids),
             )
             if getattr(state, "realaléatoirisation_state", None) is not None:
                 gen.set_realaléatoirisation_state(state.realaléatoirisation_state)
@@ -0,0 +1,365 @@
+"""
+Émulateur (modèle de substitution) des statistiques de run en fonction de paramètres de config.
+
+Un espace de paramètres (chemins pointés de la config et bornes) est échantillonné par
+hypercube latin ; chaque point est simulé par le balayage (sweep_service, une cellule par
+point, un run par seed). Un émulateur par statistique de StatistiquesRun est ajusté sur les
+runs : processus gaussien (noyau Matérn + bruit blanc, le bruit représentant la variabilité
+entre seeds) ou gradient boosting (moyenne + régressions quantiles pour l'intervalle).
+
+predict_summary(config) prédit en quelques millisecondes la statistique attendue d'un run et
+un intervalle de prédiction ; le criblage de milliers de configurations se fait avec
+predire(points), seules les plus prometteuses passant ensuite en simulation complète. Le
+rapport de validation compare les prédictions à des runs réels d'un plan tenu à l'écart.
+
+Sorties dans le dossier de l'émulateur :
+  - apprentissage/, validation/ : balayages des deux plans (resume_runs.csv, cellule_XXX)
+  - emulateur.joblib : émulateur ajusté (Emulateur.charger)
+  - validation_emulateur.csv : une ligne par statistique (RMSE, R², couverture de l'intervalle)
+"""
+
+import json
+import logging
+import warnings
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy import stats
+from scipy.stats import qmc
+from sklearn.ensemble import GradientBoostingRegressor
+from sklearn.exceptions import ConvergenceWarning
+from sklearn.gaussian_process import GaussianProcessRegressor
+from sklearn.gaussian_process.kernels import ConstantKernel, Matern, WhiteKernel
+
+from ..core.config.config_validator import Config
+from .sweep_service import RESUME_RUNS_FILENAME, GrilleBalayage, executer_balayage
+
+logger = logging.getLogger(__name__)
+
+EMULATEUR_FILENAME = "emulateur.joblib"
+VALIDATION_FILENAME = "validation_emulateur.csv"
+METHODES_EMULATEUR = ("gp", "gradient_boosting")
+
+# Colonnes de resume_runs.csv qui ne sont pas des statistiques de run
+_COLONNES_NON_STATISTIQUES = [
+    "cellule", "scenario", "variabilite", "jours", "surcharges", "seed", "run_id", "statut", "erreur", "duree_s",
+]
+
+
+@dataclass
+class EspaceParametres:
+    """
+    Paramètres émulés : chemin pointé de la config → (borne basse, borne haute).
+
+    Les chemins sont ceux des surcharges de balayage ("matrices_base.reduction_effet").
+    """
+
+    bornes: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if not self.bornes:
+            raise ValueError("L'espace de paramètres doit contenir au moins un paramètre")
+        self.bornes = {k: (float(b[0]), float(b[1])) for k, b in self.bornes.items()}
+        invalides = [k for k, (bas, haut) in self.bornes.items() if not bas < haut]
+        if invalides:
+            raise ValueError(f"Bornes invalides (basse ≥ haute) : {invalides}")
+
+    @classmethod
+    def defaut(cls, scenario: str = "moyen") -> "EspaceParametres":
+        """Intensité et proba de crise du scénario, réductions d'effet des matrices et des patterns."""
+        return cls({
+            f"scenarios.{scenario}.facteur_intensite": (0.5, 2.0),
+            f"scenarios.{scenario}.proba_crise": (0.0, 0.3),
+            "matrices_base.reduction_effet": (-1.0, 0.8),
+            "effets_patterns.reduction_effet": (-1.0, 0.8),
+        })
+
+    @property
+    def parametres(self) -> List[str]:
+        return list(self.bornes)
+
+    def plan_hypercube(self, n: int, seed: Optional[int] = None) -> List[Dict[str, float]]:
+        """n points d'un hypercube latin dans les bornes, sous forme de surcharges."""
+        if n < 1:
+            raise ValueError("Le plan doit contenir au moins un point")
+        bas, haut = np.array(list(self.bornes.values())).T
+        points = qmc.scale(qmc.LatinHypercube(d=len(self.bornes), seed=seed).random(n), bas, haut)
+        return [{k: float(v) for k, v in zip(self.parametres, point)} for point in points]
+
+    def valeurs(self, config: Config) -> Dict[str, float]:
+        """
+        Valeurs des paramètres dans une config.
+
+        Raises:
+            KeyError: Si un chemin n'existe pas dans la config
+        """
+        d = config.model_dump()
+        valeurs = {}
+        for chemin in self.parametres:
+            noeud: Any = d
+            for cle in chemin.split("."):
+                if not isinstance(noeud, dict) or cle not in noeud:
+                    raise KeyError(f"Paramètre inconnu : {chemin}")
+                noeud = noeud[cle]
+            valeurs[chemin] = float(noeud)
+        return valeurs
+
+    def normaliser(self, points: Sequence[Dict[str, float]]) -> np.ndarray:
+        """Matrice (points × paramètres) ramenée à [0, 1] par les bornes."""
+        bas, haut = np.array(list(self.bornes.values())).T
+        x = np.array([[float(p[k]) for k in self.parametres] for p in points], dtype=float)
+        return (x - bas) / (haut - bas)
+
+
+class Emulateur:
+    """Émulateur des statistiques de run : un modèle par statistique, entrées normalisées par l'espace."""
+
+    def __init__(self, espace: EspaceParametres, methode: str = "gp", confiance: float = 0.95, seed: int = 0):
+        """
+        Args:
+            espace: Paramètres émulés
+            methode: "gp" (processus gaussien) ou "gradient_boosting"
+            confiance: Niveau des intervalles de prédiction d'un run
+            seed: Graine des ajustements (redémarrages du GP, sous-échantillonnage du boosting)
+        """
+        if methode not in METHODES_EMULATEUR:
+            raise ValueError(f"Méthode inconnue : {methode} (attendu : {', '.join(METHODES_EMULATEUR)})")
+        self.espace = espace
+        self.methode = methode
+        self.confiance = confiance
+        self.seed = seed
+        self.statistiques: List[str] = []
+        self._modeles: Dict[str, Dict[str, Any]] = {}
+
+    def ajuster(self, df_runs: pd.DataFrame, statistiques: Optional[List[str]] = None) -> "Emulateur":
+        """
+        Ajuste un modèle par statistique sur les runs terminés d'un balayage du plan.
+
+        Args:
+            df_runs: Contenu de resume_runs.csv (colonne surcharges : JSON des paramètres)
+            statistiques: Statistiques émulées (défaut : toutes les colonnes numériques non constantes)
+        """
+        df = df_runs[df_runs["statut"] == "termine"] if "statut" in df_runs.columns else df_runs
+        if len(df) < 2:
+            raise ValueError("Au moins deux runs terminés sont nécessaires pour ajuster l'émulateur")
+        if statistiques is None:
+            statistiques = [
+                c for c in df.columns
+                if c not in _COLONNES_NON_STATISTIQUES
+                and pd.api.types.is_numeric_dtype(df[c])
+                and df[c].nunique() > 1
+            ]
+        x = self.espace.normaliser(_points_des_runs(df))
+        self.statistiques = list(statistiques)
+        self._modeles = {stat: self._ajuster_un(x, df[stat].to_numpy(dtype=float)) for stat in self.statistiques}
+        return self
+
+    def _ajuster_un(self, x: np.ndarray, y: np.ndarray) -> Dict[str, Any]:
+        if self.methode == "gp":
+            noyau = ConstantKernel(1.0, (1e-3, 1e3)) * Matern(
+                length_scale=np.full(x.shape[1], 0.5), length_scale_bounds=(1e-2, 1e2), nu=2.5
+            ) + WhiteKernel(1e-2, (1e-6, 1e1))
+            gp = GaussianProcessRegressor(noyau, normalize_y=True, n_restarts_optimizer=2, random_state=self.seed)
+            # Longueur de corrélation en butée haute = paramètre sans effet sur la statistique
+            # (résultat attendu, pas un échec d'ajustement)
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", ConvergenceWarning)
+                return {"gp": gp.fit(x, y)}
+        alpha = (1.0 - self.confiance) / 2.0
+        options = dict(n_estimators=200, max_depth=3, learning_rate=0.05, subsample=0.8, random_state=self.seed)
+        return {
+            "moyenne": GradientBoostingRegressor(**options).fit(x, y),
+            "basse": GradientBoostingRegressor(loss="quantile", alpha=alpha, **options).fit(x, y),
+            "haute": GradientBoostingRegressor(loss="quantile", alpha=1.0 - alpha, **options).fit(x, y),
+        }
+
+    def predire(self, points: Sequence[Dict[str, float]]) -> pd.DataFrame:
+        """
+        Prédictions pour des points de l'espace (surcharges) : une ligne par point, colonnes
+        <stat>, <stat>_std, <stat>_basse, <stat>_haute (intervalle de prédiction d'un run).
+        """
+        if not self._modeles:
+            raise RuntimeError("Émulateur non ajusté")
+        x = self.espace.normaliser(points)
+        z = stats.norm.ppf(0.5 + self.confiance / 2.0)
+        colonnes: Dict[str, np.ndarray] = {}
+        for stat in self.statistiques:
+            modele = self._modeles[stat]
+            if self.methode == "gp":
+                moyenne, ecart_type = modele["gp"].predict(x, return_std=True)
+                basse, haute = moyenne - z * ecart_type, moyenne + z * ecart_type
+            else:
+                moyenne = modele["moyenne"].predict(x)
+                basse = np.minimum(modele["basse"].predict(x), moyenne)
+                haute = np.maximum(modele["haute"].predict(x), moyenne)
+                ecart_type = (haute - basse) / (2.0 * z)
+            colonnes[stat] = moyenne
+            colonnes[f"{stat}_std"] = ecart_type
+            colonnes[f"{stat}_basse"] = basse
+            colonnes[f"{stat}_haute"] = haute
+        return pd.concat([pd.DataFrame(list(points)), pd.DataFrame(colonnes)], axis=1)
+
+    def predict_summary(self, config: Config) -> Dict[str, Dict[str, float]]:
+        """
+        Statistiques attendues d'un run simulé avec cette config.
+
+        Returns:
+            {statistique: {"moyenne", "ecart_type", "borne_basse", "borne_haute"}}
+        """
+        ligne = self.predire([self.espace.valeurs(config)]).iloc[0]
+        return {
+            stat: {
+                "moyenne": float(ligne[stat]),
+                "ecart_type": float(ligne[f"{stat}_std"]),
+                "borne_basse": float(ligne[f"{stat}_basse"]),
+                "borne_haute": float(ligne[f"{stat}_haute"]),
+            }
+            for stat in self.statistiques
+        }
+
+    def sauvegarder(self, path: Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        joblib.dump(self, path)
+        return path
+
+    @staticmethod
+    def charger(path: Path) -> "Emulateur":
+        return joblib.load(Path(path))
+
+
+def rapport_validation(emulateur: Emulateur, df_runs: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compare les prédictions de l'émulateur aux runs réels tenus à l'écart.
+
+    Returns:
+        Une ligne par statistique : n, rmse, mae, r2, couverture (part des runs dans
+        l'intervalle de prédiction, à comparer au niveau de confiance), ecart_type_moyen
+    """
+    df = df_runs[df_runs["statut"] == "termine"] if "statut" in df_runs.columns else df_runs
+    predictions = emulateur.predire(_points_des_runs(df))
+    lignes = []
+    for stat in emulateur.statistiques:
+        reel = df[stat].to_numpy(dtype=float)
+        predit = predictions[stat].to_numpy()
+        erreur = predit - reel
+        dispersion = float(np.sum((reel - reel.mean()) ** 2))
+        dans_intervalle = (reel >= predictions[f"{stat}_basse"].to_numpy()) & (
+            reel <= predictions[f"{stat}_haute"].to_numpy()
+        )
+        lignes.append({
+            "statistique": stat,
+            "n": len(reel),
+            "rmse": float(np.sqrt(np.mean(erreur ** 2))),
+            "mae": float(np.mean(np.abs(erreur))),
+            "r2": 1.0 - float(np.sum(erreur ** 2)) / dispersion if dispersion > 0 else np.nan,
+            "couverture": float(dans_intervalle.mean()),
+            "confiance": emulateur.confiance,
+            "ecart_type_moyen": float(predictions[f"{stat}_std"].mean()),
+        })
+    return pd.DataFrame(lignes)
+
+
+def construire_emulateur(
+    config: Config,
+    output_dir: Path,
+    espace: Optional[EspaceParametres] = None,
+    points: int = 20,
+    points_validation: int = 5,
+    seeds: Optional[List[int]] = None,
+    jours: int = 90,
+    scenario: str = "moyen",
+    variabilite: str = "Moyenne",
+    methode: str = "gp",
+    statistiques: Optional[List[str]] = None,
+    confiance: float = 0.95,
+    seed: int = 0,
+    workers: int = 1,
+    verbose: bool = True,
+) -> Tuple[Emulateur, pd.DataFrame]:
+    """
+    Simule un plan d'apprentissage et un plan de validation, ajuste l'émulateur et écrit
+    emulateur.joblib et validation_emulateur.csv.
+
+    Les deux plans sont des hypercubes latins indépendants (graines seed et seed + 1) ; les
+    runs de validation utilisent d'autres seeds de simulation que ceux d'apprentissage.
+
+    Args:
+        config: Config de base (paramètres de l'espace surchargés point par point)
+        output_dir: Dossier de l'émulateur
+        espace: Paramètres émulés (défaut : EspaceParametres.defaut(scenario))
+        points: Points du plan d'apprentissage
+        points_validation: Points du plan de validation (0 = pas de rapport)
+        seeds: Seeds de simulation par point d'apprentissage (défaut : [42, 43])
+        jours: Horizon des runs
+        scenario: Scénario simulé (clé de config)
+        variabilite: Variabilité simulée (Faible, Moyenne, Forte)
+        methode: "gp" ou "gradient_boosting"
+        statistiques: Statistiques émulées (défaut : toutes celles qui varient)
+        confiance: Niveau des intervalles de prédiction
+        seed: Graine des plans et des ajustements
+        workers: Processus du balayage
+        verbose: Logger progression
+
+    Returns:
+        (émulateur ajusté, rapport de validation — vide si points_validation = 0)
+    """
+    output_dir = Path(output_dir)
+    espace = espace or EspaceParametres.defaut(scenario)
+    seeds = seeds or [42, 43]
+    espace.valeurs(config)  # chemins inconnus signalés avant toute simulation
+    options = dict(scenario=scenario, variabilite=variabilite, jours=jours, workers=workers, verbose=verbose)
+
+    df_apprentissage = _simuler_plan(
+        config, espace.plan_hypercube(points, seed), seeds, output_dir / "apprentissage", **options
+    )
+    emulateur = Emulateur(espace, methode=methode, confiance=confiance, seed=seed).ajuster(
+        df_apprentissage, statistiques
+    )
+    emulateur.sauvegarder(output_dir / EMULATEUR_FILENAME)
+
+    df_validation = pd.DataFrame()
+    if points_validation > 0:
+        seeds_validation = [max(seeds) + 1 + i for i in range(len(seeds))]
+        df_runs_validation = _simuler_plan(
+            config, espace.plan_hypercube(points_validation, seed + 1), seeds_validation,
+            output_dir / "validation", **options,
+        )
+        df_validation = rapport_validation(emulateur, df_runs_validation)
+        df_validation.to_csv(output_dir / VALIDATION_FILENAME, index=False)
+        if verbose:
+            logger.info(
+                "Validation de l'émulateur (%s) : R² médian %.3f, couverture moyenne %.2f (cible %.2f)",
+                methode, df_validation["r2"].median(), df_validation["couverture"].mean(), confiance,
+            )
+    return emulateur, df_validation
+
+
+def _simuler_plan(
+    config: Config,
+    plan: List[Dict[str, float]],
+    seeds: List[int],
+    output_dir: Path,
+    scenario: str,
+    variabilite: str,
+    jours: int,
+    workers: int,
+    verbose: bool,
+) -> pd.DataFrame:
+    """Simule chaque point du plan (une cellule de balayage par point) ; retourne resume_runs.csv."""
+    grille = GrilleBalayage(
+        scenarios=[scenario], variabilites=[variabilite], seeds=list(seeds), jours=[jours], surcharges=plan
+    )
+    executer_balayage(
+        config, grille, output_dir, workers=workers, save_pickles=False, save_trace=False, verbose=verbose
+    )
+    return pd.read_csv(Path(output_dir) / RESUME_RUNS_FILENAME)
+
+
+def _points_des_runs(df_runs: pd.DataFrame) -> List[Dict[str, float]]:
+    """Paramètres de chaque run (colonne surcharges, JSON dans resume_runs.csv)."""
+    return [json.loads(s) if isinstance(s, str) else dict(s) for s in df_runs["surcharges"]]
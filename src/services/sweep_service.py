@@ -0,0 +1,329 @@
+"""
+Balayage de paramètres : grille scénario × variabilité × seeds × horizon × surcharges de config.
+
+Chaque cellule (scénario, variabilité, horizon, surcharges) a son dossier cellule_XXX avec un
+run par seed (run_XXX, mêmes fichiers qu'en headless) et cellule.json. Les runs de toutes les
+cellules sont répartis sur un pool de processus ; les données statiques sont publiées une fois
+en mémoire partagée et chaque worker garde un contexte de génération par lissage, partagé par
+toutes les cellules qu'il exécute.
+
+Sorties dans le dossier du balayage :
+  - resume_runs.csv : une ligne par run (paramètres de la cellule, seed, statut, StatistiquesRun)
+  - resume_cellules.csv : une ligne par cellule (moyenne et écart-type des statistiques sur les seeds)
+"""
+
+import itertools
+import json
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from ..core.config.config_validator import Config, validate_config_dict
+from ..core.generation.generation_context import GenerationContext
+from ..core.generation.shared_static_data import DonneesStatiques, publier_donnees_statiques
+from .simulation_service import (
+    SCENARIO_UI_TO_CONFIG,
+    VARIABILITE_UI_TO_FLOAT,
+    SimulationService,
+    _get_microzone_ids,
+    _resolve_run_params,
+)
+
+logger = logging.getLogger(__name__)
+
+RESUME_RUNS_FILENAME = "resume_runs.csv"
+RESUME_CELLULES_FILENAME = "resume_cellules.csv"
+
+_SCENARIO_CONFIG_TO_UI = {v: k for k, v in SCENARIO_UI_TO_CONFIG.items()}
+_COLONNES_CELLULE = ["cellule", "scenario", "variabilite", "jours", "surcharges"]
+
+
+@dataclass
+class GrilleBalayage:
+    """
+    Grille d'un balayage.
+
+    scenarios : clés de config (pessimiste, moyen, optimiste) ; variabilites : libellés
+    (Faible, Moyenne, Forte) ; surcharges : dictionnaires {"section.champ": valeur} appliqués
+    à la config ({} = config de base).
+    """
+
+    scenarios: List[str] = field(default_factory=lambda: ["pessimiste", "moyen", "optimiste"])
+    variabilites: List[str] = field(default_factory=lambda: ["Faible", "Moyenne", "Forte"])
+    seeds: List[int] = field(default_factory=lambda: [42])
+    jours: List[int] = field(default_factory=lambda: [365])
+    surcharges: List[Dict[str, Any]] = field(default_factory=lambda: [{}])
+
+    def __post_init__(self):
+        inconnus = [s for s in self.scenarios if s not in _SCENARIO_CONFIG_TO_UI]
+        inconnus += [v for v in self.variabilites if v not in VARIABILITE_UI_TO_FLOAT]
+        if inconnus:
+            raise ValueError(f"Valeurs de grille inconnues : {inconnus}")
+        if not (self.scenarios and self.variabilites and self.seeds and self.jours and self.surcharges):
+            raise ValueError("Chaque dimension de la grille doit contenir au moins une valeur")
+
+    @classmethod
+    def depuis_dict(cls, d: Dict[str, Any]) -> "GrilleBalayage":
+        """Grille depuis un dictionnaire (ex. fichier YAML) ; clés absentes → valeurs par défaut."""
+        return cls(**{k: v for k, v in d.items() if k in cls.__dataclass_fields__})
+
+    def cellules(self) -> List[Dict[str, Any]]:
+        """Cellules dans l'ordre (surcharges, horizon, scénario, variabilité)."""
+        produit = itertools.product(self.surcharges, self.jours, self.scenarios, self.variabilites)
+        return [
+            {"cellule": i, "scenario": sc, "variabilite": var, "jours": jours, "surcharges": surcharges}
+            for i, (surcharges, jours, sc, var) in enumerate(produit)
+        ]
+
+
+def appliquer_surcharges(config: Config, surcharges: Dict[str, Any]) -> Config:
+    """
+    Config revalidée avec surcharges par chemin pointé ("matrices_base.reduction_effet": 0.7).
+
+    Raises:
+        KeyError: Si un chemin n'existe pas dans la config
+    """
+    if not surcharges:
+        return config
+    d = config.model_dump()
+    for chemin, valeur in surcharges.items():
+        *sections, champ = chemin.split(".")
+        noeud = d
+        for section in sections:
+            if not isinstance(noeud.get(section), dict):
+                raise KeyError(f"Surcharge inconnue : {chemin}")
+            noeud = noeud[section]
+        if champ not in noeud:
+            raise KeyError(f"Surcharge inconnue : {chemin}")
+        noeud[champ] = valeur
+    return validate_config_dict(d)
+
+
+class _ExecuteurBalayage:
+    """Exécute les runs d'un balayage dans un processus : un service par surcharge, un contexte par lissage."""
+
+    def __init__(self, config: Config, microzone_ids: List[str], donnees_statiques: Optional[DonneesStatiques]):
+        self.config = config
+        self.microzone_ids = list(microzone_ids)
+        self.donnees_statiques = donnees_statiques
+        self._services: Dict[str, SimulationService] = {}
+        self._contextes: Dict[float, GenerationContext] = {}
+
+    def service(self, surcharges: Dict[str, Any]) -> SimulationService:
+        cle = json.dumps(surcharges, sort_keys=True)
+        svc = self._services.get(cle)
+        if svc is None:
+            svc = SimulationService(config=appliquer_surcharges(self.config, surcharges))
+            svc._microzone_ids = self.microzone_ids
+            svc._donnees_statiques = self.donnees_statiques
+            alpha = svc._lissage_alpha()
+            if alpha not in self._contextes:
+                self._contextes[alpha] = svc._contexte_generation(self.microzone_ids)
+            svc._contexte = self._contextes[alpha]
+            self._services[cle] = svc
+        return svc
+
+    def executer(self, tache: Dict[str, Any]) -> Dict[str, Any]:
+        svc = self.service(tache["surcharges"])
+        scenario_config, variabilite_locale, scenario_key, variabilite_label = _resolve_run_params(
+            svc.config, _SCENARIO_CONFIG_TO_UI[tache["scenario"]], tache["variabilite"]
+        )
+        return svc._run_one_headless_iteration(
+            run_idx=tache["run_idx"],
+            runs=tache["runs"],
+            days=tache["jours"],
+            base=Path(tache["dossier"]),
+            microzone_ids=self.microzone_ids,
+            scenario_config=scenario_config,
+            variabilite_locale=variabilite_locale,
+            scenario_key=scenario_key,
+            variabilite_label=variabilite_label,
+            save_pickles=tache["save_pickles"],
+            save_trace=tache["save_trace"],
+            verbose=False,
+            debug_prints=False,
+            seed_run=tache["seed"],
+            statistiques=True,
+        )
+
+
+# Exécuteur du processus de travail, créé par _init_worker_balayage
+_WORKER_EXECUTEUR: Optional[_ExecuteurBalayage] = None
+
+
+def _init_worker_balayage(config: Config, microzone_ids: List[str], descripteur: Dict[str, Any]) -> None:
+    """Initialiseur de processus : données statiques attachées une fois par worker."""
+    global _WORKER_EXECUTEUR
+    _WORKER_EXECUTEUR = _ExecuteurBalayage(config, microzone_ids, DonneesStatiques.attacher(descripteur))
+
+
+def _executer_tache_worker(tache: Dict[str, Any]) -> Dict[str, Any]:
+    return _WORKER_EXECUTEUR.executer(tache)
+
+
+def executer_balayage(
+    config: Config,
+    grille: GrilleBalayage,
+    output_dir: Path,
+    workers: int = 1,
+    save_pickles: bool = True,
+    save_trace: bool = True,
+    verbose: bool = True,
+) -> pd.DataFrame:
+    """
+    Exécute toutes les cellules de la grille et écrit les tableaux de synthèse.
+
+    Args:
+        config: Config de base (surcharges appliquées par cellule)
+        grille: Grille du balayage
+        output_dir: Dossier du balayage (cellule_XXX/run_XXX, resume_*.csv)
+        workers: Nombre de processus (1 = dans le processus courant)
+        save_pickles: Sauvegarder simulation_state.pkl par run
+        save_trace: Sauvegarder trace JSON par run
+        verbose: Logger progression
+
+    Returns:
+        Résumé par cellule (contenu de resume_cellules.csv)
+    """
+    output_dir = Path(output_dir)
+    taches = preparer_taches_balayage(grille, output_dir, save_pickles, save_trace)
+    if verbose:
+        logger.info(
+            "Balayage : %s cellules × %s seeds = %s runs (%s worker(s))",
+            len(grille.cellules()), len(grille.seeds), len(taches), workers,
+        )
+
+    microzone_ids = _get_microzone_ids(config)
+    resultats: List[Optional[Dict[str, Any]]] = [None] * len(taches)
+    erreurs: Dict[int, str] = {}
+    if workers > 1 and len(taches) > 1:
+        with publier_donnees_statiques() as descripteur:
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(taches)),
+                initializer=_init_worker_balayage,
+                initargs=(config, microzone_ids, descripteur),
+            ) as pool:
+                futures = [pool.submit(_executer_tache_worker, t) for t in taches]
+                for i, future in enumerate(futures):
+                    try:
+                        resultats[i] = future.result()
+                    except BrokenProcessPool:
+                        erreurs[i] = "processus interrompu"
+                    except Exception as e:
+                        erreurs[i] = str(e)
+                    _journaliser(i, taches, erreurs, verbose)
+    else:
+        executeur = _ExecuteurBalayage(config, microzone_ids, DonneesStatiques.normaliser())
+        for i, tache in enumerate(taches):
+            try:
+                resultats[i] = executeur.executer(tache)
+            except Exception as e:
+                erreurs[i] = str(e)
+            _journaliser(i, taches, erreurs, verbose)
+
+    df_cellules = ecrire_resumes_balayage(taches, resultats, erreurs, output_dir)
+    if erreurs:
+        logger.error("%s run(s) en échec sur %s", len(erreurs), len(taches))
+    return df_cellules
+
+
+def preparer_taches_balayage(
+    grille: GrilleBalayage,
+    output_dir: Path,
+    save_pickles: bool = True,
+    save_trace: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    Crée les dossiers cellule_XXX (avec cellule.json) et retourne une tâche par (cellule, seed),
+    dans l'ordre des cellules puis des seeds.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    taches = []
+    for cellule in grille.cellules():
+        dossier = output_dir / f"cellule_{cellule['cellule']:03d}"
+        dossier.mkdir(exist_ok=True)
+        with open(dossier / "cellule.json", "w", encoding="utf-8") as f:
+            json.dump({**cellule, "seeds": grille.seeds}, f, indent=2)
+        for run_idx, seed in enumerate(grille.seeds):
+            taches.append({
+                **cellule,
+                "run_idx": run_idx,
+                "runs": len(grille.seeds),
+                "seed": seed,
+                "dossier": str(dossier),
+                "save_pickles": save_pickles,
+                "save_trace": save_trace,
+            })
+    return taches
+
+
+def ecrire_resumes_balayage(
+    taches: List[Dict[str, Any]],
+    resultats: List[Optional[Dict[str, Any]]],
+    erreurs: Dict[int, str],
+    output_dir: Path,
+) -> pd.DataFrame:
+    """
+    Écrit resume_runs.csv et resume_cellules.csv à partir des résultats des tâches
+    (resultats[i] ou erreurs[i] pour la tâche i).
+
+    Returns:
+        Résumé par cellule
+    """
+    lignes = []
+    for i, tache in enumerate(taches):
+        ligne = {k: tache[k] for k in _COLONNES_CELLULE}
+        ligne["surcharges"] = json.dumps(tache["surcharges"], sort_keys=True)
+        ligne.update({"seed": tache["seed"], "run_id": f"run_{tache['run_idx']:03d}"})
+        if i in erreurs:
+            ligne.update({"statut": "echec", "erreur": erreurs[i]})
+        else:
+            ligne.update({"statut": "termine", "duree_s": resultats[i]["duree_s"]})
+            ligne.update(resultats[i]["statistiques"])
+        lignes.append(ligne)
+    df_runs = pd.DataFrame(lignes)
+    df_runs.to_csv(Path(output_dir) / RESUME_RUNS_FILENAME, index=False)
+
+    df_cellules = resumer_cellules(df_runs)
+    df_cellules.to_csv(Path(output_dir) / RESUME_CELLULES_FILENAME, index=False)
+    return df_cellules
+
+
+def resumer_cellules(df_runs: pd.DataFrame) -> pd.DataFrame:
+    """
+    Moyenne et écart-type (colonnes <stat>_moy, <stat>_std) des statistiques des runs terminés,
+    par cellule, avec le nombre de runs terminés (n_runs).
+    """
+    termines = df_runs[df_runs["statut"] == "termine"]
+    if termines.empty:
+        return pd.DataFrame(columns=_COLONNES_CELLULE + ["n_runs"])
+    stats = [
+        c for c in termines.columns
+        if c not in _COLONNES_CELLULE + ["seed", "run_id", "statut", "erreur", "duree_s"]
+        and pd.api.types.is_numeric_dtype(termines[c])
+    ]
+    groupes = termines.groupby(_COLONNES_CELLULE, sort=True)
+    df = groupes[stats].agg(["mean", "std"])
+    df.columns = [f"{stat}_{'moy' if agg == 'mean' else 'std'}" for stat, agg in df.columns]
+    df.insert(0, "n_runs", groupes.size())
+    return df.reset_index()
+
+
+def _journaliser(i: int, taches: List[Dict[str, Any]], erreurs: Dict[int, str], verbose: bool) -> None:
+    t = taches[i]
+    if i in erreurs:
+        logger.error(
+            "Cellule %s (%s, %s, %s jours) seed %s en échec : %s",
+            t["cellule"], t["scenario"], t["variabilite"], t["jours"], t["seed"], erreurs[i],
+        )
+    elif verbose:
+        logger.info(
+            "Run %s/%s terminé — cellule %s (%s, %s, %s jours), seed %s",
+            i + 1, len(taches), t["cellule"], t["scenario"], t["variabilite"], t["jours"], t["seed"],
+        )
@@ -3,6 +3,7 @@ Tests unitaires pour EventGenerator.
 Story 2.2.7 - Événements graves modulables
 """
 
+import numpy as np
 import pytest
 
 from src.core.data.constants import (
@@ -131,6 +132,39 @@ class TestEventGenerator:
         
         assert len(evenements) == 0
     
+    def test_generer_evenements_graves_batch(self, event_generator):
+        """Tirage par lots : un événement par incident grave, journal colonnaire alimenté."""
+        microzones = ["MZ_11_01", "MZ_12_01", "MZ_INCONNUE"]
+        # Colonnes : agression, incendie, accident
+        graves = np.array([[0, 2, 1], [1, 0, 0], [3, 0, 0]])
+        events_state = EventsState()
+
+        evenements = event_generator.generer_evenements_graves_batch(0, microzones, graves, events_state)
+
+        # MZ_INCONNUE n'a pas d'arrondissement : ignorée
+        assert len(evenements) == 4
+        assert [e.get_type() for e in evenements] == [
+            "incendie_grave", "incendie_grave", "accident_grave", "agression_grave",
+        ]
+        assert [e.arrondissement for e in evenements] == [11, 11, 11, 12]
+        assert len({e.event_id for e in evenements}) == 4
+        assert len(events_state.get_grave_events_for_day(0)) == 4
+        journal = events_state.journal_graves.colonnes()
+        assert journal["casualties_base"].tolist() == [2, 2, 1, 1]
+        for e, duree, trafic in zip(evenements, journal["duration"], journal["traffic_slowdown"]):
+            assert DUREE_MIN_EVENT <= e.duration <= DUREE_MAX_EVENT
+            assert e.duration == duree
+            assert ("traffic_slowdown" in e.characteristics) == trafic
+
+    def test_tirage_batch_frequences(self, event_generator):
+        """Les fréquences des caractéristiques tirées par lots suivent les probabilités."""
+        colonnes = event_generator.tirer_evenements_graves(0, ["MZ_11_01"], np.array([[20000, 0, 0]]))
+        assert colonnes["traffic_slowdown"].mean() == pytest.approx(PROB_TRAFFIC_SLOWDOWN, abs=0.02)
+        assert colonnes["cancel_sports"].mean() == pytest.approx(PROB_CANCEL_SPORTS, abs=0.02)
+        assert colonnes["increase_bad_vectors"].mean() == pytest.approx(PROB_INCREASE_BAD_VECTORS, abs=0.02)
+        assert colonnes["kill_pompier"].mean() == pytest.approx(PROB_KILL_POMPIER, abs=0.01)
+        assert set(np.unique(colonnes["duration"])) == set(range(DUREE_MIN_EVENT, DUREE_MAX_EVENT + 1))
+
     def test_appliquer_effets_congestion_temps_reel(self, event_generator):
         """Test application effets congestion temps réel."""
         # Créer calculateur de congestion
@@ -26,8 +26,11 @@ if str(SRC) not in sys.path:
 from core.evolution import (
     evoluer_dynamic_state,
     evoluer_incidents_alcool_J1,
+    evoluer_incidents_alcool_J1_array,
     evoluer_incidents_nuit_J1,
+    evoluer_incidents_nuit_J1_array,
     evoluer_trafic_J1,
+    matrice_poids_inter,
 )
 from core.evolution._loader import load_matrices_for_evolution
 from core.state import DynamicState, SimulationState
@@ -269,3 +272,79 @@ class TestLoader:
             assert isinstance(m["matrices_trafic"], dict)
         if "matrices_inter_type" in m:
             assert isinstance(m["matrices_inter_type"], dict)
+
+
+# ---- Implémentations tableaux ----
+
+
+class TestEvolutionArray:
+    """Versions tableau (microzones × types) de l'évolution nuit/alcool."""
+
+    def _entrees(self, n=50, seed=0):
+        rng = np.random.default_rng(seed)
+        mzs = [f"MZ{i:03d}" for i in range(n)]
+        counts = rng.poisson(2.0, size=(n, len(TYPES)))
+        prev = rng.integers(0, 3, size=(n, len(TYPES)))
+        inter = {}
+        for mz in mzs:
+            inter.update(_matrices_inter_mock(mz))
+        return mzs, counts, prev, matrice_poids_inter(inter, mzs)
+
+    def test_poids_inter_equivalent_inter_influence(self):
+        from core.evolution.nuit_evolution import _inter_influence
+
+        mzs, counts, _, poids = self._entrees(5)
+        inter = {}
+        for mz in mzs:
+            inter.update(_matrices_inter_mock(mz))
+        corr = np.einsum("nct,nt->nc", poids, counts)
+        for i, mz in enumerate(mzs):
+            c = dict(zip(TYPES, counts[i].tolist()))
+            for k, t in enumerate(TYPES):
+                assert corr[i, k] == pytest.approx(_inter_influence(mz, t, c, inter))
+
+    @pytest.mark.parametrize("fonction", [evoluer_incidents_nuit_J1_array, evoluer_incidents_alcool_J1_array])
+    def test_bornes_et_zeros(self, fonction):
+        _, counts, prev, poids = self._entrees()
+        out = fonction(prev, counts, poids, "ete", rng=np.random.default_rng(1))
+        assert out.shape == counts.shape
+        assert (out >= 0).all() and (out <= counts).all()
+        assert (out[counts == 0] == 0).all()
+
+    @pytest.mark.parametrize("fonction", [evoluer_incidents_nuit_J1_array, evoluer_incidents_alcool_J1_array])
+    def test_reproductibilite(self, fonction):
+        _, counts, prev, poids = self._entrees()
+        a = fonction(prev, counts, poids, "hiver", rng=np.random.default_rng(5))
+        b = fonction(prev, counts, poids, "hiver", rng=np.random.default_rng(5))
+        assert np.array_equal(a, b)
+
+    def test_moyenne_equivalente_version_dict(self):
+        """Même loi que la version dict : moyennes proches sur de nombreux tirages."""
+        mzs, counts, prev, poids = self._entrees(20)
+        inter = {}
+        for mz in mzs:
+            inter.update(_matrices_inter_mock(mz))
+        incidents_J = {
+            mz: {t: {"benin": int(counts[i, k]), "moyen": 0, "grave": 0} for k, t in enumerate(TYPES)}
+            for i, mz in enumerate(mzs)
+        }
+        nuit_J = {mz: dict(zip(TYPES, prev[i].tolist())) for i, mz in enumerate(mzs)}
+        rng_a, rng_d = np.random.default_rng(2), np.random.default_rng(3)
+        somme_a = np.zeros(counts.shape)
+        somme_d = np.zeros(counts.shape)
+        for _ in range(300):
+            somme_a += evoluer_incidents_nuit_J1_array(prev, counts, poids, "intersaison", rng=rng_a)
+            d = evoluer_incidents_nuit_J1(nuit_J, incidents_J, inter, mzs, "intersaison", rng=rng_d)
+            somme_d += np.array([[d[mz][t] for t in TYPES] for mz in mzs])
+        assert somme_a.sum() == pytest.approx(somme_d.sum(), rel=0.03)
+
+    def test_dynamic_state_aller_retour(self):
+        mzs = ["MZ001", "MZ002"]
+        state = DynamicState()
+        state.ensure_microzones(mzs)
+        valeurs = np.array([[1, 2, 3], [4, 5, 6]])
+        state.update_incidents_from_array("incidents_nuit", mzs, valeurs)
+        assert state.incidents_nuit["MZ002"] == {"agressions": 4, "incendies": 5, "accidents": 6}
+        assert type(state.incidents_nuit["MZ001"]["accidents"]) is int
+        assert np.array_equal(state.incidents_to_array("incidents_nuit", mzs), valeurs)
+        assert state.incidents_to_array("incidents_alcool", []).shape == (0, 3)
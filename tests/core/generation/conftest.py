@@ -0,0 +1,72 @@
+"""
+Fixtures partagées des tests de génération : VectorGenerator minimal sur trois microzones et
+enchaînement de jours simulés.
+"""
+
+import pytest
+
+from src.core.data.constants import (
+    INCIDENT_TYPE_ACCIDENT,
+    INCIDENT_TYPE_AGRESSION,
+    INCIDENT_TYPE_INCENDIE,
+)
+from src.core.data.vector import Vector
+from src.core.generation.intensity_calculator import IntensityCalculator
+from src.core.generation.regime_manager import RegimeManager
+from src.core.generation.vector_generator import VectorGenerator
+
+MICROZONES = ["MZ_11_01", "MZ_11_02", "MZ_12_01"]
+TYPES = [INCIDENT_TYPE_AGRESSION, INCIDENT_TYPE_INCENDIE, INCIDENT_TYPE_ACCIDENT]
+
+
+@pytest.fixture
+def generateur():
+    """
+    Fabrique de VectorGenerator sur MICROZONES, sans matrices (sauf celles d'un MatrixModulator).
+
+    fabriquer(base_intensities, seed=7, modulator=None, mode_creux=False, compiler=False, **attributs) :
+    compiler appelle compiler_facteurs_statiques() ; attributs fixe inclinaison, flux_communs, etc.
+    """
+
+    def fabriquer(base_intensities, seed=7, modulator=None, mode_creux=False, compiler=False, **attributs):
+        gen = VectorGenerator(
+            regime_manager=RegimeManager(),
+            intensity_calculator=IntensityCalculator(base_intensities, matrix_modulator=modulator),
+            base_intensities=base_intensities,
+            matrices_intra_type=modulator.matrices_intra_type if modulator is not None else {},
+            matrices_inter_type={},
+            matrices_voisin=modulator.matrices_voisin if modulator is not None else {},
+            matrices_saisonnalite={},
+            microzone_ids=MICROZONES,
+            seed=seed,
+            mode_creux=mode_creux,
+        )
+        for nom, valeur in attributs.items():
+            setattr(gen, nom, valeur)
+        if compiler:
+            gen.compiler_facteurs_statiques()
+        return gen
+
+    return fabriquer
+
+
+@pytest.fixture
+def simuler():
+    """
+    Enchaîne les jours à partir de vecteurs nuls : simuler(gen, jours, vectors_state=None, **options)
+    produit les vecteurs de chaque jour (enregistrés dans vectors_state s'il est fourni) ; options est
+    transmis à generate_vectors_for_day (prix_m2_modulator, effets_reduction, ...).
+    """
+
+    def jours_simules(gen, jours, vectors_state=None, **options):
+        precedent = {mz: {t: Vector(0, 0, 0) for t in TYPES} for mz in MICROZONES}
+        for jour in range(jours):
+            vectors_j = gen.generate_vectors_for_day(jour + 1, precedent, vectors_state=vectors_state, **options)
+            if vectors_state is not None:
+                for mz, vecteurs in vectors_j.items():
+                    for t, v in vecteurs.items():
+                        vectors_state.set_vector(mz, jour, t, v)
+            yield vectors_j
+            precedent = vectors_j
+
+    return jours_simules
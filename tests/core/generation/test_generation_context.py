@@ -0,0 +1,86 @@
+"""
+Tests unitaires pour GenerationContext (données statiques partagées entre runs).
+"""
+
+import numpy as np
+import pytest
+
+from src.core.generation.generation_context import GenerationContext
+from src.core.generation.generation_service import GenerationRun, GenerationService
+from src.core.state.simulation_state import SimulationState
+
+MICROZONES = ["MZ_11_01", "MZ_11_02", "MZ_12_01"]
+
+
+@pytest.fixture
+def base_intensities():
+    return {
+        mz: {"agression": 0.4 + 0.1 * i, "incendie": 0.2, "accident": 0.3}
+        for i, mz in enumerate(MICROZONES)
+    }
+
+
+@pytest.fixture
+def matrices():
+    matrice = np.array([[0.7, 0.2, 0.1], [0.3, 0.5, 0.2], [0.1, 0.3, 0.6]])
+    return {
+        "matrices_intra_type": {mz: {t: matrice for t in ("agressions", "incendies", "accidents")} for mz in MICROZONES},
+        "matrices_inter_type": {},
+        "matrices_voisin": {
+            "MZ_11_01": {"voisins": ["MZ_11_02"], "poids_influence": [1.0], "seuil_activation": 5},
+        },
+        "matrices_saisonnalite": {},
+    }
+
+
+def _simuler(gen: GenerationService, jours: int) -> SimulationState:
+    state = SimulationState(run_id="run_000", config={})
+    state.dynamic_state.ensure_microzones(MICROZONES)
+    gen.generate_multiple_days(state, start_day=0, num_days=jours)
+    return state
+
+
+class TestGenerationContext:
+    """Tests pour GenerationContext."""
+
+    def test_runs_partages_identiques_aux_services_independants(self, base_intensities, matrices):
+        contexte = GenerationContext(MICROZONES, base_intensities=base_intensities, matrices=matrices)
+        for seed in (1, 2):
+            partage = _simuler(GenerationRun(MICROZONES, seed=seed, contexte=contexte), 10)
+            seul = _simuler(
+                GenerationService(MICROZONES, seed=seed, base_intensities=base_intensities, matrices=matrices), 10
+            )
+            assert partage.vectors_state.to_dict() == seul.vectors_state.to_dict()
+
+    def test_donnees_statiques_partagees(self, base_intensities, matrices):
+        contexte = GenerationContext(MICROZONES, base_intensities=base_intensities, matrices=matrices)
+        a = GenerationRun(MICROZONES, seed=1, contexte=contexte)
+        b = GenerationRun(MICROZONES, seed=2, contexte=contexte)
+        assert a.facteurs_statiques is b.facteurs_statiques is contexte.facteurs_statiques
+        assert a.generator.facteurs_statiques is contexte.facteurs_statiques
+        assert a.prix_m2_modulator is b.prix_m2_modulator
+        assert a._poids_inter is b._poids_inter
+        # État par run distinct
+        assert a.generator.rng is not b.generator.rng
+        assert a.generator.regime_state is not b.generator.regime_state
+
+    def test_contexte_non_modifie_par_les_runs(self, base_intensities, matrices):
+        contexte = GenerationContext(MICROZONES, base_intensities=base_intensities, matrices=matrices)
+        lam = contexte.facteurs_statiques.lambda_base.copy()
+        _simuler(GenerationRun(MICROZONES, seed=3, contexte=contexte), 5)
+        np.testing.assert_array_equal(contexte.facteurs_statiques.lambda_base, lam)
+        assert contexte.base_intensities == base_intensities
+
+    def test_flux_evolution_distinct_du_generateur(self, base_intensities, matrices):
+        """Le générateur d'évolution nuit/alcool ne rejoue pas la suite de VectorGenerator.rng."""
+        contexte = GenerationContext(MICROZONES, base_intensities=base_intensities, matrices=matrices)
+        a = GenerationRun(MICROZONES, seed=7, contexte=contexte)
+        b = GenerationRun(MICROZONES, seed=7, contexte=contexte)
+        tirages = a.evolution_rng.random(8)
+        assert not np.array_equal(tirages, a.generator.rng.random(8))
+        np.testing.assert_array_equal(tirages, b.evolution_rng.random(8))
+
+    def test_microzones_differentes(self, base_intensities, matrices):
+        contexte = GenerationContext(MICROZONES, base_intensities=base_intensities, matrices=matrices)
+        with pytest.raises(ValueError):
+            GenerationRun(MICROZONES[:2], seed=1, contexte=contexte)
@@ -0,0 +1,96 @@
+"""
+Tests unitaires pour l'échantillonnage préférentiel (Inclinaison, VectorGenerator incliné).
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from src.core.data.constants import (
+    INCIDENT_TYPE_ACCIDENT,
+    INCIDENT_TYPE_AGRESSION,
+    INCIDENT_TYPE_INCENDIE,
+)
+from src.core.generation.importance_sampling import Inclinaison, log_rapport_multinomial
+from src.core.state.regime_state import REGIME_CRISE
+
+MICROZONES = ["MZ_11_01", "MZ_11_02", "MZ_12_01"]
+TYPES = [INCIDENT_TYPE_AGRESSION, INCIDENT_TYPE_INCENDIE, INCIDENT_TYPE_ACCIDENT]
+BASE_INTENSITIES = {mz: {t: 0.6 for t in TYPES} for mz in MICROZONES}
+
+
+class TestInclinaison:
+    """Tests pour Inclinaison."""
+
+    def test_facteurs_invalides(self):
+        with pytest.raises(ValueError):
+            Inclinaison(facteur_crise=0.0)
+
+    def test_depuis_config(self):
+        assert Inclinaison.depuis_config(SimpleNamespace()) is None
+        neutre = SimpleNamespace(facteur_deterioration=1.0, facteur_crise=1.0, facteur_grave=1.0)
+        assert Inclinaison.depuis_config(SimpleNamespace(echantillonnage_preferentiel=neutre)) is None
+        section = SimpleNamespace(facteur_deterioration=1.0, facteur_crise=3.0, facteur_grave=2.0)
+        inclinaison = Inclinaison.depuis_config(SimpleNamespace(echantillonnage_preferentiel=section))
+        assert inclinaison.active
+        assert inclinaison.facteurs()["facteur_crise"] == 3.0
+
+    def test_lois_inclinees_normalisees(self):
+        inclinaison = Inclinaison(facteur_crise=4.0, facteur_grave=3.0)
+        q = inclinaison.incliner_transition(np.array([0.85, 0.12, 0.03]))
+        assert q.sum() == pytest.approx(1.0)
+        assert q[2] > 0.03 * 3
+        g = inclinaison.incliner_gravite((6.0, 3.0, 1.0))
+        assert g.sum() == pytest.approx(1.0)
+        assert g[2] == pytest.approx(0.3 / 1.2)
+
+    def test_log_rapport_multinomial(self):
+        p = np.array([0.6, 0.3, 0.1])
+        q = Inclinaison(facteur_grave=5.0).incliner_gravite(p)
+        counts = (3, 1, 2)
+        attendu = stats.multinomial.logpmf(counts, 6, p) - stats.multinomial.logpmf(counts, 6, q)
+        assert log_rapport_multinomial(counts, p, q) == pytest.approx(attendu)
+
+
+class TestVectorGeneratorIncline:
+    """Tests pour VectorGenerator avec inclinaison."""
+
+    @pytest.fixture
+    def graves_et_crise(self, simuler):
+        """(graves, jours-microzones en crise) d'un run."""
+
+        def compter(gen, jours):
+            graves = crise = 0
+            for vectors_j in simuler(gen, jours):
+                graves += sum(v.grave for vecteurs in vectors_j.values() for v in vecteurs.values())
+                crise += sum(gen.regime_state.get_regime_or_default(mz) == REGIME_CRISE for mz in MICROZONES)
+            return graves, crise
+
+        return compter
+
+    def test_log_rapport_par_jour(self, generateur, graves_et_crise):
+        gen = generateur(BASE_INTENSITIES, 0, inclinaison=Inclinaison(facteur_crise=3.0, facteur_grave=2.0))
+        graves_et_crise(gen, 5)
+        assert sorted(gen.log_rapport_jours) == [0, 1, 2, 3, 4]
+        assert generateur(BASE_INTENSITIES, 0).log_rapport_jours == {}
+
+    def test_estimation_ponderee_sans_biais(self, generateur, graves_et_crise):
+        """Moyenne pondérée des runs inclinés ≈ moyenne des runs nominaux ; plus de crises simulées."""
+        jours, runs = 10, 400
+        nominaux = np.array(
+            [graves_et_crise(generateur(BASE_INTENSITIES, s), jours) for s in range(runs)], dtype=float
+        )
+        inclinaison = Inclinaison(facteur_crise=2.0, facteur_grave=1.5)
+        inclines, poids = [], []
+        for s in range(runs):
+            gen = generateur(BASE_INTENSITIES, 1000 + s, inclinaison=inclinaison)
+            inclines.append(graves_et_crise(gen, jours))
+            poids.append(np.exp(sum(gen.log_rapport_jours.values())))
+        inclines, poids = np.array(inclines, dtype=float), np.array(poids)
+        assert inclines[:, 1].mean() > 1.3 * nominaux[:, 1].mean()
+        ponderes = poids[:, None] * inclines
+        ecart_type = np.sqrt(ponderes.var(axis=0) / runs + nominaux.var(axis=0) / runs)
+        assert (np.abs(ponderes.mean(axis=0) - nominaux.mean(axis=0)) < 4 * ecart_type).all()
+        assert poids.mean() == pytest.approx(1.0, abs=4 * poids.std() / np.sqrt(runs))
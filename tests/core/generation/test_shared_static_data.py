@@ -0,0 +1,101 @@
+"""
+Tests unitaires pour les données statiques partagées (DonneesStatiques, publier_donnees_statiques).
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from src.core.generation.shared_static_data import DonneesStatiques, publier_donnees_statiques
+
+
+@pytest.fixture
+def sources():
+    matrice = np.array([[0.8, 0.15, 0.05], [0.1, 0.7, 0.2], [0.05, 0.2, 0.75]])
+    return {
+        "matrices": {
+            "matrices_intra_type": {
+                "MZ001": {"agressions": matrice, "incendies": matrice * 0.5},
+                "MZ002": {"accidents": matrice},
+            },
+            "matrices_inter_type": {
+                "MZ001": {"agressions": {"incendies": [0.05, 0.03, 0.01], "accidents": [0.06, 0.04, 0.02]}},
+            },
+            "matrices_voisin": {
+                "MZ001": {"voisins": ["MZ002", "MZ099"], "poids_influence": [0.6, 0.4],
+                          "distances": [0.01, 0.02], "seuil_activation": 5},
+                "MZ002": {"voisins": ["MZ001"], "poids_influence": [1.0], "distances": [0.01], "seuil_activation": 3},
+            },
+            "matrices_saisonnalite": {
+                "MZ002": {"incendies": {"hiver": 1.3, "intersaison": 1.0, "ete": 0.9}},
+            },
+        },
+        "vecteurs_statiques": {
+            "MZ001": {"agression": (9.0, 5.0, 2.0), "incendie": (1.0, 0.0, 0.0), "accident": (3.0, 2.0, 1.0)},
+            "MZ002": {"agression": (4.0, 1.0, 0.0)},
+        },
+        "limites": {"MZ001": 11, "MZ002": 12},
+        "prix_m2": {"MZ001": 12000.0, "MZ002": None},
+        "congestion": None,
+    }
+
+
+def _egal(a, b) -> bool:
+    if isinstance(a, dict):
+        return isinstance(b, dict) and list(a) == list(b) and all(_egal(a[k], b[k]) for k in a)
+    if isinstance(a, (list, tuple)):
+        return type(a) is type(b) and len(a) == len(b) and all(_egal(x, y) for x, y in zip(a, b))
+    if isinstance(a, np.ndarray):
+        return np.array_equal(a, b)
+    return a == b
+
+
+def _somme_intra(descripteur) -> float:
+    donnees = DonneesStatiques.attacher(descripteur)
+    return float(donnees.tables["intra_type"].sum())
+
+
+class TestDonneesStatiques:
+    """Tests pour DonneesStatiques."""
+
+    def test_normaliser_aller_retour(self, sources):
+        donnees = DonneesStatiques.normaliser(sources)
+        # Voisin hors tables ajouté au vocabulaire
+        assert donnees.microzone_ids == ["MZ001", "MZ002", "MZ099"]
+        assert _egal(donnees.matrices(), sources["matrices"])
+        assert _egal(donnees.vecteurs_statiques(), sources["vecteurs_statiques"])
+        assert donnees.limites_microzone_arrondissement() == {"MZ001": 11, "MZ002": 12}
+        assert donnees.prix_m2() == {"MZ001": 12000.0, "MZ002": None}
+        assert donnees.congestion_statique() is None
+
+    def test_tables_csr_voisins(self, sources):
+        t = DonneesStatiques.normaliser(sources).tables
+        assert t["voisins_indptr"].tolist() == [0, 2, 3, 3]
+        assert t["voisins_indices"].tolist() == [1, 2, 0]
+        assert t["voisins_seuil"].tolist() == [5, 3, 0]
+
+    def test_publier_attacher(self, sources):
+        donnees = DonneesStatiques.normaliser(sources)
+        with publier_donnees_statiques(donnees) as descripteur:
+            attache = DonneesStatiques.attacher(descripteur)
+            assert attache.microzone_ids == donnees.microzone_ids
+            for nom, arr in donnees.tables.items():
+                np.testing.assert_array_equal(attache.tables[nom], arr)
+            # Vues en lecture seule, sans copie
+            intra = attache.matrices()["matrices_intra_type"]["MZ001"]["agressions"]
+            assert not intra.flags.writeable
+            assert not intra.flags.owndata
+            assert _egal(attache.matrices(), sources["matrices"])
+            del intra
+            attache.fermer()
+        # Segment détruit en sortie de bloc
+        with pytest.raises(FileNotFoundError):
+            DonneesStatiques.attacher(descripteur)
+
+    def test_attacher_depuis_workers(self, sources):
+        donnees = DonneesStatiques.normaliser(sources)
+        with publier_donnees_statiques(donnees) as descripteur:
+            with ProcessPoolExecutor(max_workers=2) as pool:
+                sommes = list(pool.map(_somme_intra, [descripteur] * 3))
+        assert sommes == [pytest.approx(float(donnees.tables["intra_type"].sum()))] * 3
@@ -0,0 +1,167 @@
+"""
+Tests unitaires pour le mode creux (MoteurCreux, VectorGenerator(mode_creux=True)).
+"""
+
+import numpy as np
+import pytest
+
+from src.core.data.constants import (
+    INCIDENT_TYPE_ACCIDENT,
+    INCIDENT_TYPE_AGRESSION,
+    INCIDENT_TYPE_INCENDIE,
+)
+from src.core.data.vector import Vector
+from src.core.generation.matrix_modulator import MatrixModulator
+from src.core.generation.sparse_mode import MoteurCreux
+from src.core.state.regime_state import REGIME_CRISE, REGIME_DETERIORATION, REGIME_STABLE
+from src.core.state.vectors_state import VectorsState
+
+MICROZONES = ["MZ_11_01", "MZ_11_02", "MZ_12_01"]
+TYPES = [INCIDENT_TYPE_AGRESSION, INCIDENT_TYPE_INCENDIE, INCIDENT_TYPE_ACCIDENT]
+
+
+@pytest.fixture
+def base_intensities():
+    return {
+        mz: {
+            INCIDENT_TYPE_AGRESSION: 0.3 + 0.1 * i,
+            INCIDENT_TYPE_INCENDIE: 0.2,
+            INCIDENT_TYPE_ACCIDENT: 0.0 if i == 2 else 0.1,
+        }
+        for i, mz in enumerate(MICROZONES)
+    }
+
+
+@pytest.fixture
+def modulator():
+    matrice = np.array([[0.7, 0.2, 0.1], [0.3, 0.5, 0.2], [0.1, 0.3, 0.6]])
+    return MatrixModulator(
+        matrices_intra_type={mz: {t: matrice for t in TYPES} for mz in MICROZONES[:2]},
+        matrices_inter_type={},
+        matrices_voisin={
+            "MZ_11_01": {"voisins": ["MZ_11_02"], "seuil_activation": 5},
+            "MZ_11_02": {"voisins": ["MZ_11_01", "MZ_99_99"], "seuil_activation": 5},
+        },
+        reduction_base_matrices=0.8,
+        reduction_effet_patterns=-0.4,
+    )
+
+
+def _vectors(counts):
+    return {
+        mz: {t: Vector(grave=0, moyen=0, benin=int(counts[i, k])) for k, t in enumerate(TYPES)}
+        for i, mz in enumerate(MICROZONES)
+    }
+
+
+class TestMoteurCreux:
+    """Tests pour MoteurCreux."""
+
+    def test_tables(self, base_intensities, modulator):
+        moteur = MoteurCreux(MICROZONES, base_intensities, modulator)
+        # Ligne bénin pondérée (0.5, 1.0, 1.5) ; 1.0 sans matrice
+        assert moteur.facteur_gravite_calme[0, 0] == pytest.approx(0.7 * 0.5 + 0.2 + 0.1 * 1.5)
+        assert np.all(moteur.facteur_gravite_calme[2] == 1.0)
+        # Voisin hors microzones générées ignoré
+        assert moteur.adjacence.nnz == 2
+
+    def test_cellules_actives(self, base_intensities, modulator):
+        moteur = MoteurCreux(MICROZONES, base_intensities, modulator)
+        moteur.synchroniser(0, VectorsState())
+        counts = np.zeros((3, 3), dtype=np.int64)
+        counts[0, 1] = 2  # incendies MZ_11_01 à J-1
+        actives = moteur.cellules_actives(counts)
+        # Toute la microzone (facteur croisé) + le même type chez le voisin
+        assert actives[0].all()
+        assert actives[1].tolist() == [False, True, False]
+        assert not actives[2].any()
+
+    def test_historique_reconstruit_et_enregistre(self, base_intensities, modulator):
+        moteur = MoteurCreux(MICROZONES, base_intensities, modulator)
+        vs = VectorsState()
+        vs.set_vector("MZ_12_01", 2, INCIDENT_TYPE_ACCIDENT, Vector(1, 0, 0))
+        moteur.synchroniser(5, vs)
+        zeros = np.zeros((3, 3), dtype=np.int64)
+        assert moteur.cellules_actives(zeros)[2, 2]
+        # Hors fenêtre J-7..J-1 après 5 jours calmes enregistrés
+        for jour in range(5, 10):
+            moteur.enregistrer(jour, zeros)
+        moteur.synchroniser(10, vs)
+        assert not moteur.cellules_actives(zeros).any()
+
+    def test_intensites_calmes_identiques_au_calcul_detaille(self, base_intensities, modulator):
+        moteur = MoteurCreux(MICROZONES, base_intensities, modulator)
+        regimes = [REGIME_STABLE, REGIME_DETERIORATION, REGIME_CRISE]
+        patterns = {"MZ_11_02": [{"type": "7j"}, {"type": "60j"}]}
+        facteurs_saison = np.array([0.8, 1.3, 1.0])
+        lam = moteur.intensites_calmes(3, facteurs_saison, regimes, [], [], patterns)
+        vides = _vectors(np.zeros((3, 3), dtype=np.int64))
+        for i, mz in enumerate(MICROZONES):
+            for t, incident_type in enumerate(TYPES):
+                attendu = modulator.calculer_intensite_calibree(
+                    mz, incident_type, base_intensities[mz][incident_type], float(facteurs_saison[t]),
+                    VectorsState(), vides, 3, regimes[i], [], [], patterns,
+                )
+                assert lam[i, t] == attendu
+
+    def test_tirer_calmes_loi(self, base_intensities, modulator):
+        moteur = MoteurCreux(MICROZONES, base_intensities, modulator)
+        n = 200000
+        lam = np.full((n, 1), 0.8)
+        regime = np.ones(n)
+        probas = np.array([[0.6, 0.3, 0.1]])
+        tirages = moteur.tirer_calmes(lam, regime, np.ones((n, 1), dtype=bool), probas, np.random.default_rng(0))
+        e = np.exp(-0.5 * 0.8)
+        pi = e / (1.0 + e)
+        totaux = np.array([v.total() for v in tirages.values()])
+        assert totaux.min() >= 1
+        assert len(tirages) / n == pytest.approx((1 - pi) * (1 - np.exp(-0.8)), abs=0.005)
+        assert totaux.sum() / n == pytest.approx((1 - pi) * 0.8, abs=0.01)
+        graves = sum(v.grave for v in tirages.values())
+        assert graves / totaux.sum() == pytest.approx(0.1, abs=0.01)
+
+
+class TestVectorGeneratorModeCreux:
+    """Tests pour VectorGenerator en mode creux."""
+
+    @pytest.fixture
+    def creux(self, base_intensities, modulator, generateur):
+        """Générateur en mode creux (facteurs statiques compilés)."""
+        return lambda seed: generateur(base_intensities, seed, modulator=modulator, mode_creux=True, compiler=True)
+
+    @pytest.fixture
+    def totaux(self, simuler):
+        """Incidents cumulés par (microzone, type) d'un run."""
+
+        def cumuler(gen, jours):
+            totaux = np.zeros((3, 3))
+            for vectors_j in simuler(gen, jours, vectors_state=VectorsState()):
+                for mz, vecteurs in vectors_j.items():
+                    for t, v in vecteurs.items():
+                        totaux[MICROZONES.index(mz), TYPES.index(t)] += v.total()
+            return totaux
+
+        return cumuler
+
+    def test_generation_complete(self, creux, totaux):
+        gen = creux(3)
+        cumul = totaux(gen, 20)
+        assert gen.moteur_creux is not None
+        assert cumul[2, 2] == 0  # λ_base nul
+        assert cumul.sum() > 0
+
+    def test_meme_loi_que_mode_dense(self, creux, totaux):
+        en_creux = sum(totaux(creux(s), 60) for s in range(10))
+        denses = []
+        for s in range(10):
+            gen = creux(s)
+            gen.mode_creux = False
+            denses.append(totaux(gen, 60))
+        dense = sum(denses)
+        # ~300 incidents par type sur 10 × 60 jours
+        np.testing.assert_allclose(en_creux.sum(axis=0), dense.sum(axis=0), rtol=0.2)
+
+    def test_repli_dense_sans_vectors_state(self, creux):
+        gen = creux(1)
+        gen.generate_vectors_for_day(1, _vectors(np.zeros((3, 3), dtype=np.int64)))
+        assert gen.moteur_creux is None
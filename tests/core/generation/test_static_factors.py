@@ -0,0 +1,73 @@
+"""
+Tests unitaires pour les facteurs statiques compilés (FacteursStatiques).
+"""
+
+import numpy as np
+import pytest
+
+from src.core.data.constants import (
+    INCIDENT_TYPE_ACCIDENT,
+    INCIDENT_TYPE_AGRESSION,
+    INCIDENT_TYPE_INCENDIE,
+)
+from src.core.events.prix_m2_modulator import PrixM2Modulator
+from src.core.generation.static_factors import SAISONS, TYPES_INCIDENT, FacteursStatiques, saison_du_jour
+
+MICROZONES = ["MZ_11_01", "MZ_11_02", "MZ_12_01"]
+
+
+@pytest.fixture
+def base_intensities():
+    return {
+        mz: {
+            INCIDENT_TYPE_AGRESSION: 1.0 + i,
+            INCIDENT_TYPE_INCENDIE: 0.8,
+            INCIDENT_TYPE_ACCIDENT: 0.5,
+        }
+        for i, mz in enumerate(MICROZONES)
+    }
+
+
+@pytest.fixture
+def prix_m2():
+    # Moyenne 10000 : facteurs 1.5 (riche), 0.5, 1.0
+    return PrixM2Modulator(prix_m2_data={"MZ_11_01": 15000.0, "MZ_11_02": 5000.0, "MZ_12_01": 10000.0})
+
+
+class TestFacteursStatiques:
+    """Tests pour FacteursStatiques."""
+
+    def test_tableaux(self, base_intensities, prix_m2):
+        fs = FacteursStatiques(MICROZONES, base_intensities, {mz: 11 for mz in MICROZONES}, prix_m2)
+        assert fs.lambda_base.shape == (3, 3)
+        assert fs.lambda_base[1, 0] == 2.0
+        assert fs.diviseur_prix[:, 0].tolist() == [1.5, 0.5, 1.0]
+        # Prix m² : seules les agressions sont modulées
+        assert np.all(fs.diviseur_prix[:, 1:] == 1.0)
+        assert fs.quartier_riche.tolist() == [True, False, False]
+
+    def test_facteurs_saison_identiques_au_generateur(self, base_intensities, generateur):
+        gen = generateur(base_intensities)
+        fs = gen.compiler_facteurs_statiques()
+        for t in (INCIDENT_TYPE_AGRESSION, INCIDENT_TYPE_INCENDIE, INCIDENT_TYPE_ACCIDENT):
+            for saison in ("hiver", "intersaison", "ete"):
+                facteur = fs.facteur_saison[TYPES_INCIDENT.index(t), SAISONS.index(saison)]
+                assert facteur == gen._get_season_factor(t, saison)
+
+    def test_saison_du_jour(self):
+        assert saison_du_jour(1) == "hiver"
+        assert saison_du_jour(100) == "intersaison"
+        assert saison_du_jour(300) == "ete"
+
+    def test_generation_identique_compile_ou_non(self, base_intensities, prix_m2, generateur, simuler):
+        """Les vecteurs générés sont identiques avec ou sans facteurs compilés."""
+        sorties = []
+        for compiler in (False, True):
+            gen = generateur(base_intensities)
+            if compiler:
+                gen.compiler_facteurs_statiques(prix_m2)
+            sorties.append([
+                {mz: {t: (v.grave, v.moyen, v.benin) for t, v in vecs.items()} for mz, vecs in vectors.items()}
+                for vectors in simuler(gen, 29, prix_m2_modulator=prix_m2, effets_reduction={11: 0.2})
+            ])
+        assert sorties[0] == sorties[1]
@@ -0,0 +1,137 @@
+"""
+Tests unitaires pour la réduction de variance (nombres aléatoires communs, antithétiques).
+"""
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from src.core.data.constants import (
+    INCIDENT_TYPE_ACCIDENT,
+    INCIDENT_TYPE_AGRESSION,
+    INCIDENT_TYPE_INCENDIE,
+)
+from src.core.generation.variance_reduction import (
+    UNIFORMES_PAR_MICROZONE,
+    FluxCommuns,
+    binomiale_inverse,
+    choix_inverse,
+    flux_du_run,
+    multinomiale_inverse,
+    poisson_inverse,
+    seed_du_run,
+    zip_inverse,
+)
+from src.core.state.vectors_state import VectorsState
+
+MICROZONES = ["MZ_11_01", "MZ_11_02", "MZ_12_01"]
+TYPES = [INCIDENT_TYPE_AGRESSION, INCIDENT_TYPE_INCENDIE, INCIDENT_TYPE_ACCIDENT]
+
+
+class TestInversions:
+    """Tests pour les tirages par inversion de la fonction de répartition."""
+
+    @pytest.mark.parametrize("lam", [0.3, 4.0, 55.0])
+    def test_poisson_egal_quantile_scipy(self, lam):
+        for u in np.linspace(0.001, 0.999, 97):
+            assert poisson_inverse(u, lam) == int(stats.poisson.ppf(u, lam))
+
+    @pytest.mark.parametrize("n,p", [(7, 0.3), (40, 0.85), (300, 0.1)])
+    def test_binomiale_egal_quantile_scipy(self, n, p):
+        for u in np.linspace(0.001, 0.999, 97):
+            assert binomiale_inverse(u, n, p) == int(stats.binom.ppf(u, n, p))
+
+    def test_cas_degeneres(self):
+        assert poisson_inverse(0.9, 0.0) == 0
+        assert binomiale_inverse(0.5, 0, 0.3) == 0
+        assert binomiale_inverse(0.5, 5, 1.0) == 5
+        assert poisson_inverse(1.0, 2.0) >= 0  # u = 1 (miroir de u = 0)
+
+    def test_choix_inverse(self):
+        probas = [0.7, 0.2, 0.1]
+        assert [choix_inverse(u, probas) for u in (0.0, 0.69, 0.71, 0.89, 0.95, 1.0)] == [0, 0, 1, 1, 2, 2]
+
+    def test_zip_et_multinomiale_monotones(self):
+        assert zip_inverse(0.1, 0.99, 3.0, proba_zero=0.2) == 0
+        assert zip_inverse(0.5, 0.2, 3.0, 0.2) <= zip_inverse(0.5, 0.8, 3.0, 0.2)
+        benin, moyen, grave = multinomiale_inverse(0.5, 0.5, 10, (0.6, 0.3, 0.1))
+        assert benin + moyen + grave == 10
+        assert multinomiale_inverse(0.0, 0.0, 10, (0.6, 0.3, 0.1))[2] >= grave
+
+    def test_multinomiale_meme_loi(self):
+        rng = np.random.default_rng(0)
+        tirages = np.array([multinomiale_inverse(a, b, 20, (0.5, 0.3, 0.2)) for a, b in rng.random((4000, 2))])
+        np.testing.assert_allclose(tirages.mean(axis=0), [10.0, 6.0, 4.0], atol=0.15)
+
+
+class TestFluxCommuns:
+    """Tests pour FluxCommuns et les seeds de campagne."""
+
+    def test_sous_flux_par_jour_reproductibles(self):
+        u = FluxCommuns(42).uniformes(1, 5, 4, UNIFORMES_PAR_MICROZONE)
+        assert u.shape == (4, UNIFORMES_PAR_MICROZONE)
+        np.testing.assert_array_equal(u, FluxCommuns(42).uniformes(1, 5, 4, UNIFORMES_PAR_MICROZONE))
+        assert not np.array_equal(u, FluxCommuns(42).uniformes(1, 6, 4, UNIFORMES_PAR_MICROZONE))
+        assert not np.array_equal(u, FluxCommuns(43).uniformes(1, 5, 4, UNIFORMES_PAR_MICROZONE))
+
+    def test_antithetique_miroir(self):
+        u = FluxCommuns(7).uniformes(1, 3, 2, 5)
+        np.testing.assert_allclose(FluxCommuns(7, antithetique=True).uniformes(1, 3, 2, 5), 1.0 - u)
+
+    def test_seed_et_flux_du_run(self):
+        assert [seed_du_run(10, i) for i in range(4)] == [10, 11, 12, 13]
+        assert [seed_du_run(10, i, "crn") for i in range(4)] == [10, 11, 12, 13]
+        assert [seed_du_run(10, i, "antithetique") for i in range(4)] == [10, 10, 11, 11]
+        assert flux_du_run(10, 0) is None
+        assert not flux_du_run(10, 1, "crn").antithetique
+        assert [flux_du_run(10, i, "antithetique").antithetique for i in range(2)] == [False, True]
+        with pytest.raises(ValueError):
+            seed_du_run(10, 0, "inconnu")
+
+
+class TestVectorGeneratorFluxCommuns:
+    """Tests pour VectorGenerator avec nombres aléatoires communs."""
+
+    @pytest.fixture
+    def fabrique(self, generateur):
+        """Générateur en mode creux, intensités 0.8 × facteur, flux communs optionnels."""
+
+        def fabriquer(seed, facteur=1.0, flux=None):
+            base_intensities = {mz: {t: 0.8 * facteur for t in TYPES} for mz in MICROZONES}
+            return generateur(base_intensities, seed, mode_creux=True, flux_communs=flux)
+
+        return fabriquer
+
+    @pytest.fixture
+    def comptes(self, simuler):
+        """Comptes (jour, microzone, type) d'un run."""
+
+        def compter(gen, jours):
+            return np.array([
+                [[v.total() for v in vectors_j[mz].values()] for mz in MICROZONES]
+                for vectors_j in simuler(gen, jours, vectors_state=VectorsState())
+            ])
+
+        return compter
+
+    def test_tirages_independants_du_generateur_sequentiel(self, fabrique, comptes):
+        """Même seed de flux, générateurs séquentiels différents : mêmes vecteurs (régimes initiaux mis à part)."""
+        a = fabrique(1, flux=FluxCommuns(5))
+        b = fabrique(2, flux=FluxCommuns(5))
+        b.regime_state = a.regime_state.__class__()
+        for mz in MICROZONES:
+            b.regime_state.set_regime(mz, a.regime_state.get_regime_or_default(mz))
+        np.testing.assert_array_equal(comptes(a, 15), comptes(b, 15))
+        assert a.moteur_creux is None  # mode creux désactivé sous flux communs
+
+    def test_scenarios_correles(self, fabrique, comptes):
+        """Intensité +30 % : comptes jour par jour jamais inférieurs avec les mêmes uniformes."""
+        base = comptes(fabrique(3, flux=FluxCommuns(9)), 30)
+        forte = comptes(fabrique(3, facteur=1.3, flux=FluxCommuns(9)), 30)
+        assert (forte >= base).all() and forte.sum() > base.sum()
+        assert np.corrcoef(base.ravel(), forte.ravel())[0, 1] > 0.5
+
+    def test_meme_loi_que_mode_sequentiel(self, fabrique, comptes):
+        communs = sum(comptes(fabrique(s, flux=FluxCommuns(s)), 40).sum() for s in range(8))
+        sequentiel = sum(comptes(fabrique(s), 40).sum() for s in range(8))
+        assert communs == pytest.approx(sequentiel, rel=0.15)
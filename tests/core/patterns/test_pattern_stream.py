@@ -0,0 +1,108 @@
+"""
+Tests du détecteur incrémental de patterns (StreamingPatternDetector).
+
+- Équivalence avec detect_pattern_4j / detect_pattern_60j
+- Déclenchement unique par série, expiration, limite par microzone
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[3]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from core.patterns import StreamingPatternDetector, detect_pattern_4j, detect_pattern_60j
+
+MZS = ["MZ001", "MZ002"]
+
+
+def _counts(agressions: list[int]) -> np.ndarray:
+    """Totaux du jour (N, 3) avec seulement des agressions."""
+    counts = np.zeros((len(agressions), 3), dtype=np.int64)
+    counts[:, 0] = agressions
+    return counts
+
+
+class TestSeries:
+    def test_series(self):
+        det = StreamingPatternDetector(MZS)
+        for a in [1, 2, 0, 3]:
+            det.observer(_counts([a, 0]))
+        assert det.serie_active[:, 0].tolist() == [1, 0]
+        assert det.serie_calme[:, 0].tolist() == [0, 4]
+
+    def test_forme_invalide(self):
+        det = StreamingPatternDetector(MZS)
+        with pytest.raises(ValueError):
+            det.observer(np.zeros((3, 3)))
+
+    def test_type_declencheur_inconnu(self):
+        with pytest.raises(ValueError):
+            StreamingPatternDetector(MZS, types_declencheurs=("inconnu",))
+
+
+class TestEquivalenceFenetres:
+    def test_declenchements_equivalents_aux_detecteurs(self):
+        """Un déclenchement correspond au premier jour où le détecteur fenêtré devient vrai."""
+        rng = np.random.default_rng(0)
+        det = StreamingPatternDetector(["MZ001"])
+        historique = []
+        precedent_4j = precedent_60j = False
+        for _ in range(300):
+            a = int(rng.random() < 0.4)
+            historique.append((a, 0, 0))
+            det.observer(_counts([a]))
+            masques = det.declenchements()
+            h = {"MZ001": historique}
+            vrai_4j, vrai_60j = detect_pattern_4j(h, "MZ001"), detect_pattern_60j(h, "MZ001")
+            assert bool(masques["7j"][0, 0]) == (vrai_4j and not precedent_4j)
+            assert bool(masques["60j"][0, 0]) == (vrai_60j and not precedent_60j)
+            precedent_4j, precedent_60j = vrai_4j, vrai_60j
+
+
+class TestUpdate:
+    def test_pattern_7j_puis_expiration(self):
+        det = StreamingPatternDetector(MZS)
+        patterns_actifs: dict = {}
+        evenements = []
+        for jour in range(1, 5):
+            evenements += det.update(jour, _counts([1, 1]), patterns_actifs)
+        debuts = [e for e in evenements if e["evenement"] == "debut"]
+        assert {e["microzone_id"] for e in debuts} == set(MZS)
+        assert patterns_actifs["MZ001"][0]["type"] == "7j"
+        # Série continue : pas de second déclenchement, expiration après 7 jours
+        fins = []
+        for jour in range(5, 12):
+            fins += [e for e in det.update(jour, _counts([1, 1]), patterns_actifs) if e["evenement"] == "fin"]
+        assert len(fins) == 2
+        assert patterns_actifs == {}
+
+    def test_pattern_60j(self):
+        det = StreamingPatternDetector(MZS)
+        patterns_actifs: dict = {}
+        for jour in range(1, 8):
+            det.update(jour, _counts([0, 1]), patterns_actifs)
+        assert [p["type"] for p in patterns_actifs["MZ001"]] == ["60j"]
+        assert [p["type"] for p in patterns_actifs["MZ002"]] == ["7j"]
+
+    def test_incendies_ne_declenchent_pas(self):
+        det = StreamingPatternDetector(MZS)
+        patterns_actifs: dict = {}
+        counts = np.zeros((2, 3), dtype=np.int64)
+        counts[:, 1] = 1
+        counts[:, 0] = 1
+        for jour in range(1, 4):
+            det.update(jour, counts, patterns_actifs)
+        assert patterns_actifs == {}
+
+    def test_nombre_actifs(self):
+        det = StreamingPatternDetector(MZS)
+        patterns_actifs = {"MZ002": [{"type": "7j", "jour_actuel": 0, "duree": 7}]}
+        assert det.nombre_actifs(patterns_actifs).tolist() == [0, 1]
@@ -26,6 +26,8 @@ from core.probability import (
     apply_voisin,
     apply_saisonnalite,
     calculer_probabilite_incidents_J1,
+    calculer_probabilite_incidents_J1_array,
+    compiler_matrices_probabilite,
 )
 from core.probability._loader import load_matrices_for_probability
 
@@ -250,3 +252,80 @@ class TestLoader:
             for t in TYPES:
                 p = out[mz][t]
                 assert all(0 <= x <= 1 for x in p), f"{mz}/{t}: {p}"
+
+
+# ---- Version tensorielle ----
+
+
+class _EtatDynamique:
+    def __init__(self, trafic, incidents_nuit, incidents_alcool):
+        self.trafic = trafic
+        self.incidents_nuit = incidents_nuit
+        self.incidents_alcool = incidents_alcool
+
+
+def _donnees_aleatoires(n: int, seed: int):
+    """Microzones avec matrices, incidents, état dynamique et patterns aléatoires."""
+    rng = np.random.default_rng(seed)
+    mz_ids = [f"MZ{i:03d}" for i in range(1, n + 1)]
+    prob_base = {mz: {t: float(rng.uniform(0.0, 0.4)) for t in TYPES} for mz in mz_ids}
+    inc = {mz: {t: tuple(int(x) for x in rng.poisson(0.6, 3)) for t in TYPES} for mz in mz_ids}
+    intra = {mz: {t: rng.dirichlet(np.ones(3), 3) for t in TYPES if rng.random() < 0.9} for mz in mz_ids}
+    inter, voisin, saison = {}, {}, {}
+    for mz in mz_ids:
+        inter.update(_inter_mock(mz))
+        # Seuils non entiers : pas d'égalité exacte avec la somme pondérée
+        voisin.update({mz: {"voisins": list(rng.choice(mz_ids, 8)), "seuil_activation": 2.55}})
+        saison.update(_saison_mock(mz))
+    etat = _EtatDynamique(
+        {mz: float(rng.random()) for mz in mz_ids},
+        {mz: {t: int(rng.integers(0, 2)) for t in TYPES} for mz in mz_ids},
+        {mz: {t: int(rng.integers(0, 2)) for t in TYPES} for mz in mz_ids},
+    )
+    patterns = {
+        mz: [{"type": "7j", "type_incident": "agressions", "jour_actuel": int(rng.integers(0, 7))}]
+        for mz in mz_ids[::4]
+    }
+    return mz_ids, prob_base, inc, intra, inter, voisin, saison, etat, patterns
+
+
+class TestCalculerProbabiliteTenseur:
+    @pytest.mark.parametrize("saison", ["hiver", "intersaison", "ete"])
+    def test_identique_au_calcul_par_microzone(self, saison):
+        mz_ids, prob_base, inc, intra, inter, voisin, saisons, etat, patterns = _donnees_aleatoires(40, 3)
+        args = (prob_base, inc, intra, inter, voisin, saisons, mz_ids, saison)
+        attendu = calculer_probabilite_incidents_J1(*args, dynamic_state=etat, patterns_actifs=patterns)
+        out, tableau = calculer_probabilite_incidents_J1_array(*args, dynamic_state=etat, patterns_actifs=patterns)
+        assert tableau.shape == (40, 3, 3)
+        for mz in mz_ids:
+            for t in TYPES:
+                assert out[mz][t] == pytest.approx(attendu[mz][t], abs=1e-12)
+
+    def test_matrices_compilees_reutilisables(self):
+        mz_ids, prob_base, inc, intra, inter, voisin, saisons, _, _ = _donnees_aleatoires(10, 5)
+        matrices = compiler_matrices_probabilite(mz_ids, intra, inter, voisin, saisons)
+        args = (prob_base, inc, intra, inter, voisin, saisons, mz_ids, "ete")
+        _, sans = calculer_probabilite_incidents_J1_array(*args)
+        _, avec = calculer_probabilite_incidents_J1_array(*args, matrices=matrices)
+        np.testing.assert_array_equal(sans, avec)
+
+    def test_matrices_chargees(self):
+        if not SOURCE_DATA.exists():
+            pytest.skip("data/source_data absent")
+        m = load_matrices_for_probability(SOURCE_DATA)
+        for k in ("matrices_intra_type", "matrices_inter_type", "matrices_voisin", "matrices_saisonnalite"):
+            if k not in m or not m[k]:
+                pytest.skip(f"matrices {k} manquantes")
+        mz_ids = list(m["matrices_intra_type"].keys())
+        rng = np.random.default_rng(0)
+        prob_base = {mz: {t: 0.1 for t in TYPES} for mz in mz_ids}
+        inc = {mz: {t: tuple(int(x) for x in rng.poisson(0.5, 3)) for t in TYPES} for mz in mz_ids}
+        args = (
+            prob_base, inc, m["matrices_intra_type"], m["matrices_inter_type"],
+            m["matrices_voisin"], m["matrices_saisonnalite"], mz_ids, "hiver",
+        )
+        attendu = calculer_probabilite_incidents_J1(*args)
+        out, _ = calculer_probabilite_incidents_J1_array(*args)
+        for mz in mz_ids:
+            for t in TYPES:
+                assert out[mz][t] == pytest.approx(attendu[mz][t], abs=1e-12)
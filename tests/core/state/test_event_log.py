@@ -0,0 +1,60 @@
+"""
+Tests du journal colonnaire des événements (JournalEvenements).
+"""
+
+import pickle
+
+import numpy as np
+import pytest
+
+from src.core.state.event_log import COLONNES, JournalEvenements
+from src.core.state.events_state import EventsState
+
+
+def _bloc(n: int, jour: int) -> dict:
+    bloc = {c: np.zeros(n, dtype=dt) for c, dt in COLONNES.items()}
+    bloc["jour"][:] = jour
+    return bloc
+
+
+class TestJournalEvenements:
+    """Tests pour JournalEvenements."""
+
+    def test_ajout_et_concatenation(self):
+        journal = JournalEvenements()
+        journal.ajouter(_bloc(2, 0))
+        journal.ajouter(_bloc(0, 1))
+        journal.ajouter(_bloc(3, 2))
+        assert len(journal) == 5
+        assert journal.colonnes()["jour"].tolist() == [0, 0, 2, 2, 2]
+        # Lecture répétée : même résultat après compaction
+        assert journal.colonnes()["jour"].tolist() == [0, 0, 2, 2, 2]
+
+    def test_vide(self):
+        journal = JournalEvenements()
+        assert len(journal) == 0
+        assert set(journal.colonnes()) == set(COLONNES)
+
+    def test_colonne_manquante(self):
+        bloc = _bloc(1, 0)
+        del bloc["duration"]
+        with pytest.raises(ValueError):
+            JournalEvenements().ajouter(bloc)
+
+    def test_longueurs_differentes(self):
+        bloc = _bloc(2, 0)
+        bloc["duration"] = np.zeros(3, dtype=np.int64)
+        with pytest.raises(ValueError):
+            JournalEvenements().ajouter(bloc)
+
+
+class TestEventsStatePickle:
+    """Compatibilité des EventsState picklés avant le journal colonnaire."""
+
+    def test_etat_sans_journal(self):
+        ancien = EventsState()
+        del ancien.__dict__["journal_graves"]
+        relu = pickle.loads(pickle.dumps(ancien))
+        assert isinstance(relu.journal_graves, JournalEvenements)
+        relu.journal_graves.ajouter(_bloc(2, 0))
+        assert len(relu.journal_graves) == 2
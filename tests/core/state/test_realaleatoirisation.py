@@ -98,3 +98,35 @@ def test_dampening_only_affects_correct_arrondissement() -> None:
     d12 = state.get_matrix_dampening(10, "MZ_12_01")
     assert d11 < 1.0
     assert d12 == 1.0
+
+
+def _alpha_and_r_par_parcours(state, jour: int, arr: int) -> tuple[float, float]:
+    """Référence : parcours des patterns actifs (calcul avant compilation en tables)."""
+    active = [p for p in state.patterns if p.arrondissement == arr and p.jour_debut <= jour <= p.jour_fin()]
+    active.sort(key=lambda p: p.jour_debut)
+    alphas = [p.alpha_at_day(jour) for p in active]
+    if not active or min(1.0, sum(alphas)) <= 0:
+        return 0.0, 0.0
+    return min(1.0, sum(alphas)), sum(p.taux_reduction_r * a for p, a in zip(active, alphas)) / sum(alphas)
+
+
+def test_tables_identiques_au_parcours() -> None:
+    """Les tables compilées jours × arrondissements reproduisent exactement le parcours des patterns."""
+    mz_to_arr = {f"MZ_{a:02d}_01": a for a in range(1, 21)}
+    state = mod.generate_realaléatoirisation_patterns(list(range(1, 21)), 120, mz_to_arr, {"enabled": True}, seed=7)
+    for jour in range(140):
+        for mz, arr in mz_to_arr.items():
+            alpha, r = _alpha_and_r_par_parcours(state, jour, arr)
+            assert state.get_alpha_and_r(jour, mz) == (alpha, r)
+            assert state.get_matrix_dampening(jour, mz) == 1.0 - r * alpha
+
+
+def test_dampening_jour_vectoriel() -> None:
+    """dampening_jour lit une journée entière en une fois, hors table → 1."""
+    patterns = [mod.RealaléatoirisationPattern(11, 5, 10, 2, 0, 2, 0.8)]
+    mz_ids = ["MZ_11_01", "MZ_12_01"]
+    state = mod.RealaléatoirisationState(patterns, {"MZ_11_01": 11, "MZ_12_01": 12}, {})
+    valeurs = state.dampening_jour(10, mz_ids)
+    assert valeurs.tolist() == [state.get_matrix_dampening(10, mz) for mz in mz_ids]
+    assert state.dampening_jour(500, mz_ids).tolist() == [1.0, 1.0]
+    assert state.get_matrix_dampening(-1, "MZ_11_01") == 1.0
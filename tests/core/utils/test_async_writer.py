@@ -0,0 +1,69 @@
+"""
+Tests unitaires pour l'écrivain asynchrone (EcrivainAsynchrone).
+"""
+
+import threading
+
+import pytest
+
+from src.core.utils.async_writer import EcrivainAsynchrone
+
+
+class TestEcrivainAsynchrone:
+    """Tests pour EcrivainAsynchrone."""
+
+    def test_taches_executees_dans_l_ordre_sur_un_autre_thread(self):
+        ecrits, threads = [], set()
+
+        def ecrire(i):
+            ecrits.append(i)
+            threads.add(threading.current_thread().name)
+
+        with EcrivainAsynchrone(taille_file=1) as ecrivain:
+            for i in range(20):
+                ecrivain.soumettre(ecrire, i)
+        # Vidage garanti en sortie de bloc
+        assert ecrits == list(range(20))
+        assert threads == {"ecrivain-sorties"}
+
+    def test_contre_pression(self):
+        debloquer = threading.Event()
+        ecrivain = EcrivainAsynchrone(taille_file=1)
+        ecrivain.soumettre(debloquer.wait)  # occupe le thread
+        ecrivain.soumettre(lambda: None)  # remplit la file
+        bloque = threading.Thread(target=ecrivain.soumettre, args=(lambda: None,))
+        bloque.start()
+        bloque.join(timeout=0.2)
+        assert bloque.is_alive()
+        debloquer.set()
+        bloque.join(timeout=5)
+        assert not bloque.is_alive()
+        ecrivain.fermer()
+
+    def test_erreur_relevee_sans_arreter_les_taches_suivantes(self):
+        ecrits = []
+
+        def echouer():
+            raise OSError("disque plein")
+
+        ecrivain = EcrivainAsynchrone()
+        ecrivain.soumettre(echouer)
+        ecrivain.soumettre(ecrits.append, 1)
+        with pytest.raises(OSError, match="disque plein"):
+            ecrivain.fermer()
+        assert ecrits == [1]
+        with pytest.raises(RuntimeError):
+            ecrivain.soumettre(ecrits.append, 2)
+
+    def test_exception_en_cours_prioritaire(self):
+        ecrits = []
+        with pytest.raises(KeyError):
+            with EcrivainAsynchrone() as ecrivain:
+                ecrivain.soumettre(ecrits.append, 1)
+                ecrivain.soumettre(lambda: 1 / 0)
+                raise KeyError("simulation")
+        assert ecrits == [1]
+
+    def test_taille_file_invalide(self):
+        with pytest.raises(ValueError):
+            EcrivainAsynchrone(taille_file=0)
@@ -0,0 +1,97 @@
+"""
+Tests unitaires pour les statistiques en ligne (AccumulateurWelford).
+"""
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from src.core.utils.online_stats import AccumulateurWelford, EstimateurQuantilesP2
+
+
+class TestAccumulateurWelford:
+    """Tests pour AccumulateurWelford."""
+
+    def test_moyenne_variance_comme_numpy(self):
+        x = np.random.default_rng(0).normal(10.0, 3.0, size=(50, 4))
+        acc = AccumulateurWelford()
+        for ligne in x:
+            acc.ajouter(ligne)
+        assert acc.n == 50
+        np.testing.assert_allclose(acc.moyenne, x.mean(axis=0))
+        np.testing.assert_allclose(acc.variance, x.var(axis=0, ddof=1))
+
+    def test_fusion_equivaut_a_un_seul_accumulateur(self):
+        x = np.random.default_rng(1).poisson(5.0, size=30).astype(float)
+        a, b, tout = AccumulateurWelford(), AccumulateurWelford(), AccumulateurWelford()
+        for v in x[:12]:
+            a.ajouter(v)
+        for v in x[12:]:
+            b.ajouter(v)
+        for v in x:
+            tout.ajouter(v)
+        vide = AccumulateurWelford()
+        vide.fusionner(a)
+        vide.fusionner(b)
+        assert vide.n == 30
+        np.testing.assert_allclose(vide.moyenne, tout.moyenne)
+        np.testing.assert_allclose(vide.variance, tout.variance)
+
+    def test_demi_largeur_ic(self):
+        x = [1.0, 2.0, 4.0, 7.0]
+        acc = AccumulateurWelford()
+        acc.ajouter(x[0])
+        assert np.isinf(acc.demi_largeur_ic())
+        for v in x[1:]:
+            acc.ajouter(v)
+        attendu = stats.t.ppf(0.975, 3) * np.std(x, ddof=1) / 2.0
+        assert acc.demi_largeur_ic(0.95) == pytest.approx(attendu)
+
+    def test_formes_incompatibles(self):
+        acc = AccumulateurWelford()
+        acc.ajouter([1.0, 2.0])
+        with pytest.raises(ValueError):
+            acc.ajouter([1.0, 2.0, 3.0])
+        with pytest.raises(ValueError):
+            AccumulateurWelford().moyenne
+
+
+class TestEstimateurQuantilesP2:
+    """Tests pour EstimateurQuantilesP2."""
+
+    def test_exact_sur_les_premieres_observations(self):
+        est = EstimateurQuantilesP2((0.25, 0.5))
+        for v in ([3.0, 0.0], [1.0, 0.0], [2.0, 4.0]):
+            est.ajouter(v)
+        np.testing.assert_allclose(est.quantiles(), np.quantile([[3.0, 0.0], [1.0, 0.0], [2.0, 4.0]], (0.25, 0.5), axis=0))
+
+    def test_proche_des_quantiles_empiriques(self):
+        x = np.random.default_rng(2).gamma(2.0, 3.0, size=(3000, 2))
+        est = EstimateurQuantilesP2((0.05, 0.5, 0.95))
+        for ligne in x:
+            est.ajouter(ligne)
+        attendu = np.quantile(x, (0.05, 0.5, 0.95), axis=0)
+        np.testing.assert_allclose(est.quantiles(), attendu, rtol=0.05)
+
+    def test_fusion_exacte_avec_peu_d_observations(self):
+        x = np.random.default_rng(3).normal(size=(40, 3))
+        sequentiel, fusionne = EstimateurQuantilesP2(), EstimateurQuantilesP2()
+        for ligne in x:
+            sequentiel.ajouter(ligne)
+            un_run = EstimateurQuantilesP2()
+            un_run.ajouter(ligne)
+            fusionne.fusionner(un_run)
+        np.testing.assert_array_equal(fusionne.quantiles(), sequentiel.quantiles())
+
+    def test_fusion_approchee(self):
+        x = np.random.default_rng(4).normal(5.0, 2.0, size=3000)
+        a, b = EstimateurQuantilesP2((0.1, 0.5, 0.9)), EstimateurQuantilesP2((0.1, 0.5, 0.9))
+        for v in x[:1000]:
+            a.ajouter(v)
+        for v in x[1000:]:
+            b.ajouter(v)
+        a.fusionner(b)
+        assert a.n == 3000
+        np.testing.assert_allclose(a.quantiles(), np.quantile(x, (0.1, 0.5, 0.9)), atol=0.15)
+        with pytest.raises(ValueError):
+            a.fusionner(EstimateurQuantilesP2((0.5,)))
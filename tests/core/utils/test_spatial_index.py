@@ -0,0 +1,77 @@
+"""
+Tests unitaires pour MicrozoneSpatialIndex (index STRtree des microzones).
+"""
+
+import numpy as np
+import pytest
+
+gpd = pytest.importorskip("geopandas")
+from shapely.geometry import LineString, Point, box
+
+from src.core.utils.spatial_index import MicrozoneSpatialIndex
+
+
+@pytest.fixture
+def grille_microzones():
+    """Grille 3×3 de carrés 10×10 (MZ001..MZ009, rang = ordre ligne par ligne)."""
+    geoms, ids = [], []
+    for j in range(3):
+        for i in range(3):
+            geoms.append(box(i * 10, j * 10, (i + 1) * 10, (j + 1) * 10))
+            ids.append(f"MZ{len(ids) + 1:03d}")
+    return gpd.GeoDataFrame({"microzone_id": ids}, geometry=geoms, crs="EPSG:32631")
+
+
+class TestMicrozoneSpatialIndex:
+    """Tests pour MicrozoneSpatialIndex."""
+
+    def test_find_point_interieur(self, grille_microzones):
+        index = MicrozoneSpatialIndex(grille_microzones)
+        assert index.find(Point(5, 5)) == "MZ001"
+        assert index.find(Point(25, 15)) == "MZ006"
+
+    def test_point_hors_emprise(self, grille_microzones):
+        index = MicrozoneSpatialIndex(grille_microzones)
+        assert index.find(Point(-1, 5)) is None
+        assert index.find(Point(100, 100)) is None
+
+    def test_frontiere_retient_plus_petit_rang(self, grille_microzones):
+        """Un point sur une frontière appartient à la première microzone (comme iterrows)."""
+        index = MicrozoneSpatialIndex(grille_microzones)
+        assert index.find(Point(10, 10)) == "MZ001"
+        assert index.find(Point(20, 5)) == "MZ002"
+
+    def test_query_groupee_equivalente_boucle(self, grille_microzones):
+        index = MicrozoneSpatialIndex(grille_microzones)
+        rng = np.random.default_rng(0)
+        xs = rng.uniform(-5, 35, 500)
+        ys = rng.uniform(-5, 35, 500)
+
+        result = index.query(xs, ys)
+
+        for x, y, mz in zip(xs, ys, result):
+            attendu = None
+            for _, row in grille_microzones.iterrows():
+                if row.geometry.intersects(Point(x, y)):
+                    attendu = row["microzone_id"]
+                    break
+            assert mz == attendu
+
+    def test_query_vide(self, grille_microzones):
+        index = MicrozoneSpatialIndex(grille_microzones)
+        assert index.query([], []).shape == (0,)
+        assert index.query_points([]).shape == (0,)
+
+    def test_intersecting_ordre_source(self, grille_microzones):
+        index = MicrozoneSpatialIndex(grille_microzones)
+        ligne = LineString([(25, 5), (5, 5)])
+        assert index.intersecting(ligne) == ["MZ001", "MZ002", "MZ003"]
+
+    def test_nearest_centroid(self, grille_microzones):
+        index = MicrozoneSpatialIndex(grille_microzones)
+        assert index.nearest_centroid(Point(-50, -50)) == "MZ001"
+        assert index.nearest_centroid(Point(40, 40)) == "MZ009"
+
+    def test_colonne_identifiant_absente(self, grille_microzones):
+        with pytest.raises(KeyError):
+            MicrozoneSpatialIndex(grille_microzones, id_column="inconnu")
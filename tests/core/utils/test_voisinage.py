@@ -0,0 +1,97 @@
+"""
+Tests unitaires pour la construction du voisinage des microzones (knn, rayon, adjacence).
+"""
+
+import numpy as np
+import pytest
+
+gpd = pytest.importorskip("geopandas")
+pytest.importorskip("scipy")
+from shapely.geometry import box
+
+from src.core.utils.voisinage import VoisinageCSR, construire_voisinage
+
+
+@pytest.fixture
+def grille_microzones():
+    """Grille 4×4 de carrés 10×10 (MZ001..MZ016)."""
+    geoms, ids = [], []
+    for j in range(4):
+        for i in range(4):
+            geoms.append(box(i * 10, j * 10, (i + 1) * 10, (j + 1) * 10))
+            ids.append(f"MZ{len(ids) + 1:03d}")
+    return gpd.GeoDataFrame({"microzone_id": ids}, geometry=geoms, crs="EPSG:32631")
+
+
+def _voisins_boucle(microzones, k):
+    """Référence : ancienne boucle O(N²) (tri stable par distance)."""
+    centroids = {
+        row["microzone_id"]: (row.geometry.centroid.x, row.geometry.centroid.y)
+        for _, row in microzones.iterrows()
+    }
+    resultat = {}
+    for mz_id, (cx, cy) in centroids.items():
+        distances = [
+            (other, np.sqrt((cx - ox) ** 2 + (cy - oy) ** 2))
+            for other, (ox, oy) in centroids.items() if other != mz_id
+        ]
+        distances.sort(key=lambda x: x[1])
+        resultat[mz_id] = distances[:k]
+    return resultat
+
+
+class TestConstruireVoisinage:
+    """Tests pour construire_voisinage."""
+
+    def test_knn_equivalent_boucle(self, grille_microzones):
+        voisinage = construire_voisinage(grille_microzones, mode="knn", k=8)
+        matrices = voisinage.to_matrices_voisin()
+        reference = _voisins_boucle(grille_microzones, 8)
+
+        for mz_id, attendu in reference.items():
+            assert matrices[mz_id]["voisins"] == [v for v, _ in attendu]
+            assert np.allclose(matrices[mz_id]["distances"], [d for _, d in attendu])
+            assert abs(sum(matrices[mz_id]["poids_influence"]) - 1.0) < 1e-9
+            assert matrices[mz_id]["seuil_activation"] == 5
+
+    def test_knn_poids_inverse_distance(self, grille_microzones):
+        voisinage = construire_voisinage(grille_microzones, mode="knn", k=3)
+        d = voisinage.distances[:3]
+        attendu = (1.0 / (d + 0.001)) / (1.0 / (d + 0.001)).sum()
+        assert np.allclose(voisinage.poids[:3], attendu)
+
+    def test_knn_k_superieur_nombre_microzones(self, grille_microzones):
+        voisinage = construire_voisinage(grille_microzones.iloc[:3], mode="knn", k=8)
+        assert np.diff(voisinage.indptr).tolist() == [2, 2, 2]
+
+    def test_rayon(self, grille_microzones):
+        voisinage = construire_voisinage(grille_microzones, mode="rayon", rayon=10.5)
+        # Coin : 2 voisins à distance 10, centre : 4
+        assert np.diff(voisinage.indptr)[0] == 2
+        assert np.diff(voisinage.indptr)[5] == 4
+        assert (voisinage.distances <= 10.5).all()
+
+    def test_rayon_requis(self, grille_microzones):
+        with pytest.raises(ValueError):
+            construire_voisinage(grille_microzones, mode="rayon")
+
+    def test_adjacence(self, grille_microzones):
+        voisinage = construire_voisinage(grille_microzones, mode="adjacence")
+        ids = voisinage.microzone_ids
+        # MZ001 (coin) touche MZ002, MZ005 et MZ006 (par le sommet)
+        assert sorted(ids[i] for i in voisinage.voisins(0)) == ["MZ002", "MZ005", "MZ006"]
+        # Graphe symétrique
+        paires = {(i, int(j)) for i in range(len(voisinage)) for j in voisinage.voisins(i)}
+        assert all((j, i) in paires for i, j in paires)
+
+    def test_mode_inconnu(self, grille_microzones):
+        with pytest.raises(ValueError):
+            construire_voisinage(grille_microzones, mode="delaunay")
+
+    def test_aller_retour_dict(self, grille_microzones):
+        voisinage = construire_voisinage(grille_microzones, mode="knn", k=4)
+        copie = VoisinageCSR.from_dict(voisinage.to_dict())
+        assert copie.microzone_ids == voisinage.microzone_ids
+        assert np.array_equal(copie.indices, voisinage.indices)
+        assert np.allclose(copie.poids, voisinage.poids)
+        assert copie.mode == "knn"
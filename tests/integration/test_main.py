@@ -30,7 +30,7 @@ def test_config_load_and_validate() -> None:
     assert config.paths.data_intermediate
 
 
-def test_headless_pipeline() -> None:
+def test_headless_pipeline(tmp_path: Path) -> None:
     """Pipeline config → simulation headless OK (2 runs × 3 jours, sans Streamlit)."""
     from src.core.config.config_validator import load_and_validate_config
     from src.core.utils.path_resolver import PathResolver
@@ -40,7 +40,7 @@ def test_headless_pipeline() -> None:
     config = load_and_validate_config(str(path))
     svc = SimulationService(config=config)
 
-    base = ROOT / "data" / "intermediate"
+    base = tmp_path
     svc.run_headless(
         days=3,
         runs=2,
@@ -58,7 +58,154 @@ def test_headless_pipeline() -> None:
         assert (run_dir / "trace.json").exists()
 
 
-def test_main_headless_cli() -> None:
+def _load_config():
+    from src.core.config.config_validator import load_and_validate_config
+    from src.core.utils.path_resolver import PathResolver
+
+    return load_and_validate_config(str(PathResolver.config_file("config.yaml")))
+
+
+def test_headless_parallel_identique_sequentiel(tmp_path: Path) -> None:
+    """workers=2 : mêmes fichiers et mêmes vecteurs qu'en séquentiel (seed par run)."""
+    from src.core.state.simulation_state import SimulationState
+    from src.services.simulation_service import SimulationService
+
+    config = _load_config()
+    SimulationService(config=config).run_headless(days=3, runs=3, output_dir=tmp_path / "seq", verbose=False)
+    echecs = SimulationService(config=config).run_headless(
+        days=3, runs=3, output_dir=tmp_path / "par", verbose=False, workers=2
+    )
+    assert echecs == []
+
+    fichiers = lambda d: sorted(p.relative_to(d) for p in d.rglob("*") if p.is_file())
+    assert fichiers(tmp_path / "seq") == fichiers(tmp_path / "par")
+    for i in range(3):
+        run_id = f"run_{i:03d}"
+        assert (tmp_path / "seq" / run_id / "trace.json").read_text() == (
+            tmp_path / "par" / run_id / "trace.json"
+        ).read_text()
+        seq = SimulationState.load(str(tmp_path / "seq" / run_id / "simulation_state.pkl"))
+        par = SimulationState.load(str(tmp_path / "par" / run_id / "simulation_state.pkl"))
+        assert seq.vectors_state.to_dict() == par.vectors_state.to_dict()
+
+
+def test_headless_parallel_isole_les_echecs(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Un run en échec n'interrompt pas les autres ; son indice est retourné."""
+    import multiprocessing
+
+    from src.services.simulation_service import SimulationService
+
+    if multiprocessing.get_start_method() != "fork":
+        pytest.skip("le patch n'est hérité par les workers qu'avec fork")
+
+    original = SimulationService._run_one_headless_iteration
+
+    def run_fragile(self, run_idx, **kwargs):
+        if run_idx == 1:
+            raise RuntimeError("run volontairement en échec")
+        return original(self, run_idx=run_idx, **kwargs)
+
+    monkeypatch.setattr(SimulationService, "_run_one_headless_iteration", run_fragile)
+    echecs = SimulationService(config=_load_config()).run_headless(
+        days=2, runs=3, output_dir=tmp_path, save_pickles=False, verbose=False, workers=2
+    )
+    assert echecs == [1]
+    assert (tmp_path / "run_000" / "trace.json").exists()
+    assert not (tmp_path / "run_001").exists()
+    assert (tmp_path / "run_002" / "trace.json").exists()
+
+
+def test_headless_resume_relance_runs_manquants(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """resume=True : runs vérifiés par le manifeste sautés, runs supprimés ou corrompus relancés."""
+    import json
+
+    from src.services.simulation_service import SimulationService
+
+    config = _load_config()
+    SimulationService(config=config).run_headless(days=2, runs=3, output_dir=tmp_path, verbose=False)
+    manifeste = json.loads((tmp_path / "manifest.json").read_text())
+    assert sorted(manifeste["runs"]) == ["run_000", "run_001", "run_002"]
+    assert all(r["status"] == "termine" for r in manifeste["runs"].values())
+    trace_000 = (tmp_path / "run_000" / "trace.json").read_text()
+
+    # run_001 corrompu, run_002 absent
+    (tmp_path / "run_001" / "simulation_state.pkl").write_bytes(b"tronque")
+    import shutil
+    shutil.rmtree(tmp_path / "run_002")
+
+    executes = []
+    original = SimulationService._run_one_headless_iteration
+
+    def run_trace(self, run_idx, **kwargs):
+        executes.append(run_idx)
+        return original(self, run_idx=run_idx, **kwargs)
+
+    monkeypatch.setattr(SimulationService, "_run_one_headless_iteration", run_trace)
+    echecs = SimulationService(config=config).run_headless(
+        days=2, runs=3, output_dir=tmp_path, verbose=False, resume=True
+    )
+    assert echecs == []
+    assert executes == [1, 2]
+    assert (tmp_path / "run_000" / "trace.json").read_text() == trace_000
+    manifeste = json.loads((tmp_path / "manifest.json").read_text())
+    assert manifeste["runs"]["run_002"]["seed"] == config.simulation.seed_default + 2
+
+    # Autre horizon : configuration différente, tous les runs relancés
+    executes.clear()
+    SimulationService(config=config).run_headless(days=3, runs=3, output_dir=tmp_path, verbose=False, resume=True)
+    assert executes == [0, 1, 2]
+
+
+def test_headless_echec_ecriture_attribue_au_bon_run(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Écriture de run_000 en échec sur le thread d'écriture : seul run_000 est marqué en échec."""
+    import json
+
+    from src.core.state.simulation_state import SimulationState
+    from src.services.simulation_service import ErreurEcritureRun, SimulationService
+
+    original = SimulationState.save
+
+    def save_fragile(self, path):
+        if "run_000" in str(path):
+            raise OSError("disque plein")
+        return original(self, path)
+
+    monkeypatch.setattr(SimulationState, "save", save_fragile)
+    with pytest.raises(ErreurEcritureRun) as erreur:
+        SimulationService(config=_load_config()).run_headless(days=2, runs=3, output_dir=tmp_path, verbose=False)
+    assert erreur.value.run_id == "run_000"
+    runs = json.loads((tmp_path / "manifest.json").read_text())["runs"]
+    assert runs["run_000"]["status"] == "echec"
+    assert "disque plein" in runs["run_000"]["erreur"]
+    assert all(r["status"] == "termine" for run_id, r in runs.items() if run_id != "run_000")
+
+
+def test_headless_stream_identique_au_pickle(tmp_path: Path) -> None:
+    """save_stream sans pickle (historique purgé) : mêmes vecteurs que l'état complet picklé."""
+    from src.core.state.simulation_state import SimulationState
+    from src.services.result_stream import lire_flux
+    from src.services.simulation_service import SimulationService
+
+    config = _load_config()
+    SimulationService(config=config).run_headless(days=12, runs=1, output_dir=tmp_path / "pkl", verbose=False)
+    SimulationService(config=config).run_headless(
+        days=12, runs=1, output_dir=tmp_path / "flux", save_pickles=False, save_stream=True, verbose=False
+    )
+
+    state = SimulationState.load(str(tmp_path / "pkl" / "run_000" / "simulation_state.pkl"))
+    flux = lire_flux(tmp_path / "flux" / "run_000")
+    assert flux["jour"].tolist() == list(range(12))
+    for i, mz_id in enumerate(flux["microzone_ids"]):
+        for t, incident_type in enumerate(flux["types"]):
+            for jour in range(12):
+                v = state.vectors_state.get_vector(mz_id, jour, incident_type)
+                attendu = v.to_list() if v is not None else [0, 0, 0]
+                assert flux["vecteurs"][jour, i, t].tolist() == attendu
+    evenements = sorted(e.event_id for j in range(12) for e in state.events_state.get_events_for_day(j))
+    assert sorted(flux["evt_id"].tolist()) == evenements
+
+
+def test_main_headless_cli(tmp_path: Path) -> None:
     """main.py --headless --runs 2 --days 3 s'exécute sans erreur."""
     cmd = [
         sys.executable,
@@ -71,11 +218,43 @@ def test_main_headless_cli() -> None:
         "3",
         "--no-pickles",
         "--no-trace",
+        "--output",
+        str(tmp_path),
     ]
     r = subprocess.run(cmd, cwd=str(ROOT), capture_output=True, text=True, timeout=120)
     assert r.returncode == 0, (r.stdout, r.stderr)
 
 
+def test_main_queue_worker_cli(tmp_path: Path) -> None:
+    """main.py --headless --queue dépose les runs ; main.py --worker --queue les exécute."""
+    from src.services.job_queue import FileTravaux
+
+    queue = tmp_path / "file.db"
+    base = [sys.executable, "-m", "main", "--queue", str(queue)]
+    options = ["--runs", "2", "--days", "2", "--no-pickles", "--output", str(tmp_path / "sortie")]
+    r = subprocess.run(base + ["--headless"] + options, cwd=str(ROOT), capture_output=True, text=True, timeout=120)
+    assert r.returncode == 0, (r.stdout, r.stderr)
+    assert FileTravaux(queue).compter()["en_attente"] == 2
+
+    r = subprocess.run(base + ["--worker", "--exit-when-empty"], cwd=str(ROOT), capture_output=True, text=True, timeout=120)
+    assert r.returncode == 0, (r.stdout, r.stderr)
+    assert FileTravaux(queue).compter()["termine"] == 2
+    assert (tmp_path / "sortie" / "run_001" / "trace.json").exists()
+
+
+def test_main_options_sans_effet_refusees(tmp_path: Path) -> None:
+    """Options ignorées par --queue ou --cible : erreur plutôt qu'une option silencieusement inactive."""
+    base = [sys.executable, "-m", "main", "--headless", "--runs", "2", "--days", "2", "--output", str(tmp_path)]
+    for options, attendu in (
+        (["--queue", str(tmp_path / "file.db"), "--workers", "4", "--ensemble"], "--ensemble, --workers sans effet avec --queue"),
+        (["--cible", "incidents_par_jour", "--resume"], "--resume sans effet avec --cible"),
+    ):
+        r = subprocess.run(base + options, cwd=str(ROOT), capture_output=True, text=True, timeout=120)
+        assert r.returncode == 1
+        assert attendu in r.stderr
+    assert not (tmp_path / "file.db").exists()
+
+
 def test_main_ui_launch() -> None:
     """main.py --ui lance Streamlit sans erreur immédiate (timeout après démarrage)."""
     cmd = [
@@ -0,0 +1,104 @@
+"""
+Tests pour le cache d'artefacts de pré-calcul (scripts/precompute_cache.py).
+"""
+
+import json
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+SCRIPTS_DIR = ROOT_DIR / "scripts"
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from precompute_cache import SOURCE_MANIFEST_FILENAME, ArtifactCache, sha256_file
+from precompute_pipeline import STATUT_CACHE, STATUT_SUCCES, PrecomputePipeline, PrecomputeStep
+
+
+def etape_parametree(config, output_dir):
+    (output_dir / "sortie.txt").write_text(f"k={config['k']}")
+    return True
+
+
+def _pipeline(tmp_path, k):
+    etapes = [PrecomputeStep("etape", etape_parametree, outputs=("sortie.txt",), config_keys=("k",))]
+    cache = ArtifactCache(tmp_path / "cache")
+    return PrecomputePipeline(etapes, {"k": k}, tmp_path / "out", max_workers=1, cache=cache)
+
+
+class TestArtifactCache:
+    """Tests pour ArtifactCache."""
+
+    def test_store_puis_restore(self, tmp_path):
+        out = tmp_path / "out"
+        out.mkdir()
+        (out / "a.pkl").write_bytes(b"contenu")
+        cache = ArtifactCache(tmp_path / "cache")
+
+        manifest = cache.store("etape", "cle", out, ["a.pkl"])
+        assert manifest["outputs"]["a.pkl"]["sha256"] == sha256_file(out / "a.pkl")
+
+        (out / "a.pkl").write_bytes(b"autre")
+        assert cache.restore("etape", "cle", out, ["a.pkl"])
+        assert (out / "a.pkl").read_bytes() == b"contenu"
+
+    def test_restore_cle_inconnue(self, tmp_path):
+        cache = ArtifactCache(tmp_path / "cache")
+        assert not cache.restore("etape", "inconnue", tmp_path, ["a.pkl"])
+
+    def test_blob_independant_de_la_sortie(self, tmp_path):
+        """Réécrire la sortie en place ne doit pas modifier le blob du cache."""
+        out = tmp_path / "out"
+        out.mkdir()
+        (out / "a.pkl").write_bytes(b"v1")
+        cache = ArtifactCache(tmp_path / "cache")
+        cache.store("etape", "cle", out, ["a.pkl"])
+        cache.restore("etape", "cle", out, ["a.pkl"])
+
+        with open(out / "a.pkl", "wb") as f:
+            f.write(b"v2")
+        assert cache.restore("etape", "cle", out, ["a.pkl"])
+        assert (out / "a.pkl").read_bytes() == b"v1"
+
+    def test_sortie_absente_non_mise_en_cache(self, tmp_path):
+        cache = ArtifactCache(tmp_path / "cache")
+        assert cache.store("etape", "cle", tmp_path, ["absent.pkl"]) is None
+        assert cache.load_manifest("etape", "cle") is None
+
+    def test_manifeste_source(self, tmp_path):
+        out = tmp_path / "out"
+        out.mkdir()
+        (out / "a.pkl").write_bytes(b"contenu")
+        cache = ArtifactCache(tmp_path / "cache")
+        cache.store("etape", "cle", out, ["a.pkl"])
+
+        manifest = json.loads((out / SOURCE_MANIFEST_FILENAME).read_text())
+        assert manifest["a.pkl"]["step"] == "etape"
+        assert Path(manifest["a.pkl"]["object"]).read_bytes() == b"contenu"
+
+    def test_from_config(self, tmp_path):
+        assert ArtifactCache.from_config({"precompute": {"cache": {"enabled": False}}}, tmp_path) is None
+        cache = ArtifactCache.from_config({"precompute": {"cache": {"dir": "c"}}}, tmp_path)
+        assert cache.cache_dir == tmp_path / "c"
+
+
+class TestPipelineAvecCache:
+    """Tests de l'intégration du cache dans PrecomputePipeline."""
+
+    def test_retour_config_precedente_restaure(self, tmp_path):
+        (tmp_path / "out").mkdir()
+        assert _pipeline(tmp_path, 8).run()["etape"].statut == STATUT_SUCCES
+        assert _pipeline(tmp_path, 6).run()["etape"].statut == STATUT_SUCCES
+
+        resultats = _pipeline(tmp_path, 8).run()
+        assert resultats["etape"].statut == STATUT_CACHE
+        assert resultats["etape"].ok
+        assert (tmp_path / "out" / "sortie.txt").read_text() == "k=8"
+
+    def test_force_ignore_cache(self, tmp_path):
+        (tmp_path / "out").mkdir()
+        _pipeline(tmp_path, 8).run()
+        _pipeline(tmp_path, 6).run()
+        pipeline = _pipeline(tmp_path, 8)
+        pipeline.force = True
+        assert pipeline.run()["etape"].statut == STATUT_SUCCES
@@ -102,6 +102,18 @@ class TestMatricesStructure:
             assert abs(sum(d["poids_influence"]) - 1.0) < 1e-5
             assert d["seuil_activation"] == 5
 
+    def test_voisin_mode_adjacence(self, microzones):
+        _scripts_path()
+        from precompute_matrices_correlation import MatricesCorrelationCalculator
+        cfg = {"precompute": {"matrices_correlation": {"voisinage": {"mode": "adjacence"}}}}
+        m = MatricesCorrelationCalculator(cfg).calculate_matrices_voisin(microzones)
+        assert len(m) == len(microzones)
+        for mz_id, d in m.items():
+            assert mz_id not in d["voisins"]
+            assert len(d["poids_influence"]) == len(d["voisins"])
+            if d["voisins"]:
+                assert abs(sum(d["poids_influence"]) - 1.0) < 1e-5
+
     def test_trafic_structure(self, calculator, microzones):
         m = calculator.calculate_matrice_trafic(microzones)
         assert len(m) == len(microzones)
@@ -132,6 +144,49 @@ class TestMatricesStructure:
                     assert 0.5 <= by_type[t][s] <= 2.0
 
 
+class TestTenseurs:
+    """Forme dense des matrices (calculate_tenseurs) cohérente avec les dictionnaires."""
+
+    def test_dimensions(self, calculator, microzones):
+        t = calculator.calculate_tenseurs(microzones)
+        n = len(microzones)
+        assert t["microzone_ids"] == microzones["microzone_id"].tolist()
+        assert t["intra_type"].shape == (n, 3, 3, 3)
+        assert t["inter_type"].shape == (n, 3, 3, 3)
+        assert t["saisonnalite"].shape == (n, 3, 3)
+        assert t["trafic"].shape == (n, len(t["champs_trafic"]))
+        assert t["alcool_nuit"]["prob_alcool"].shape == (n, 3)
+
+    def test_identique_aux_dictionnaires(self, calculator, microzones):
+        t = calculator.calculate_tenseurs(microzones)
+        intra = calculator.calculate_matrices_intra_type(microzones)
+        inter = calculator.calculate_matrices_inter_type(microzones)
+        saisons = calculator.calculate_matrices_saisonnalite(microzones)
+        trafic = calculator.calculate_matrice_trafic(microzones)
+        alcool = calculator.calculate_matrices_alcool_nuit(microzones)
+        types, noms_saisons = t["types_incidents"], t["saisons"]
+        for i, mz_id in enumerate(t["microzone_ids"]):
+            assert [trafic[mz_id][k] for k in t["champs_trafic"]] == t["trafic"][i].tolist()
+            for ti, type_incident in enumerate(types):
+                assert np.array_equal(intra[mz_id][type_incident], t["intra_type"][i, ti])
+                assert [saisons[mz_id][type_incident][s] for s in noms_saisons] == t["saisonnalite"][i, ti].tolist()
+                assert alcool[mz_id][type_incident]["prob_nuit"] == t["alcool_nuit"]["prob_nuit"][i, ti]
+                for si, source in enumerate(types):
+                    if source == type_incident:
+                        assert (t["inter_type"][i, ti, si] == 0).all()
+                    else:
+                        assert inter[mz_id][type_incident][source] == t["inter_type"][i, ti, si].tolist()
+
+    def test_regles_arrondissement(self, calculator):
+        """Nord-est : dégradation renforcée ; centre : atténuée ; autres : base."""
+        arr = np.array([19, 3, 14])
+        intra = calculator._tenseur_intra_type(arr)
+        assert intra[0, 0, 0, 1] > intra[2, 0, 0, 1] > intra[1, 0, 0, 1]
+        saisons = calculator._tenseur_saisonnalite(arr)
+        # Agressions en été : 1.25 de base, amplitude ×1.1 au nord-est, ×0.7 au centre
+        assert saisons[:, 0, 2] == pytest.approx([1.275, 1.175, 1.25])
+
+
 class TestChargementPickle:
     """IV1: Fichiers pickle lisibles et chargés correctement."""
 
@@ -159,6 +214,8 @@ class TestChargementPickle:
                 "matrices_trafic.pkl",
                 "matrices_alcool_nuit.pkl",
                 "matrices_saisonnalite.pkl",
+                "matrices_voisin_csr.pkl",
+                "matrices_correlation_arrays.pkl",
             ):
                 p = out / name
                 assert p.exists(), f"Manquant: {name}"
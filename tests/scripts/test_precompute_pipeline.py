@@ -0,0 +1,149 @@
+"""
+Tests pour l'exécuteur DAG des pré-calculs (scripts/precompute_pipeline.py).
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+SCRIPTS_DIR = ROOT_DIR / "scripts"
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from precompute_pipeline import (
+    STATUT_A_JOUR,
+    STATUT_DEPENDANCE_ECHOUEE,
+    STATUT_ECHEC,
+    STATUT_SUCCES,
+    PrecomputePipeline,
+    PrecomputeStep,
+)
+
+
+# Fonctions d'étape au niveau module (picklables pour le ProcessPoolExecutor)
+def etape_source(config, output_dir):
+    (output_dir / "a.txt").write_text(str(config.get("valeur", 0)))
+    return True
+
+
+def etape_double(config, output_dir):
+    valeur = int((output_dir / "a.txt").read_text())
+    (output_dir / "b.txt").write_text(str(valeur * 2))
+    return True
+
+
+def etape_triple(config, output_dir):
+    valeur = int((output_dir / "a.txt").read_text())
+    (output_dir / "c.txt").write_text(str(valeur * 3))
+    return True
+
+
+def etape_echec(config, output_dir):
+    return False
+
+
+def etape_exception(config, output_dir):
+    raise RuntimeError("boom")
+
+
+def _etapes(func_source=etape_source):
+    return [
+        PrecomputeStep("double", etape_double, inputs=("a.txt",), outputs=("b.txt",)),
+        PrecomputeStep("triple", etape_triple, inputs=("a.txt",), outputs=("c.txt",)),
+        PrecomputeStep("source", func_source, outputs=("a.txt",), config_keys=("valeur",)),
+    ]
+
+
+class TestPrecomputePipeline:
+    """Tests pour PrecomputePipeline."""
+
+    def test_ordre_topologique(self, tmp_path):
+        pipeline = PrecomputePipeline(_etapes(), {}, tmp_path, max_workers=1)
+        assert pipeline.order[0] == "source"
+        assert pipeline.dependencies["double"] == ["source"]
+        assert pipeline.dependencies["triple"] == ["source"]
+
+    def test_cycle_detecte(self, tmp_path):
+        etapes = [
+            PrecomputeStep("x", etape_double, inputs=("b.txt",), outputs=("a.txt",)),
+            PrecomputeStep("y", etape_double, inputs=("a.txt",), outputs=("b.txt",)),
+        ]
+        with pytest.raises(ValueError):
+            PrecomputePipeline(etapes, {}, tmp_path)
+
+    def test_sortie_produite_deux_fois(self, tmp_path):
+        etapes = [
+            PrecomputeStep("x", etape_source, outputs=("a.txt",)),
+            PrecomputeStep("y", etape_source, outputs=("a.txt",)),
+        ]
+        with pytest.raises(ValueError):
+            PrecomputePipeline(etapes, {}, tmp_path)
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_execution(self, tmp_path, workers):
+        resultats = PrecomputePipeline(_etapes(), {"valeur": 7}, tmp_path, max_workers=workers).run()
+        assert all(r.statut == STATUT_SUCCES for r in resultats.values())
+        assert (tmp_path / "b.txt").read_text() == "14"
+        assert (tmp_path / "c.txt").read_text() == "21"
+
+    def test_etapes_a_jour_sautees(self, tmp_path):
+        PrecomputePipeline(_etapes(), {"valeur": 1}, tmp_path, max_workers=1).run()
+        resultats = PrecomputePipeline(_etapes(), {"valeur": 1}, tmp_path, max_workers=1).run()
+        assert all(r.statut == STATUT_A_JOUR for r in resultats.values())
+
+    def test_changement_config_relance_aval(self, tmp_path):
+        PrecomputePipeline(_etapes(), {"valeur": 1}, tmp_path, max_workers=1).run()
+        resultats = PrecomputePipeline(_etapes(), {"valeur": 2}, tmp_path, max_workers=1).run()
+        # La source change → son contenu change → double et triple sont relancées
+        assert all(r.statut == STATUT_SUCCES for r in resultats.values())
+        assert (tmp_path / "b.txt").read_text() == "4"
+
+    def test_sortie_supprimee_relance(self, tmp_path):
+        PrecomputePipeline(_etapes(), {"valeur": 1}, tmp_path, max_workers=1).run()
+        (tmp_path / "c.txt").unlink()
+        resultats = PrecomputePipeline(_etapes(), {"valeur": 1}, tmp_path, max_workers=1).run()
+        assert resultats["triple"].statut == STATUT_SUCCES
+        assert resultats["double"].statut == STATUT_A_JOUR
+
+    def test_force(self, tmp_path):
+        PrecomputePipeline(_etapes(), {"valeur": 1}, tmp_path, max_workers=1).run()
+        resultats = PrecomputePipeline(_etapes(), {"valeur": 1}, tmp_path, max_workers=1, force=True).run()
+        assert all(r.statut == STATUT_SUCCES for r in resultats.values())
+
+    @pytest.mark.parametrize("func", [etape_echec, etape_exception])
+    def test_echec_propage_aux_dependants(self, tmp_path, func):
+        resultats = PrecomputePipeline(_etapes(func), {}, tmp_path, max_workers=2).run()
+        assert resultats["source"].statut == STATUT_ECHEC
+        assert resultats["double"].statut == STATUT_DEPENDANCE_ECHOUEE
+        assert not resultats["triple"].ok
+
+    def test_chemin_critique(self, tmp_path):
+        pipeline = PrecomputePipeline(_etapes(), {}, tmp_path, max_workers=1)
+        resultats = pipeline.run()
+        resultats["source"].duree, resultats["double"].duree, resultats["triple"].duree = 1.0, 2.0, 5.0
+        chemin, duree = pipeline.critical_path(resultats)
+        assert chemin == ["source", "triple"]
+        assert duree == 6.0
+
+
+class TestBuildPrecomputeSteps:
+    """Tests de l'intégration dans run_precompute."""
+
+    def test_dag_blocs(self):
+        from argparse import Namespace
+        from run_precompute import build_precompute_steps
+
+        etapes = build_precompute_steps({"paths": {}}, Namespace())
+        pipeline = PrecomputePipeline(etapes, {}, ROOT_DIR / "data" / "source_data")
+        assert pipeline.dependencies["vectors_static"] == ["distances"]
+        assert pipeline.dependencies["matrices_correlation"] == ["distances"]
+        assert pipeline.dependencies["prix_m2"] == ["vectors_static"]
+
+    def test_blocs_ignores_retires(self):
+        from argparse import Namespace
+        from run_precompute import build_precompute_steps
+
+        etapes = build_precompute_steps({"paths": {}}, Namespace(skip_distances=True, skip_matrices=True))
+        assert [e.name for e in etapes] == ["vectors_static", "prix_m2", "congestion_static"]
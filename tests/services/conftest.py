@@ -5,7 +5,18 @@ Configuration pytest pour tests services.
 import sys
 from pathlib import Path
 
+import pytest
+
 # Ajouter le répertoire racine au path Python
 ROOT = Path(__file__).resolve().parents[2]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+
+@pytest.fixture(scope="module")
+def config():
+    """Configuration validée du projet (config/config.yaml)."""
+    from src.core.config.config_validator import load_and_validate_config
+    from src.core.utils.path_resolver import PathResolver
+
+    return load_and_validate_config(str(PathResolver.config_file("config.yaml")))
@@ -0,0 +1,118 @@
+"""
+Tests pour la campagne Monte-Carlo adaptative (arrêt sur intervalle de confiance).
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.utils.online_stats import AccumulateurWelford
+from src.services.adaptive_campaign import (
+    CONVERGENCE_FILENAME,
+    TRAJECTOIRE_FILENAME,
+    METRIQUES,
+    CibleConvergence,
+    etat_convergence,
+    executer_campagne_adaptative,
+)
+
+
+class TestCibleConvergence:
+    """Tests pour CibleConvergence et etat_convergence."""
+
+    def test_metrique_inconnue(self):
+        with pytest.raises(ValueError):
+            CibleConvergence("inexistante")
+        with pytest.raises(ValueError):
+            CibleConvergence("incidents", precision_relative=0.0)
+
+    def test_composante_nulle_convergee_par_tolerance(self):
+        acc = AccumulateurWelford()
+        for x in ([10.0, 0.0], [10.2, 0.0], [9.8, 0.0]):
+            acc.ajouter(x)
+        metrique = "morts_base_evenements_mensuelles_arrondissement"
+        sans_tolerance = etat_convergence(acc, CibleConvergence(metrique, 0.1), 0.95)
+        assert sans_tolerance["composantes"] == 2
+        assert sans_tolerance["composantes_convergees"] == 1
+        assert not sans_tolerance["converge"]
+        etat = etat_convergence(acc, CibleConvergence(metrique, 0.1, tolerance_absolue=0.01), 0.95)
+        assert etat["composantes_convergees"] == 2
+        assert etat["converge"]
+
+    def test_depuis_texte(self):
+        assert CibleConvergence.depuis_texte("incidents") == CibleConvergence("incidents")
+        assert CibleConvergence.depuis_texte("incidents:0.1:0.5") == CibleConvergence("incidents", 0.1, 0.5)
+        with pytest.raises(ValueError):
+            CibleConvergence.depuis_texte("incidents:0.1:0.5:1")
+
+    def test_precision_insuffisante(self):
+        acc = AccumulateurWelford()
+        for x in (1.0, 10.0, 20.0):
+            acc.ajouter(x)
+        etat = etat_convergence(acc, CibleConvergence("incidents", 0.05), 0.95)
+        assert not etat["converge"]
+        assert etat["precision_relative"] > 0.05
+
+
+def test_campagne_arretee_des_convergence(config, tmp_path):
+    """Précision large : arrêt après le premier lot, trajectoire et bilan écrits."""
+    bilan = executer_campagne_adaptative(
+        config, [CibleConvergence("incidents_par_jour", 0.5)], tmp_path,
+        jours=3, taille_lot=3, runs_max=12, verbose=False,
+    )
+    assert bilan["converge"]
+    assert bilan["runs"] == 3
+    assert bilan["lots"] == 1
+    assert sorted(p.name for p in tmp_path.glob("run_*")) == ["run_000", "run_001", "run_002"]
+    assert json.loads((tmp_path / CONVERGENCE_FILENAME).read_text())["converge"]
+
+
+def test_campagne_premier_lot_nul(config, tmp_path, monkeypatch):
+    """Premier lot tout à zéro : pas de convergence sans tolérance absolue, budget consommé."""
+    monkeypatch.setitem(METRIQUES, "evenements_graves", lambda resultat, jours: np.zeros(3))
+    bilan = executer_campagne_adaptative(
+        config, [CibleConvergence("evenements_graves", 0.5)], tmp_path / "sans", jours=2, taille_lot=2, runs_max=4,
+        save_trace=False, verbose=False,
+    )
+    assert not bilan["converge"] and bilan["runs"] == 4
+    bilan = executer_campagne_adaptative(
+        config, [CibleConvergence("evenements_graves", 0.5, tolerance_absolue=0.1)], tmp_path / "avec", jours=2,
+        taille_lot=2, runs_max=4, save_trace=False, verbose=False,
+    )
+    assert bilan["converge"] and bilan["runs"] == 2
+
+
+def test_campagne_antithetique_par_paires(config, tmp_path):
+    """Mode antithétique : lots pairs exigés, une observation par paire de runs."""
+    from src.services.sweep_service import appliquer_surcharges
+
+    anti = appliquer_surcharges(config, {"simulation.reduction_variance": "antithetique"})
+    cible = CibleConvergence("incidents_par_jour", 1e-6)
+    with pytest.raises(ValueError):
+        executer_campagne_adaptative(anti, [cible], tmp_path / "impair", jours=2, taille_lot=3, runs_max=6)
+    bilan = executer_campagne_adaptative(
+        anti, [cible], tmp_path, jours=2, taille_lot=4, runs_max=8, save_trace=False, verbose=False,
+    )
+    assert bilan["runs"] == 8
+    assert bilan["cibles"]["incidents_par_jour"]["runs"] == 4
+    assert bilan["parametres"]["unite"] == "paire"
+
+
+def test_campagne_budget_et_workers(config, tmp_path):
+    """Précision inatteignable : budget consommé par lots ; même trajectoire avec et sans pool."""
+    cibles = [CibleConvergence("incidents_par_jour", 1e-6), CibleConvergence("morts_base_evenements_mensuelles_arrondissement", 1e-6)]
+    seq = executer_campagne_adaptative(
+        config, cibles, tmp_path / "seq", jours=2, taille_lot=2, runs_max=5, save_trace=False, verbose=False,
+    )
+    par = executer_campagne_adaptative(
+        config, cibles, tmp_path / "par", jours=2, taille_lot=2, runs_max=5, save_trace=False, workers=2,
+        verbose=False,
+    )
+    assert not seq["converge"]
+    assert seq["runs"] == 5 and seq["lots"] == 3
+    assert len(seq["cibles"]["morts_base_evenements_mensuelles_arrondissement"]["moyennes"]) == 20
+    traj_seq = pd.read_csv(tmp_path / "seq" / TRAJECTOIRE_FILENAME)
+    pd.testing.assert_frame_equal(traj_seq, pd.read_csv(tmp_path / "par" / TRAJECTOIRE_FILENAME))
+    assert traj_seq["runs"].tolist() == [2, 2, 4, 4, 5, 5]
@@ -0,0 +1,71 @@
+"""
+Tests unitaires pour le manifeste de campagne (ManifesteCampagne).
+"""
+
+import json
+
+from src.services.campaign_manifest import (
+    MANIFEST_FILENAME,
+    STATUT_ECHEC,
+    ManifesteCampagne,
+    empreinte_config,
+    somme_fichier,
+)
+
+
+def _run_termine(base, run_id="run_000", seed=42):
+    run_dir = base / run_id
+    run_dir.mkdir(parents=True)
+    (run_dir / "trace.json").write_text('{"completed": true}')
+    return {
+        "run_id": run_id,
+        "seed": seed,
+        "fichiers": {"trace.json": somme_fichier(run_dir / "trace.json")},
+        "debut": "2026-01-01T00:00:00",
+        "fin": "2026-01-01T00:00:05",
+        "duree_s": 5.0,
+    }
+
+
+class TestManifesteCampagne:
+    """Tests pour ManifesteCampagne."""
+
+    def test_empreinte_config(self):
+        a = empreinte_config({"simulation": {"seed_default": 42}}, days=3)
+        assert a == empreinte_config({"simulation": {"seed_default": 42}}, days=3)
+        assert a != empreinte_config({"simulation": {"seed_default": 42}}, days=4)
+
+    def test_enregistrer_et_reprendre(self, tmp_path):
+        manifeste = ManifesteCampagne.ouvrir(tmp_path, "h1")
+        manifeste.enregistrer_succes("run_000", _run_termine(tmp_path))
+        manifeste.enregistrer_echec("run_001", 43, "boom")
+
+        contenu = json.loads((tmp_path / MANIFEST_FILENAME).read_text())
+        assert contenu["runs"]["run_000"]["duree_s"] == 5.0
+        assert contenu["runs"]["run_001"]["status"] == STATUT_ECHEC
+        # Pas de fichier temporaire résiduel
+        assert [p.name for p in tmp_path.iterdir() if p.is_file()] == [MANIFEST_FILENAME]
+
+        repris = ManifesteCampagne.ouvrir(tmp_path, "h1", reprise=True)
+        assert repris.run_verifie("run_000", 42)
+        assert not repris.run_verifie("run_001", 43)
+        assert not repris.run_verifie("run_002", 44)
+
+    def test_run_non_verifie(self, tmp_path):
+        manifeste = ManifesteCampagne.ouvrir(tmp_path, "h1")
+        manifeste.enregistrer_succes("run_000", _run_termine(tmp_path))
+        # Autre seed, autre configuration
+        assert not manifeste.run_verifie("run_000", 7)
+        assert not ManifesteCampagne.ouvrir(tmp_path, "h2", reprise=True).run_verifie("run_000", 42)
+        # Fichier corrompu
+        (tmp_path / "run_000" / "trace.json").write_text('{"completed": tru')
+        assert not manifeste.run_verifie("run_000", 42)
+
+    def test_sans_reprise_manifeste_vide(self, tmp_path):
+        manifeste = ManifesteCampagne.ouvrir(tmp_path, "h1")
+        manifeste.enregistrer_succes("run_000", _run_termine(tmp_path))
+        assert ManifesteCampagne.ouvrir(tmp_path, "h1").runs == {}
+
+    def test_manifeste_illisible(self, tmp_path):
+        (tmp_path / MANIFEST_FILENAME).write_text("{tronqué")
+        assert ManifesteCampagne.ouvrir(tmp_path, "h1", reprise=True).runs == {}
@@ -0,0 +1,106 @@
+"""
+Tests pour les statistiques d'ensemble (CubeRun, StatistiquesEnsemble) et leur alimentation en headless.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.services.ensemble_statistics import (
+    ENSEMBLE_FILENAME,
+    CubeRun,
+    StatistiquesEnsemble,
+    charger_tableau_ensemble,
+)
+
+LIMITES = {"MZ_01_01": 1, "MZ_01_02": 1, "MZ_02_01": 2}
+
+
+def _cube(valeur_depart: int, jours: int = 2) -> CubeRun:
+    cube = CubeRun(jours, LIMITES)
+    cube.valeurs[:] = np.arange(cube.valeurs.size).reshape(cube.valeurs.shape) % 5 + valeur_depart
+    return cube
+
+
+class TestStatistiquesEnsemble:
+    """Tests pour StatistiquesEnsemble."""
+
+    def test_tableau(self):
+        ens = StatistiquesEnsemble(config_hash="h")
+        for i in range(3):
+            assert ens.ajouter(f"run_{i:03d}", _cube(i))
+        assert not ens.ajouter("run_001", _cube(10))
+        df = ens.tableau()
+        assert len(df) == 2 * 2 * 3 * 3
+        assert list(df.columns[:4]) == ["jour", "arrondissement", "type", "gravite"]
+        assert {"n", "moyenne", "ecart_type", "min", "max", "q05", "q50", "q95"} <= set(df.columns)
+        cubes = np.stack([_cube(i).valeurs for i in range(3)])
+        np.testing.assert_allclose(df["moyenne"], cubes.mean(axis=0).ravel())
+        np.testing.assert_array_equal(df["max"], cubes.max(axis=0).ravel())
+        assert (df["n"] == 3).all()
+
+    def test_fusion_et_sauvegarde(self, tmp_path):
+        a, b, tout = StatistiquesEnsemble(), StatistiquesEnsemble(), StatistiquesEnsemble()
+        for i in range(8):
+            (a if i < 3 else b).ajouter(f"run_{i:03d}", _cube(i))
+            tout.ajouter(f"run_{i:03d}", _cube(i))
+        a.fusionner(b)
+        pd.testing.assert_frame_equal(
+            a.tableau().drop(columns=["q05", "q50", "q95"]), tout.tableau().drop(columns=["q05", "q50", "q95"])
+        )
+        with pytest.raises(ValueError):
+            a.fusionner(b)
+
+        a.sauvegarder(tmp_path / ENSEMBLE_FILENAME)
+        relu = StatistiquesEnsemble.charger(tmp_path / ENSEMBLE_FILENAME)
+        assert relu.run_ids == a.run_ids
+        pd.testing.assert_frame_equal(charger_tableau_ensemble(tmp_path), a.tableau())
+        relu.ajouter("run_008", _cube(8))
+        assert relu.n == 9
+
+    def test_ensemble_vide(self, tmp_path):
+        with pytest.raises(ValueError):
+            StatistiquesEnsemble().sauvegarder(tmp_path / ENSEMBLE_FILENAME)
+
+
+def test_headless_ensemble_parallele_et_reprise(config, tmp_path):
+    """Même ensemble en séquentiel et en parallèle ; la reprise complète l'ensemble existant."""
+    from src.services.simulation_service import SimulationService
+
+    options = dict(days=3, save_pickles=False, save_trace=True, verbose=False, save_ensemble=True)
+    SimulationService(config=config).run_headless(runs=3, output_dir=tmp_path / "seq", **options)
+    SimulationService(config=config).run_headless(runs=3, output_dir=tmp_path / "par", workers=2, **options)
+    seq = charger_tableau_ensemble(tmp_path / "seq")
+    pd.testing.assert_frame_equal(seq, charger_tableau_ensemble(tmp_path / "par"))
+    assert (seq["n"] == 3).all()
+    assert seq["jour"].max() == 2
+
+    SimulationService(config=config).run_headless(runs=2, output_dir=tmp_path / "rep", **options)
+    SimulationService(config=config).run_headless(runs=3, output_dir=tmp_path / "rep", resume=True, **options)
+    ens = StatistiquesEnsemble.charger(tmp_path / "rep" / ENSEMBLE_FILENAME)
+    assert ens.run_ids == ["run_000", "run_001", "run_002"]
+    pd.testing.assert_frame_equal(ens.tableau(), seq)
+
+
+def test_headless_ensemble_interrompu_puis_repris(config, tmp_path, monkeypatch):
+    """Ensemble écrit après chaque run ; la reprise relance les runs vérifiés absents de l'ensemble."""
+    from src.services.simulation_service import SimulationService
+
+    options = dict(days=2, save_pickles=False, save_trace=True, verbose=False)
+    # Campagne lancée sans ensemble : la reprise avec ensemble relance les runs vérifiés
+    SimulationService(config=config).run_headless(runs=2, output_dir=tmp_path, **options)
+    SimulationService(config=config).run_headless(runs=2, output_dir=tmp_path, resume=True, save_ensemble=True, **options)
+    assert StatistiquesEnsemble.charger(tmp_path / ENSEMBLE_FILENAME).run_ids == ["run_000", "run_001"]
+
+    # Interruption au second run : le premier figure déjà dans ensemble.npz
+    executer_run = SimulationService._run_one_headless_iteration
+
+    def run_interrompu(self, **kwargs):
+        if kwargs["run_idx"] == 1:
+            raise KeyboardInterrupt
+        return executer_run(self, **kwargs)
+
+    monkeypatch.setattr(SimulationService, "_run_one_headless_iteration", run_interrompu)
+    with pytest.raises(KeyboardInterrupt):
+        SimulationService(config=config).run_headless(runs=2, output_dir=tmp_path / "int", save_ensemble=True, **options)
+    assert StatistiquesEnsemble.charger(tmp_path / "int" / ENSEMBLE_FILENAME).run_ids == ["run_000"]
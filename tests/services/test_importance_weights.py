@@ -0,0 +1,87 @@
+"""
+Tests pour les poids d'échantillonnage préférentiel et les estimateurs pondérés.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.generation.importance_sampling import Inclinaison
+from src.services.importance_weights import (
+    POIDS_FILENAME,
+    charger_log_rapport_jours,
+    ecrire_poids,
+    estimation_ponderee,
+    frequence_classe_ponderee,
+    log_poids_mensuels,
+    quantile_pondere,
+)
+
+
+class TestFichierPoids:
+    """Tests pour ecrire_poids / charger_log_rapport_jours / log_poids_mensuels."""
+
+    def test_aller_retour(self, tmp_path):
+        assert charger_log_rapport_jours(tmp_path) is None
+        ecrire_poids(tmp_path, Inclinaison(facteur_crise=2.0), [0.1, -0.3, 0.05])
+        assert (tmp_path / POIDS_FILENAME).exists()
+        np.testing.assert_allclose(charger_log_rapport_jours(tmp_path), [0.1, -0.3, 0.05])
+
+    def test_log_poids_mensuels(self):
+        jours = np.full(60, 0.01)
+        np.testing.assert_allclose(log_poids_mensuels(jours), [0.28, 0.56])
+        np.testing.assert_allclose(log_poids_mensuels(jours, nb_mois=1), [0.28])
+        with pytest.raises(ValueError):
+            log_poids_mensuels(jours, nb_mois=3)
+
+
+class TestEstimateursPonderes:
+    """Tests pour estimation_ponderee, quantile_pondere, frequence_classe_ponderee."""
+
+    def test_estimation_ponderee(self):
+        e = estimation_ponderee([1.0, 0.0, 1.0, 0.0], [0.5, 1.5, 0.5, 1.5])
+        assert e["n"] == 4
+        assert e["estimation"] == pytest.approx(0.25)
+        assert e["autonormalisee"] == pytest.approx(0.25)
+        assert e["taille_effective"] == pytest.approx(16.0 / 5.0)
+        assert np.isfinite(e["demi_largeur"])
+        with pytest.raises(ValueError):
+            estimation_ponderee([1.0], [1.0, 2.0])
+
+    def test_groupes(self):
+        e = estimation_ponderee([1.0, 0.0, 1.0, 1.0], [1.0, 1.0, 1.0, 1.0], groupes=["a", "a", "b", "b"])
+        assert e["n"] == 2
+        assert e["estimation"] == pytest.approx(0.75)
+
+    def test_quantile_pondere(self):
+        x = np.arange(1.0, 101.0)
+        np.testing.assert_array_equal(quantile_pondere(x, np.ones(100), [0.1, 0.5, 1.0]), [10.0, 50.0, 100.0])
+        # Poids concentré sur les petites valeurs : quantiles décalés vers le bas
+        w = np.where(x <= 50, 3.0, 1.0)
+        assert quantile_pondere(x, w, [0.5])[0] < 50.0
+
+    def test_frequence_classe_ponderee(self):
+        df = pd.DataFrame({
+            "run_id": [0, 0, 1, 1],
+            "classe": ["Catastrophe", "Normal", "Normal", "Catastrophe"],
+            "poids": [0.2, 0.2, 0.4, 0.4],
+        })
+        e = frequence_classe_ponderee(df, "Catastrophe")
+        assert e["n"] == 2
+        assert e["estimation"] == pytest.approx(0.15)
+        sans_poids = frequence_classe_ponderee(df.drop(columns="poids"), "Catastrophe")
+        assert sans_poids["estimation"] == pytest.approx(0.5)
+
+
+def test_headless_ecrit_les_poids(config, tmp_path):
+    """Run headless incliné : poids_importance.json avec un log-rapport par jour."""
+    from src.services.simulation_service import SimulationService
+    from src.services.sweep_service import appliquer_surcharges
+
+    incline = appliquer_surcharges(config, {"echantillonnage_preferentiel.facteur_crise": 3.0})
+    SimulationService(config=incline).run_headless(
+        days=3, runs=1, output_dir=tmp_path, save_pickles=False, save_trace=True, verbose=False
+    )
+    log_rapport = charger_log_rapport_jours(tmp_path / "run_000")
+    assert log_rapport is not None and len(log_rapport) == 3
+    assert log_poids_mensuels(log_rapport).size == 0  # moins d'un mois simulé
@@ -0,0 +1,119 @@
+"""
+Tests pour la file de travaux SQLite (FileTravaux, workers, balayage déposé).
+"""
+
+import multiprocessing
+import time
+
+import pandas as pd
+import pytest
+
+from src.services.job_queue import (
+    STATUT_ATTENTE,
+    STATUT_ECHEC,
+    STATUT_TERMINE,
+    FileTravaux,
+    collecter_balayage,
+    executer_worker,
+    soumettre_balayage,
+)
+from src.services.sweep_service import GrilleBalayage, executer_balayage
+
+
+def _reclamer_tout(path, sortie):
+    file = FileTravaux(path)
+    ids = []
+    while True:
+        travail = file.reclamer(multiprocessing.current_process().name)
+        if travail is None:
+            break
+        ids.append(travail.id)
+        file.terminer(travail.id, multiprocessing.current_process().name, {"ok": True})
+    sortie.put(ids)
+
+
+class TestFileTravaux:
+    """Tests pour FileTravaux."""
+
+    def test_reclamation_dans_l_ordre(self, config, tmp_path):
+        file = FileTravaux(tmp_path / "file.db")
+        ids = file.ajouter("c", config, [{"run_idx": i} for i in range(3)])
+        a, b = file.reclamer("a"), file.reclamer("b")
+        assert (a.id, b.id) == (ids[0], ids[1])
+        assert a.params == {"run_idx": 0} and a.tentative == 1
+        assert file.terminer(a.id, "a", {"duree_s": 1.0})
+        assert not file.terminer(b.id, "a", {})  # pas le détenteur du bail
+        assert file.compter("c") == {"en_attente": 1, "en_cours": 1, "termine": 1, "echec": 0}
+        assert file.travaux("c")["resultat"].iloc[0] == {"duree_s": 1.0}
+        assert file.config_campagne("c") == config
+
+    def test_bail_expire_puis_echec(self, config, tmp_path):
+        file = FileTravaux(tmp_path / "file.db", duree_bail=0.05)
+        file.ajouter("c", config, [{"run_idx": 0}], max_tentatives=2)
+        premier = file.reclamer("a")
+        time.sleep(0.1)
+        repris = file.reclamer("b")
+        assert repris.id == premier.id and repris.tentative == 2
+        assert not file.prolonger(premier.id, "a")
+        assert not file.terminer(premier.id, "a", {})
+        time.sleep(0.1)
+        assert file.reclamer("c") is None
+        ligne = file.travaux("c").iloc[0]
+        assert ligne["statut"] == STATUT_ECHEC
+        assert "bail expiré" in ligne["erreur"]
+
+    def test_echec_relance(self, config, tmp_path):
+        file = FileTravaux(tmp_path / "file.db")
+        file.ajouter("c", config, [{"run_idx": 0}], max_tentatives=2)
+        assert file.echouer(file.reclamer("a").id, "a", "boom")
+        assert file.travaux("c")["statut"].iloc[0] == STATUT_ATTENTE
+        assert file.echouer(file.reclamer("a").id, "a", "boom")
+        assert file.travaux("c")["statut"].iloc[0] == STATUT_ECHEC
+
+    def test_campagne_autre_configuration(self, config, tmp_path):
+        from src.services.sweep_service import appliquer_surcharges
+
+        file = FileTravaux(tmp_path / "file.db")
+        file.ajouter("c", config, [{"run_idx": 0}])
+        autre = appliquer_surcharges(config, {"effets_patterns.reduction_effet": 0.5})
+        with pytest.raises(ValueError):
+            file.ajouter("c", autre, [{"run_idx": 1}])
+
+    def test_redepot_sans_doublon(self, config, tmp_path):
+        """Redéposer une campagne n'ajoute que les runs absents."""
+        file = FileTravaux(tmp_path / "file.db")
+        file.ajouter("c", config, [{"run_idx": i} for i in range(2)])
+        ajoutes = file.ajouter("c", config, [{"run_idx": i} for i in range(3)])
+        assert len(ajoutes) == 1
+        travaux = file.travaux("c")
+        assert len(travaux) == 3
+        assert travaux.set_index("id")["params"][ajoutes[0]] == {"run_idx": 2}
+        # Même run dans deux cellules de balayage : tâches distinctes
+        assert len(file.ajouter("b", config, [{"cellule": c, "run_idx": 0} for c in range(2)])) == 2
+
+    def test_processus_concurrents(self, config, tmp_path):
+        """Quatre processus vident la file : chaque travail réclamé une seule fois."""
+        path = tmp_path / "file.db"
+        ids = FileTravaux(path).ajouter("c", config, [{"run_idx": i} for i in range(40)])
+        sortie = multiprocessing.Queue()
+        processus = [multiprocessing.Process(target=_reclamer_tout, args=(path, sortie)) for _ in range(4)]
+        for p in processus:
+            p.start()
+        reclames = [i for _ in processus for i in sortie.get(timeout=60)]
+        for p in processus:
+            p.join()
+        assert sorted(reclames) == ids
+        assert FileTravaux(path).compter("c")[STATUT_TERMINE] == 40
+
+
+def test_balayage_par_la_file(config, tmp_path):
+    """Balayage déposé puis exécuté par un worker : mêmes résumés qu'en exécution directe."""
+    grille = GrilleBalayage(scenarios=["pessimiste", "optimiste"], variabilites=["Moyenne"], seeds=[7, 8], jours=[2])
+    file = FileTravaux(tmp_path / "file.db")
+    campagne = soumettre_balayage(file, config, grille, tmp_path / "file", save_pickles=False)
+    assert executer_worker(tmp_path / "file.db", worker="w", arret_si_vide=True) == 4
+    assert file.compter(campagne)[STATUT_TERMINE] == 4
+    par_file = collecter_balayage(file, campagne)
+    direct = executer_balayage(config, grille, tmp_path / "direct", save_pickles=False, verbose=False)
+    pd.testing.assert_frame_equal(par_file, direct)
+    assert (tmp_path / "file" / "cellule_001" / "run_001" / "trace.json").exists()
@@ -193,3 +193,34 @@ class TestMLTrainerTrainAll:
         assert "huber_regressor" in out["regression"]
         assert "ridge" in out["regression"]
         assert "logistic_regression" in out["classification"]
+
+
+class TestMLTrainerPondere:
+    """Tests entraînement pondéré (colonne poids, échantillonnage préférentiel)."""
+
+    def test_poids_exclu_des_features(self):
+        df = _make_df_ml_regression(n_rows=10, n_features=5)
+        df["poids"] = 2.0
+        assert "poids" not in _get_ml_feature_columns(df)
+
+    def test_poids_modifient_ajustement_et_metriques(self, tmp_path, monkeypatch):
+        from src.core.utils.path_resolver import PathResolver
+
+        # Modèles sauvegardés sous tmp_path, pas dans data/models
+        monkeypatch.setattr(PathResolver, "get_project_root", classmethod(lambda cls: tmp_path))
+        df = _make_df_ml_regression(n_rows=80, n_features=5)
+        trainer = MLTrainer()
+        sans = trainer.train_regression_models(df, label_column="score", params_str="sans_poids")
+        df["poids"] = np.where(df["f0"] > 0, 10.0, 0.1)
+        avec = trainer.train_regression_models(df, label_column="score", params_str="poids")
+        assert avec["ridge"]["feature_columns"] == sans["ridge"]["feature_columns"]
+        assert not np.allclose(avec["ridge"]["model"].coef_, sans["ridge"]["model"].coef_)
+        assert avec["ridge"]["metrics"]["MAE"] != sans["ridge"]["metrics"]["MAE"]
+        assert list((tmp_path / "data" / "models" / "regression").glob("*_poids.joblib"))
+
+    def test_metriques_classification_ponderees(self):
+        trainer = MLTrainer()
+        m = trainer._metrics_classification(
+            np.array([0, 1, 1, 0]), np.array([0, 1, 0, 0]), sample_weight=np.array([1.0, 1.0, 0.0, 1.0])
+        )
+        assert m["accuracy"] == 1.0
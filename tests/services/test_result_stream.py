@@ -0,0 +1,69 @@
+"""
+Tests unitaires pour le flux de résultats headless (FluxResultats, lire_flux).
+"""
+
+import numpy as np
+import pytest
+
+from src.core.data.vector import Vector
+from src.core.events.agression_grave import AgressionGrave
+from src.core.events.fin_travaux import FinTravaux
+from src.core.state.simulation_state import SimulationState
+from src.services.result_stream import FLUX_DIRNAME, FSYNC_AUCUN, FluxResultats, lire_flux
+
+MICROZONES = ["MZ_11_01", "MZ_12_01"]
+
+
+def _state(jours):
+    state = SimulationState(run_id="run_000", config={})
+    for jour in range(jours):
+        state.vectors_state.set_vector("MZ_11_01", jour, "agression", Vector(1, jour, 2))
+        state.vectors_state.set_vector("MZ_12_01", jour, "accident", Vector(0, 0, jour))
+    state.events_state.add_event(AgressionGrave("ag_1", 2, 11, duration=3, casualties_base=1))
+    state.events_state.add_event(FinTravaux("ft_1", 4, 12, impact_reduction=0.2))
+    return state
+
+
+class TestFluxResultats:
+    """Tests pour FluxResultats."""
+
+    def test_blocs_et_relecture(self, tmp_path):
+        state = _state(5)
+        flux = FluxResultats(tmp_path, MICROZONES, jours_par_bloc=2)
+        for jour in range(5):
+            flux.ajouter_jour(jour, state, {"MZ_11_01": 1.5})
+            # Tampon borné : un bloc écrit tous les 2 jours
+            assert len(flux.fichiers) == (jour + 1) // 2
+        flux.fermer()
+        assert [p.name for p in flux.fichiers] == ["bloc_000000.npz", "bloc_000002.npz", "bloc_000004.npz"]
+
+        lu = lire_flux(tmp_path)
+        assert lu["microzone_ids"] == MICROZONES
+        assert lu["jour"].tolist() == [0, 1, 2, 3, 4]
+        assert lu["vecteurs"].shape == (5, 2, 3, 3)
+        assert lu["vecteurs"][3, 0, 0].tolist() == [1, 3, 2]  # agression MZ_11_01 [grave, moyen, bénin]
+        assert lu["vecteurs"][4, 1, 2].tolist() == [0, 0, 4]  # accident MZ_12_01
+        assert lu["congestion"][:, 0].tolist() == [1.5] * 5
+        assert np.isnan(lu["congestion"][:, 1]).all()
+        assert lu["evt_id"].tolist() == ["ag_1", "ft_1"]
+        assert lu["evt_jour"].tolist() == [2, 4]
+        assert lu["evt_duree"].tolist() == [3, 1]
+        assert lu["evt_morts_base"].tolist() == [1, 0]
+        assert lu["evt_impact_reduction"][1] == pytest.approx(0.2)
+
+    def test_blocs_lisibles_pendant_le_run(self, tmp_path):
+        state = _state(3)
+        flux = FluxResultats(tmp_path, MICROZONES, jours_par_bloc=2, fsync=FSYNC_AUCUN)
+        assert lire_flux(tmp_path)["jour"].size == 0
+        for jour in range(3):
+            flux.ajouter_jour(jour, state)
+        # Jour 2 encore en tampon
+        assert lire_flux(tmp_path)["jour"].tolist() == [0, 1]
+        # Aucun fichier temporaire résiduel
+        assert not list((tmp_path / FLUX_DIRNAME).glob(".*"))
+
+    def test_parametres_invalides(self, tmp_path):
+        with pytest.raises(ValueError):
+            FluxResultats(tmp_path, MICROZONES, jours_par_bloc=0)
+        with pytest.raises(ValueError):
+            FluxResultats(tmp_path, MICROZONES, fsync="toujours")
@@ -0,0 +1,66 @@
+"""
+Tests pour la comparaison de scénarios par différences appariées.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.services.scenario_comparison import COMPARAISON_FILENAME, comparer_scenarios, estimateur_apparie
+from src.services.sweep_service import appliquer_surcharges
+
+
+class TestEstimateurApparie:
+    """Tests pour estimateur_apparie."""
+
+    def test_correlation_reduit_la_variance(self):
+        rng = np.random.default_rng(0)
+        commun = rng.normal(100.0, 10.0, 50)
+        a = commun + rng.normal(0.0, 1.0, 50)
+        b = commun + 5.0 + rng.normal(0.0, 1.0, 50)
+        e = estimateur_apparie(a, b)
+        assert e["n"] == 50
+        assert e["difference"] == pytest.approx(5.0, abs=0.6)
+        assert e["demi_largeur_appariee"] < e["demi_largeur_independante"] / 5
+        assert e["facteur_reduction_variance"] > 25
+
+    def test_paires_antithetiques(self):
+        a = np.array([1.0, 3.0, 2.0, 4.0, 9.0])
+        b = np.array([2.0, 4.0, 3.0, 5.0, 0.0])
+        e = estimateur_apparie(a, b, paires_antithetiques=True)
+        assert e["n"] == 2  # paire incomplète (run 4) ignorée
+        assert e["moyenne_a"] == pytest.approx(2.5)
+        assert e["difference"] == pytest.approx(1.0)
+        assert e["demi_largeur_appariee"] == 0.0
+        assert e["facteur_reduction_variance"] == np.inf
+
+    def test_moins_de_deux_unites(self):
+        e = estimateur_apparie([1.0], [2.0])
+        assert e["difference"] == 1.0
+        assert e["demi_largeur_appariee"] == np.inf
+        with pytest.raises(ValueError):
+            estimateur_apparie([1.0, 2.0], [1.0])
+
+
+def test_comparaison_crn(config, tmp_path):
+    """Runs appariés par scénario, comparaison.csv écrite avec une ligne par statistique."""
+    config_crn = appliquer_surcharges(config, {"simulation.reduction_variance": "crn"})
+    df = comparer_scenarios(
+        config_crn, tmp_path, scenario_a="moyen", scenario_b="pessimiste", jours=3, runs=3, save_trace=True,
+        verbose=False,
+    )
+    assert sorted(p.name for p in (tmp_path / "pessimiste").glob("run_*")) == ["run_000", "run_001", "run_002"]
+    relu = pd.read_csv(tmp_path / COMPARAISON_FILENAME)
+    assert list(relu["statistique"]) == list(df["statistique"])
+    ligne = df.set_index("statistique").loc["incidents"]
+    assert ligne["n"] == 3
+    assert ligne["reduction_variance"] == "crn"
+    assert ligne["difference"] == pytest.approx(ligne["moyenne_b"] - ligne["moyenne_a"])
+
+
+def test_comparaison_parametres_invalides(config, tmp_path):
+    with pytest.raises(ValueError):
+        comparer_scenarios(config, tmp_path, scenario_a="moyen", scenario_b="moyen", runs=2)
+    config_anti = appliquer_surcharges(config, {"simulation.reduction_variance": "antithetique"})
+    with pytest.raises(ValueError):
+        comparer_scenarios(config_anti, tmp_path, runs=3)
@@ -0,0 +1,112 @@
+"""
+Tests pour l'émulateur des statistiques de run (plan en hypercube latin, GP / gradient boosting).
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.services.surrogate import (
+    EMULATEUR_FILENAME,
+    VALIDATION_FILENAME,
+    Emulateur,
+    EspaceParametres,
+    construire_emulateur,
+    rapport_validation,
+)
+from src.services.sweep_service import appliquer_surcharges
+
+
+ESPACE = EspaceParametres({"scenarios.moyen.facteur_intensite": (0.5, 2.0), "matrices_base.reduction_effet": (-1.0, 0.8)})
+
+
+def _runs_synthetiques(n: int, seed: int) -> pd.DataFrame:
+    """Runs factices : incidents ≈ 100 × intensité + bruit, reduction_effet sans effet."""
+    rng = np.random.default_rng(seed)
+    lignes = []
+    for point in ESPACE.plan_hypercube(n, seed):
+        lignes.append({
+            "surcharges": json.dumps(point, sort_keys=True),
+            "statut": "termine",
+            "jours": 30,
+            "incidents": 100.0 * point["scenarios.moyen.facteur_intensite"] + rng.normal(0.0, 3.0),
+        })
+    return pd.DataFrame(lignes)
+
+
+class TestEspaceParametres:
+    """Tests pour EspaceParametres."""
+
+    def test_plan_hypercube(self):
+        plan = ESPACE.plan_hypercube(10, seed=1)
+        assert len(plan) == 10
+        x = ESPACE.normaliser(plan)
+        assert ((x >= 0.0) & (x <= 1.0)).all()
+        # Une valeur par strate de chaque dimension
+        for colonne in x.T:
+            assert sorted(np.floor(colonne * 10).astype(int)) == list(range(10))
+        assert plan == ESPACE.plan_hypercube(10, seed=1)
+
+    def test_bornes_invalides(self):
+        with pytest.raises(ValueError):
+            EspaceParametres({"matrices_base.reduction_effet": (0.5, 0.5)})
+        with pytest.raises(ValueError):
+            EspaceParametres({})
+
+    def test_valeurs(self, config):
+        valeurs = ESPACE.valeurs(appliquer_surcharges(config, {"scenarios.moyen.facteur_intensite": 1.7}))
+        assert valeurs["scenarios.moyen.facteur_intensite"] == 1.7
+        with pytest.raises(KeyError):
+            EspaceParametres({"scenarios.inconnu.facteur_intensite": (0.5, 2.0)}).valeurs(config)
+
+
+class TestEmulateur:
+    """Tests pour Emulateur et rapport_validation sur des runs synthétiques."""
+
+    @pytest.mark.parametrize("methode", ["gp", "gradient_boosting"])
+    def test_ajustement_et_validation(self, methode):
+        emulateur = Emulateur(ESPACE, methode=methode).ajuster(_runs_synthetiques(40, 0))
+        assert emulateur.statistiques == ["incidents"]  # jours constant, ignoré
+        rapport = rapport_validation(emulateur, _runs_synthetiques(30, 1)).set_index("statistique")
+        assert rapport.loc["incidents", "n"] == 30
+        assert rapport.loc["incidents", "r2"] > 0.9
+        assert rapport.loc["incidents", "couverture"] >= 0.6
+
+    def test_predire_intervalle(self):
+        emulateur = Emulateur(ESPACE).ajuster(_runs_synthetiques(30, 0))
+        df = emulateur.predire([{"scenarios.moyen.facteur_intensite": 1.5, "matrices_base.reduction_effet": 0.0}])
+        assert df.loc[0, "incidents"] == pytest.approx(150.0, abs=10.0)
+        assert df.loc[0, "incidents_basse"] < df.loc[0, "incidents"] < df.loc[0, "incidents_haute"]
+        assert df.loc[0, "incidents_std"] > 0
+
+    def test_predict_summary_et_sauvegarde(self, config, tmp_path):
+        emulateur = Emulateur(ESPACE).ajuster(_runs_synthetiques(30, 0))
+        config_forte = appliquer_surcharges(config, {"scenarios.moyen.facteur_intensite": 1.8})
+        resume = emulateur.predict_summary(config_forte)
+        assert set(resume["incidents"]) == {"moyenne", "ecart_type", "borne_basse", "borne_haute"}
+        assert resume["incidents"]["moyenne"] > emulateur.predict_summary(config)["incidents"]["moyenne"]
+        relu = Emulateur.charger(emulateur.sauvegarder(tmp_path / EMULATEUR_FILENAME))
+        assert relu.predict_summary(config_forte) == resume
+
+    def test_erreurs(self):
+        with pytest.raises(ValueError):
+            Emulateur(ESPACE, methode="inconnue")
+        with pytest.raises(RuntimeError):
+            Emulateur(ESPACE).predire(ESPACE.plan_hypercube(2))
+        with pytest.raises(ValueError):
+            Emulateur(ESPACE).ajuster(_runs_synthetiques(1, 0))
+
+
+def test_construire_emulateur(config, tmp_path):
+    """Plans simulés par le balayage, émulateur et rapport de validation écrits."""
+    emulateur, rapport = construire_emulateur(
+        config, tmp_path, espace=ESPACE, points=4, points_validation=2, seeds=[42], jours=3, verbose=False,
+    )
+    assert (tmp_path / EMULATEUR_FILENAME).exists()
+    assert len(pd.read_csv(tmp_path / "apprentissage" / "resume_runs.csv")) == 4
+    relu = pd.read_csv(tmp_path / VALIDATION_FILENAME)
+    assert list(relu["statistique"]) == emulateur.statistiques
+    assert (rapport["n"] == 2).all()
+    assert "incidents" in emulateur.predict_summary(config)
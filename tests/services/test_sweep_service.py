@@ -0,0 +1,96 @@
+"""
+Tests pour le balayage de paramètres (GrilleBalayage, executer_balayage).
+"""
+
+import json
+
+import pandas as pd
+import pytest
+
+from src.services.sweep_service import (
+    RESUME_CELLULES_FILENAME,
+    RESUME_RUNS_FILENAME,
+    GrilleBalayage,
+    appliquer_surcharges,
+    executer_balayage,
+    resumer_cellules,
+)
+
+
+class TestGrilleBalayage:
+    """Tests pour GrilleBalayage."""
+
+    def test_cellules(self):
+        grille = GrilleBalayage(scenarios=["pessimiste", "optimiste"], variabilites=["Faible"], jours=[30, 60])
+        cellules = grille.cellules()
+        assert [c["cellule"] for c in cellules] == [0, 1, 2, 3]
+        assert [(c["jours"], c["scenario"]) for c in cellules] == [
+            (30, "pessimiste"), (30, "optimiste"), (60, "pessimiste"), (60, "optimiste"),
+        ]
+
+    def test_valeurs_invalides(self):
+        with pytest.raises(ValueError):
+            GrilleBalayage(scenarios=["catastrophe"])
+        with pytest.raises(ValueError):
+            GrilleBalayage(seeds=[])
+
+    def test_depuis_dict(self):
+        grille = GrilleBalayage.depuis_dict({"seeds": [1, 2], "inconnue": 3})
+        assert grille.seeds == [1, 2]
+        assert grille.scenarios == ["pessimiste", "moyen", "optimiste"]
+
+
+class TestSurcharges:
+    """Tests pour appliquer_surcharges."""
+
+    def test_surcharge_appliquee(self, config):
+        avant = config.effets_patterns.reduction_effet
+        surcharge = appliquer_surcharges(config, {"effets_patterns.reduction_effet": 0.5})
+        assert surcharge.effets_patterns.reduction_effet == 0.5
+        assert config.effets_patterns.reduction_effet == avant
+
+    def test_surcharge_inconnue(self, config):
+        with pytest.raises(KeyError):
+            appliquer_surcharges(config, {"effets_patterns.inexistant": 1})
+
+    def test_parametres_generation(self, config):
+        """Détection des patterns désactivée par défaut, activée explicitement par surcharge."""
+        from src.services.simulation_service import _parametres_generation
+
+        params = _parametres_generation(config)
+        assert params["detection_patterns"] is False
+        assert params["reduction_effet_patterns"] == config.effets_patterns.reduction_effet
+        active = appliquer_surcharges(config, {"effets_patterns.detection_active": True})
+        assert _parametres_generation(active)["detection_patterns"] is True
+
+
+def test_resumer_cellules_ignore_les_echecs():
+    df_runs = pd.DataFrame([
+        {"cellule": 0, "scenario": "moyen", "variabilite": "Faible", "jours": 2, "surcharges": "{}",
+         "seed": 1, "run_id": "run_000", "statut": "termine", "incidents": 10},
+        {"cellule": 0, "scenario": "moyen", "variabilite": "Faible", "jours": 2, "surcharges": "{}",
+         "seed": 2, "run_id": "run_001", "statut": "termine", "incidents": 14},
+        {"cellule": 0, "scenario": "moyen", "variabilite": "Faible", "jours": 2, "surcharges": "{}",
+         "seed": 3, "run_id": "run_002", "statut": "echec", "erreur": "boom"},
+    ])
+    df = resumer_cellules(df_runs)
+    assert df["n_runs"].tolist() == [2]
+    assert df["incidents_moy"].tolist() == [12.0]
+
+
+def test_executer_balayage_pool_identique_sequentiel(config, tmp_path):
+    """Grille 2 scénarios × 2 seeds : mêmes statistiques avec et sans pool, un dossier par cellule."""
+    grille = GrilleBalayage(scenarios=["pessimiste", "optimiste"], variabilites=["Moyenne"], seeds=[7, 8], jours=[3])
+    seq = executer_balayage(config, grille, tmp_path / "seq", save_pickles=False, verbose=False)
+    par = executer_balayage(config, grille, tmp_path / "par", workers=2, save_pickles=False, verbose=False)
+    pd.testing.assert_frame_equal(seq, par)
+    assert seq["n_runs"].tolist() == [2, 2]
+
+    runs = pd.read_csv(tmp_path / "seq" / RESUME_RUNS_FILENAME)
+    assert runs["statut"].tolist() == ["termine"] * 4
+    assert (runs["jours"] == 3).all()
+    assert (tmp_path / "seq" / RESUME_CELLULES_FILENAME).exists()
+    cellule = json.loads((tmp_path / "seq" / "cellule_001" / "cellule.json").read_text())
+    assert cellule["scenario"] == "optimiste"
+    trace = json.loads((tmp_path / "seq" / "cellule_001" / "run_001" / "trace.json").read_text())
+    assert trace["seed"] == 8